@@ -0,0 +1,73 @@
+"""
+Shared helpers for the standalone benchmark scripts.
+
+Benchmarks are plain scripts (not pytest tests) so they can be run on demand
+without slowing down the unit test suite:
+
+    python benchmarks/bench_metrics_engine.py
+
+Each script imports this module first so that the project root is on
+sys.path and ``src`` can be imported the same way the tests import it.
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+# Project root (parent of benchmarks/) - make ``src`` importable
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+# Real Touchstone files shipped with the test suite (4-port SIT data)
+DATA_DIR = PROJECT_ROOT / "tests" / "data"
+
+
+def sit_files() -> List[Path]:
+    """
+    Return the 4-port SIT Touchstone files used as benchmark input.
+    
+    Returns:
+        Sorted list of .s4p paths from tests/data
+    """
+    return sorted(DATA_DIR.glob("*.s4p"))
+
+
+def time_call(func: Callable[[], object], repeat: int = 5) -> Tuple[float, object]:
+    """
+    Time a callable, returning the best wall-clock time of several runs.
+    
+    The best (minimum) time is the least noisy estimate of the cost of the
+    code itself; slower runs are dominated by scheduler/GC noise.
+    
+    Args:
+        func: Zero-argument callable to time
+        repeat: Number of runs
+        
+    Returns:
+        Tuple of (best_seconds, result_of_last_call)
+    """
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def report(label: str, baseline_s: float, optimized_s: float) -> None:
+    """
+    Print a one-line baseline vs optimized comparison.
+    
+    Args:
+        label: What was measured
+        baseline_s: Baseline time in seconds
+        optimized_s: Optimized time in seconds
+    """
+    speedup = baseline_s / optimized_s if optimized_s > 0 else float("inf")
+    print(
+        f"{label:<40} baseline {baseline_s * 1e3:9.2f} ms   "
+        f"optimized {optimized_s * 1e3:9.2f} ms   speedup {speedup:6.1f}x"
+    )
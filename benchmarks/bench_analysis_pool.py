@@ -0,0 +1,75 @@
+"""
+Benchmark: one GUI refresh cycle with and without a shared analysis pool.
+
+A refresh evaluates compliance of every SIT measurement and prepares three
+plots (operational gain, operational VSWR, wideband gain). Without sharing
+(a fresh pool per consumer call - the previous behavior) every consumer
+decodes the stored BLOB and band-limits the network again; with one
+AnalysisContextPool each measurement is decoded once.
+
+Usage:
+    python benchmarks/bench_analysis_pool.py
+"""
+
+from datetime import date
+
+import _common  # noqa: F401  (puts project root on sys.path)
+from _common import report, sit_files, time_call
+
+from src.core.models.device import Device
+from src.core.models.measurement import Measurement
+from src.core.models.test_criteria import TestCriteria
+from src.core.rf_data.analysis_context import AnalysisContextPool
+from src.core.rf_data.touchstone_loader import TouchstoneLoader
+from src.core.services.plotting_service import PlottingService
+from src.core.test_types.s_parameters import SParametersTestType
+
+PLOT_TYPES = ["Operational Gain", "Operational VSWR", "Wideband Gain"]
+
+
+def main() -> None:
+    loader = TouchstoneLoader()
+    device = Device(
+        name="Bench", part_number="L109908",
+        operational_freq_min=1.0, operational_freq_max=2.0,
+        wideband_freq_min=0.1, wideband_freq_max=5.0,
+        input_ports=[1, 2], output_ports=[3, 4]
+    )
+    criteria = [TestCriteria(
+        device_id=device.id, test_type="S-Parameters", test_stage="SIT",
+        requirement_name="Gain Range", criteria_type="range",
+        min_value=20.0, max_value=40.0, unit="dB"
+    )]
+    blobs = [loader.serialize_network(loader.load_file(path)) for path in sit_files()]
+
+    def refresh(shared: bool) -> None:
+        # New measurement IDs per refresh - nothing carries over between runs
+        measurements = [
+            Measurement(
+                device_id=device.id, serial_number="SN0001", test_type="S-Parameters",
+                test_stage="SIT", temperature=temperature, path_type=path_type,
+                file_path="bench.s4p", measurement_date=date(2025, 9, 30), touchstone_data=blob
+            )
+            for blob, (temperature, path_type) in zip(
+                blobs, [(t, p) for p in ("PRI", "RED") for t in ("AMB", "COLD", "HOT")]
+            )
+        ]
+        pool = AnalysisContextPool()
+        pool_for = (lambda: pool) if shared else AnalysisContextPool
+        for measurement in measurements:
+            SParametersTestType(analysis_pool=pool_for()).evaluate_compliance(
+                measurement, device, criteria, 1.0, 2.0
+            )
+        for plot_type in PLOT_TYPES:
+            PlottingService(analysis_pool=pool_for()).prepare_plot_data(
+                device, measurements, plot_type, set(), set(), set(), "SIT"
+            )
+
+    base_s, _ = time_call(lambda: refresh(shared=False))
+    opt_s, _ = time_call(lambda: refresh(shared=True))
+    report(f"Refresh cycle, {len(blobs)} measurements x (compliance + {len(PLOT_TYPES)} plots)",
+           base_s, opt_s)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark: Network.interpolate band filtering vs the numpy band-edge kernel.
+
+filter_frequency_range is called by every compliance and plotting path. The
+original implementation interpolated the whole network onto the target grid;
+the kernel slices interior samples and interpolates only the two band edges.
+
+Usage:
+    python benchmarks/bench_band_filter.py
+"""
+
+import numpy as np
+
+import _common  # noqa: F401  (puts project root on sys.path)
+from _common import sit_files, time_call, report
+
+from src.core.rf_data.touchstone_loader import TouchstoneLoader
+from src.core.rf_data.s_parameter_calculator import SParameterCalculator
+
+BAND_MIN_GHZ = 0.5
+BAND_MAX_GHZ = 2.0
+
+
+def interpolate_filter(network, freq_min: float, freq_max: float):
+    """Original filter_frequency_range implementation (full Network.interpolate)."""
+    freq_hz = network.f
+    target_min = np.clip(freq_min * 1e9, freq_hz.min(), freq_hz.max())
+    target_max = np.clip(freq_max * 1e9, freq_hz.min(), freq_hz.max())
+    interior = freq_hz[(freq_hz >= target_min) & (freq_hz <= target_max)]
+    targets = np.unique(np.sort(np.concatenate([interior, [target_min, target_max]])))
+    interpolated = network.interpolate(targets)
+    mask = (interpolated.f >= target_min - 1e-9) & (interpolated.f <= target_max + 1e-9)
+    return interpolated[mask]
+
+
+def main() -> None:
+    loader = TouchstoneLoader()
+    calculator = SParameterCalculator()
+    networks = [loader.load_file(path) for path in sit_files()]
+    
+    baseline_s, _ = time_call(
+        lambda: [interpolate_filter(n, BAND_MIN_GHZ, BAND_MAX_GHZ) for n in networks]
+    )
+    network_s, _ = time_call(
+        lambda: [calculator.filter_frequency_range(n, BAND_MIN_GHZ, BAND_MAX_GHZ) for n in networks]
+    )
+    arrays_s, _ = time_call(
+        lambda: [
+            calculator.band_limit_arrays(n.f, n.s, BAND_MIN_GHZ, BAND_MAX_GHZ)
+            for n in networks
+        ]
+    )
+    
+    report("filter_frequency_range (Network)", baseline_s, network_s)
+    report("band_limit_arrays (raw arrays)", baseline_s, arrays_s)
+
+
+if __name__ == "__main__":
+    main()
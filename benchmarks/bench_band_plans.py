@@ -0,0 +1,49 @@
+"""
+Benchmark: band-limiting with fresh index computation vs cached band plans.
+
+Band-limits every SIT network to the bands a compliance evaluation and the
+plots use (operational, wideband, two OOB bands), planning each call from
+scratch (searchsorted, clamping, edge weights - the previous behavior) and
+through the BandPlanCache, and prints the cache hit rate.
+
+Usage:
+    python benchmarks/bench_band_plans.py [repeat_files]
+"""
+
+import sys
+
+import _common  # noqa: F401  (puts project root on sys.path)
+from _common import report, sit_files, time_call
+
+from src.core.rf_data.band_plan import BandPlanCache, make_band_plan
+from src.core.rf_data.s_parameter_calculator import SParameterCalculator
+from src.core.rf_data.touchstone_loader import TouchstoneLoader
+
+BANDS = [(0.5, 2.0), (0.01, 6.0), (3.0, 5.0), (0.05, 0.3)]
+
+
+def main() -> None:
+    repeat_files = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    loader = TouchstoneLoader()
+    networks = [loader.load_file(path) for path in sit_files()] * repeat_files
+    calculator = SParameterCalculator(band_plans=BandPlanCache())
+
+    def uncached():
+        for network in networks:
+            for band in BANDS:
+                plan = make_band_plan(network.f, *band)
+                plan.apply(network.s)
+
+    def cached():
+        for network in networks:
+            for band in BANDS:
+                calculator.band_limit_arrays(network.f, network.s, *band)
+
+    base_s, _ = time_call(uncached)
+    opt_s, _ = time_call(cached)
+    report(f"Band-limit {len(networks)} networks x {len(BANDS)} bands", base_s, opt_s)
+    print(f"  plan cache hit rate {calculator.band_plan_stats().hit_rate:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: per-row commits vs batched single-transaction writes.
+
+Saves test results to a file-backed SQLite database, once with one
+TestResultRepository.create call per result (one commit each, as
+ComplianceService.save_test_results used to do) and once with create_many
+(one executemany, one commit). Reports results per second.
+
+Usage:
+    python benchmarks/bench_batched_writes.py [n_results]
+"""
+
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from uuid import uuid4
+
+import _common  # noqa: F401  (puts project root on sys.path)
+
+from src.database.schema import create_schema
+from src.core.models.test_result import TestResult
+from src.core.repositories.test_result_repository import TestResultRepository
+
+
+def make_results(n_results: int) -> list:
+    """Build n_results test results spread over 16 S-parameters per measurement."""
+    criteria_id = uuid4()
+    results = []
+    measurement_id = uuid4()
+    for i in range(n_results):
+        if i % 16 == 0:
+            measurement_id = uuid4()
+        results.append(
+            TestResult(
+                measurement_id=measurement_id,
+                test_criteria_id=criteria_id,
+                measured_value=float(i),
+                passed=i % 7 != 0,
+                s_parameter=f"S{i % 4 + 1}{i // 4 % 4 + 1}",
+            )
+        )
+    return results
+
+
+def open_db(path: Path) -> sqlite3.Connection:
+    """Open a fresh file-backed database with the application schema."""
+    conn = sqlite3.connect(str(path))
+    conn.row_factory = sqlite3.Row
+    create_schema(conn)
+    return conn
+
+
+def main() -> None:
+    n_results = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        # Baseline: one commit per result
+        conn = open_db(Path(tmp) / "per_row.db")
+        repo = TestResultRepository(conn)
+        results = make_results(n_results)
+        start = time.perf_counter()
+        for result in results:
+            repo.create(result)
+        per_row_s = time.perf_counter() - start
+        conn.close()
+        
+        # Batched: one executemany, one commit
+        conn = open_db(Path(tmp) / "batched.db")
+        repo = TestResultRepository(conn)
+        results = make_results(n_results)
+        start = time.perf_counter()
+        repo.create_many(results)
+        batched_s = time.perf_counter() - start
+        conn.close()
+    
+    print(f"{n_results} test results, file-backed database")
+    print(f"  per-row commits   {n_results / per_row_s:12.0f} results/s")
+    print(f"  create_many       {n_results / batched_s:12.0f} results/s")
+    print(f"  speedup           {per_row_s / batched_s:12.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark: sequential vs process-pool bulk directory ingest.
+
+Builds a synthetic campaign by copying the SIT Touchstone files under many
+serial numbers, then ingests it with BulkIngestService twice: with one
+worker (in-process parsing, the sequential baseline) and with one worker
+per core. Each run writes to a fresh file-backed database.
+
+Usage:
+    python benchmarks/bench_bulk_ingest.py [n_serials]
+"""
+
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+import _common  # noqa: F401  (puts project root on sys.path)
+
+from src.database.schema import create_schema
+from src.core.models.device import Device
+from src.core.repositories.device_repository import DeviceRepository
+from src.core.repositories.measurement_repository import MeasurementRepository
+from src.core.services.bulk_ingest_service import BulkIngestService
+
+
+def build_campaign(root: Path, n_serials: int) -> int:
+    """Copy the 6 SIT files (3 temperatures x PRI/RED) once per serial number."""
+    count = 0
+    for serial in range(1, n_serials + 1):
+        folder = root / f"SN{serial:04d}"
+        folder.mkdir()
+        for source in _common.sit_files():
+            name = source.name.replace("SN0001", f"SN{serial:04d}")
+            shutil.copy(source, folder / name)
+            count += 1
+    return count
+
+
+def run_ingest(db_path: Path, campaign: Path, max_workers: int):
+    """Ingest the campaign into a fresh database, returning the report."""
+    conn = sqlite3.connect(str(db_path))
+    conn.row_factory = sqlite3.Row
+    create_schema(conn)
+    device_repo = DeviceRepository(conn)
+    device = device_repo.create(Device(
+        name="Bench Device",
+        part_number="L109908",
+        operational_freq_min=0.5,
+        operational_freq_max=2.0,
+        wideband_freq_min=0.1,
+        wideband_freq_max=5.0,
+        input_ports=[1, 2],
+        output_ports=[3, 4],
+    ))
+    service = BulkIngestService(
+        MeasurementRepository(conn), device_repo, max_workers=max_workers
+    )
+    report = service.ingest_directory(campaign, device, "SIT")
+    conn.close()
+    return report
+
+
+def main() -> None:
+    n_serials = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    cores = os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        campaign = Path(tmp) / "campaign"
+        campaign.mkdir()
+        n_files = build_campaign(campaign, n_serials)
+
+        sequential = run_ingest(Path(tmp) / "sequential.db", campaign, max_workers=1)
+        parallel = run_ingest(Path(tmp) / "parallel.db", campaign, max_workers=cores)
+
+    assert sequential.measurements_saved == parallel.measurements_saved == n_files
+
+    print(f"{n_files} Touchstone files, {cores} cores")
+    print(f"  {'1 worker':<18}{n_files / sequential.elapsed_s:10.0f} files/s")
+    print(f"  {f'{cores} workers':<18}{n_files / parallel.elapsed_s:10.0f} files/s")
+    print(f"  {'speedup':<18}{sequential.elapsed_s / parallel.elapsed_s:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
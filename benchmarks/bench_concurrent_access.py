@@ -0,0 +1,150 @@
+"""
+Benchmark: GUI read latency while a background worker writes.
+
+A writer thread saves batches of test results (like ComplianceEvaluationWorker)
+while the main thread runs the compliance table query in a loop (like the GUI
+refreshing). Runs twice on a file database: default rollback-journal mode
+with plain connections (the old create_services_for_thread setup) and WAL
+mode with ConnectionManager connections. Reports read latency percentiles.
+
+Usage:
+    python benchmarks/bench_concurrent_access.py [seconds]
+"""
+
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+from pathlib import Path
+
+import _common  # noqa: F401  (puts project root on sys.path)
+
+from src.database.schema import create_schema
+from src.database.connection_manager import ConnectionManager
+from src.core.models.device import Device
+from src.core.models.measurement import Measurement
+from src.core.models.test_criteria import TestCriteria
+from src.core.models.test_result import TestResult
+from src.core.repositories import (
+    DeviceRepository, MeasurementRepository, TestCriteriaRepository, TestResultRepository
+)
+from src.core.rf_data.touchstone_loader import TouchstoneLoader
+
+
+def plain_connection(db_path: Path) -> sqlite3.Connection:
+    """Connection as opened before the connection manager (default journal)."""
+    conn = sqlite3.connect(str(db_path), check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    return conn
+
+
+def run(db_path: Path, connect, network, duration_s: float) -> dict:
+    """Measure reader latency while a writer thread commits result batches."""
+    setup = connect(db_path)
+    create_schema(setup)
+    device = DeviceRepository(setup).create(Device(
+        name="Bench Device",
+        part_number="L109908",
+        operational_freq_min=0.5,
+        operational_freq_max=2.0,
+        wideband_freq_min=0.1,
+        wideband_freq_max=5.0,
+        input_ports=[1, 2],
+        output_ports=[3, 4],
+    ))
+    criteria = TestCriteriaRepository(setup).create(TestCriteria(
+        device_id=device.id, test_type="S-Parameters", test_stage="SIT",
+        requirement_name="Gain Range", criteria_type="range",
+        min_value=27.5, max_value=31.3, unit="dB"
+    ))
+    # Half the measurements are shown by the reader, half get new results
+    measurements = MeasurementRepository(setup).create_many([
+        Measurement(
+            device_id=device.id, serial_number=f"SN{serial:04d}",
+            test_type="S-Parameters", test_stage="SIT",
+            temperature="AMB", path_type="PRI",
+            file_path=f"/bench/SN{serial:04d}.s4p",
+            measurement_date=date(2025, 9, 30), touchstone_data=network
+        )
+        for serial in range(1, 49)
+    ])
+    measurement_ids = [m.id for m in measurements[:24]]
+    written_ids = [m.id for m in measurements[24:]]
+    TestResultRepository(setup).create_many([
+        TestResult(measurement_id=m_id, test_criteria_id=criteria.id,
+                   measured_value=29.0, passed=True, s_parameter=f"S{i}1")
+        for m_id in measurement_ids for i in range(2, 10)
+    ])
+    setup.close()
+
+    stop = threading.Event()
+    writes = [0]
+
+    def writer():
+        repo = TestResultRepository(connect(db_path))
+        while not stop.is_set():
+            # Every batch changes every value, so all 2000 rows are rewritten
+            repo.upsert_by_key([
+                TestResult(measurement_id=written_ids[i % len(written_ids)],
+                           test_criteria_id=criteria.id,
+                           measured_value=29.0 + writes[0] % 2, passed=True,
+                           s_parameter=f"S{i // len(written_ids)}")
+                for i in range(2000)
+            ])
+            writes[0] += 1
+        repo.conn.close()
+
+    reader = TestResultRepository(connect(db_path))
+    latencies, errors = [], 0
+    thread = threading.Thread(target=writer)
+    thread.start()
+    deadline = time.perf_counter() + duration_s
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            reader.get_with_criteria(measurement_ids, "SIT")
+        except sqlite3.OperationalError:
+            errors += 1  # "database is locked"
+        latencies.append(time.perf_counter() - start)
+    stop.set()
+    thread.join()
+    reader.conn.close()
+
+    latencies.sort()
+    return {
+        "reads": len(latencies),
+        "writes": writes[0],
+        "errors": errors,
+        "p50": statistics.median(latencies),
+        "p99": latencies[int(len(latencies) * 0.99)],
+        "max": latencies[-1],
+    }
+
+
+def main() -> None:
+    duration_s = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    network = TouchstoneLoader().load_file(_common.sit_files()[0])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = run(Path(tmp) / "journal.db", plain_connection, network, duration_s)
+        wal = run(
+            Path(tmp) / "wal.db",
+            lambda path: ConnectionManager(path).open_connection(check_same_thread=False),
+            network, duration_s
+        )
+
+    print(f"read latency during background writes ({duration_s:.0f} s each)")
+    print(f"  {'':<18}{'reads':>8}{'writes':>8}{'errors':>8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for label, stats in (("rollback journal", journal), ("WAL + pragmas", wal)):
+        print(
+            f"  {label:<18}{stats['reads']:>8}{stats['writes']:>8}{stats['errors']:>8}"
+            f"{stats['p50'] * 1e3:>10.2f}{stats['p99'] * 1e3:>10.2f}{stats['max'] * 1e3:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: device/criteria lookups with and without the identity-map cache.
+
+Simulates the lookups of reopening and re-evaluating a campaign: for every
+measurement the compliance table resolves the criteria of its stored
+results by ID (get_by_ids) and the selected row's criterion (get_by_id);
+then the device and the stage's criteria are fetched (as ComplianceService
+does) and a plot re-reads the criteria. Runs against a file-backed
+database without a cache and with a shared EntityCache, and reports the
+hit rate of each cache region.
+
+Usage:
+    python benchmarks/bench_entity_cache.py [n_measurements]
+"""
+
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+import _common  # noqa: F401  (puts project root on sys.path)
+from _common import report, time_call
+
+from src.database.schema import create_schema
+from src.core.models.device import Device
+from src.core.models.test_criteria import TestCriteria
+from src.core.repositories import (
+    DeviceRepository, EntityCache, TestCriteriaRepository
+)
+
+
+def main() -> None:
+    n_measurements = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(str(Path(tmp) / "bench.db"))
+        conn.row_factory = sqlite3.Row
+        create_schema(conn)
+        device = DeviceRepository(conn).create(Device(
+            name="Bench Device", part_number="L109908",
+            operational_freq_min=0.5, operational_freq_max=2.0,
+            wideband_freq_min=0.1, wideband_freq_max=5.0,
+            input_ports=[1, 2], output_ports=[3, 4],
+        ))
+        criteria_ids = [
+            TestCriteriaRepository(conn).create(TestCriteria(
+                device_id=device.id, test_type="S-Parameters", test_stage="SIT",
+                requirement_name=f"OOB {i}", criteria_type="greater_than_equal",
+                min_value=40.0, unit="dBc", frequency_min=3.0 + i, frequency_max=3.5 + i
+            )).id
+            for i in range(8)
+        ]
+
+        def campaign(cache):
+            device_repo = DeviceRepository(conn, cache)
+            criteria_repo = TestCriteriaRepository(conn, cache)
+            loaded = 0
+            # Compliance table of the reopened campaign: criteria of the stored results
+            for i in range(n_measurements):
+                loaded += len(criteria_repo.get_by_ids(criteria_ids))
+                loaded += criteria_repo.get_by_id(criteria_ids[i % len(criteria_ids)]) is not None
+            # Re-evaluation
+            for _ in range(n_measurements):
+                device_repo.get_by_id(device.id)
+                loaded += len(criteria_repo.get_by_device_and_test(device.id, "S-Parameters", "SIT"))
+                # Plot of the measurement re-reads the gain criteria
+                criteria_repo.get_by_device_and_test(device.id, "S-Parameters", "SIT")
+            return loaded
+
+        cache = EntityCache()
+        base_s, base = time_call(lambda: campaign(None), repeat=3)
+        opt_s, opt = time_call(lambda: campaign(cache), repeat=3)
+        assert base == opt
+        conn.close()
+
+    print(f"{n_measurements} measurements, 5 lookups each")
+    report("device + criteria lookups", base_s, opt_s)
+    for region, stats in cache.stats().items():
+        print(f"  {region:<18} hits {stats.hits:7d}   misses {stats.misses:4d}   "
+              f"hit rate {stats.hit_rate:6.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark: per-measurement band metrics vs stacked fleet batches.
+
+Builds a campaign of N production units on the SIT frequency grid (the
+SIT files with small random perturbations) and computes the operational
+band and two OOB bands for every unit, once per measurement with
+compute_band_metrics and once with compute_band_metrics_batch (one
+[N, f, n, n] stack per grid).
+
+Usage:
+    python benchmarks/bench_fleet_metrics.py [n_units]
+"""
+
+import sys
+from uuid import uuid4
+
+import numpy as np
+
+import _common  # noqa: F401  (puts project root on sys.path)
+from _common import report, sit_files, time_call
+
+from src.core.rf_data.touchstone_loader import TouchstoneLoader
+from src.core.models.measurement import Measurement
+from src.core.test_types.s_parameters import SParametersTestType
+
+BANDS = [(0.5, 2.0), (3.0, 5.0), (0.01, 0.3)]
+
+
+def main() -> None:
+    n_units = int(sys.argv[1]) if len(sys.argv) > 1 else 120
+
+    loader = TouchstoneLoader()
+    test_type = SParametersTestType()
+    templates = [loader.load_file(path) for path in sit_files()]
+    rng = np.random.default_rng(0)
+
+    measurements = []
+    for unit in range(n_units):
+        network = templates[unit % len(templates)].copy()
+        network.s = network.s * (1 + 0.01 * rng.standard_normal(network.s.shape))
+        measurements.append(Measurement.model_construct(id=uuid4(), touchstone_data=network))
+    print(f"{n_units} units, {templates[0].nports} ports, {len(templates[0].f)} points, {len(BANDS)} bands\n")
+
+    base_s, single = time_call(
+        lambda: {m.id: test_type.compute_band_metrics(m, BANDS) for m in measurements}, repeat=3
+    )
+    opt_s, batch = time_call(lambda: test_type.compute_band_metrics_batch(measurements, BANDS), repeat=3)
+    assert single == batch
+
+    report(f"Band metrics, {n_units} units", base_s, opt_s)
+
+
+if __name__ == "__main__":
+    main()
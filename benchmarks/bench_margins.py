@@ -0,0 +1,63 @@
+"""
+Benchmark: per-frequency limit margins, per S-parameter vs margin engine.
+
+Computes the signed margin to a gain range limit at every frequency for
+every gain S-parameter and to a VSWR limit for every port of every SIT
+network. The baseline band-limits the network and converts each
+S-parameter separately (calculate_gain / calculate_vswr per S-parameter);
+the margin engine reduces the band samples that band metrics are computed
+from (calculate_band_samples + calculate_margins), so the metrics come
+along in the same pass.
+
+Usage:
+    python benchmarks/bench_margins.py [repeat_files]
+"""
+
+import sys
+
+import numpy as np
+
+import _common  # noqa: F401  (puts project root on sys.path)
+from _common import report, sit_files, time_call
+
+from src.core.rf_data.s_parameter_calculator import MarginLimit, SParameterCalculator
+from src.core.rf_data.touchstone_loader import TouchstoneLoader
+
+BAND = (1.0, 2.0)
+GAIN_PARAMS = ["S31", "S32", "S41", "S42"]
+GAIN_LIMIT = MarginLimit("gain", lower=-30.0, upper=0.0, guard_band=0.5)
+VSWR_LIMIT = MarginLimit("vswr", upper=2.0, guard_band=0.1)
+
+
+def main() -> None:
+    repeat_files = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    loader = TouchstoneLoader()
+    networks = [loader.load_file(path) for path in sit_files()] * repeat_files
+    calculator = SParameterCalculator()
+
+    def per_parameter():
+        for network in networks:
+            band = calculator.filter_frequency_range(network, *BAND)
+            for s_param in GAIN_PARAMS:
+                gain = calculator.calculate_gain(band, s_param)
+                margin = np.minimum(gain - GAIN_LIMIT.lower, GAIN_LIMIT.upper - gain)
+                np.argmin(margin), np.mean(margin < GAIN_LIMIT.guard_band)
+            for port in range(1, network.nports + 1):
+                vswr = calculator.calculate_vswr(band, port=port, freq_min=None, freq_max=None)
+                margin = VSWR_LIMIT.upper - vswr
+                np.argmin(margin), np.mean(margin < VSWR_LIMIT.guard_band)
+
+    def engine():
+        for network in networks:
+            samples = calculator.calculate_band_samples(network, [BAND])[BAND]
+            calculator.reduce_band_samples(samples)  # Band metrics, same samples
+            calculator.calculate_margins(samples, GAIN_LIMIT)
+            calculator.calculate_margins(samples, VSWR_LIMIT)
+
+    base_s, _ = time_call(per_parameter)
+    opt_s, _ = time_call(engine)
+    report(f"Margins of {len(networks)} networks (gain + VSWR limits)", base_s, opt_s)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: per-S-parameter metrics loop vs the vectorized metrics engine.
+
+Compares the previous SParametersTestType.calculate_metrics strategy (three
+calculator calls per S-parameter, each re-filtering the network) against the
+single-pass SParameterCalculator.calculate_band_metrics engine on the 4-port
+SIT files in tests/data.
+
+Usage:
+    python benchmarks/bench_metrics_engine.py
+"""
+
+import _common  # noqa: F401  (puts project root on sys.path)
+from _common import sit_files, time_call, report
+
+from src.core.rf_data.touchstone_loader import TouchstoneLoader
+from src.core.rf_data.s_parameter_calculator import SParameterCalculator
+from src.core.models.measurement import Measurement
+from src.core.test_types.s_parameters import SParametersTestType
+
+OPERATIONAL_MIN_GHZ = 0.5
+OPERATIONAL_MAX_GHZ = 2.0
+
+
+def legacy_metrics(calculator: SParameterCalculator, network) -> dict:
+    """Per-S-parameter metrics loop as implemented before the vectorized engine."""
+    metrics = {}
+    n_ports = network.nports
+    for out_port in range(1, n_ports + 1):
+        for in_port in range(1, n_ports + 1):
+            s_param = f"S{out_port}{in_port}"
+            min_gain, max_gain = calculator.calculate_gain_range(
+                network, OPERATIONAL_MIN_GHZ, OPERATIONAL_MAX_GHZ, s_param
+            )
+            metrics[f"{s_param} Gain Range"] = {"min": min_gain, "max": max_gain}
+            metrics[f"{s_param} Flatness"] = calculator.calculate_flatness(
+                network, OPERATIONAL_MIN_GHZ, OPERATIONAL_MAX_GHZ, s_param
+            )
+            metrics[f"{s_param} Lowest In-Band Gain"] = calculator.calculate_lowest_in_band_gain(
+                network, OPERATIONAL_MIN_GHZ, OPERATIONAL_MAX_GHZ, s_param
+            )
+    for port in range(1, n_ports + 1):
+        metrics[f"S{port}{port} VSWR"] = calculator.calculate_vswr(
+            network, port=port, freq_min=OPERATIONAL_MIN_GHZ, freq_max=OPERATIONAL_MAX_GHZ
+        )
+    return metrics
+
+
+def main() -> None:
+    loader = TouchstoneLoader()
+    calculator = SParameterCalculator()
+    test_type = SParametersTestType()
+    
+    files = sit_files()
+    networks = [loader.load_file(path) for path in files]
+    measurements = [
+        Measurement.model_construct(touchstone_data=network) for network in networks
+    ]
+    print(f"{len(networks)} files, {networks[0].nports} ports, {len(networks[0].f)} points each\n")
+    
+    baseline_s, baseline = time_call(
+        lambda: [legacy_metrics(calculator, n) for n in networks], repeat=3
+    )
+    optimized_s, optimized = time_call(
+        lambda: [
+            test_type.calculate_metrics(m, OPERATIONAL_MIN_GHZ, OPERATIONAL_MAX_GHZ)
+            for m in measurements
+        ],
+        repeat=3,
+    )
+    
+    # Sanity check: both strategies must agree
+    for old, new in zip(baseline, optimized):
+        assert old.keys() == new.keys()
+        for key in old:
+            if isinstance(old[key], dict):
+                assert abs(old[key]["min"] - new[key]["min"]) < 1e-9
+                assert abs(old[key]["max"] - new[key]["max"]) < 1e-9
+            else:
+                assert abs(old[key] - new[key]) < 1e-9
+    
+    report("calculate_metrics (all SIT files)", baseline_s, optimized_s)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark: pickled Network blobs vs the binary network codec.
+
+Reports bytes per measurement and decode time for the legacy pickle format
+and both codec precision modes on the 4-port SIT files. decode_network
+assembles the Network from the arrays like unpickling does; the validating
+constructor path (build_network, as used for parsed files) is reported for
+comparison.
+
+Usage:
+    python benchmarks/bench_network_codec.py
+"""
+
+import pickle
+
+import _common  # noqa: F401  (puts project root on sys.path)
+from _common import sit_files, time_call, report
+
+from src.core.rf_data.touchstone_loader import TouchstoneLoader
+from src.core.rf_data import network_codec
+
+
+def main() -> None:
+    loader = TouchstoneLoader()
+    networks = [loader.load_file(path) for path in sit_files()]
+    
+    pickled = [pickle.dumps(n) for n in networks]
+    double = [network_codec.encode_network(n, precision="double") for n in networks]
+    single = [network_codec.encode_network(n, precision="single") for n in networks]
+    
+    def mean_size(blobs):
+        return sum(len(b) for b in blobs) / len(blobs)
+    
+    print("Bytes per measurement")
+    print(f"  pickle              {mean_size(pickled):10.0f}")
+    print(f"  codec (complex128)  {mean_size(double):10.0f}")
+    print(f"  codec (complex64)   {mean_size(single):10.0f}\n")
+    
+    pickle_s, _ = time_call(lambda: [pickle.loads(b) for b in pickled], repeat=10)
+    network_s, _ = time_call(lambda: [network_codec.decode_network(b) for b in double], repeat=10)
+    constructed_s, _ = time_call(
+        lambda: [network_codec.build_network(network_codec.decode_arrays(b)) for b in double],
+        repeat=10
+    )
+    arrays_s, _ = time_call(lambda: [network_codec.decode_arrays(b) for b in double], repeat=10)
+    
+    report("decode -> Network", pickle_s, network_s)
+    report("decode -> Network (constructor)", pickle_s, constructed_s)
+    report("decode -> raw arrays (frombuffer)", pickle_s, arrays_s)
+
+
+if __name__ == "__main__":
+    main()
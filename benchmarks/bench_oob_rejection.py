@@ -0,0 +1,54 @@
+"""
+Benchmark: OOB rejection of many OOB bands, per S-parameter vs one pass.
+
+Evaluates eight OOB bands against the operational band for every gain
+S-parameter of every SIT network, once with calculate_oob_rejection (the
+in-band minimum and each OOB band recomputed per call - the previous
+behavior) and once with calculate_oob_rejections (in-band minimum once,
+all OOB bands from one shared dB sweep).
+
+Usage:
+    python benchmarks/bench_oob_rejection.py [repeat_files]
+"""
+
+import sys
+
+import _common  # noqa: F401  (puts project root on sys.path)
+from _common import report, sit_files, time_call
+
+from src.core.rf_data.s_parameter_calculator import SParameterCalculator
+from src.core.rf_data.touchstone_loader import TouchstoneLoader
+
+OPERATIONAL = (1.0, 2.0)
+OOB_BANDS = [(0.05, 0.5), (0.5, 0.9), (2.2, 2.6), (2.6, 3.0),
+             (3.0, 3.5), (3.5, 4.2), (4.2, 5.0), (5.0, 6.0)]
+GAIN_PARAMS = ["S21", "S31", "S41", "S32", "S42", "S43"]
+
+
+def main() -> None:
+    repeat_files = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    loader = TouchstoneLoader()
+    networks = [loader.load_file(path) for path in sit_files()] * repeat_files
+    calculator = SParameterCalculator()
+
+    def per_parameter():
+        for network in networks:
+            for band in OOB_BANDS:
+                for s_param in GAIN_PARAMS:
+                    calculator.calculate_oob_rejection(network, *band, *OPERATIONAL, s_param)
+
+    def one_pass():
+        for network in networks:
+            calculator.calculate_oob_rejections(network, OOB_BANDS, *OPERATIONAL)
+
+    base_s, _ = time_call(per_parameter, repeat=3)
+    opt_s, _ = time_call(one_pass, repeat=3)
+    report(
+        f"OOB rejection, {len(networks)} networks x {len(OOB_BANDS)} bands x "
+        f"{len(GAIN_PARAMS)} S-params",
+        base_s, opt_s
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark: loading a new file vs reloading an identical, already-stored file.
+
+Loads the SIT files through MeasurementService.load_measurement_file and
+saves them, then loads the same files again. Reloads hit the content-hash
+cache: only the filename is parsed and the stored RF data is reused. Also
+reports database growth per reload (shared blobs are stored once).
+
+Usage:
+    python benchmarks/bench_reload_dedup.py
+"""
+
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import _common  # noqa: F401  (puts project root on sys.path)
+
+from src.database.schema import create_schema
+from src.core.models.device import Device
+from src.core.repositories.device_repository import DeviceRepository
+from src.core.repositories.measurement_repository import MeasurementRepository
+from src.core.services.measurement_service import MeasurementService
+
+
+def main() -> None:
+    files = _common.sit_files()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "dedup.db"
+        conn = sqlite3.connect(str(db_path))
+        conn.row_factory = sqlite3.Row
+        create_schema(conn)
+        device_repo = DeviceRepository(conn)
+        device = device_repo.create(Device(
+            name="Bench Device",
+            part_number="L109908",
+            operational_freq_min=0.5,
+            operational_freq_max=2.0,
+            wideband_freq_min=0.1,
+            wideband_freq_max=5.0,
+            input_ports=[1, 2],
+            output_ports=[3, 4],
+        ))
+        service = MeasurementService(MeasurementRepository(conn), device_repo)
+
+        def load_all():
+            return [service.load_measurement_file(f, device, "SIT")[0] for f in files]
+
+        # First load parses every file (best of 1 - afterwards they are stored)
+        first_s, measurements = _common.time_call(load_all, repeat=1)
+        service.save_multiple_measurements(measurements)
+        size_after_first = db_path.stat().st_size
+
+        reload_s, measurements = _common.time_call(load_all)
+        service.save_multiple_measurements(measurements)
+        size_after_reload = db_path.stat().st_size
+        conn.close()
+
+    _common.report(f"load {len(files)} files (new vs reload)", first_s, reload_s)
+    print(
+        f"database growth per reload: {(size_after_reload - size_after_first) / 1024:.0f} KiB "
+        f"(first load: {size_after_first / 1024:.0f} KiB)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: pass/fail status per measurement vs one aggregate query.
+
+Stores the results of a campaign, then computes the overall pass status of
+every measurement the old way (load each measurement's results and check
+them in Python) and with TestResultRepository.get_summaries (one GROUP BY
+query returning counts).
+
+Usage:
+    python benchmarks/bench_result_summaries.py [n_measurements]
+"""
+
+import sqlite3
+import sys
+from uuid import uuid4
+
+import _common  # noqa: F401  (puts project root on sys.path)
+from _common import report, time_call
+
+from src.database.schema import create_schema
+from src.core.models.device import Device
+from src.core.models.test_criteria import TestCriteria
+from src.core.models.test_result import TestResult
+from src.core.repositories import (
+    DeviceRepository, TestCriteriaRepository, TestResultRepository
+)
+
+# S-parameters evaluated per criterion (4-port device, gain + VSWR terms)
+S_PARAMETERS = ["S31", "S41", "S32", "S42", "S11", "S22", "S33", "S44"]
+
+
+def main() -> None:
+    n_measurements = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    create_schema(conn)
+    device = DeviceRepository(conn).create(Device(
+        name="Bench Device", part_number="L109908",
+        operational_freq_min=0.5, operational_freq_max=2.0,
+        wideband_freq_min=0.1, wideband_freq_max=5.0,
+        input_ports=[1, 2], output_ports=[3, 4],
+    ))
+    criteria = [
+        TestCriteriaRepository(conn).create(TestCriteria(
+            device_id=device.id, test_type="S-Parameters", test_stage="SIT",
+            requirement_name=f"Requirement {i}", criteria_type="max",
+            max_value=2.0, unit="dB"
+        ))
+        for i in range(5)
+    ]
+    repo = TestResultRepository(conn)
+    measurement_ids = [uuid4() for _ in range(n_measurements)]
+    repo.create_many([
+        TestResult(
+            measurement_id=m_id, test_criteria_id=c.id, measured_value=1.0,
+            passed=(i + j) % 97 != 0, s_parameter=s_parameter
+        )
+        for i, m_id in enumerate(measurement_ids)
+        for j, c in enumerate(criteria)
+        for s_parameter in S_PARAMETERS
+    ])
+
+    def per_measurement():
+        return {
+            m_id: all(r.passed for r in repo.get_by_measurement_id(m_id))
+            for m_id in measurement_ids
+        }
+
+    def aggregated():
+        statuses = dict.fromkeys(measurement_ids, True)
+        for summary in repo.get_summaries(measurement_ids):
+            statuses[summary.measurement_id] = summary.all_passed
+        return statuses
+
+    base_s, base = time_call(per_measurement, repeat=3)
+    opt_s, opt = time_call(aggregated, repeat=3)
+    assert base == opt
+
+    print(f"{n_measurements} measurements, {n_measurements * 40} results")
+    report("pass status for all measurements", base_s, opt_s)
+
+
+if __name__ == "__main__":
+    main()
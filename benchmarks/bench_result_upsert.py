@@ -0,0 +1,119 @@
+"""
+Benchmark: re-evaluation saves as delete + insert vs upsert by result key.
+
+Stores the results of a campaign, then saves a re-evaluation in which a
+small share of values changed twice on a file-backed database: the old way
+(delete the stage's results, insert all results again) and with
+TestResultRepository.upsert_by_key (unchanged rows are not rewritten).
+Reports save time and rows written per save.
+
+Usage:
+    python benchmarks/bench_result_upsert.py [n_measurements]
+"""
+
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+from uuid import uuid4
+
+import _common  # noqa: F401  (puts project root on sys.path)
+
+from src.database.schema import create_schema
+from src.core.models.device import Device
+from src.core.models.test_criteria import TestCriteria
+from src.core.models.test_result import TestResult
+from src.core.repositories import (
+    DeviceRepository, TestCriteriaRepository, TestResultRepository
+)
+
+# S-parameters evaluated per criterion (4-port device, gain + VSWR terms)
+S_PARAMETERS = ["S31", "S41", "S32", "S42", "S11", "S22", "S33", "S44"]
+
+
+def open_db(path: Path):
+    """Open a file-backed database with a device and 5 SIT criteria."""
+    conn = sqlite3.connect(str(path))
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    create_schema(conn)
+    device = DeviceRepository(conn).create(Device(
+        name="Bench Device", part_number="L109908",
+        operational_freq_min=0.5, operational_freq_max=2.0,
+        wideband_freq_min=0.1, wideband_freq_max=5.0,
+        input_ports=[1, 2], output_ports=[3, 4],
+    ))
+    criteria = [
+        TestCriteriaRepository(conn).create(TestCriteria(
+            device_id=device.id, test_type="S-Parameters", test_stage="SIT",
+            requirement_name=f"Requirement {i}", criteria_type="max",
+            max_value=2.0, unit="dB"
+        ))
+        for i in range(5)
+    ]
+    # Measurements are not needed for this benchmark - disable the FK
+    conn.execute("PRAGMA foreign_keys = OFF")
+    return conn, criteria
+
+
+def evaluate(measurement_ids, criteria, changed_every: int, generation: int):
+    """Build one evaluation; every changed_every-th value depends on generation."""
+    results = []
+    for m_index, measurement_id in enumerate(measurement_ids):
+        for criterion in criteria:
+            for s_parameter in S_PARAMETERS:
+                index = len(results)
+                value = 1.0 + (generation if index % changed_every == 0 else 0)
+                results.append(TestResult(
+                    measurement_id=measurement_id, test_criteria_id=criterion.id,
+                    measured_value=value, passed=value <= 2.0, s_parameter=s_parameter
+                ))
+    return results
+
+
+def main() -> None:
+    n_measurements = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    measurement_ids = [uuid4() for _ in range(n_measurements)]
+    repeat = 5
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Old path: delete the stage's results, insert everything again
+        conn, criteria = open_db(Path(tmp) / "delete_insert.db")
+        repo = TestResultRepository(conn)
+        repo.create_many(evaluate(measurement_ids, criteria, 20, 0))
+        before = conn.total_changes
+
+        # Evaluations are built up front - only the save is timed
+        pending = [evaluate(measurement_ids, criteria, 20, g) for g in range(repeat, 0, -1)]
+
+        def delete_insert():
+            results = pending.pop()
+            repo.delete_by_measurements_and_stage(measurement_ids, "SIT")
+            return repo.create_many(results)
+
+        base_s, results = _common.time_call(delete_insert, repeat)
+        base_rows = (conn.total_changes - before) // repeat
+        conn.close()
+
+        # Upsert by key: only changed rows are rewritten
+        conn, criteria = open_db(Path(tmp) / "upsert.db")
+        repo = TestResultRepository(conn)
+        repo.upsert_by_key(evaluate(measurement_ids, criteria, 20, 0))
+        before = conn.total_changes
+
+        pending = [evaluate(measurement_ids, criteria, 20, g) for g in range(repeat, 0, -1)]
+
+        def upsert():
+            return repo.upsert_by_key(pending.pop())
+
+        opt_s, _ = _common.time_call(upsert, repeat)
+        opt_rows = (conn.total_changes - before) // repeat
+        conn.close()
+
+    print(f"{len(results)} results, 5% changed: rows written "
+          f"{base_rows} (delete + insert) vs {opt_rows} (upsert)")
+    _common.report(f"save re-evaluation of {n_measurements} measurements", base_s, opt_s)
+
+
+if __name__ == "__main__":
+    main()
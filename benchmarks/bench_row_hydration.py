@@ -0,0 +1,129 @@
+"""
+Benchmark: hydrating models from database rows with and without validation.
+
+Stores a campaign's test results, fetches the rows once, then converts them
+to TestResult objects the old way (full pydantic validation) and with the
+repositories' trusted path (construct_trusted, foreign keys parsed through
+the uuid_from_db cache, which is cleared before every run). Criteria rows,
+which carry field and model validators, are compared the same way.
+Reports rows/second.
+
+Usage:
+    python benchmarks/bench_row_hydration.py [n_results]
+"""
+
+import sqlite3
+import sys
+from uuid import UUID, uuid4
+
+import _common  # noqa: F401  (puts project root on sys.path)
+from _common import report, time_call
+
+from src.database.schema import create_schema
+from src.core.models.test_criteria import TestCriteria
+from src.core.models.test_result import TestResult
+from src.core.repositories import TestCriteriaRepository, TestResultRepository
+from src.core.repositories.hydration import uuid_from_db
+
+# S-parameters evaluated per criterion (4-port device, gain + VSWR terms)
+S_PARAMETERS = ["S31", "S41", "S32", "S42", "S11", "S22", "S33", "S44"]
+
+
+def validated_result(row: sqlite3.Row) -> TestResult:
+    """Previous _row_to_result: full validation of every row."""
+    return TestResult(
+        id=UUID(row["id"]),
+        measurement_id=UUID(row["measurement_id"]),
+        test_criteria_id=UUID(row["test_criteria_id"]),
+        measured_value=row["measured_value"],
+        passed=bool(row["passed"]),
+        s_parameter=row["s_parameter"],
+        is_stale=bool(row["is_stale"]),
+        measured_min=row["measured_min"],
+        measured_max=row["measured_max"],
+        worst_frequency=row["worst_frequency"]
+    )
+
+
+def validated_criteria(row: sqlite3.Row) -> TestCriteria:
+    """Previous _row_to_criteria: field and model validators on every row."""
+    return TestCriteria(
+        id=UUID(row["id"]),
+        device_id=UUID(row["device_id"]),
+        test_type=row["test_type"],
+        test_stage=row["test_stage"],
+        requirement_name=row["requirement_name"],
+        criteria_type=row["criteria_type"],
+        min_value=row["min_value"],
+        max_value=row["max_value"],
+        unit=row["unit"],
+        frequency_min=row["frequency_min"],
+        frequency_max=row["frequency_max"]
+    )
+
+
+def compare(label: str, rows, baseline, trusted) -> None:
+    """Time both converters over the rows and print time and rows/s."""
+    base_s, base = time_call(lambda: [baseline(row) for row in rows])
+
+    def trusted_run():
+        uuid_from_db.cache_clear()
+        return [trusted(row) for row in rows]
+
+    opt_s, opt = time_call(trusted_run)
+    assert base == opt
+    report(label, base_s, opt_s)
+    print(f"{'':<40} {len(rows) / base_s:12,.0f} rows/s -> {len(rows) / opt_s:12,.0f} rows/s")
+
+
+def main() -> None:
+    n_results = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    create_schema(conn)
+    criteria_repo = TestCriteriaRepository(conn)
+    result_repo = TestResultRepository(conn)
+
+    device_id = uuid4()
+    # 5 criteria x 8 S-parameters = 40 results per measurement
+    criteria = [
+        criteria_repo.create(TestCriteria(
+            device_id=device_id, test_type="S-Parameters", test_stage="SIT",
+            requirement_name=f"Requirement {i}", criteria_type="range",
+            min_value=27.5, max_value=31.3, unit="dB",
+            frequency_min=0.5, frequency_max=2.0
+        ))
+        for i in range(5)
+    ]
+    # A device library's worth of criteria rows for the criteria comparison
+    for i in range(5, 5000):
+        criteria_repo.create(TestCriteria(
+            device_id=uuid4() if i % 25 == 0 else device_id,
+            test_type="S-Parameters", test_stage="SIT",
+            requirement_name=f"Requirement {i}", criteria_type="range",
+            min_value=27.5, max_value=31.3, unit="dB"
+        ))
+    n_measurements = max(1, n_results // (len(criteria) * len(S_PARAMETERS)))
+    result_repo.create_many([
+        TestResult(
+            measurement_id=measurement_id, test_criteria_id=criterion.id,
+            measured_value=29.0, passed=True, s_parameter=s_parameter,
+            measured_min=28.0, measured_max=29.5, worst_frequency=1.2
+        )
+        for measurement_id in (uuid4() for _ in range(n_measurements))
+        for criterion in criteria
+        for s_parameter in S_PARAMETERS
+    ])
+
+    result_rows = conn.execute("SELECT * FROM test_results").fetchall()
+    criteria_rows = conn.execute("SELECT * FROM test_criteria").fetchall()
+
+    compare(f"{len(result_rows)} TestResult rows", result_rows,
+            validated_result, result_repo._row_to_result)
+    compare(f"{len(criteria_rows)} TestCriteria rows", criteria_rows,
+            validated_criteria, criteria_repo._row_to_criteria)
+
+
+if __name__ == "__main__":
+    main()
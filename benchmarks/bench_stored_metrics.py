@@ -0,0 +1,105 @@
+"""
+Benchmark: campaign re-evaluation from RF data vs from stored band metrics.
+
+Stores the SIT files under many serial numbers, then re-evaluates the whole
+campaign after a criteria change twice: without a metrics repository (every
+network is fetched, decoded and reduced) and with one (stored metrics are
+compared against the new limits; the RF data is never touched).
+
+Usage:
+    python benchmarks/bench_stored_metrics.py [n_serials]
+"""
+
+import sqlite3
+import sys
+from datetime import date
+
+import _common  # noqa: F401  (puts project root on sys.path)
+
+from src.database.schema import create_schema
+from src.core.models.device import Device
+from src.core.models.measurement import Measurement
+from src.core.models.test_criteria import TestCriteria
+from src.core.repositories import (
+    DeviceRepository, MeasurementRepository, TestCriteriaRepository,
+    TestResultRepository, MeasurementMetricsRepository
+)
+from src.core.rf_data.touchstone_loader import TouchstoneLoader
+from src.core.services.compliance_service import ComplianceService
+
+
+def main() -> None:
+    n_serials = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    create_schema(conn)
+    device_repo = DeviceRepository(conn)
+    measurement_repo = MeasurementRepository(conn)
+    criteria_repo = TestCriteriaRepository(conn)
+    device = device_repo.create(Device(
+        name="Bench Device",
+        part_number="L109908",
+        operational_freq_min=0.5,
+        operational_freq_max=2.0,
+        wideband_freq_min=0.1,
+        wideband_freq_max=5.0,
+        input_ports=[1, 2],
+        output_ports=[3, 4],
+    ))
+    gain = criteria_repo.create(TestCriteria(
+        device_id=device.id, test_type="S-Parameters", test_stage="SIT",
+        requirement_name="Gain Range", criteria_type="range",
+        min_value=27.5, max_value=31.3, unit="dB"
+    ))
+    for name, value, unit in (("Gain Flatness", 2.3, "dB"), ("VSWR Max", 2.0, "")):
+        criteria_repo.create(TestCriteria(
+            device_id=device.id, test_type="S-Parameters", test_stage="SIT",
+            requirement_name=name, criteria_type="max", max_value=value, unit=unit
+        ))
+    criteria_repo.create(TestCriteria(
+        device_id=device.id, test_type="S-Parameters", test_stage="SIT",
+        requirement_name="OOB 1", criteria_type="greater_than_equal",
+        min_value=25.0, unit="dBc", frequency_min=3.0, frequency_max=5.0
+    ))
+
+    loader = TouchstoneLoader()
+    networks = [loader.load_file(f) for f in _common.sit_files()]
+    measurement_repo.create_many([
+        Measurement(
+            device_id=device.id, serial_number=f"SN{serial:04d}",
+            test_type="S-Parameters", test_stage="SIT",
+            temperature="AMB", path_type="PRI" if i % 2 == 0 else "RED",
+            file_path=f"/bench/SN{serial:04d}_{i}.s4p",
+            measurement_date=date(2025, 9, 30), touchstone_data=network
+        )
+        for serial in range(1, n_serials + 1)
+        for i, network in enumerate(networks)
+    ])
+
+    def make_service(metrics_repo):
+        return ComplianceService(
+            measurement_repo, criteria_repo, device_repo, TestResultRepository(conn),
+            metrics_repository=metrics_repo
+        )
+
+    from_rf = make_service(None)
+    from_metrics = make_service(MeasurementMetricsRepository(conn))
+    # Populate stored metrics once (first evaluation after load)
+    from_metrics.evaluate_all_measurements(device.id, "S-Parameters", "SIT")
+
+    def reevaluate(service):
+        gain.min_value += 0.01  # A limit change between evaluations
+        criteria_repo.update(gain)
+        return service.evaluate_all_measurements(device.id, "S-Parameters", "SIT")
+
+    base_s, base = _common.time_call(lambda: reevaluate(from_rf), repeat=3)
+    opt_s, opt = _common.time_call(lambda: reevaluate(from_metrics))
+    conn.close()
+
+    assert len(base) == len(opt) == n_serials * len(networks)
+    _common.report(f"re-evaluate {len(opt)} measurements", base_s, opt_s)
+
+
+if __name__ == "__main__":
+    main()
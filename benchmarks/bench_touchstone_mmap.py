@@ -0,0 +1,70 @@
+"""
+Benchmark: peak memory of in-memory vs memory-mapped Touchstone parsing.
+
+Writes a synthetic 10-port sweep (wrapped lines, RI format) and parses it
+with parse_touchstone (whole file read into memory) and
+parse_touchstone_mapped (memory map, chunked). Reports the time and the
+peak traced allocation of each, relative to the size of the parsed arrays.
+
+Usage:
+    python benchmarks/bench_touchstone_mmap.py [n_points_10port]
+"""
+
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import skrf
+
+import _common  # noqa: F401  (puts project root on sys.path)
+from _common import report, time_call
+
+from src.core.rf_data.touchstone_parser import parse_touchstone, parse_touchstone_mapped
+
+
+def _peak_memory(func):
+    """Run func once and return (result, peak traced allocation in bytes)."""
+    tracemalloc.start()
+    try:
+        result = func()
+        return result, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    n_points = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rng = np.random.default_rng(0)
+        shape = (n_points, 10, 10)
+        network = skrf.Network(
+            frequency=skrf.Frequency(0.01, 40, n_points, unit="GHz"),
+            s=rng.random(shape) * np.exp(1j * rng.uniform(-3, 3, shape)),
+            name="wideband",
+        )
+        network.write_touchstone(str(Path(tmp) / "wideband"), form="ri")
+        path = Path(tmp) / "wideband.s10p"
+        del network
+
+        base_s, reference = time_call(lambda: parse_touchstone(path), repeat=3)
+        opt_s, parsed = time_call(lambda: parse_touchstone_mapped(path), repeat=3)
+        assert np.array_equal(reference.s, parsed.s)
+        assert np.array_equal(reference.frequency_hz, parsed.frequency_hz)
+        del reference, parsed
+
+        in_memory, in_memory_peak = _peak_memory(lambda: parse_touchstone(path))
+        result_mb = (in_memory.s.nbytes + in_memory.frequency_hz.nbytes) / 1e6
+        del in_memory
+        _, mapped_peak = _peak_memory(lambda: parse_touchstone_mapped(path))
+
+        report(f"10-port sweep, {n_points} points ({path.stat().st_size / 1e6:.0f} MB)", base_s, opt_s)
+        print(f"  parsed arrays   {result_mb:8.1f} MB")
+        print(f"  in-memory peak  {in_memory_peak / 1e6:8.1f} MB  ({in_memory_peak / 1e6 / result_mb:.2f}x)")
+        print(f"  mapped peak     {mapped_peak / 1e6:8.1f} MB  ({mapped_peak / 1e6 / result_mb:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark: Touchstone parse throughput, scikit-rf reader vs native parser.
+
+Loads every SIT file into a Network with TouchstoneLoader using scikit-rf's
+reader (baseline) and the native vectorized parser, and reports the
+throughput in MB/s and frequency points/s. A synthetic 10-port sweep
+(wrapped lines, RI format) is timed as well.
+
+Usage:
+    python benchmarks/bench_touchstone_parser.py [n_points_10port]
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import skrf
+
+import _common  # noqa: F401  (puts project root on sys.path)
+from _common import report, sit_files, time_call
+
+from src.core.rf_data.touchstone_loader import TouchstoneLoader
+
+
+def _throughput(label: str, files, seconds: float, points: int) -> None:
+    """Print MB/s and points/s of one parser."""
+    megabytes = sum(path.stat().st_size for path in files) / 1e6
+    print(f"  {label:<8} {megabytes / seconds:8.1f} MB/s   {points / seconds / 1e3:8.1f} k points/s")
+
+
+def _compare(title: str, files) -> None:
+    """Time both parsers on files and print the comparison."""
+    skrf_loader = TouchstoneLoader(native_parser=False)
+    native_loader = TouchstoneLoader()
+
+    base_s, reference = time_call(lambda: [skrf_loader.load_file(path) for path in files], repeat=3)
+    opt_s, parsed = time_call(lambda: [native_loader.load_file(path) for path in files], repeat=3)
+    for a, b in zip(reference, parsed):
+        assert np.allclose(a.s, b.s, rtol=1e-12) and np.array_equal(a.f, b.f)
+
+    points = sum(len(network.f) for network in parsed)
+    report(title, base_s, opt_s)
+    _throughput("skrf", files, base_s, points)
+    _throughput("native", files, opt_s, points)
+
+
+def main() -> None:
+    n_points = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    _compare(f"{len(sit_files())} SIT .s4p files", sit_files())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rng = np.random.default_rng(0)
+        shape = (n_points, 10, 10)
+        network = skrf.Network(
+            frequency=skrf.Frequency(0.01, 40, n_points, unit="GHz"),
+            s=rng.random(shape) * np.exp(1j * rng.uniform(-3, 3, shape)),
+            name="wideband",
+        )
+        network.write_touchstone(str(Path(tmp) / "wideband"), form="ri")
+        _compare(f"10-port sweep, {n_points} points", [Path(tmp) / "wideband.s10p"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark: Touchstone header facts from a full load vs a header scan.
+
+Port count, point count and frequency range of every SIT file, read by
+building a scikit-rf Network (baseline) and by TouchstoneLoader.scan_file.
+Also times reading the same facts from stored codec blobs with
+network_codec.read_header instead of decoding them.
+
+Usage:
+    python benchmarks/bench_touchstone_scan.py
+"""
+
+import _common  # noqa: F401  (puts project root on sys.path)
+from _common import report, sit_files, time_call
+
+from src.core.rf_data import network_codec
+from src.core.rf_data.touchstone_loader import TouchstoneLoader
+from src.core.rf_data.touchstone_scan import header_from_network
+
+
+def main() -> None:
+    loader = TouchstoneLoader()
+    files = sit_files()
+
+    def full_load():
+        return [header_from_network(loader.load_file(path)) for path in files]
+
+    def scan():
+        return [loader.scan_file(path) for path in files]
+
+    base_s, loaded = time_call(full_load)
+    opt_s, scanned = time_call(scan)
+    assert [(h.n_ports, h.n_points, h.freq_start_hz, h.freq_stop_hz) for h in loaded] == [
+        (h.n_ports, h.n_points, h.freq_start_hz, h.freq_stop_hz) for h in scanned
+    ]
+    points = sum(h.n_points for h in scanned)
+    print(f"{len(files)} files, {points} frequency points")
+    report("file header: load vs scan", base_s, opt_s)
+
+    blobs = [loader.serialize_network(loader.load_file(path)) for path in files]
+    base_s, _ = time_call(
+        lambda: [header_from_network(network_codec.decode_network(blob)) for blob in blobs]
+    )
+    opt_s, _ = time_call(lambda: [network_codec.read_header(blob) for blob in blobs])
+    report("blob header: decode vs read_header", base_s, opt_s)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
 """
-Measurement data model.
+Measurement data models.
 
 This module defines the Measurement model, which represents a single loaded
-RF measurement file. Each measurement contains:
+RF measurement file, and MeasurementHeader, the same record without the RF
+data (used by listing screens that never touch the network). Each
+measurement contains:
 - Identification (serial number, device, test type/stage)
 - Environmental conditions (temperature, path type)
 - File information (path, date)
@@ -26,16 +28,15 @@ except ImportError:
     Network = Any
 
 
-class Measurement(BaseModel):
+class MeasurementHeader(BaseModel):
     """
-    Measurement data model for loaded RF files.
+    Measurement header - every measurement field except the RF data.
     
-    Represents a single measurement instance - one Touchstone file loaded
-    for a specific device, serial number, temperature, and path type.
+    Lightweight projection returned by header-only repository queries.
+    Screens that only list files (file displays, deletion summaries) use
+    this so the touchstone BLOB is never fetched or decoded.
     
     Key fields:
-    - touchstone_data: The actual RF data (scikit-rf Network object)
-                      Stored as bytes (pickled) in database, deserialized when needed
     - metadata: Additional parsed information from filename (part number, run number, etc.)
     
     Temperature and path_type are validated to ensure only allowed values:
@@ -78,17 +79,25 @@ class Measurement(BaseModel):
     # Date when measurement was taken (extracted from filename)
     measurement_date: date
     
-    # The actual RF data (scikit-rf Network object)
-    # When stored in database, this is pickled to bytes
-    # When loaded from database, it's deserialized back to Network object
-    # Field allows Any type because Network may not be importable at module load time
-    touchstone_data: Any = Field(description="scikit-rf Network object (stored as blob in DB)")
-    
     # Additional metadata extracted from filename
     # Examples: part_number, run_number, test_type hints
     # This is a flexible dictionary for extensibility
     metadata: Dict[str, Any] = Field(default_factory=dict)
     
+    # SHA-256 of the source file contents (hex), set when loaded from a file
+    # Measurements with the same hash share one stored copy of the RF data,
+    # and reloading an identical file reuses it without parsing
+    content_hash: Optional[str] = None
+    
+    # Header facts of the RF data (see rf_data.touchstone_scan), stored as
+    # columns so filters and port checks never decode the network
+    # Set when the measurement is saved; None for rows whose data could
+    # not be scanned (legacy pickle blobs)
+    n_ports: Optional[int] = None
+    n_points: Optional[int] = None
+    freq_start: Optional[float] = None  # First frequency in GHz
+    freq_stop: Optional[float] = None  # Last frequency in GHz
+    
     @field_validator("temperature")
     @classmethod
     def validate_temperature(cls, v: str) -> str:
@@ -140,6 +149,37 @@ class Measurement(BaseModel):
             raise ValueError(f"path_type must be one of {allowed}, got: {v}")
         return v
     
+    model_config = ConfigDict(
+        # Custom serializers for non-JSON-serializable types
+        json_encoders={
+            UUID: str,
+            date: str
+        }
+    )
+
+
+class Measurement(MeasurementHeader):
+    """
+    Measurement data model for loaded RF files.
+    
+    Represents a single measurement instance - one Touchstone file loaded
+    for a specific device, serial number, temperature, and path type.
+    All identification fields and validators come from MeasurementHeader.
+    
+    Key fields:
+    - touchstone_data: The actual RF data (scikit-rf Network object)
+                      Stored as bytes (binary codec) in database, deserialized when needed.
+                      Repository list queries return a LazyNetwork proxy that
+                      fetches and decodes the BLOB on first access.
+    """
+    
+    # The actual RF data (scikit-rf Network object)
+    # When stored in database, this is encoded to bytes (see rf_data.network_codec)
+    # When loaded from database, it's deserialized back to Network object
+    # (or a LazyNetwork proxy for list queries - see rf_data.lazy_network)
+    # Field allows Any type because Network may not be importable at module load time
+    touchstone_data: Any = Field(description="scikit-rf Network object (stored as blob in DB)")
+    
     model_config = ConfigDict(
         # Allow arbitrary types (Network object) for touchstone_data
         arbitrary_types_allowed=True,
@@ -0,0 +1,97 @@
+"""
+Stored band metrics model.
+
+This module defines the MeasurementMetrics model, which stores the
+frequency-band reductions computed from a measurement's RF data. Storing
+them means compliance can be re-evaluated after a criteria (limit) change by
+comparing stored numbers against the new limits, without fetching or
+decoding the touchstone data again.
+
+One MeasurementMetrics row exists per measurement, frequency band and
+calculator version:
+- The operational band gives gain range, flatness, lowest in-band gain
+  and VSWR
+- Each OOB band gives the peak (worst-case) OOB gain used for rejection
+- The frequency of every extreme is stored too, so results can report
+  where the worst case occurs
+- The operational band also keeps the margin reductions (worst-case
+  margin, its frequency and the guard band share) of every gain range and
+  VSWR limit it was evaluated against, so stored re-evaluation reports
+  the margins of a direct evaluation
+
+The calculator version is bumped whenever the metric math changes, so
+metrics stored by an older version are recalculated instead of reused.
+"""
+
+from typing import Any, Dict, List, Tuple
+from uuid import UUID
+from pydantic import BaseModel, Field, ConfigDict
+
+
+class MeasurementMetrics(BaseModel):
+    """
+    Band metrics for one measurement over one frequency band.
+
+    The gain matrices are indexed [out_port - 1][in_port - 1], the same
+    layout as the S-matrix (gain_min[2][0] is the minimum S31 gain).
+    All lists are empty if the measurement has no frequency points in the
+    band.
+    """
+
+    # Which measurement these metrics were computed from
+    measurement_id: UUID
+
+    # Frequency band in GHz
+    freq_min: float
+    freq_max: float
+
+    # Version of the metric calculations that produced these values
+    calculator_version: int
+
+    # Number of ports of the measured network
+    n_ports: int
+
+    # Minimum / maximum gain in dB over the band per S-parameter, [n][n]
+    gain_min: List[List[float]] = Field(default_factory=list)
+    gain_max: List[List[float]] = Field(default_factory=list)
+
+    # Maximum VSWR over the band per port, [n]
+    vswr_max: List[float] = Field(default_factory=list)
+
+    # Frequency in GHz where each extreme occurs (same layouts as above)
+    gain_min_freq: List[List[float]] = Field(default_factory=list)
+    gain_max_freq: List[List[float]] = Field(default_factory=list)
+    vswr_max_freq: List[float] = Field(default_factory=list)
+
+    # Margin reductions per criterion limit, keyed by MarginLimit.key:
+    # {"margin_min": ..., "margin_min_freq": ..., "guard_band_percent": ...}
+    # with the port layout of the quantity ([n][n] for gain, [n] for VSWR).
+    # Only limits evaluated when the metrics were computed are present.
+    margins: Dict[str, Dict[str, List[Any]]] = Field(default_factory=dict)
+
+    model_config = ConfigDict(
+        # Allow UUID serialization to string for JSON compatibility
+        json_encoders={
+            UUID: str
+        }
+    )
+
+    @property
+    def band(self) -> Tuple[float, float]:
+        """
+        Frequency band key.
+
+        Returns:
+            Tuple of (freq_min, freq_max) in GHz
+        """
+        return (self.freq_min, self.freq_max)
+
+    @property
+    def is_empty(self) -> bool:
+        """
+        Whether the band contained no frequency points.
+
+        Returns:
+            True if no metrics could be computed for the band
+        """
+        return not self.gain_min
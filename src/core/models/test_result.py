@@ -8,10 +8,16 @@ a measurement against a single test criterion. Each TestResult records:
 - What value was measured
 - Whether it passed or failed
 - Which S-parameter this result applies to (if applicable)
+- Secondary values from evaluation (min/max, worst-case frequency, margin
+  to the limit), so the compliance table renders from stored data without
+  RF calculations
 
 Multiple TestResults are generated for generic criteria (e.g., "Gain Range")
 that apply to multiple S-parameters. Each result is tagged with the specific
 S-parameter it represents.
+
+ResultSummary holds aggregated counts (total/passed/stale) for a group of
+results, produced by aggregate queries for status displays and reports.
 """
 
 from typing import Optional
@@ -67,6 +73,38 @@ class TestResult(BaseModel):
         description="S-parameter this result is for (e.g., 'S21', 'S11')"
     )
     
+    # Secondary values produced by evaluation (None if not applicable):
+    # - Gain Range: min and max gain in dB over the operational band
+    # - Flatness: the min and max gain whose difference is the flatness
+    # - VSWR: max VSWR (measured_max only)
+    # - OOB: worst-case (min) and best-case (max) rejection in dBc
+    measured_min: Optional[float] = None
+    measured_max: Optional[float] = None
+    
+    # Frequency in GHz of the worst-case point (closest to / furthest past
+    # the limit), None if not applicable (e.g. flatness)
+    worst_frequency: Optional[float] = Field(
+        default=None,
+        description="Frequency in GHz where the worst-case value occurs"
+    )
+    
+    # Signed margin to the criterion limit at the worst-case frequency
+    # (positive = inside the limit, negative = violation), in the
+    # criterion's unit. None if not applicable (flatness, OOB)
+    margin: Optional[float] = Field(
+        default=None,
+        description="Smallest signed distance to the limit over the band"
+    )
+    
+    # Percentage of the band's frequency points whose margin is below the
+    # guard band (closer to the limit than the guard band, or violating it).
+    # Needs the per-frequency data - None when evaluated from stored band
+    # metrics alone
+    guard_band_percent: Optional[float] = Field(
+        default=None,
+        description="Percent of the band within the guard band of the limit"
+    )
+    
     # Whether this result is stale (criteria changed after result was calculated)
     # Stale results should be recalculated before being used for compliance decisions
     # Marked as stale when criteria are updated or deleted
@@ -81,3 +119,50 @@ class TestResult(BaseModel):
             UUID: str
         }
     )
+
+
+class ResultSummary(BaseModel):
+    """
+    Aggregated pass/fail counts for a group of test results.
+    
+    Returned by aggregate repository queries (one SQL GROUP BY) so status
+    displays and reports never load individual TestResult objects.
+    
+    A summary always belongs to one measurement. Depending on the grouping
+    it is also specific to one test stage or one criterion:
+    - Per measurement: test_stage and test_criteria_id are None
+    - Per stage: test_stage is set
+    - Per criterion: test_criteria_id and test_stage are set
+    
+    Stale results are counted in total/passed like the others (same rule as
+    the overall pass status); stale tells how many need recalculation.
+    """
+    
+    # Measurement the results belong to
+    measurement_id: UUID
+    
+    # Test stage of the results' criteria (None when not grouped by stage)
+    test_stage: Optional[str] = None
+    
+    # Criterion of the results (None when not grouped by criterion)
+    test_criteria_id: Optional[UUID] = None
+    
+    # Number of results, results that passed, and stale results
+    total: int
+    passed: int
+    stale: int = 0
+    
+    @property
+    def failed(self) -> int:
+        """Number of results that failed."""
+        return self.total - self.passed
+    
+    @property
+    def current(self) -> int:
+        """Number of results that are not stale."""
+        return self.total - self.stale
+    
+    @property
+    def all_passed(self) -> bool:
+        """True if no result in the group failed."""
+        return self.passed == self.total
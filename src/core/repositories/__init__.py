@@ -10,6 +10,10 @@ Repositories provided:
 - TestCriteriaRepository: Test criteria CRUD operations
 - MeasurementRepository: Measurement CRUD operations
 - TestResultRepository: Test result CRUD operations
+- MeasurementMetricsRepository: Stored band metrics (not an IRepository)
+
+EntityCache is the identity-map cache of devices and criteria that
+DeviceRepository and TestCriteriaRepository share per database.
 """
 
 from .base import IRepository
@@ -17,11 +21,16 @@ from .device_repository import DeviceRepository
 from .test_criteria_repository import TestCriteriaRepository
 from .measurement_repository import MeasurementRepository
 from .test_result_repository import TestResultRepository
+from .measurement_metrics_repository import MeasurementMetricsRepository
+from .entity_cache import EntityCache, CacheStats
 
 __all__ = [
     "IRepository",
     "DeviceRepository",
     "TestCriteriaRepository",
     "MeasurementRepository",
-    "TestResultRepository"
+    "TestResultRepository",
+    "MeasurementMetricsRepository",
+    "EntityCache",
+    "CacheStats"
 ]
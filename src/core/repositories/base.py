@@ -12,6 +12,11 @@ The repository pattern:
 - Keeps business logic separate from data access
 
 This generic interface uses Python's Generic type system to ensure type safety.
+
+Validation happens on the write path: models are validated when they are
+constructed by the application, before create()/update() store them. Rows
+read back from our own schema are hydrated without re-validation (see
+hydration.py).
 """
 
 from abc import ABC, abstractmethod
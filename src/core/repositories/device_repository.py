@@ -7,6 +7,8 @@ handling all database operations for device entities. It handles:
 - Serialization of complex fields (lists, ports) to JSON
 - Deserialization when reading from database
 - Error handling and transaction management
+- Optional identity-map caching of get_by_id (EntityCache shared with the
+  criteria repository), invalidated by update and delete
 
 Key design decisions:
 - Uses JSON for lists (tests_performed, input_ports, output_ports) since SQLite
@@ -24,6 +26,8 @@ from uuid import UUID
 from ..models.device import Device
 from ..exceptions import DeviceNotFoundError, DatabaseError
 from .base import IRepository
+from .entity_cache import DEVICES, EntityCache
+from .hydration import construct_trusted
 
 
 class DeviceRepository(IRepository[Device]):
@@ -41,20 +45,47 @@ class DeviceRepository(IRepository[Device]):
     and converted to application-specific exceptions.
     """
     
-    def __init__(self, connection: sqlite3.Connection):
+    def __init__(self, connection: sqlite3.Connection, cache: Optional[EntityCache] = None):
         """
         Initialize repository with database connection.
         
         Args:
             connection: SQLite connection (should have row_factory=sqlite3.Row)
                         This enables column access by name
+            cache: Identity-map cache shared by all repositories of this
+                   database (None = no caching, every lookup queries)
         """
         self.conn = connection
+        self.cache = cache
     
     def get_by_id(self, id: UUID) -> Optional[Device]:
         """
         Get a device by ID.
         
+        Served from the cache when one is configured and the device was
+        loaded before (and not changed since).
+        
+        Args:
+            id: UUID of the device to retrieve
+            
+        Returns:
+            Device object if found, None otherwise
+        """
+        if self.cache is None:
+            return self._select_by_id(id)
+        
+        device = self.cache.get(DEVICES, id)
+        if device is None:
+            generation = self.cache.generation
+            device = self._select_by_id(id)
+            if device is not None:
+                self.cache.put(DEVICES, id, device, generation)
+        return device
+    
+    def _select_by_id(self, id: UUID) -> Optional[Device]:
+        """
+        Query a device by ID (bypassing the cache).
+        
         Args:
             id: UUID of the device to retrieve
             
@@ -200,6 +231,10 @@ class DeviceRepository(IRepository[Device]):
             # Rollback on error and convert to application exception
             self.conn.rollback()
             raise DatabaseError(f"Failed to update device: {e}") from e
+        finally:
+            # Drop the cached copy whether or not the write succeeded
+            if self.cache is not None:
+                self.cache.invalidate(DEVICES, device.id)
     
     def delete(self, id: UUID) -> None:
         """
@@ -228,6 +263,10 @@ class DeviceRepository(IRepository[Device]):
             # Rollback on error and convert to application exception
             self.conn.rollback()
             raise DatabaseError(f"Failed to delete device: {e}") from e
+        finally:
+            # ON DELETE CASCADE also removed the device's criteria
+            if self.cache is not None:
+                self.cache.invalidate_device(id)
     
     def _row_to_device(self, row: sqlite3.Row) -> Device:
         """
@@ -239,6 +278,10 @@ class DeviceRepository(IRepository[Device]):
         - JSON TEXT -> List (for tests_performed, ports)
         - NULL -> default values (empty lists, None handling)
         
+        The part number, frequency and port validators ran when the row was
+        written, so the model is built with construct_trusted (no
+        re-validation).
+        
         Args:
             row: SQLite Row object (from cursor.fetchone() or fetchall())
             
@@ -300,7 +343,8 @@ class DeviceRepository(IRepository[Device]):
             if wideband_freq_max is None:
                 wideband_freq_max = 1.0
             
-            return Device(
+            return construct_trusted(
+                Device,
                 id=UUID(row["id"]),  # TEXT -> UUID
                 name=row["name"] or "",  # Handle NULL
                 description=row["description"] or "",  # Handle NULL as empty string
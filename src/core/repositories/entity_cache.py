@@ -0,0 +1,200 @@
+"""
+Identity-map cache for devices and test criteria.
+
+Devices and criteria are read constantly (every evaluation, plot and
+compliance table needs them) but change rarely (only in device
+maintenance). EntityCache keeps the loaded objects in memory so repeated
+lookups are served without a query:
+
+- devices: Device by ID
+- criteria: TestCriteria by ID
+- criteria_by_test: criteria lists by (device_id, test_type, test_stage)
+
+One EntityCache is shared by all DeviceRepository and TestCriteriaRepository
+instances of a database (across threads), so a write through any of them
+invalidates what the others see. The repositories invalidate entries after
+every create/update/delete (write-through invalidation); the next read
+loads the committed data again.
+
+A reader that loaded a row before a concurrent write committed must not
+put it into the cache afterwards. Every invalidation advances a generation
+counter; readers take the generation before their query and put() ignores
+values loaded in an older generation.
+
+Cached objects are shared, not copied: treat them as read-only unless the
+change is saved through the repository's update().
+
+Changes made to the database file by other processes are not seen until
+clear() is called.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional
+from uuid import UUID
+
+
+# Cache regions
+DEVICES = "devices"
+CRITERIA = "criteria"
+CRITERIA_BY_TEST = "criteria_by_test"
+
+REGIONS = (DEVICES, CRITERIA, CRITERIA_BY_TEST)
+
+
+@dataclass
+class CacheStats:
+    """
+    Lookup counters of one cache region.
+
+    Attributes:
+        hits: Lookups served from the cache
+        misses: Lookups that had to query the database
+        invalidations: Entries dropped because of writes
+    """
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+
+    @property
+    def lookups(self) -> int:
+        """Total number of lookups."""
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups served from the cache (0.0 if none yet)."""
+        return self.hits / self.lookups if self.lookups else 0.0
+
+
+class EntityCache:
+    """
+    Thread-safe identity map shared by the repositories of one database.
+
+    Entries are stored per region (DEVICES, CRITERIA, CRITERIA_BY_TEST)
+    under the keys the repositories use: the entity UUID, or
+    (device_id, test_type, test_stage) for criteria lists.
+    """
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[Hashable, Any]] = {region: {} for region in REGIONS}
+        self._stats: Dict[str, CacheStats] = {region: CacheStats() for region in REGIONS}
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        """
+        Current generation (advanced by every invalidation).
+
+        Take it before querying the database and pass it to put().
+        """
+        with self._lock:
+            return self._generation
+
+    def get(self, region: str, key: Hashable) -> Optional[Any]:
+        """
+        Look up an entry and count the hit or miss.
+
+        Args:
+            region: Cache region (DEVICES, CRITERIA, CRITERIA_BY_TEST)
+            key: Entry key
+
+        Returns:
+            Cached value, or None if not cached
+        """
+        with self._lock:
+            value = self._entries[region].get(key)
+            stats = self._stats[region]
+            if value is None:
+                stats.misses += 1
+            else:
+                stats.hits += 1
+            return value
+
+    def put(self, region: str, key: Hashable, value: Any, generation: int) -> None:
+        """
+        Store a value loaded from the database.
+
+        Ignored if an invalidation happened since generation was taken (the
+        value may predate a committed write).
+
+        Args:
+            region: Cache region
+            key: Entry key
+            value: Loaded value (not None)
+            generation: Value of the generation property before the query
+        """
+        with self._lock:
+            if generation == self._generation:
+                self._entries[region][key] = value
+
+    def invalidate(self, region: str, key: Hashable) -> None:
+        """
+        Drop one entry (after a write affecting it).
+
+        Args:
+            region: Cache region
+            key: Entry key (missing keys are ignored)
+        """
+        with self._lock:
+            self._generation += 1
+            if self._entries[region].pop(key, None) is not None:
+                self._stats[region].invalidations += 1
+
+    def invalidate_device(self, device_id: UUID) -> None:
+        """
+        Drop a device together with all of its criteria and criteria lists.
+
+        Used when a device is deleted (its criteria are removed by
+        ON DELETE CASCADE) or all of its criteria are deleted at once.
+
+        Args:
+            device_id: UUID of the device
+        """
+        with self._lock:
+            self._generation += 1
+            self._drop(DEVICES, lambda key, value: key == device_id)
+            self._drop(CRITERIA, lambda key, value: value.device_id == device_id)
+            self._drop(CRITERIA_BY_TEST, lambda key, value: key[0] == device_id)
+
+    def clear(self) -> None:
+        """Drop all entries (statistics are kept)."""
+        with self._lock:
+            self._generation += 1
+            for region in REGIONS:
+                self._stats[region].invalidations += len(self._entries[region])
+                self._entries[region].clear()
+
+    def stats(self) -> Dict[str, CacheStats]:
+        """
+        Get a snapshot of the counters of every region.
+
+        Returns:
+            Dictionary mapping region name -> CacheStats (copies)
+        """
+        with self._lock:
+            return {
+                region: CacheStats(stats.hits, stats.misses, stats.invalidations)
+                for region, stats in self._stats.items()
+            }
+
+    def reset_stats(self) -> None:
+        """Reset all counters to zero."""
+        with self._lock:
+            self._stats = {region: CacheStats() for region in REGIONS}
+
+    def _drop(self, region: str, predicate) -> None:
+        """
+        Drop the entries of a region matching predicate(key, value).
+
+        Args:
+            region: Cache region
+            predicate: Function (key, value) -> bool
+        """
+        entries = self._entries[region]
+        keys = [key for key, value in entries.items() if predicate(key, value)]
+        for key in keys:
+            del entries[key]
+        self._stats[region].invalidations += len(keys)
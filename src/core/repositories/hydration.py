@@ -0,0 +1,70 @@
+"""
+Trusted model hydration for rows read back from our own schema.
+
+Models are validated on the write path (when the application constructs
+them, before a repository stores them). Rows read back were valid when they
+were written, so the repositories' _row_to_* converters build models with
+construct_trusted() instead of running every field and model validator
+again on each load.
+
+construct_trusted() is faster than pydantic's model_construct(), which
+still loops over all model fields in Python to apply defaults and aliases:
+the converters always pass every field, already converted to its model type
+(UUID, bool, date, ...), so the values become the instance __dict__
+directly.
+
+Foreign keys repeat across rows (every result of a measurement carries the
+same measurement_id), so they are parsed with the cached uuid_from_db().
+"""
+
+from functools import lru_cache
+from typing import Any, Type, TypeVar
+from uuid import UUID
+
+from pydantic import BaseModel
+
+M = TypeVar("M", bound=BaseModel)
+
+# Bypass BaseModel.__setattr__ (which would validate/track the assignment)
+_object_setattr = object.__setattr__
+
+
+def construct_trusted(model_cls: Type[M], **fields: Any) -> M:
+    """
+    Build a model from already valid, fully converted field values.
+    
+    No validators run and no defaults are applied, so callers must pass
+    every field of the model in its model type. Only use this for data
+    read from the database (validated when it was written).
+    
+    Args:
+        model_cls: Pydantic model class (without private attributes)
+        **fields: Value for every model field, in declaration order
+        
+    Returns:
+        Model instance equal to model_cls(**fields)
+    """
+    model = model_cls.__new__(model_cls)
+    _object_setattr(model, "__dict__", fields)
+    _object_setattr(model, "__pydantic_fields_set__", set(fields))
+    _object_setattr(model, "__pydantic_extra__", None)
+    _object_setattr(model, "__pydantic_private__", None)
+    return model
+
+
+@lru_cache(maxsize=65536)
+def uuid_from_db(text: str) -> UUID:
+    """
+    Parse a UUID stored as TEXT, caching repeated values.
+    
+    UUIDs are immutable, so one instance can be shared by every row that
+    references the same entity. Use for foreign keys; primary keys are
+    unique per row and are parsed with UUID() directly.
+    
+    Args:
+        text: UUID string from the database
+        
+    Returns:
+        UUID object
+    """
+    return UUID(text)
@@ -0,0 +1,245 @@
+"""
+Measurement metrics repository implementation.
+
+This module provides SQLite storage for MeasurementMetrics - the band
+metrics computed from a measurement's RF data. Compliance evaluation reads
+them instead of decoding the touchstone data, so re-evaluating a whole
+campaign after a limit change is a pure comparison of stored numbers.
+
+Rows are keyed by (measurement_id, freq_min, freq_max, calculator_version)
+rather than a UUID, so this repository does not implement IRepository.
+Metrics are removed with their measurement (ON DELETE CASCADE) and when a
+measurement's RF data is replaced (see MeasurementRepository.update).
+"""
+
+import json
+import sqlite3
+from collections import defaultdict
+from typing import Dict, Iterable, List, Sequence, Tuple
+from uuid import UUID
+
+from ..models.measurement_metrics import MeasurementMetrics
+from ..exceptions import DatabaseError
+from .hydration import construct_trusted, uuid_from_db
+
+
+# Frequency band key (freq_min, freq_max) in GHz
+Band = Tuple[float, float]
+
+
+class MeasurementMetricsRepository:
+    """
+    SQLite repository for stored band metrics.
+
+    Provides lookups for one measurement or for many measurements at once
+    (one query per campaign re-evaluation), and batched writes.
+    """
+
+    def __init__(self, connection: sqlite3.Connection):
+        """
+        Initialize repository with database connection.
+
+        Args:
+            connection: SQLite connection (should have row_factory=sqlite3.Row)
+        """
+        self.conn = connection
+
+    def get_for_measurement(
+        self,
+        measurement_id: UUID,
+        calculator_version: int
+    ) -> Dict[Band, MeasurementMetrics]:
+        """
+        Get all stored band metrics of a measurement.
+
+        Args:
+            measurement_id: UUID of the measurement
+            calculator_version: Only metrics from this version are returned
+
+        Returns:
+            Dictionary mapping (freq_min, freq_max) -> MeasurementMetrics
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(
+            """
+            SELECT * FROM measurement_metrics
+            WHERE measurement_id = ? AND calculator_version = ?
+            """,
+            (str(measurement_id), calculator_version)
+        )
+        return {
+            metrics.band: metrics
+            for metrics in (self._row_to_metrics(row) for row in cursor.fetchall())
+        }
+
+    def get_for_measurements(
+        self,
+        measurement_ids: Iterable[UUID],
+        calculator_version: int
+    ) -> Dict[UUID, Dict[Band, MeasurementMetrics]]:
+        """
+        Get stored band metrics for many measurements in one query.
+
+        Args:
+            measurement_ids: UUIDs of the measurements
+            calculator_version: Only metrics from this version are returned
+
+        Returns:
+            Dictionary mapping measurement_id -> {band: MeasurementMetrics}
+            Measurements without stored metrics are absent
+        """
+        ids = [str(measurement_id) for measurement_id in measurement_ids]
+        if not ids:
+            return {}
+        cursor = self.conn.cursor()
+        # IDs are passed as one JSON array parameter - no per-ID placeholders,
+        # so the statement works for any campaign size
+        cursor.execute(
+            """
+            SELECT * FROM measurement_metrics
+            WHERE calculator_version = ?
+              AND measurement_id IN (SELECT value FROM json_each(?))
+            """,
+            (calculator_version, json.dumps(ids))
+        )
+        by_measurement: Dict[UUID, Dict[Band, MeasurementMetrics]] = defaultdict(dict)
+        for row in cursor.fetchall():
+            metrics = self._row_to_metrics(row)
+            by_measurement[metrics.measurement_id][metrics.band] = metrics
+        return dict(by_measurement)
+
+    def save_many(self, metrics: Sequence[MeasurementMetrics]) -> List[MeasurementMetrics]:
+        """
+        Store band metrics in a single transaction.
+
+        Existing metrics for the same measurement/band/version are replaced.
+
+        Args:
+            metrics: MeasurementMetrics objects to store
+
+        Returns:
+            The stored MeasurementMetrics objects (same objects, unchanged)
+
+        Raises:
+            DatabaseError: If any write fails (nothing is stored)
+        """
+        metrics = list(metrics)
+        if not metrics:
+            return metrics
+        try:
+            cursor = self.conn.cursor()
+            cursor.executemany(
+                """
+                INSERT OR REPLACE INTO measurement_metrics (
+                    measurement_id, freq_min, freq_max, calculator_version,
+                    n_ports, metrics
+                ) VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                [self._metrics_to_params(m) for m in metrics]
+            )
+            self.conn.commit()
+            return metrics
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            raise DatabaseError(f"Failed to save measurement metrics: {e}") from e
+
+    def delete_for_measurement(self, measurement_id: UUID) -> None:
+        """
+        Delete all stored metrics of a measurement.
+
+        Args:
+            measurement_id: UUID of the measurement
+
+        Raises:
+            DatabaseError: If deletion fails
+        """
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                "DELETE FROM measurement_metrics WHERE measurement_id = ?",
+                (str(measurement_id),)
+            )
+            self.conn.commit()
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            raise DatabaseError(f"Failed to delete measurement metrics: {e}") from e
+
+    def delete_outdated(self, calculator_version: int) -> int:
+        """
+        Delete metrics stored by other calculator versions.
+
+        Outdated rows are never read (lookups filter by version), so this
+        only reclaims space.
+
+        Args:
+            calculator_version: Current calculator version (rows kept)
+
+        Returns:
+            Number of rows deleted
+
+        Raises:
+            DatabaseError: If deletion fails
+        """
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                "DELETE FROM measurement_metrics WHERE calculator_version != ?",
+                (calculator_version,)
+            )
+            self.conn.commit()
+            return cursor.rowcount
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            raise DatabaseError(f"Failed to delete outdated measurement metrics: {e}") from e
+
+    def _metrics_to_params(self, metrics: MeasurementMetrics) -> tuple:
+        """
+        Convert MeasurementMetrics to INSERT parameters.
+
+        Args:
+            metrics: MeasurementMetrics object
+
+        Returns:
+            Tuple of SQL parameters
+        """
+        return (
+            str(metrics.measurement_id),
+            metrics.freq_min,
+            metrics.freq_max,
+            metrics.calculator_version,
+            metrics.n_ports,
+            json.dumps({
+                "gain_min": metrics.gain_min,
+                "gain_max": metrics.gain_max,
+                "vswr_max": metrics.vswr_max,
+                "gain_min_freq": metrics.gain_min_freq,
+                "gain_max_freq": metrics.gain_max_freq,
+                "vswr_max_freq": metrics.vswr_max_freq,
+                "margins": metrics.margins,
+            })
+        )
+
+    def _row_to_metrics(self, row: sqlite3.Row) -> MeasurementMetrics:
+        """
+        Convert database row to MeasurementMetrics.
+
+        The row was written from a validated model, so it is hydrated with
+        construct_trusted (no re-validation of the per-port lists).
+
+        Args:
+            row: SQLite Row object
+
+        Returns:
+            MeasurementMetrics populated from row data
+        """
+        # JSON keys are the field names (gain_min, vswr_max_freq, margins, ...)
+        values = json.loads(row["metrics"])
+        return construct_trusted(
+            MeasurementMetrics,
+            measurement_id=uuid_from_db(row["measurement_id"]),
+            freq_min=row["freq_min"],
+            freq_max=row["freq_max"],
+            calculator_version=row["calculator_version"],
+            n_ports=row["n_ports"],
+            **values
+        )
@@ -4,27 +4,73 @@ Measurement repository implementation.
 This module provides the SQLite implementation of IRepository[Measurement],
 handling all database operations for measurement entities. It handles:
 - CRUD operations (Create, Read, Update, Delete)
-- Serialization of Network objects to BLOB (pickled bytes)
-- Deserialization when reading from database
+- Serialization of Network objects to BLOB (binary array codec)
+- Deserialization when reading from database (codec or legacy pickle)
+- Migration of legacy pickled BLOBs to the binary codec
 - Specialized queries for Test Setup screen and measurement lookup
+- Lazy RF data loading for list queries and header-only projections
+- Batched writes (create_many/upsert_many) in a single transaction
+- Content-addressed RF data: measurements with a content_hash share one
+  stored blob in touchstone_blobs
+- Header facts of the RF data (port count, point count, frequency range)
+  stored as columns, so port queries never decode a network
 
 Key design decisions:
-- Network objects stored as BLOB (pickled bytes) using TouchstoneLoader
+- Network objects stored as BLOB (versioned binary codec) using TouchstoneLoader
 - Metadata stored as JSON TEXT for flexible additional information
 - UUIDs stored as strings (TEXT) for SQLite compatibility
 - Automatic timestamp management (created_at)
+- List queries never select the BLOB column; touchstone_data is a
+  LazyNetwork proxy that fetches and decodes it on first access
+- Hashed measurements store an empty touchstone_data BLOB; reads resolve
+  the data from touchstone_blobs first (_TOUCHSTONE_DATA)
 """
 
 import json
 import sqlite3
-from typing import List, Optional, Any
+from typing import Dict, List, Optional, Any, Sequence, Set, Tuple
 from uuid import UUID
 from datetime import date
 
-from ..models.measurement import Measurement
-from ..exceptions import DatabaseError
+from ..models.measurement import Measurement, MeasurementHeader
+from ..exceptions import DatabaseError, FileLoadError
 from ..rf_data.touchstone_loader import TouchstoneLoader
+from ..rf_data import network_codec
+from ..rf_data.lazy_network import LazyNetwork
+from ..rf_data.touchstone_scan import TouchstoneHeader, header_from_network
 from .base import IRepository
+from .hydration import construct_trusted, uuid_from_db
+
+
+# Every measurements column except the touchstone_data BLOB. List queries
+# select only these so that BLOBs are fetched lazily, one row at a time.
+_HEADER_COLUMNS = (
+    "id, device_id, serial_number, test_type, test_stage, temperature, "
+    "path_type, file_path, measurement_date, metadata, content_hash, "
+    "n_ports, n_points, freq_start, freq_stop"
+)
+
+# RF data of a measurements row: the shared blob for hashed rows, the inline
+# BLOB otherwise (rows stored before content hashing)
+_TOUCHSTONE_DATA = (
+    "COALESCE((SELECT data FROM touchstone_blobs "
+    "WHERE content_hash = measurements.content_hash), touchstone_data)"
+)
+
+# Shared INSERT statement for single and batched creates
+_INSERT_SQL = """
+    INSERT INTO measurements (
+        id, device_id, serial_number, test_type, test_stage,
+        temperature, path_type, file_path, measurement_date,
+        touchstone_data, metadata, content_hash,
+        n_ports, n_points, freq_start, freq_stop
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Shared blob insert - a blob already stored under the hash is kept
+_INSERT_BLOB_SQL = """
+    INSERT OR IGNORE INTO touchstone_blobs (content_hash, data) VALUES (?, ?)
+"""
 
 
 class MeasurementRepository(IRepository[Measurement]):
@@ -34,8 +80,8 @@ class MeasurementRepository(IRepository[Measurement]):
     Handles all database operations for Measurement entities. Converts between
     Measurement model objects and SQLite database rows, handling:
     - UUID serialization (UUID -> TEXT)
-    - Network object serialization (Network -> BLOB via pickle)
-    - Network object deserialization (BLOB -> Network via pickle)
+    - Network object serialization (Network -> BLOB via binary codec)
+    - Network object deserialization (BLOB -> Network, codec or legacy pickle)
     - Metadata serialization (Dict -> JSON TEXT)
     - Date serialization (date -> DATE)
     
@@ -65,7 +111,8 @@ class MeasurementRepository(IRepository[Measurement]):
         """
         cursor = self.conn.cursor()
         cursor.execute(
-            "SELECT * FROM measurements WHERE id = ?",
+            f"SELECT {_HEADER_COLUMNS}, {_TOUCHSTONE_DATA} AS touchstone_data "
+            "FROM measurements WHERE id = ?",
             (str(id),)
         )
         row = cursor.fetchone()
@@ -83,10 +130,12 @@ class MeasurementRepository(IRepository[Measurement]):
             List of all Measurement objects, sorted by date (newest first)
         """
         cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM measurements ORDER BY measurement_date DESC")
+        cursor.execute(
+            f"SELECT {_HEADER_COLUMNS} FROM measurements ORDER BY measurement_date DESC"
+        )
         rows = cursor.fetchall()
         
-        return [self._row_to_measurement(row) for row in rows]
+        return [self._row_to_lazy_measurement(row) for row in rows]
     
     def get_by_device_and_test_stage(
         self,
@@ -109,24 +158,16 @@ class MeasurementRepository(IRepository[Measurement]):
             List of Measurement objects, ordered by temperature, path_type
             Empty list if no measurements found
         """
-        cursor = self.conn.cursor()
-        cursor.execute(
-            """
-            SELECT * FROM measurements 
-            WHERE device_id = ? AND test_type = ? AND test_stage = ?
-            ORDER BY temperature, path_type
-            """,
-            (str(device_id), test_type, test_stage)
-        )
-        rows = cursor.fetchall()
-        
-        return [self._row_to_measurement(row) for row in rows]
+        rows = self._select_by_device_and_test_stage(device_id, test_type, test_stage)
+        return [self._row_to_lazy_measurement(row) for row in rows]
     
     def get_by_device(self, device_id: UUID) -> List[Measurement]:
         """
         Get all measurements for a device.
         
-        Used when checking for related data before device deletion.
+        touchstone_data is loaded lazily (see LazyNetwork). Callers that
+        only need counts or header fields should use count_by_device or
+        get_headers_by_device instead.
         
         Args:
             device_id: UUID of the device
@@ -134,14 +175,8 @@ class MeasurementRepository(IRepository[Measurement]):
         Returns:
             List of all Measurement objects for this device
         """
-        cursor = self.conn.cursor()
-        cursor.execute(
-            "SELECT * FROM measurements WHERE device_id = ? ORDER BY measurement_date DESC",
-            (str(device_id),)
-        )
-        rows = cursor.fetchall()
-        
-        return [self._row_to_measurement(row) for row in rows]
+        rows = self._select_by_device(device_id)
+        return [self._row_to_lazy_measurement(row) for row in rows]
     
     def get_by_serial_number(self, serial_number: str) -> List[Measurement]:
         """
@@ -158,12 +193,96 @@ class MeasurementRepository(IRepository[Measurement]):
         """
         cursor = self.conn.cursor()
         cursor.execute(
-            "SELECT * FROM measurements WHERE serial_number = ? ORDER BY measurement_date DESC",
+            f"SELECT {_HEADER_COLUMNS} FROM measurements "
+            "WHERE serial_number = ? ORDER BY measurement_date DESC",
             (serial_number,)
         )
         rows = cursor.fetchall()
         
-        return [self._row_to_measurement(row) for row in rows]
+        return [self._row_to_lazy_measurement(row) for row in rows]
+    
+    def get_headers_by_device(self, device_id: UUID) -> List[MeasurementHeader]:
+        """
+        Get header-only records for all measurements of a device.
+        
+        Never touches the touchstone_data BLOB column.
+        
+        Args:
+            device_id: UUID of the device
+            
+        Returns:
+            List of MeasurementHeader objects, newest first
+        """
+        rows = self._select_by_device(device_id)
+        return [self._row_to_header(row) for row in rows]
+    
+    def get_headers_by_device_and_test_stage(
+        self,
+        device_id: UUID,
+        test_type: str,
+        test_stage: str
+    ) -> List[MeasurementHeader]:
+        """
+        Get header-only records for a device, test type, and test stage.
+        
+        Header-only variant of get_by_device_and_test_stage for screens that
+        list loaded files without analysing them.
+        
+        Args:
+            device_id: UUID of the device
+            test_type: Test type name (e.g., "S-Parameters")
+            test_stage: Test stage name (e.g., "SIT", "Board-Bring-Up")
+            
+        Returns:
+            List of MeasurementHeader objects, ordered by temperature, path_type
+        """
+        rows = self._select_by_device_and_test_stage(device_id, test_type, test_stage)
+        return [self._row_to_header(row) for row in rows]
+    
+    def count_by_device(self, device_id: UUID) -> int:
+        """
+        Count measurements for a device.
+        
+        Used when checking for related data before device deletion.
+        
+        Args:
+            device_id: UUID of the device
+            
+        Returns:
+            Number of measurements stored for this device
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "SELECT COUNT(*) FROM measurements WHERE device_id = ?",
+            (str(device_id),)
+        )
+        return cursor.fetchone()[0]
+    
+    def get_port_counts(self, device_id: UUID, test_type: str) -> List[int]:
+        """
+        Get the distinct port counts of a device's measurements.
+        
+        Answered from the n_ports column (index idx_measurements_device_ports)
+        - no RF data is fetched or decoded. Measurements whose header facts
+        are unknown (legacy pickle blobs) are not included.
+        
+        Args:
+            device_id: UUID of the device
+            test_type: Test type name (e.g., "S-Parameters")
+            
+        Returns:
+            Port counts in ascending order
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(
+            """
+            SELECT DISTINCT n_ports FROM measurements
+            WHERE device_id = ? AND test_type = ? AND n_ports IS NOT NULL
+            ORDER BY n_ports
+            """,
+            (str(device_id), test_type)
+        )
+        return [row[0] for row in cursor.fetchall()]
     
     def create(self, measurement: Measurement) -> Measurement:
         """
@@ -177,47 +296,159 @@ class MeasurementRepository(IRepository[Measurement]):
             measurement: Measurement object to create (ID may be auto-generated)
             
         Returns:
-            The created Measurement (same object, unchanged)
+            The created Measurement (same object; missing header facts filled in)
             
         Raises:
             DatabaseError: If insertion fails
         """
+        # Serialize Network object to bytes before touching the database
+        params, blob_params = self._write_params([measurement])
         try:
-            # Serialize Network object to bytes if needed
-            if isinstance(measurement.touchstone_data, bytes):
-                touchstone_blob = measurement.touchstone_data
-            else:
-                # Network object - serialize to bytes
-                touchstone_blob = self.loader.serialize_network(measurement.touchstone_data)
+            cursor = self.conn.cursor()
+            cursor.executemany(_INSERT_BLOB_SQL, blob_params)
+            cursor.executemany(_INSERT_SQL, params)
+            self.conn.commit()
+            return measurement
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            raise DatabaseError(f"Failed to create measurement: {e}") from e
+    
+    def create_many(self, measurements: Sequence[Measurement]) -> List[Measurement]:
+        """
+        Create many measurements in a single transaction.
+        
+        All Network objects are serialized first, then every row is inserted
+        with one executemany and one commit. Either all measurements are
+        stored or none are.
+        
+        Args:
+            measurements: Measurement objects to create
             
+        Returns:
+            The created Measurement objects (same objects; missing header facts filled in)
+            
+        Raises:
+            DatabaseError: If any insertion fails (nothing is stored)
+        """
+        measurements = list(measurements)
+        if not measurements:
+            return measurements
+        params, blob_params = self._write_params(measurements)
+        try:
             cursor = self.conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO measurements (
-                    id, device_id, serial_number, test_type, test_stage,
-                    temperature, path_type, file_path, measurement_date,
-                    touchstone_data, metadata
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            cursor.executemany(_INSERT_BLOB_SQL, blob_params)
+            cursor.executemany(_INSERT_SQL, params)
+            self.conn.commit()
+            return measurements
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            raise DatabaseError(f"Failed to create measurements: {e}") from e
+    
+    def upsert_many(self, measurements: Sequence[Measurement]) -> List[Measurement]:
+        """
+        Insert or update many measurements (by ID) in a single transaction.
+        
+        Existing rows with the same ID are overwritten; new IDs are inserted.
+        
+        Args:
+            measurements: Measurement objects to insert or update
+            
+        Returns:
+            The stored Measurement objects (same objects; missing header facts filled in)
+            
+        Raises:
+            DatabaseError: If any write fails (nothing is stored)
+        """
+        measurements = list(measurements)
+        if not measurements:
+            return measurements
+        params, blob_params = self._write_params(measurements)
+        try:
+            cursor = self.conn.cursor()
+            cursor.executemany(_INSERT_BLOB_SQL, blob_params)
+            # RF data may change - stored band metrics are no longer valid
+            cursor.executemany(
+                "DELETE FROM measurement_metrics WHERE measurement_id = ?",
+                [(row[0],) for row in params]
+            )
+            cursor.executemany(
+                _INSERT_SQL + """
+                ON CONFLICT(id) DO UPDATE SET
+                    serial_number = excluded.serial_number,
+                    temperature = excluded.temperature,
+                    path_type = excluded.path_type,
+                    file_path = excluded.file_path,
+                    measurement_date = excluded.measurement_date,
+                    touchstone_data = excluded.touchstone_data,
+                    metadata = excluded.metadata,
+                    content_hash = excluded.content_hash,
+                    n_ports = excluded.n_ports,
+                    n_points = excluded.n_points,
+                    freq_start = excluded.freq_start,
+                    freq_stop = excluded.freq_stop
                 """,
-                (
-                    str(measurement.id),
-                    str(measurement.device_id),
-                    measurement.serial_number,
-                    measurement.test_type,
-                    measurement.test_stage,
-                    measurement.temperature,
-                    measurement.path_type,
-                    measurement.file_path,
-                    measurement.measurement_date.isoformat(),
-                    touchstone_blob,  # BLOB - pickled Network object
-                    json.dumps(measurement.metadata, default=self._json_serializer)  # JSON TEXT
-                )
+                params
             )
             self.conn.commit()
-            return measurement
+            return measurements
         except sqlite3.Error as e:
             self.conn.rollback()
-            raise DatabaseError(f"Failed to create measurement: {e}") from e
+            raise DatabaseError(f"Failed to upsert measurements: {e}") from e
+    
+    def get_blob_by_content_hash(self, content_hash: str) -> Optional[bytes]:
+        """
+        Get the stored RF data for a file content hash.
+        
+        Used to reuse already-encoded data when an identical file is loaded
+        again, instead of parsing it.
+        
+        Args:
+            content_hash: SHA-256 hex digest of the source file
+            
+        Returns:
+            Encoded network bytes, or None if no such file was stored
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "SELECT data FROM touchstone_blobs WHERE content_hash = ?",
+            (content_hash,)
+        )
+        row = cursor.fetchone()
+        return row[0] if row else None
+    
+    def get_content_hashes(self) -> Set[str]:
+        """
+        Get the hashes of all stored files.
+        
+        Used by bulk ingest to skip parsing files that are already stored.
+        
+        Returns:
+            Set of SHA-256 hex digests
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT content_hash FROM touchstone_blobs")
+        return {row[0] for row in cursor.fetchall()}
+    
+    def get_lazy_network_by_content_hash(self, content_hash: str) -> LazyNetwork:
+        """
+        Get a deferred Network for stored RF data.
+        
+        Nothing is fetched until the network is first used; saving a
+        measurement with this proxy (and the same content_hash) does not
+        re-encode the data.
+        
+        Args:
+            content_hash: SHA-256 hex digest of a stored file
+            
+        Returns:
+            LazyNetwork proxy backed by the shared blob
+        """
+        def load() -> Any:
+            data = self.get_blob_by_content_hash(content_hash)
+            if data is None:
+                raise DatabaseError(f"No stored data for content hash {content_hash}")
+            return self.loader.deserialize_network(data)
+        return LazyNetwork(load, self.conn)
     
     def update(self, measurement: Measurement) -> Measurement:
         """
@@ -235,14 +466,18 @@ class MeasurementRepository(IRepository[Measurement]):
         Raises:
             DatabaseError: If update fails
         """
-        # Serialize Network object if needed
-        if isinstance(measurement.touchstone_data, bytes):
-            touchstone_blob = measurement.touchstone_data
-        else:
-            touchstone_blob = self.loader.serialize_network(measurement.touchstone_data)
+        # Serialize Network object if needed (shared blob for hashed rows)
+        params, blob_params = self._write_params([measurement])
+        touchstone_blob = params[0][9]
         
         try:
             cursor = self.conn.cursor()
+            cursor.executemany(_INSERT_BLOB_SQL, blob_params)
+            # RF data may change - stored band metrics are no longer valid
+            cursor.execute(
+                "DELETE FROM measurement_metrics WHERE measurement_id = ?",
+                (str(measurement.id),)
+            )
             cursor.execute(
                 """
                 UPDATE measurements SET
@@ -252,7 +487,12 @@ class MeasurementRepository(IRepository[Measurement]):
                     file_path = ?,
                     measurement_date = ?,
                     touchstone_data = ?,
-                    metadata = ?
+                    metadata = ?,
+                    content_hash = ?,
+                    n_ports = ?,
+                    n_points = ?,
+                    freq_start = ?,
+                    freq_stop = ?
                 WHERE id = ?
                 """,
                 (
@@ -263,6 +503,11 @@ class MeasurementRepository(IRepository[Measurement]):
                     measurement.measurement_date.isoformat(),
                     touchstone_blob,
                     json.dumps(measurement.metadata, default=self._json_serializer),
+                    measurement.content_hash,
+                    measurement.n_ports,
+                    measurement.n_points,
+                    measurement.freq_start,
+                    measurement.freq_stop,
                     str(measurement.id)
                 )
             )
@@ -293,6 +538,297 @@ class MeasurementRepository(IRepository[Measurement]):
             self.conn.rollback()
             raise DatabaseError(f"Failed to delete measurement: {e}") from e
     
+    def migrate_legacy_blobs(self, batch_size: int = 25) -> int:
+        """
+        Re-encode legacy pickled touchstone_data BLOBs with the binary codec.
+        
+        Databases created before the binary codec store pickled Network
+        objects. They remain readable, but are larger and slower to load.
+        This method converts them in small batches (one commit per batch) so
+        it can run in a background thread without holding long write locks.
+        
+        The header fact columns (n_ports, ...) of converted rows are filled
+        in too. Rows whose BLOB cannot be unpickled are left untouched and
+        skipped.
+        Hashed rows live in touchstone_blobs, which only ever holds codec
+        blobs, so they are never selected.
+        Safe to call repeatedly - already migrated rows are not selected.
+        
+        Args:
+            batch_size: Number of rows converted per transaction
+            
+        Returns:
+            Number of rows migrated
+            
+        Raises:
+            DatabaseError: If a database operation fails
+        """
+        migrated = 0
+        last_id = ""
+        try:
+            cursor = self.conn.cursor()
+            while True:
+                # Keyset pagination by id so skipped (corrupt) rows are not
+                # selected again. Codec blobs start with the magic bytes.
+                cursor.execute(
+                    """
+                    SELECT id, touchstone_data FROM measurements
+                    WHERE id > ? AND content_hash IS NULL
+                      AND substr(touchstone_data, 1, ?) != ?
+                    ORDER BY id
+                    LIMIT ?
+                    """,
+                    (last_id, len(network_codec.MAGIC), network_codec.MAGIC, batch_size)
+                )
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+                
+                updates = []
+                for row in rows:
+                    last_id = row["id"]
+                    try:
+                        network = self.loader.deserialize_network(row["touchstone_data"])
+                        header = header_from_network(network)
+                        updates.append((
+                            self.loader.serialize_network(network),
+                            header.n_ports,
+                            header.n_points,
+                            header.freq_start_ghz,
+                            header.freq_stop_ghz,
+                            row["id"]
+                        ))
+                    except FileLoadError:
+                        # Corrupt legacy blob - leave as is
+                        continue
+                
+                if updates:
+                    cursor.executemany(
+                        """
+                        UPDATE measurements SET
+                            touchstone_data = ?,
+                            n_ports = ?, n_points = ?, freq_start = ?, freq_stop = ?
+                        WHERE id = ?
+                        """,
+                        updates
+                    )
+                    self.conn.commit()
+                    migrated += len(updates)
+            
+            return migrated
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            raise DatabaseError(f"Failed to migrate legacy measurement data: {e}") from e
+    
+    def _select_by_device(self, device_id: UUID) -> List[sqlite3.Row]:
+        """
+        Select header columns for all measurements of a device.
+        
+        Args:
+            device_id: UUID of the device
+            
+        Returns:
+            Rows ordered by measurement_date descending
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(
+            f"SELECT {_HEADER_COLUMNS} FROM measurements "
+            "WHERE device_id = ? ORDER BY measurement_date DESC",
+            (str(device_id),)
+        )
+        return cursor.fetchall()
+    
+    def _select_by_device_and_test_stage(
+        self,
+        device_id: UUID,
+        test_type: str,
+        test_stage: str
+    ) -> List[sqlite3.Row]:
+        """
+        Select header columns for a device, test type, and test stage.
+        
+        Args:
+            device_id: UUID of the device
+            test_type: Test type name
+            test_stage: Test stage name
+            
+        Returns:
+            Rows ordered by temperature, path_type
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(
+            f"""
+            SELECT {_HEADER_COLUMNS} FROM measurements 
+            WHERE device_id = ? AND test_type = ? AND test_stage = ?
+            ORDER BY temperature, path_type
+            """,
+            (str(device_id), test_type, test_stage)
+        )
+        return cursor.fetchall()
+    
+    def _load_network(self, measurement_id: str) -> Any:
+        """
+        Fetch and decode the touchstone BLOB for one measurement.
+        
+        Loader callable behind LazyNetwork proxies.
+        
+        Args:
+            measurement_id: Measurement ID (TEXT form)
+            
+        Returns:
+            Decoded scikit-rf Network object
+            
+        Raises:
+            DatabaseError: If the measurement no longer exists
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(
+            f"SELECT {_TOUCHSTONE_DATA} FROM measurements WHERE id = ?",
+            (measurement_id,)
+        )
+        row = cursor.fetchone()
+        if row is None:
+            raise DatabaseError(f"Measurement {measurement_id} no longer exists")
+        return self.loader.deserialize_network(row[0])
+    
+    def _write_params(
+        self,
+        measurements: Sequence[Measurement]
+    ) -> Tuple[List[tuple], List[tuple]]:
+        """
+        Convert Measurements to INSERT parameters.
+        
+        RF data is encoded once per measurement: bytes are used directly,
+        Network objects (or lazy proxies) are serialized. Measurements with a
+        content_hash get an empty touchstone_data BLOB and a shared blob row
+        instead. A hashed measurement whose proxy was never loaded already
+        has its blob stored, so it is not re-fetched or re-encoded.
+        
+        Measurements without header facts (n_ports is None) get them from
+        the encoded blob header (see _fill_header_facts); the facts are set
+        on the measurement objects as well.
+        
+        Args:
+            measurements: Measurement objects
+            
+        Returns:
+            Tuple of (measurement rows in _INSERT_SQL column order,
+                      blob rows for _INSERT_BLOB_SQL)
+        """
+        params = []
+        blob_params = []
+        # Blob header facts per content hash written in this batch
+        headers_by_hash: Dict[str, Optional[TouchstoneHeader]] = {}
+        for measurement in measurements:
+            content_hash = measurement.content_hash
+            data = measurement.touchstone_data
+            if content_hash is not None:
+                # Shared blob: write once per hash (duplicates are ignored by
+                # the database too, this just skips re-encoding them)
+                stored = isinstance(data, LazyNetwork) and not data.is_loaded
+                if not stored and content_hash not in headers_by_hash:
+                    blob = self._encode(data)
+                    blob_params.append((content_hash, blob))
+                    headers_by_hash[content_hash] = self._read_header(blob)
+                if measurement.n_ports is None:
+                    if content_hash not in headers_by_hash:
+                        headers_by_hash[content_hash] = self._stored_header(content_hash)
+                    self._fill_header_facts(measurement, headers_by_hash[content_hash])
+                touchstone_blob = b""
+            else:
+                touchstone_blob = self._encode(data)
+                if measurement.n_ports is None:
+                    self._fill_header_facts(measurement, self._read_header(touchstone_blob))
+            params.append((
+                str(measurement.id),
+                str(measurement.device_id),
+                measurement.serial_number,
+                measurement.test_type,
+                measurement.test_stage,
+                measurement.temperature,
+                measurement.path_type,
+                measurement.file_path,
+                measurement.measurement_date.isoformat(),
+                touchstone_blob,  # BLOB - encoded Network arrays (empty if shared)
+                json.dumps(measurement.metadata, default=self._json_serializer),  # JSON TEXT
+                content_hash,
+                measurement.n_ports,
+                measurement.n_points,
+                measurement.freq_start,
+                measurement.freq_stop
+            ))
+        return params, blob_params
+    
+    def _read_header(self, blob: bytes) -> Optional[TouchstoneHeader]:
+        """
+        Read the header facts of an encoded blob.
+        
+        Args:
+            blob: Encoded RF data
+            
+        Returns:
+            TouchstoneHeader, or None for blobs that are not codec blobs
+            (legacy pickle bytes) or cannot be read
+        """
+        if not network_codec.is_encoded(blob):
+            return None
+        try:
+            return network_codec.read_header(blob)
+        except FileLoadError:
+            return None
+    
+    def _stored_header(self, content_hash: str) -> Optional[TouchstoneHeader]:
+        """
+        Read the header facts of an already stored shared blob.
+        
+        Used for hashed measurements saved without their data loaded and
+        without header facts (callers normally set them from scan_file).
+        
+        Args:
+            content_hash: SHA-256 hex digest of a stored file
+            
+        Returns:
+            TouchstoneHeader, or None if no readable blob is stored
+        """
+        blob = self.get_blob_by_content_hash(content_hash)
+        return self._read_header(blob) if blob is not None else None
+    
+    def _fill_header_facts(
+        self,
+        measurement: Measurement,
+        header: Optional[TouchstoneHeader]
+    ) -> None:
+        """
+        Set a measurement's header fact fields from a blob header.
+        
+        Args:
+            measurement: Measurement without header facts
+            header: Header of its RF data (None leaves the fields unset)
+        """
+        if header is None:
+            return
+        measurement.n_ports = header.n_ports
+        measurement.n_points = header.n_points
+        measurement.freq_start = header.freq_start_ghz
+        measurement.freq_stop = header.freq_stop_ghz
+    
+    def _encode(self, touchstone_data: Any) -> bytes:
+        """
+        Encode RF data for storage.
+        
+        Args:
+            touchstone_data: Encoded bytes, Network object, or lazy proxy
+            
+        Returns:
+            Encoded bytes (bytes input is returned unchanged)
+        """
+        if isinstance(touchstone_data, bytes):
+            return touchstone_data
+        # Network object (or lazy proxy) - serialize to bytes
+        return self.loader.serialize_network(
+            self.loader.resolve_network(touchstone_data)
+        )
+    
     def _json_serializer(self, obj: Any) -> str:
         """
         Custom JSON serializer for objects that aren't JSON serializable by default.
@@ -318,7 +854,7 @@ class MeasurementRepository(IRepository[Measurement]):
         
         Handles deserialization:
         - TEXT -> UUID (for id and device_id)
-        - BLOB -> Network object (via pickle deserialization)
+        - BLOB -> Network object (codec decode, or pickle for legacy rows)
         - JSON TEXT -> Dict (for metadata)
         - DATE -> date object
         
@@ -326,26 +862,78 @@ class MeasurementRepository(IRepository[Measurement]):
             row: SQLite Row object
             
         Returns:
-            Measurement object populated from row data
+            Measurement object populated from row data (trusted, not
+            re-validated - see _header_fields)
         """
         # Deserialize Network object from BLOB
-        touchstone_blob = row["touchstone_data"]
-        network = self.loader.deserialize_network(touchstone_blob)
+        network = self.loader.deserialize_network(row["touchstone_data"])
         
-        # Parse date from ISO format string
-        measurement_date = date.fromisoformat(row["measurement_date"])
+        return construct_trusted(
+            Measurement,
+            **self._header_fields(row),
+            touchstone_data=network  # Deserialized Network object
+        )
+    
+    def _row_to_header(self, row: sqlite3.Row) -> MeasurementHeader:
+        """
+        Convert database row (header columns) to MeasurementHeader.
         
-        return Measurement(
+        Args:
+            row: SQLite Row object (without touchstone_data)
+            
+        Returns:
+            MeasurementHeader object populated from row data
+        """
+        return construct_trusted(MeasurementHeader, **self._header_fields(row))
+    
+    def _row_to_lazy_measurement(self, row: sqlite3.Row) -> Measurement:
+        """
+        Convert database row (header columns) to a lazily loaded Measurement.
+        
+        touchstone_data is a LazyNetwork proxy: the BLOB is fetched and
+        decoded only when the network is first used.
+        
+        Args:
+            row: SQLite Row object (without touchstone_data)
+            
+        Returns:
+            Measurement object with deferred RF data
+        """
+        measurement_id = row["id"]
+        return construct_trusted(
+            Measurement,
+            **self._header_fields(row),
+            touchstone_data=LazyNetwork(lambda: self._load_network(measurement_id), self.conn)
+        )
+    
+    def _header_fields(self, row: sqlite3.Row) -> dict:
+        """
+        Convert header columns of a row to model field values.
+        
+        The values are complete and already in their model types, so callers
+        pass them to construct_trusted: temperature and path_type were
+        validated when the row was written and are not checked again.
+        
+        Args:
+            row: SQLite Row object
+            
+        Returns:
+            Dictionary of MeasurementHeader field values
+        """
+        return dict(
             id=UUID(row["id"]),
-            device_id=UUID(row["device_id"]),
+            device_id=uuid_from_db(row["device_id"]),
             serial_number=row["serial_number"],
             test_type=row["test_type"],
             test_stage=row["test_stage"],
             temperature=row["temperature"],
             path_type=row["path_type"],
             file_path=row["file_path"],
-            measurement_date=measurement_date,
-            touchstone_data=network,  # Deserialized Network object
-            metadata=json.loads(row["metadata"])  # JSON -> Dict
+            measurement_date=date.fromisoformat(row["measurement_date"]),
+            metadata=json.loads(row["metadata"]),  # JSON -> Dict
+            content_hash=row["content_hash"],
+            n_ports=row["n_ports"],
+            n_points=row["n_points"],
+            freq_start=row["freq_start"],
+            freq_stop=row["freq_stop"]
         )
-
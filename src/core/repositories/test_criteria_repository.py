@@ -5,7 +5,10 @@ This module provides the SQLite implementation of IRepository[TestCriteria],
 handling all database operations for test criteria entities. It includes:
 - Standard CRUD operations
 - Specialized query: get_by_device_and_test (filters by device, test type, and stage)
+- Bulk lookup: get_by_ids (many criteria in one query)
 - Batch deletion: delete_by_device (removes all criteria for a device)
+- Optional identity-map caching (EntityCache) of lookups by ID and by
+  device/test/stage, invalidated by create, update and delete
 
 Test criteria are organized hierarchically:
 - Device (root)
@@ -18,12 +21,14 @@ This hierarchy enables efficient querying of criteria for specific device/test/s
 
 import json
 import sqlite3
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 from uuid import UUID
 
 from ..models.test_criteria import TestCriteria
 from ..exceptions import DatabaseError
 from .base import IRepository
+from .entity_cache import CRITERIA, CRITERIA_BY_TEST, EntityCache
+from .hydration import construct_trusted, uuid_from_db
 
 
 class TestCriteriaRepository(IRepository[TestCriteria]):
@@ -41,19 +46,46 @@ class TestCriteriaRepository(IRepository[TestCriteria]):
     - Proper handling of optional fields (frequency, min_value, max_value)
     """
     
-    def __init__(self, connection: sqlite3.Connection):
+    def __init__(self, connection: sqlite3.Connection, cache: Optional[EntityCache] = None):
         """
         Initialize repository with database connection.
         
         Args:
             connection: SQLite connection (should have row_factory=sqlite3.Row)
+            cache: Identity-map cache shared by all repositories of this
+                   database (None = no caching, every lookup queries)
         """
         self.conn = connection
+        self.cache = cache
     
     def get_by_id(self, id: UUID) -> Optional[TestCriteria]:
         """
         Get test criteria by ID.
         
+        Served from the cache when one is configured and the criteria were
+        loaded before (and not changed since).
+        
+        Args:
+            id: UUID of the criteria to retrieve
+            
+        Returns:
+            TestCriteria object if found, None otherwise
+        """
+        if self.cache is None:
+            return self._select_by_id(id)
+        
+        criteria = self.cache.get(CRITERIA, id)
+        if criteria is None:
+            generation = self.cache.generation
+            criteria = self._select_by_id(id)
+            if criteria is not None:
+                self.cache.put(CRITERIA, id, criteria, generation)
+        return criteria
+    
+    def _select_by_id(self, id: UUID) -> Optional[TestCriteria]:
+        """
+        Query test criteria by ID (bypassing the cache).
+        
         Args:
             id: UUID of the criteria to retrieve
             
@@ -85,6 +117,48 @@ class TestCriteriaRepository(IRepository[TestCriteria]):
         
         return [self._row_to_criteria(row) for row in rows]
     
+    def get_by_ids(self, ids: Iterable[UUID]) -> Dict[UUID, TestCriteria]:
+        """
+        Get many test criteria by ID in a single query.
+        
+        Used when results are already in memory and only their criteria are
+        needed (e.g. compliance display of freshly evaluated results).
+        
+        Args:
+            ids: UUIDs of the criteria to retrieve
+            
+        Returns:
+            Dictionary mapping criteria ID -> TestCriteria
+            IDs that do not exist are absent
+        """
+        found: Dict[UUID, TestCriteria] = {}
+        missing = set(ids)
+        if self.cache is not None:
+            # Only the criteria not in the cache are queried
+            for criteria_id in list(missing):
+                criteria = self.cache.get(CRITERIA, criteria_id)
+                if criteria is not None:
+                    found[criteria_id] = criteria
+                    missing.discard(criteria_id)
+        if not missing:
+            return found
+        
+        generation = self.cache.generation if self.cache is not None else 0
+        id_strings = [str(criteria_id) for criteria_id in missing]
+        cursor = self.conn.cursor()
+        # IDs are passed as one JSON array parameter (any number of criteria)
+        cursor.execute(
+            "SELECT * FROM test_criteria WHERE id IN (SELECT value FROM json_each(?))",
+            (json.dumps(id_strings),)
+        )
+        rows = cursor.fetchall()
+        
+        for criteria in (self._row_to_criteria(row) for row in rows):
+            found[criteria.id] = criteria
+            if self.cache is not None:
+                self.cache.put(CRITERIA, criteria.id, criteria, generation)
+        return found
+    
     def get_by_device_and_test(
         self,
         device_id: UUID,
@@ -106,6 +180,39 @@ class TestCriteriaRepository(IRepository[TestCriteria]):
             List of TestCriteria objects, ordered by requirement_name
             Empty list if no criteria found (valid - device may not have criteria yet)
         """
+        if self.cache is None:
+            return self._select_by_device_and_test(device_id, test_type, test_stage)
+        
+        key = (device_id, test_type, test_stage)
+        cached = self.cache.get(CRITERIA_BY_TEST, key)
+        if cached is not None:
+            # New list each call - callers may modify it
+            return list(cached)
+        
+        generation = self.cache.generation
+        criteria_list = self._select_by_device_and_test(device_id, test_type, test_stage)
+        self.cache.put(CRITERIA_BY_TEST, key, tuple(criteria_list), generation)
+        for criteria in criteria_list:
+            self.cache.put(CRITERIA, criteria.id, criteria, generation)
+        return criteria_list
+    
+    def _select_by_device_and_test(
+        self,
+        device_id: UUID,
+        test_type: str,
+        test_stage: str
+    ) -> List[TestCriteria]:
+        """
+        Query criteria by device, test type and stage (bypassing the cache).
+        
+        Args:
+            device_id: UUID of the device
+            test_type: Test type name
+            test_stage: Test stage name
+            
+        Returns:
+            List of TestCriteria objects, ordered by requirement_name
+        """
         cursor = self.conn.cursor()
         cursor.execute(
             """
@@ -161,6 +268,8 @@ class TestCriteriaRepository(IRepository[TestCriteria]):
         except sqlite3.Error as e:
             self.conn.rollback()
             raise DatabaseError(f"Failed to create test criteria: {e}") from e
+        finally:
+            self._invalidate(criteria)
     
     def update(self, criteria: TestCriteria) -> TestCriteria:
         """
@@ -217,6 +326,9 @@ class TestCriteriaRepository(IRepository[TestCriteria]):
         except sqlite3.Error as e:
             self.conn.rollback()
             raise DatabaseError(f"Failed to update test criteria: {e}") from e
+        finally:
+            # The stored device/test/stage (not updated) identify the list
+            self._invalidate(existing)
     
     def delete(self, id: UUID) -> None:
         """
@@ -242,6 +354,8 @@ class TestCriteriaRepository(IRepository[TestCriteria]):
         except sqlite3.Error as e:
             self.conn.rollback()
             raise DatabaseError(f"Failed to delete test criteria: {e}") from e
+        finally:
+            self._invalidate(existing)
     
     def delete_by_device(self, device_id: UUID) -> None:
         """
@@ -266,6 +380,27 @@ class TestCriteriaRepository(IRepository[TestCriteria]):
         except sqlite3.Error as e:
             self.conn.rollback()
             raise DatabaseError(f"Failed to delete test criteria: {e}") from e
+        finally:
+            if self.cache is not None:
+                self.cache.invalidate_device(device_id)
+    
+    def _invalidate(self, criteria: TestCriteria) -> None:
+        """
+        Drop cached entries affected by a write of one criteria.
+        
+        Called after the write (committed or rolled back), so the next read
+        loads the stored state.
+        
+        Args:
+            criteria: Written criteria (its stored device/test/stage)
+        """
+        if self.cache is None:
+            return
+        self.cache.invalidate(CRITERIA, criteria.id)
+        self.cache.invalidate(
+            CRITERIA_BY_TEST,
+            (criteria.device_id, criteria.test_type, criteria.test_stage)
+        )
     
     def _row_to_criteria(self, row: sqlite3.Row) -> TestCriteria:
         """
@@ -275,15 +410,19 @@ class TestCriteriaRepository(IRepository[TestCriteria]):
         - TEXT -> UUID (for id and device_id)
         - NULL -> None (for optional fields: frequency, min_value, max_value)
         
+        The criteria_type and value validators ran when the row was written,
+        so the model is built with construct_trusted (no re-validation).
+        
         Args:
             row: SQLite Row object (from cursor.fetchone() or fetchall())
             
         Returns:
             TestCriteria object populated from row data
         """
-        return TestCriteria(
+        return construct_trusted(
+            TestCriteria,
             id=UUID(row["id"]),
-            device_id=UUID(row["device_id"]),
+            device_id=uuid_from_db(row["device_id"]),
             test_type=row["test_type"],
             test_stage=row["test_stage"],
             requirement_name=row["requirement_name"],
@@ -4,21 +4,93 @@ Test result repository implementation.
 This module provides the SQLite implementation of IRepository[TestResult],
 handling all database operations for test result entities. It includes:
 - Standard CRUD operations
-- Specialized queries for compliance table display
+- Specialized queries for compliance table display, including a joined
+  result + criterion query (one statement instead of one criterion lookup
+  per result)
 - Stale marking functionality (when criteria change)
+- Batched writes (create_many/upsert_many) in a single transaction
+- Idempotent saving of evaluation results by their natural key
+  (upsert_by_key), rewriting only rows whose values changed
+- Replacing a stage's results with a new evaluation (replace_stage_results):
+  the same upsert plus removal of results the evaluation no longer produced
+- Aggregate pass/fail/stale counts per measurement, stage or criterion
+  (get_summaries) computed in SQL
 
 Test results are generated during compliance evaluation and linked to both
 measurements and criteria. Results can be marked as stale when criteria
 are updated, indicating they need recalculation.
 """
 
+import json
 import sqlite3
-from typing import List, Optional
+from typing import Iterable, List, Optional, Sequence, Tuple
 from uuid import UUID
 
-from ..models.test_result import TestResult
+from ..models.test_result import TestResult, ResultSummary
+from ..models.test_criteria import TestCriteria
 from ..exceptions import DatabaseError
 from .base import IRepository
+from .hydration import construct_trusted, uuid_from_db
+
+
+# Shared INSERT statement for single and batched creates
+_INSERT_SQL = """
+    INSERT INTO test_results (
+        id, measurement_id, test_criteria_id,
+        measured_value, passed, s_parameter, is_stale,
+        measured_min, measured_max, worst_frequency,
+        margin, guard_band_percent
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Insert, or update the row with the same natural key (idx_test_results_key)
+# only if something changed. The conflict target must repeat the index
+# expressions, including IFNULL(s_parameter, '').
+_UPSERT_BY_KEY_SQL = _INSERT_SQL + """
+    ON CONFLICT(measurement_id, test_criteria_id, IFNULL(s_parameter, '')) DO UPDATE SET
+        measured_value = excluded.measured_value,
+        passed = excluded.passed,
+        is_stale = excluded.is_stale,
+        measured_min = excluded.measured_min,
+        measured_max = excluded.measured_max,
+        worst_frequency = excluded.worst_frequency,
+        margin = excluded.margin,
+        guard_band_percent = excluded.guard_band_percent
+    WHERE measured_value IS NOT excluded.measured_value
+       OR passed IS NOT excluded.passed
+       OR is_stale IS NOT excluded.is_stale
+       OR measured_min IS NOT excluded.measured_min
+       OR measured_max IS NOT excluded.measured_max
+       OR worst_frequency IS NOT excluded.worst_frequency
+       OR margin IS NOT excluded.margin
+       OR guard_band_percent IS NOT excluded.guard_band_percent
+"""
+
+# Results joined with their criterion. Criterion columns that clash with
+# test_results columns (id, created_at) are not selected - the criterion ID
+# is test_criteria_id.
+_SELECT_WITH_CRITERIA_SQL = """
+    SELECT
+        r.id, r.measurement_id, r.test_criteria_id,
+        r.measured_value, r.passed, r.s_parameter, r.is_stale,
+        r.measured_min, r.measured_max, r.worst_frequency,
+        r.margin, r.guard_band_percent,
+        c.device_id, c.test_type, c.test_stage, c.requirement_name,
+        c.criteria_type, c.min_value, c.max_value, c.unit,
+        c.frequency_min, c.frequency_max
+    FROM test_results r
+    JOIN test_criteria c ON c.id = r.test_criteria_id
+    WHERE r.measurement_id IN (SELECT value FROM json_each(?))
+"""
+
+
+# Grouping levels of get_summaries: GROUP BY columns and the criterion
+# columns reported for each level
+_SUMMARY_GROUPS = {
+    "measurement": ("r.measurement_id", "NULL", "NULL"),
+    "stage": ("r.measurement_id, c.test_stage", "c.test_stage", "NULL"),
+    "criterion": ("r.measurement_id, r.test_criteria_id", "c.test_stage", "r.test_criteria_id"),
+}
 
 
 class TestResultRepository(IRepository[TestResult]):
@@ -156,6 +228,124 @@ class TestResultRepository(IRepository[TestResult]):
         
         return [self._row_to_result(row) for row in rows]
     
+    def get_with_criteria(
+        self,
+        measurement_ids: Iterable[UUID],
+        test_stage: Optional[str] = None,
+        include_stale: bool = False
+    ) -> List[Tuple[TestResult, TestCriteria]]:
+        """
+        Get test results joined with their criteria in a single query.
+        
+        Primary query for compliance display: each result comes with the
+        requirement name, limits, unit and test stage of its criterion, so
+        callers never look criteria up one result at a time.
+        
+        Args:
+            measurement_ids: UUIDs of the measurements
+            test_stage: Optional test stage filter (criterion's test_stage)
+            include_stale: If False (default), stale results are excluded
+            
+        Returns:
+            List of (TestResult, TestCriteria) tuples, ordered like
+            get_by_measurement_id (newest first)
+            Empty list if no results found
+        """
+        ids = [str(measurement_id) for measurement_id in measurement_ids]
+        if not ids:
+            return []
+        
+        sql = _SELECT_WITH_CRITERIA_SQL
+        # IDs are passed as one JSON array parameter (any number of measurements)
+        params: list = [json.dumps(ids)]
+        if test_stage is not None:
+            sql += " AND c.test_stage = ?"
+            params.append(test_stage)
+        if not include_stale:
+            sql += " AND r.is_stale = 0"
+        sql += " ORDER BY r.created_at DESC"
+        
+        cursor = self.conn.cursor()
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+        
+        return [(self._row_to_result(row), self._row_to_criteria(row)) for row in rows]
+    
+    def get_summaries(
+        self,
+        measurement_ids: Optional[Iterable[UUID]] = None,
+        device_id: Optional[UUID] = None,
+        test_stage: Optional[str] = None,
+        group_by: str = "measurement"
+    ) -> List[ResultSummary]:
+        """
+        Get aggregated pass/fail/stale counts in a single query.
+        
+        Counting happens in SQL (GROUP BY), so no TestResult objects are
+        built however many results exist. Results are selected either by
+        measurement IDs or by device (all results of the device's criteria).
+        
+        Args:
+            measurement_ids: UUIDs of the measurements to summarize
+            device_id: Summarize every measurement of this device instead
+            test_stage: Optional test stage filter (criterion's test_stage)
+            group_by: "measurement", "stage" (measurement + test stage) or
+                     "criterion" (measurement + criterion)
+            
+        Returns:
+            List of ResultSummary objects, one per group that has results
+            (measurements without results are absent)
+            
+        Raises:
+            ValueError: If group_by is unknown, or not exactly one of
+                       measurement_ids and device_id is given
+        """
+        if group_by not in _SUMMARY_GROUPS:
+            raise ValueError(f"Unknown summary grouping: {group_by}")
+        if (measurement_ids is None) == (device_id is None):
+            raise ValueError("Specify either measurement_ids or device_id")
+        group_columns, stage_column, criteria_column = _SUMMARY_GROUPS[group_by]
+        
+        if measurement_ids is not None:
+            ids = [str(measurement_id) for measurement_id in measurement_ids]
+            if not ids:
+                return []
+            where = "r.measurement_id IN (SELECT value FROM json_each(?))"
+            params: list = [json.dumps(ids)]
+        else:
+            # Device scope goes through its criteria (idx_test_criteria_device,
+            # then idx_test_results_criteria) - no join with measurements
+            where = "c.device_id = ?"
+            params = [str(device_id)]
+        if test_stage is not None:
+            where += " AND c.test_stage = ?"
+            params.append(test_stage)
+        
+        cursor = self.conn.cursor()
+        cursor.row_factory = None  # Plain tuples
+        cursor.execute(
+            f"""
+            SELECT r.measurement_id, {stage_column}, {criteria_column},
+                   COUNT(*), SUM(r.passed), SUM(r.is_stale)
+            FROM test_results r
+            JOIN test_criteria c ON c.id = r.test_criteria_id
+            WHERE {where}
+            GROUP BY {group_columns}
+            """,
+            params
+        )
+        return [
+            ResultSummary(
+                measurement_id=UUID(measurement_id),
+                test_stage=stage,
+                test_criteria_id=UUID(criteria_id) if criteria_id else None,
+                total=total,
+                passed=passed,
+                stale=stale
+            )
+            for measurement_id, stage, criteria_id, total, passed, stale in cursor.fetchall()
+        ]
+    
     def create(self, result: TestResult) -> TestResult:
         """
         Create a new test result.
@@ -171,29 +361,219 @@ class TestResultRepository(IRepository[TestResult]):
         """
         try:
             cursor = self.conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO test_results (
-                    id, measurement_id, test_criteria_id,
-                    measured_value, passed, s_parameter, is_stale
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    str(result.id),
-                    str(result.measurement_id),
-                    str(result.test_criteria_id),
-                    result.measured_value,
-                    1 if result.passed else 0,  # bool -> INTEGER
-                    result.s_parameter,
-                    1 if result.is_stale else 0  # bool -> INTEGER
-                )
-            )
+            cursor.execute(_INSERT_SQL, self._result_to_params(result))
             self.conn.commit()
             return result
         except sqlite3.Error as e:
             self.conn.rollback()
             raise DatabaseError(f"Failed to create test result: {e}") from e
     
+    def create_many(self, results: Sequence[TestResult]) -> List[TestResult]:
+        """
+        Create many test results in a single transaction.
+        
+        Uses executemany and commits once, so saving the results of a whole
+        evaluation costs one fsync instead of one per result. Either all
+        results are stored or none are.
+        
+        Args:
+            results: TestResult objects to create
+            
+        Returns:
+            The created TestResult objects (same objects, unchanged)
+            
+        Raises:
+            DatabaseError: If any insertion fails (nothing is stored)
+        """
+        results = list(results)
+        if not results:
+            return results
+        try:
+            cursor = self.conn.cursor()
+            cursor.executemany(_INSERT_SQL, [self._result_to_params(r) for r in results])
+            self.conn.commit()
+            return results
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            raise DatabaseError(f"Failed to create test results: {e}") from e
+    
+    def upsert_many(self, results: Sequence[TestResult]) -> List[TestResult]:
+        """
+        Insert or update many test results (by ID) in a single transaction.
+        
+        Existing rows with the same ID are overwritten; new IDs are inserted.
+        Uses executemany and commits once.
+        
+        Args:
+            results: TestResult objects to insert or update
+            
+        Returns:
+            The stored TestResult objects (same objects, unchanged)
+            
+        Raises:
+            DatabaseError: If any write fails (nothing is stored)
+        """
+        results = list(results)
+        if not results:
+            return results
+        try:
+            cursor = self.conn.cursor()
+            cursor.executemany(
+                _INSERT_SQL + """
+                ON CONFLICT(id) DO UPDATE SET
+                    measured_value = excluded.measured_value,
+                    passed = excluded.passed,
+                    s_parameter = excluded.s_parameter,
+                    is_stale = excluded.is_stale,
+                    measured_min = excluded.measured_min,
+                    measured_max = excluded.measured_max,
+                    worst_frequency = excluded.worst_frequency,
+                    margin = excluded.margin,
+                    guard_band_percent = excluded.guard_band_percent
+                """,
+                [self._result_to_params(r) for r in results]
+            )
+            self.conn.commit()
+            return results
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            raise DatabaseError(f"Failed to upsert test results: {e}") from e
+
+    def upsert_by_key(self, results: Sequence[TestResult]) -> int:
+        """
+        Store evaluation results by their natural key in a single transaction.
+
+        A result is identified by (measurement_id, test_criteria_id,
+        s_parameter) - the unique key of test_results. New keys are
+        inserted. Existing rows are updated only if the value, verdict,
+        staleness or a secondary value changed; identical rows are left
+        untouched (no page writes). Re-running an evaluation is therefore
+        idempotent and needs no delete step.
+
+        Existing rows keep their ID. The ID of each passed-in TestResult is
+        set to the stored row's ID, so callers hold the persisted identity.
+
+        Args:
+            results: TestResult objects from an evaluation
+
+        Returns:
+            Number of rows inserted or changed
+
+        Raises:
+            DatabaseError: If any write fails (nothing is stored)
+        """
+        results = list(results)
+        if not results:
+            return 0
+        params = [self._result_to_params(r) for r in results]
+        try:
+            cursor = self.conn.cursor()
+            cursor.executemany(_UPSERT_BY_KEY_SQL, params)
+            written = cursor.rowcount
+            self.conn.commit()
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            raise DatabaseError(f"Failed to save test results: {e}") from e
+        
+        self._adopt_stored_ids(results, params)
+        return written
+
+    def replace_stage_results(
+        self,
+        measurement_ids: Iterable[UUID],
+        test_stage: str,
+        results: Sequence[TestResult]
+    ) -> int:
+        """
+        Replace a stage's results of measurements with a new evaluation.
+
+        The results are stored like upsert_by_key (unchanged rows are not
+        rewritten). Afterwards, every result of these measurements for the
+        stage's criteria whose key was not written is deleted - results the
+        evaluation no longer produces (e.g., a port that was removed from
+        the device, or a deleted S-parameter). Upsert and delete run in one
+        transaction, so readers never see a partial replacement.
+
+        Args:
+            measurement_ids: UUIDs of the evaluated measurements (including
+                             measurements whose evaluation produced nothing)
+            test_stage: Test stage of the evaluated criteria
+            results: TestResult objects from the evaluation
+
+        Returns:
+            Number of rows inserted, changed or deleted
+
+        Raises:
+            DatabaseError: If any write fails (nothing is changed)
+        """
+        results = list(results)
+        ids = [str(measurement_id) for measurement_id in measurement_ids]
+        params = [self._result_to_params(r) for r in results]
+        # Natural keys written by this evaluation, as (measurement, criterion, s_parameter)
+        keys = [[p[1], p[2], p[5] or ""] for p in params]
+        try:
+            cursor = self.conn.cursor()
+            written = 0
+            if params:
+                cursor.executemany(_UPSERT_BY_KEY_SQL, params)
+                written = cursor.rowcount
+            if ids:
+                # Results are found through the measurement index; each one's
+                # criterion is checked by primary key (correlated EXISTS)
+                cursor.execute(
+                    """
+                    DELETE FROM test_results
+                    WHERE measurement_id IN (SELECT value FROM json_each(?))
+                      AND EXISTS (
+                          SELECT 1 FROM test_criteria c
+                          WHERE c.id = test_results.test_criteria_id
+                            AND c.test_stage = ?
+                      )
+                      AND NOT EXISTS (
+                          SELECT 1 FROM json_each(?) k
+                          WHERE json_extract(k.value, '$[0]') = test_results.measurement_id
+                            AND json_extract(k.value, '$[1]') = test_results.test_criteria_id
+                            AND json_extract(k.value, '$[2]') = IFNULL(test_results.s_parameter, '')
+                      )
+                    """,
+                    (json.dumps(ids), test_stage, json.dumps(keys))
+                )
+                written += cursor.rowcount
+            self.conn.commit()
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            raise DatabaseError(f"Failed to replace test results: {e}") from e
+        
+        if results:
+            self._adopt_stored_ids(results, params)
+        return written
+
+    def _adopt_stored_ids(self, results: List[TestResult], params: List[tuple]) -> None:
+        """
+        Set the ID of each result to the ID of its stored row.
+
+        Args:
+            results: Results just stored by their natural key
+            params: Their _result_to_params tuples (same order)
+        """
+        # Adopt the IDs of rows that already existed (one indexed query).
+        # Keys and IDs are compared as the strings already built for the
+        # INSERT; only results whose stored ID differs get a new UUID.
+        cursor = self.conn.cursor()
+        cursor.row_factory = None  # Plain tuples - no column lookup by name
+        cursor.execute(
+            """
+            SELECT measurement_id, test_criteria_id, s_parameter, id FROM test_results
+            WHERE measurement_id IN (SELECT value FROM json_each(?))
+            """,
+            (json.dumps(list({p[1] for p in params})),)
+        )
+        stored_ids = {row[:3]: row[3] for row in cursor.fetchall()}
+        for result, p in zip(results, params):
+            stored_id = stored_ids[(p[1], p[2], p[5])]
+            if stored_id != p[0]:
+                result.id = UUID(stored_id)
+
     def update(self, result: TestResult) -> TestResult:
         """
         Update an existing test result.
@@ -215,7 +595,12 @@ class TestResultRepository(IRepository[TestResult]):
                     measured_value = ?,
                     passed = ?,
                     s_parameter = ?,
-                    is_stale = ?
+                    is_stale = ?,
+                    measured_min = ?,
+                    measured_max = ?,
+                    worst_frequency = ?,
+                    margin = ?,
+                    guard_band_percent = ?
                 WHERE id = ?
                 """,
                 (
@@ -223,6 +608,11 @@ class TestResultRepository(IRepository[TestResult]):
                     1 if result.passed else 0,
                     result.s_parameter,
                     1 if result.is_stale else 0,
+                    result.measured_min,
+                    result.measured_max,
+                    result.worst_frequency,
+                    result.margin,
+                    result.guard_band_percent,
                     str(result.id)
                 )
             )
@@ -334,6 +724,114 @@ class TestResultRepository(IRepository[TestResult]):
         except sqlite3.Error as e:
             self.conn.rollback()
             raise DatabaseError(f"Failed to delete test results: {e}") from e
+
+    def delete_by_measurements_and_stage(
+        self,
+        measurement_ids: Iterable[UUID],
+        test_stage: str
+    ) -> int:
+        """
+        Delete all results of measurements for one test stage.
+
+        A result belongs to the stage of its criterion. Stale and current
+        results are both deleted. Runs as a single DELETE statement with one
+        commit, however many measurements and results are affected.
+
+        Args:
+            measurement_ids: UUIDs of the measurements
+            test_stage: Test stage whose results should be removed
+
+        Returns:
+            Number of results deleted
+
+        Raises:
+            DatabaseError: If deletion fails
+        """
+        ids = [str(measurement_id) for measurement_id in measurement_ids]
+        if not ids:
+            return 0
+        try:
+            cursor = self.conn.cursor()
+            # Results are found through the measurement index; each one's
+            # criterion is checked by primary key (correlated EXISTS)
+            cursor.execute(
+                """
+                DELETE FROM test_results
+                WHERE measurement_id IN (SELECT value FROM json_each(?))
+                  AND EXISTS (
+                      SELECT 1 FROM test_criteria c
+                      WHERE c.id = test_results.test_criteria_id
+                        AND c.test_stage = ?
+                  )
+                """,
+                (json.dumps(ids), test_stage)
+            )
+            count = cursor.rowcount
+            self.conn.commit()
+            return count
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            raise DatabaseError(f"Failed to delete test results: {e}") from e
+
+    def delete_stale(self, measurement_ids: Iterable[UUID]) -> int:
+        """
+        Delete stale results of measurements.
+
+        Runs as a single DELETE statement with one commit.
+
+        Args:
+            measurement_ids: UUIDs of the measurements
+
+        Returns:
+            Number of results deleted
+
+        Raises:
+            DatabaseError: If deletion fails
+        """
+        ids = [str(measurement_id) for measurement_id in measurement_ids]
+        if not ids:
+            return 0
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                """
+                DELETE FROM test_results
+                WHERE measurement_id IN (SELECT value FROM json_each(?))
+                  AND is_stale = 1
+                """,
+                (json.dumps(ids),)
+            )
+            count = cursor.rowcount
+            self.conn.commit()
+            return count
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            raise DatabaseError(f"Failed to delete stale test results: {e}") from e
+
+    def _result_to_params(self, result: TestResult) -> tuple:
+        """
+        Convert TestResult to INSERT parameters (column order of _INSERT_SQL).
+        
+        Args:
+            result: TestResult object
+            
+        Returns:
+            Tuple of SQL parameters
+        """
+        return (
+            str(result.id),
+            str(result.measurement_id),
+            str(result.test_criteria_id),
+            result.measured_value,
+            1 if result.passed else 0,  # bool -> INTEGER
+            result.s_parameter,
+            1 if result.is_stale else 0,  # bool -> INTEGER
+            result.measured_min,
+            result.measured_max,
+            result.worst_frequency,
+            result.margin,
+            result.guard_band_percent
+        )
     
     def _row_to_result(self, row: sqlite3.Row) -> TestResult:
         """
@@ -343,29 +841,53 @@ class TestResultRepository(IRepository[TestResult]):
         - TEXT -> UUID (for id, measurement_id, criteria_id)
         - INTEGER -> bool (for passed and is_stale)
         
+        The row was validated when it was written, so the model is built
+        with construct_trusted (no re-validation).
+        
         Args:
             row: SQLite Row object
             
         Returns:
             TestResult object populated from row data
         """
-        return TestResult(
+        return construct_trusted(
+            TestResult,
             id=UUID(row["id"]),
-            measurement_id=UUID(row["measurement_id"]),
-            test_criteria_id=UUID(row["test_criteria_id"]),
+            measurement_id=uuid_from_db(row["measurement_id"]),
+            test_criteria_id=uuid_from_db(row["test_criteria_id"]),
             measured_value=row["measured_value"],  # Can be None
             passed=bool(row["passed"]),  # INTEGER -> bool
             s_parameter=row["s_parameter"],  # Can be None
-            is_stale=bool(row["is_stale"])  # INTEGER -> bool
+            is_stale=bool(row["is_stale"]),  # INTEGER -> bool
+            measured_min=row["measured_min"],  # Can be None
+            measured_max=row["measured_max"],  # Can be None
+            worst_frequency=row["worst_frequency"],  # Can be None
+            margin=row["margin"],  # Can be None
+            guard_band_percent=row["guard_band_percent"]  # Can be None
+        )
+    
+    def _row_to_criteria(self, row: sqlite3.Row) -> TestCriteria:
+        """
+        Convert the criterion columns of a joined row to TestCriteria.
+        
+        Args:
+            row: SQLite Row object from _SELECT_WITH_CRITERIA_SQL
+            
+        Returns:
+            TestCriteria object populated from row data (trusted, not
+            re-validated)
+        """
+        return construct_trusted(
+            TestCriteria,
+            id=uuid_from_db(row["test_criteria_id"]),
+            device_id=uuid_from_db(row["device_id"]),
+            test_type=row["test_type"],
+            test_stage=row["test_stage"],
+            requirement_name=row["requirement_name"],
+            criteria_type=row["criteria_type"],
+            min_value=row["min_value"],  # Can be None
+            max_value=row["max_value"],  # Can be None
+            unit=row["unit"],
+            frequency_min=row["frequency_min"],  # Can be None
+            frequency_max=row["frequency_max"]   # Can be None
         )
-
-
-
-
-
-
-
-
-
-
-
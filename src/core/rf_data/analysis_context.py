@@ -0,0 +1,457 @@
+"""
+Per-measurement analysis contexts and their pool.
+
+One GUI refresh touches the RF data of a measurement several times:
+compliance evaluation computes band metrics, the plot window band-limits
+the network for every plot and looks up the port count. Each of these used
+to resolve measurement.touchstone_data on its own - decoding the stored
+BLOB (or LazyNetwork proxy) and band-filtering the network again.
+
+An AnalysisContext holds everything derived from one measurement's RF
+data: the decoded network, band-limited networks (plots), band samples
+(dB and VSWR per band) and the band metrics reduced from them
+(compliance). AnalysisContextPool keeps contexts keyed by (measurement ID,
+content hash) with LRU eviction, so every consumer of a measurement shares
+one decode and one band-limit per band. The pool is bounded by the bytes
+of the arrays its contexts hold (and by a context count), so a few very
+large networks cannot grow it without limit.
+
+Contexts and everything they return are shared - callers must not modify
+the networks or arrays.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Try to import scikit-rf - handle gracefully if not installed
+try:
+    from skrf import Network
+except ImportError:
+    Network = Any
+
+from ..models.measurement import Measurement
+from .s_parameter_calculator import BandSamples, SParameterCalculator
+from .touchstone_loader import TouchstoneLoader
+
+# Frequency band key (freq_min, freq_max) in GHz
+Band = Tuple[float, float]
+
+# Contexts kept by an AnalysisContextPool by default - a few sessions of
+# PRI/RED x AMB/HOT/COLD measurements
+DEFAULT_MAX_CONTEXTS = 32
+
+# Array bytes kept by an AnalysisContextPool by default - far more than 32
+# 4-port sweeps of a few thousand points, far less than 32 dense 16-port ones
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+@dataclass
+class AnalysisPoolStats:
+    """
+    Counters of an AnalysisContextPool.
+
+    Attributes:
+        hits: Lookups served by an existing context
+        misses: Lookups that created a context
+        evictions: Contexts dropped to stay within the size limits
+        decodes: Networks resolved from touchstone_data
+        nbytes: Array bytes held by the pooled contexts
+    """
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    decodes: int = 0
+    nbytes: int = 0
+
+    @property
+    def lookups(self) -> int:
+        """Total number of lookups."""
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups served by an existing context (0.0 if none yet)."""
+        return self.hits / self.lookups if self.lookups else 0.0
+
+
+def _arrays_nbytes(*arrays: np.ndarray) -> int:
+    """
+    Bytes of numpy arrays (0 for anything else, e.g. a missing z0).
+
+    Args:
+        *arrays: Arrays to count
+
+    Returns:
+        Sum of their nbytes
+    """
+    return sum(array.nbytes for array in arrays if isinstance(array, np.ndarray))
+
+
+def _network_nbytes(network: Network) -> int:
+    """
+    Bytes of a network's frequency, S-matrix and reference impedance arrays.
+
+    Args:
+        network: scikit-rf Network
+
+    Returns:
+        Array bytes held by the network
+    """
+    return _arrays_nbytes(network.f, network.s, network.z0)
+
+
+class AnalysisContext:
+    """
+    Decoded RF data of one measurement and everything derived from it.
+
+    The network is resolved on first use; band-limited networks, band
+    samples and band metrics are computed on first request per band.
+    Every addition is reported to the pool (nbytes), which evicts least
+    recently used contexts to stay within its byte limit.
+    """
+
+    def __init__(
+        self,
+        touchstone_data: Any,
+        pool: "AnalysisContextPool",
+        key: Hashable = None
+    ):
+        """
+        Initialize an undecoded context.
+
+        Args:
+            touchstone_data: Network object, encoded bytes, or LazyNetwork proxy
+            pool: Pool the context belongs to (loader, calculator, counters)
+            key: Key of the context in the pool (size accounting)
+        """
+        self._source = touchstone_data
+        self._pool = pool
+        self._key = key
+        self._lock = threading.RLock()
+        self._network: Optional[Network] = None
+        self._band_networks: Dict[Band, Network] = {}
+        self._band_samples: Dict[Band, BandSamples] = {}
+        self._band_metrics: Dict[Band, Dict[str, np.ndarray]] = {}
+        self._nbytes = 0
+
+    @property
+    def nbytes(self) -> int:
+        """Array bytes held by the context (network, band views, samples, metrics)."""
+        return self._nbytes
+
+    def _grow(self, nbytes: int) -> None:
+        """
+        Account for arrays added to the context (call with the lock held).
+
+        Args:
+            nbytes: Bytes added
+        """
+        self._nbytes += nbytes
+        self._pool._resize(self._key, self, nbytes)
+
+    @property
+    def is_decoded(self) -> bool:
+        """Whether the network has already been resolved."""
+        return self._network is not None
+
+    @property
+    def network(self) -> Network:
+        """
+        The measurement's network, resolved on first access.
+
+        Returns:
+            scikit-rf Network object (shared - do not modify)
+
+        Raises:
+            FileLoadError: If the RF data is missing or cannot be decoded
+                           (not cached - the next access tries again)
+        """
+        with self._lock:
+            if self._network is None:
+                self._network = self._pool.loader.resolve_network(self._source)
+                # Drop the source (a BLOB or a proxy holding a connection)
+                self._source = None
+                self._pool._count_decode()
+                self._grow(_network_nbytes(self._network))
+            return self._network
+
+    def rebind_source(self, touchstone_data: Any) -> None:
+        """
+        Replace the RF data an undecoded context will resolve.
+
+        LazyNetwork proxies must be loaded on the thread that owns their
+        connection, so the pool hands each caller's own touchstone_data to
+        a context that has not been decoded yet. No effect once decoded.
+
+        Args:
+            touchstone_data: Network object, encoded bytes, or LazyNetwork proxy
+        """
+        with self._lock:
+            if self._network is None and touchstone_data is not None:
+                self._source = touchstone_data
+
+    def band_network(self, freq_min: float, freq_max: float) -> Network:
+        """
+        The network band-limited to a frequency range (with interpolated edges).
+
+        Args:
+            freq_min: Minimum frequency in GHz
+            freq_max: Maximum frequency in GHz
+
+        Returns:
+            Band-limited Network, see SParameterCalculator.filter_frequency_range
+            (shared - do not modify)
+        """
+        band = (freq_min, freq_max)
+        with self._lock:
+            band_network = self._band_networks.get(band)
+            if band_network is None:
+                band_network = self._pool.calculator.filter_frequency_range(
+                    self.network, freq_min, freq_max
+                )
+                self._band_networks[band] = band_network
+                self._grow(_network_nbytes(band_network))
+            return band_network
+
+    def band_samples(self, bands: Sequence[Band]) -> Dict[Band, BandSamples]:
+        """
+        dB and VSWR samples of several bands, computing only the missing ones.
+
+        Missing bands share one dB conversion of the sweep
+        (SParameterCalculator.calculate_band_samples).
+
+        Args:
+            bands: (freq_min, freq_max) bands in GHz
+
+        Returns:
+            Dictionary mapping band -> BandSamples (shared - do not modify)
+        """
+        with self._lock:
+            missing = [band for band in dict.fromkeys(bands) if band not in self._band_samples]
+            if missing:
+                computed = self._pool.calculator.calculate_band_samples(self.network, missing)
+                self._band_samples.update(computed)
+                self._grow(sum(
+                    _arrays_nbytes(samples.frequency_hz, samples.s_db, samples.vswr)
+                    for samples in computed.values()
+                ))
+            return {band: self._band_samples[band] for band in bands}
+
+    def band_metrics(self, bands: Sequence[Band]) -> Dict[Band, Dict[str, np.ndarray]]:
+        """
+        Band metric arrays of several bands, computing only the missing ones.
+
+        Missing bands are reduced from their band samples, which are kept
+        as well (equal to SParameterCalculator.calculate_multi_band_metrics).
+
+        Args:
+            bands: (freq_min, freq_max) bands in GHz
+
+        Returns:
+            Dictionary mapping band -> calculate_band_metrics result, in the
+            order of bands (arrays shared - do not modify)
+        """
+        with self._lock:
+            missing = [band for band in dict.fromkeys(bands) if band not in self._band_metrics]
+            for band, samples in self.band_samples(missing).items():
+                arrays = self._pool.calculator.reduce_band_samples(samples)
+                self._band_metrics[band] = arrays
+                self._grow(_arrays_nbytes(*arrays.values()))
+            return {band: self._band_metrics[band] for band in bands}
+
+    def store_band_metrics(
+        self,
+        band: Band,
+        arrays: Dict[str, np.ndarray],
+        samples: Optional[BandSamples] = None
+    ) -> None:
+        """
+        Record band metrics computed elsewhere (e.g. for a stack of networks).
+
+        The arrays are copied, so the context does not keep the arrays of
+        a whole stack alive through views of one row.
+
+        Args:
+            band: (freq_min, freq_max) in GHz
+            arrays: calculate_band_metrics result of this measurement
+            samples: Band samples the metrics were reduced from, None if
+                     not available
+        """
+        with self._lock:
+            arrays = {key: np.array(values) for key, values in arrays.items()}
+            self._band_metrics[band] = arrays
+            added = _arrays_nbytes(*arrays.values())
+            if samples is not None:
+                samples = BandSamples(
+                    np.array(samples.frequency_hz), np.array(samples.s_db), np.array(samples.vswr)
+                )
+                self._band_samples[band] = samples
+                added += _arrays_nbytes(samples.frequency_hz, samples.s_db, samples.vswr)
+            self._grow(added)
+
+
+class AnalysisContextPool:
+    """
+    Thread-safe LRU pool of analysis contexts keyed by measurement.
+
+    The key is (measurement ID, content hash): measurements whose RF data
+    is replaced get a new hash and therefore a fresh context.
+
+    The pool is bounded by the array bytes of its contexts (AnalysisContext.nbytes)
+    and by their number. Contexts report every array they add; when a
+    limit is exceeded, least recently used contexts are dropped. The most
+    recently used context is always kept, even if it alone exceeds
+    max_bytes - its caller is using it. Dropped contexts stay valid for
+    callers still holding them; their memory is freed once released.
+    """
+
+    def __init__(
+        self,
+        max_contexts: int = DEFAULT_MAX_CONTEXTS,
+        loader: Optional[TouchstoneLoader] = None,
+        calculator: Optional[SParameterCalculator] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        """
+        Initialize an empty pool.
+
+        Args:
+            max_contexts: Maximum number of contexts kept (least recently
+                          used contexts are evicted first)
+            loader: Loader resolving touchstone_data (default TouchstoneLoader())
+            calculator: Calculator for band-limiting and band metrics
+                        (default SParameterCalculator())
+            max_bytes: Maximum array bytes held by the pooled contexts
+
+        Raises:
+            ValueError: If max_contexts is less than 1 or max_bytes is negative
+        """
+        if max_contexts < 1:
+            raise ValueError(f"max_contexts must be at least 1, got {max_contexts}")
+        if max_bytes < 0:
+            raise ValueError(f"max_bytes must not be negative, got {max_bytes}")
+        self.max_contexts = max_contexts
+        self.max_bytes = max_bytes
+        self.loader = loader if loader is not None else TouchstoneLoader()
+        self.calculator = calculator if calculator is not None else SParameterCalculator()
+        self._lock = threading.Lock()
+        self._contexts: "OrderedDict[Hashable, AnalysisContext]" = OrderedDict()
+        # Bytes accounted per pooled context, and their total
+        self._sizes: Dict[Hashable, int] = {}
+        self._nbytes = 0
+        self._stats = AnalysisPoolStats()
+
+    def get(self, measurement: Measurement) -> AnalysisContext:
+        """
+        Get the context of a measurement, creating it on a miss.
+
+        Args:
+            measurement: Measurement containing touchstone_data
+
+        Returns:
+            AnalysisContext (shared by every caller of the measurement)
+        """
+        key = (measurement.id, measurement.content_hash)
+        with self._lock:
+            context = self._contexts.get(key)
+            if context is not None:
+                self._contexts.move_to_end(key)
+                self._stats.hits += 1
+            else:
+                self._stats.misses += 1
+                context = AnalysisContext(measurement.touchstone_data, self, key)
+                self._contexts[key] = context
+                self._sizes[key] = 0
+                self._evict()
+                return context
+        # Existing context - decode (if still needed) from the caller's data
+        context.rebind_source(measurement.touchstone_data)
+        return context
+
+    def stats(self) -> AnalysisPoolStats:
+        """
+        Get a snapshot of the counters.
+
+        Returns:
+            AnalysisPoolStats copy (not updated by later lookups)
+        """
+        with self._lock:
+            return AnalysisPoolStats(
+                self._stats.hits, self._stats.misses, self._stats.evictions,
+                self._stats.decodes, self._nbytes
+            )
+
+    def reset_stats(self) -> None:
+        """Reset the counters (the contexts are kept)."""
+        with self._lock:
+            self._stats = AnalysisPoolStats()
+
+    def clear(self) -> None:
+        """Drop every context (counters are kept)."""
+        with self._lock:
+            self._contexts.clear()
+            self._sizes.clear()
+            self._nbytes = 0
+
+    @property
+    def nbytes(self) -> int:
+        """Array bytes held by the pooled contexts."""
+        with self._lock:
+            return self._nbytes
+
+    def __len__(self) -> int:
+        """Number of pooled contexts."""
+        with self._lock:
+            return len(self._contexts)
+
+    def _count_decode(self) -> None:
+        """Count one network decode (called by contexts)."""
+        with self._lock:
+            self._stats.decodes += 1
+
+    def _resize(self, key: Hashable, context: AnalysisContext, nbytes: int) -> None:
+        """
+        Account for arrays added to a context and evict to stay within max_bytes.
+
+        Called by contexts. Contexts already evicted are not counted.
+
+        Args:
+            key: Key of the context
+            context: The context that grew
+            nbytes: Bytes added
+        """
+        with self._lock:
+            if self._contexts.get(key) is not context:
+                return
+            self._sizes[key] += nbytes
+            self._nbytes += nbytes
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used contexts until both limits hold (lock held)."""
+        while len(self._contexts) > 1 and (
+            len(self._contexts) > self.max_contexts or self._nbytes > self.max_bytes
+        ):
+            key, _ = self._contexts.popitem(last=False)
+            self._nbytes -= self._sizes.pop(key)
+            self._stats.evictions += 1
+
+
+# Process-wide pool shared by compliance evaluation and plotting, so one
+# refresh decodes each measurement once
+_SHARED_ANALYSIS_POOL = AnalysisContextPool()
+
+
+def shared_analysis_pool() -> AnalysisContextPool:
+    """
+    Get the process-wide analysis context pool.
+
+    Returns:
+        AnalysisContextPool used by default by SParametersTestType and
+        PlottingService
+    """
+    return _SHARED_ANALYSIS_POOL
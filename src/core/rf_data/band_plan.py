@@ -0,0 +1,373 @@
+"""
+Band index plans and their cache.
+
+Band-limiting a frequency sweep (SParameterCalculator.band_limit_arrays)
+needs the slice of interior samples and, for band edges that fall between
+two samples, the neighbouring indices and linear interpolation weights.
+These depend only on the frequency grid and the band - not on the
+S-parameter data - and almost every measurement of a device shares one
+grid and a handful of bands (operational, wideband, one per OOB
+criterion).
+
+A BandPlan holds that precomputed index information; applying it to a data
+array is a slice plus at most two interpolated samples. BandPlanCache
+keeps plans keyed by (grid fingerprint, band) with LRU eviction, so each
+grid/band combination is planned once per process.
+
+The grid fingerprint is the point count, first and last frequency and a
+hash of the raw frequency bytes: two grids share plans only if they are
+identical.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Hashable, Optional
+
+import numpy as np
+
+
+# Plans kept by a BandPlanCache by default - a few grids times a few bands
+DEFAULT_MAX_PLANS = 256
+
+
+@dataclass(frozen=True)
+class BandEdge:
+    """
+    One interpolated band-edge sample.
+
+    Attributes:
+        upper_index: Index of the first sample above the edge frequency
+        weight: Interpolation weight between upper_index - 1 and upper_index
+    """
+    upper_index: int
+    weight: float
+
+
+@dataclass(frozen=True)
+class BandPlan:
+    """
+    Precomputed band-limiting of one frequency grid to one band.
+
+    Attributes:
+        lo: First interior sample index
+        hi: One past the last interior sample index
+        frequency_hz: Band frequencies in Hz (read-only), including
+                      interpolated edges
+        left: Interpolated lower edge, None if on a measured point
+        right: Interpolated upper edge, None if on a measured point
+    """
+    lo: int
+    hi: int
+    frequency_hz: np.ndarray
+    left: Optional[BandEdge] = None
+    right: Optional[BandEdge] = None
+
+    @property
+    def is_slice(self) -> bool:
+        """True if the band is a plain slice of the grid (no interpolated edges)."""
+        return self.left is None and self.right is None
+
+    def apply(self, data: np.ndarray) -> np.ndarray:
+        """
+        Band-limit an array with frequency as its first axis.
+
+        Args:
+            data: Array on the plan's grid, e.g. S-matrix [f, n, n]
+
+        Returns:
+            Band-limited data; a view of the input if is_slice
+        """
+        return self.apply_derived(data, data)
+
+    def apply_derived(
+        self,
+        derived: np.ndarray,
+        data: np.ndarray,
+        derive: Optional[Callable[[np.ndarray], np.ndarray]] = None
+    ) -> np.ndarray:
+        """
+        Band-limit a quantity derived from data, computed over the whole sweep.
+
+        The interior samples are sliced from derived; the edge samples are
+        derive() of the interpolated data (e.g. dB of the interpolated
+        complex S-parameters, not interpolated dB). The result equals
+        derive(apply(data)), but derived is computed once per sweep and
+        shared by every band.
+
+        Args:
+            derived: derive(data), frequency as the first axis
+            data: Array on the plan's grid the quantity is derived from
+            derive: Elementwise (per frequency) derivation; None = identity
+
+        Returns:
+            Band-limited derived values; a view of derived if is_slice
+        """
+        interior = derived[self.lo:self.hi]
+        if self.is_slice:
+            return interior
+        parts = [interior]
+        if self.left is not None:
+            edge = _interpolate(data, self.left)
+            parts.insert(0, derive(edge) if derive is not None else edge)
+        if self.right is not None:
+            edge = _interpolate(data, self.right)
+            parts.append(derive(edge) if derive is not None else edge)
+        return np.concatenate(parts)
+
+    def band_frequencies(self, freq_hz: np.ndarray) -> np.ndarray:
+        """
+        Band frequencies in Hz (a view of freq_hz if is_slice).
+
+        Args:
+            freq_hz: The grid the plan was made for
+
+        Returns:
+            Frequencies matching apply() results
+        """
+        return freq_hz[self.lo:self.hi] if self.is_slice else self.frequency_hz
+
+
+@dataclass
+class BandPlanStats:
+    """
+    Lookup counters of a BandPlanCache.
+
+    Attributes:
+        hits: Lookups served from the cache
+        misses: Lookups that had to build a plan
+        evictions: Plans dropped to stay within the size limit
+    """
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def lookups(self) -> int:
+        """Total number of lookups."""
+        return self.hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups served from the cache (0.0 if none yet)."""
+        return self.hits / self.lookups if self.lookups else 0.0
+
+
+def grid_fingerprint(freq_hz: np.ndarray) -> Hashable:
+    """
+    Fingerprint of a frequency grid for cache keys.
+
+    Args:
+        freq_hz: Frequency array in Hz
+
+    Returns:
+        Hashable fingerprint; equal only for identical grids (up to a
+        64-bit hash collision of grids with equal size and end points)
+    """
+    if len(freq_hz) == 0:
+        return (0,)
+    return (
+        len(freq_hz),
+        float(freq_hz[0]),
+        float(freq_hz[-1]),
+        hash(np.ascontiguousarray(freq_hz, dtype=np.float64).tobytes()),
+    )
+
+
+def make_band_plan(freq_hz: np.ndarray, freq_min: float, freq_max: float) -> BandPlan:
+    """
+    Plan band-limiting of a frequency grid, including boundary points.
+
+    Boundary behavior:
+    - freq_min/freq_max are swapped if given in reverse order
+    - Boundaries are clamped to the measured sweep (no extrapolation)
+    - A boundary that falls exactly on a measured point is not duplicated
+
+    Args:
+        freq_hz: Frequency array in Hz (ascending)
+        freq_min: Minimum frequency in GHz
+        freq_max: Maximum frequency in GHz
+
+    Returns:
+        BandPlan for the grid and band
+    """
+    # Convert GHz to Hz (frequency arrays are in Hz)
+    freq_min_hz = freq_min * 1e9
+    freq_max_hz = freq_max * 1e9
+
+    n_points = len(freq_hz)
+    if n_points == 0:
+        return _read_only_plan(0, 0, freq_hz[:0])
+
+    # Ensure freq_min_hz <= freq_max_hz
+    if freq_min_hz > freq_max_hz:
+        freq_min_hz, freq_max_hz = freq_max_hz, freq_min_hz
+
+    # Clamp desired boundaries to network domain (no extrapolation)
+    target_min = float(np.clip(freq_min_hz, freq_hz[0], freq_hz[-1]))
+    target_max = float(np.clip(freq_max_hz, freq_hz[0], freq_hz[-1]))
+
+    # Interior samples: lo is the first index >= target_min,
+    # hi is one past the last index <= target_max
+    lo = int(np.searchsorted(freq_hz, target_min, side="left"))
+    hi = int(np.searchsorted(freq_hz, target_max, side="right"))
+
+    # Left edge: only needed if target_min falls between two samples
+    # (clamping guarantees lo >= 1 in that case)
+    left = None
+    if lo >= n_points or freq_hz[lo] != target_min:
+        left = _edge(freq_hz, lo, target_min)
+
+    # Right edge: only needed if target_max falls between two samples
+    # (clamping guarantees hi < n_points in that case). A collapsed band
+    # (target_min == target_max) is a single point, already added above.
+    right = None
+    if freq_hz[hi - 1] != target_max and target_max != target_min:
+        right = _edge(freq_hz, hi, target_max)
+
+    f_parts = [freq_hz[lo:hi]]
+    if left is not None:
+        f_parts.insert(0, np.array([target_min]))
+    if right is not None:
+        f_parts.append(np.array([target_max]))
+    return _read_only_plan(lo, hi, np.concatenate(f_parts), left, right)
+
+
+class BandPlanCache:
+    """
+    Thread-safe LRU cache of band plans keyed by (grid fingerprint, band).
+
+    Plans are immutable and shared by all callers.
+    """
+
+    def __init__(self, max_plans: int = DEFAULT_MAX_PLANS):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_plans: Maximum number of plans kept (least recently used
+                       plans are evicted first)
+
+        Raises:
+            ValueError: If max_plans is less than 1
+        """
+        if max_plans < 1:
+            raise ValueError(f"max_plans must be at least 1, got {max_plans}")
+        self.max_plans = max_plans
+        self._lock = threading.Lock()
+        self._plans: "OrderedDict[Hashable, BandPlan]" = OrderedDict()
+        self._stats = BandPlanStats()
+
+    def get_plan(self, freq_hz: np.ndarray, freq_min: float, freq_max: float) -> BandPlan:
+        """
+        Get the plan for a grid and band, building it on a miss.
+
+        Args:
+            freq_hz: Frequency array in Hz (ascending)
+            freq_min: Minimum frequency in GHz
+            freq_max: Maximum frequency in GHz
+
+        Returns:
+            BandPlan (shared - do not modify)
+        """
+        key = (grid_fingerprint(freq_hz), freq_min, freq_max)
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                self._stats.hits += 1
+                return plan
+            self._stats.misses += 1
+
+        # Plan outside the lock - building is cheap and idempotent
+        plan = make_band_plan(freq_hz, freq_min, freq_max)
+        with self._lock:
+            self._plans[key] = plan
+            self._plans.move_to_end(key)
+            while len(self._plans) > self.max_plans:
+                self._plans.popitem(last=False)
+                self._stats.evictions += 1
+        return plan
+
+    def stats(self) -> BandPlanStats:
+        """
+        Get a snapshot of the lookup counters.
+
+        Returns:
+            BandPlanStats copy (not updated by later lookups)
+        """
+        with self._lock:
+            return BandPlanStats(self._stats.hits, self._stats.misses, self._stats.evictions)
+
+    def reset_stats(self) -> None:
+        """Reset the lookup counters (the plans are kept)."""
+        with self._lock:
+            self._stats = BandPlanStats()
+
+    def clear(self) -> None:
+        """Drop every plan (counters are kept)."""
+        with self._lock:
+            self._plans.clear()
+
+    def __len__(self) -> int:
+        """Number of cached plans."""
+        with self._lock:
+            return len(self._plans)
+
+
+def _edge(freq_hz: np.ndarray, upper_index: int, target_hz: float) -> BandEdge:
+    """
+    Interpolation weight of one edge sample between upper_index - 1 and upper_index.
+
+    Args:
+        freq_hz: Frequency array in Hz (ascending)
+        upper_index: Index of the first sample above target_hz
+        target_hz: Edge frequency
+
+    Returns:
+        BandEdge
+    """
+    f0 = freq_hz[upper_index - 1]
+    f1 = freq_hz[upper_index]
+    return BandEdge(upper_index=upper_index, weight=(target_hz - f0) / (f1 - f0))
+
+
+def _interpolate(data: np.ndarray, edge: BandEdge) -> np.ndarray:
+    """
+    Linearly interpolate one edge sample of data.
+
+    Args:
+        data: Array with frequency as the first axis
+        edge: Edge to interpolate
+
+    Returns:
+        Interpolated sample with a leading axis of length 1
+    """
+    y0 = data[edge.upper_index - 1]
+    y1 = data[edge.upper_index]
+    return (y0 + edge.weight * (y1 - y0))[np.newaxis]
+
+
+def _read_only_plan(
+    lo: int,
+    hi: int,
+    frequency_hz: np.ndarray,
+    left: Optional[BandEdge] = None,
+    right: Optional[BandEdge] = None
+) -> BandPlan:
+    """
+    Build a plan whose frequency array is a read-only copy (plans are shared).
+
+    Args:
+        lo: First interior sample index
+        hi: One past the last interior sample index
+        frequency_hz: Band frequencies in Hz
+        left: Interpolated lower edge
+        right: Interpolated upper edge
+
+    Returns:
+        BandPlan
+    """
+    frequency_hz = np.array(frequency_hz, dtype=np.float64)
+    frequency_hz.setflags(write=False)
+    return BandPlan(lo=lo, hi=hi, frequency_hz=frequency_hz, left=left, right=right)
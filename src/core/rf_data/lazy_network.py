@@ -0,0 +1,144 @@
+"""
+Lazy proxy for measurement RF data.
+
+Repository list queries (all measurements for a device, a serial number,
+etc.) used to deserialize every touchstone BLOB up front, even though most
+callers only look at the header columns (file name, temperature, path type).
+LazyNetwork defers both the BLOB fetch and the decode until the network is
+first used.
+
+The proxy forwards attribute access (.f, .s, .nports, ...) to the loaded
+scikit-rf Network, so code that only reads attributes works unchanged. Code
+that needs a real Network instance (isinstance checks, scikit-rf functions)
+should call TouchstoneLoader.resolve_network().
+
+A proxy created by a repository fetches through that repository's SQLite
+connection. It records the creating thread and the connection, and refuses
+to load on any other thread or after a pooled connection has been returned
+(another worker may be using it by then).
+"""
+
+import sqlite3
+import threading
+from typing import Any, Callable, Optional
+
+from ..exceptions import DatabaseError
+
+# Try to import scikit-rf - handle gracefully if not installed
+try:
+    from skrf import Network
+except ImportError:
+    Network = Any
+
+
+class LazyNetwork:
+    """
+    Deferred scikit-rf Network that loads on first access.
+
+    Wraps a zero-argument callable that returns the decoded Network. The
+    callable is invoked at most once; the result is cached on the proxy.
+
+    Note:
+        Repository-created proxies fetch the BLOB through the repository's
+        SQLite connection, so the first access must happen on the creating
+        thread while it still holds that connection (same rule as any other
+        repository call). Otherwise load() raises DatabaseError.
+    """
+
+    __slots__ = ("_loader", "_network", "_connection", "_owner_thread")
+
+    def __init__(
+        self,
+        loader: Callable[[], Network],
+        connection: Optional[sqlite3.Connection] = None
+    ):
+        """
+        Initialize the proxy.
+
+        Args:
+            loader: Zero-argument callable returning the decoded Network
+            connection: Connection the loader reads from (None = no
+                       ownership checks, e.g. a loader without database access)
+        """
+        self._loader = loader
+        self._network: Optional[Network] = None
+        self._connection = connection
+        self._owner_thread = threading.get_ident()
+
+    @property
+    def is_loaded(self) -> bool:
+        """
+        Whether the network has already been fetched and decoded.
+
+        Returns:
+            True if load() has run
+        """
+        return self._network is not None
+
+    def load(self) -> Network:
+        """
+        Fetch and decode the network (first call only).
+
+        Returns:
+            The decoded scikit-rf Network object
+
+        Raises:
+            DatabaseError: If called on another thread than the one that
+                          created the proxy, or after its pooled connection
+                          was returned
+        """
+        if self._network is None:
+            self._check_owner()
+            self._network = self._loader()
+            # Drop the loader (and the connection it closes over)
+            self._loader = None
+            self._connection = None
+        return self._network
+
+    def _check_owner(self) -> None:
+        """
+        Make sure the loader's connection may be used here.
+
+        Raises:
+            DatabaseError: On a foreign thread or a returned pooled connection
+        """
+        if self._connection is None:
+            return
+        if threading.get_ident() != self._owner_thread:
+            raise DatabaseError(
+                "LazyNetwork accessed from a thread that does not own its connection; "
+                "resolve the network on the thread that queried it"
+            )
+        # Deferred import: the database layer depends on core, not the reverse
+        from ...database.connection_manager import connection_released
+        if connection_released(self._connection, self._owner_thread):
+            raise DatabaseError(
+                "LazyNetwork accessed after its connection was returned to the pool; "
+                "resolve the network before leaving the connection block"
+            )
+
+    def __getattr__(self, name: str) -> Any:
+        """
+        Forward attribute access to the loaded Network.
+
+        Only called for attributes not found on the proxy itself, so the
+        proxy's own slots are never forwarded.
+
+        Args:
+            name: Attribute name
+
+        Returns:
+            Attribute value from the underlying Network
+
+        Raises:
+            AttributeError: For dunder lookups (copy/pickle protocol probes
+                           must not trigger a database fetch)
+        """
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.load(), name)
+
+    def __repr__(self) -> str:
+        """Return a representation that does not trigger loading."""
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"<LazyNetwork ({state})>"
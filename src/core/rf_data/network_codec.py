@@ -0,0 +1,480 @@
+"""
+Versioned binary codec for storing S-parameter networks.
+
+This module replaces pickled scikit-rf Network objects in
+measurements.touchstone_data with a compact, self-describing binary layout.
+Pickle ties stored data to the scikit-rf class layout, is slow to load and
+carries a lot of object overhead; the codec stores only the raw arrays.
+
+Blob layout (little-endian):
+
+    offset  size  field
+    0       4     magic b"MRFN"
+    4       1     format version (currently 1)
+    5       1     S-matrix dtype code (1 = complex128, 2 = complex64)
+    6       1     flags (bit 0: per-point z0 buffer present)
+    7       1     frequency display unit code (see FREQUENCY_UNITS)
+    8       2     port count (n)
+    10      2     network name length in bytes (UTF-8)
+    12      4     point count (f)
+    16      8     z0 real part (uniform reference impedance)
+    24      8     z0 imaginary part
+    32      ...   network name, zero-padded to a 16-byte boundary
+    ...     8f    frequency buffer in Hz (float64)
+    ...     ...   S-matrix buffer [f, n, n] (complex128 or complex64)
+    ...     16fn  optional z0 buffer [f, n] (complex128), if flag bit 0 set
+
+Frequencies are always stored as float64 in Hz (float32 cannot resolve GHz
+sweeps to the Hz). The compact "single" precision mode only narrows the
+S-matrix, which dominates the blob size.
+
+Decoding uses np.frombuffer, so the decoded arrays are zero-copy, read-only
+views of the blob. decode_network then builds the Network the way
+unpickling does (state assignment, no constructor validation), since a
+blob always holds a network that was valid when it was encoded. That fast
+path relies on scikit-rf's private attribute layout, so it is verified
+once per process against the public constructor of the installed
+scikit-rf; if the layout differs, decoding uses the constructor.
+"""
+
+import logging
+import struct
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+# Try to import scikit-rf - handle gracefully if not installed
+try:
+    from skrf import Network, Frequency
+    SKRF_AVAILABLE = True
+except ImportError:
+    SKRF_AVAILABLE = False
+    Network = None
+    Frequency = None
+
+from ..exceptions import FileLoadError
+from .touchstone_scan import TouchstoneHeader
+
+
+# Magic bytes identifying a codec blob (legacy rows are pickle streams,
+# which always start with b"\x80")
+MAGIC = b"MRFN"
+
+# Current format version - bump when the layout changes and keep decoding
+# older versions
+FORMAT_VERSION = 1
+
+# Fixed-size header: magic, version, dtype, flags, unit, ports, name length,
+# points, z0 real, z0 imag
+_HEADER = struct.Struct("<4sBBBBHHIdd")
+
+# One float64 of the frequency buffer
+_FREQUENCY = struct.Struct("<d")
+
+# Buffers start on a 16-byte boundary so complex128 views are aligned
+_ALIGNMENT = 16
+
+# Flag bits
+_FLAG_PER_POINT_Z0 = 0x01
+
+# S-matrix precision modes -> dtype codes
+PRECISIONS = {
+    "double": 1,  # complex128 - lossless
+    "single": 2,  # complex64 - half the size, ~7 significant digits
+}
+_DTYPES = {
+    1: np.dtype("<c16"),
+    2: np.dtype("<c8"),
+}
+
+# Frequency display units (the data itself is always stored in Hz)
+FREQUENCY_UNITS = ["Hz", "kHz", "MHz", "GHz", "THz"]
+
+
+@dataclass(frozen=True)
+class DecodedNetwork:
+    """
+    Raw arrays decoded from a codec blob.
+
+    All arrays are read-only views of the original blob (no copy).
+
+    Attributes:
+        frequency_hz: Frequency points in Hz, shape [f]
+        s: Complex S-matrix, shape [f, n, n]
+        z0: Reference impedance, shape [f, n]
+        frequency_unit: Display unit of the original network (e.g., "GHz")
+        name: Network name (typically the source filename stem)
+    """
+    frequency_hz: np.ndarray
+    s: np.ndarray
+    z0: np.ndarray
+    frequency_unit: str
+    name: Optional[str]
+
+
+def is_encoded(data: bytes) -> bool:
+    """
+    Check whether a blob was written by this codec.
+
+    Used to tell codec blobs apart from legacy pickled Network objects.
+
+    Args:
+        data: Stored blob
+
+    Returns:
+        True if the blob starts with the codec magic bytes
+    """
+    return bytes(data[:len(MAGIC)]) == MAGIC
+
+
+def encode_network(network: Network, precision: str = "double") -> bytes:
+    """
+    Encode a scikit-rf Network into the binary storage format.
+
+    Args:
+        network: scikit-rf Network object to encode
+        precision: "double" (complex128, lossless) or "single" (complex64)
+
+    Returns:
+        Encoded bytes (stored as BLOB in the database)
+
+    Raises:
+        FileLoadError: If the precision mode is unknown or encoding fails
+    """
+    if precision not in PRECISIONS:
+        raise FileLoadError(
+            f"Unknown storage precision '{precision}'. "
+            f"Expected one of: {', '.join(PRECISIONS)}"
+        )
+    dtype_code = PRECISIONS[precision]
+
+    try:
+        frequency_hz = np.ascontiguousarray(network.f, dtype="<f8")
+        s = np.ascontiguousarray(network.s, dtype=_DTYPES[dtype_code])
+        n_points, n_ports = s.shape[0], s.shape[1]
+
+        # Reference impedance: store a single value when uniform (the usual
+        # 50 ohm case), otherwise append the full [f, n] buffer
+        z0 = np.asarray(network.z0, dtype="<c16")
+        flags = 0
+        z0_scalar = complex(z0.flat[0]) if z0.size else complex(50.0)
+        if z0.size and not np.all(z0 == z0.flat[0]):
+            flags |= _FLAG_PER_POINT_Z0
+
+        unit = network.frequency.unit
+        unit_code = FREQUENCY_UNITS.index(unit) if unit in FREQUENCY_UNITS else 0
+
+        name_bytes = (network.name or "").encode("utf-8")
+        header = _HEADER.pack(
+            MAGIC,
+            FORMAT_VERSION,
+            dtype_code,
+            flags,
+            unit_code,
+            n_ports,
+            len(name_bytes),
+            n_points,
+            z0_scalar.real,
+            z0_scalar.imag,
+        )
+
+        parts = [header, name_bytes, b"\x00" * _padding(len(header) + len(name_bytes))]
+        parts.append(frequency_hz.tobytes())
+        parts.append(s.tobytes())
+        if flags & _FLAG_PER_POINT_Z0:
+            parts.append(np.ascontiguousarray(z0.reshape(n_points, n_ports)).tobytes())
+        return b"".join(parts)
+    except FileLoadError:
+        raise
+    except Exception as e:
+        raise FileLoadError(f"Failed to encode Network object: {e}") from e
+
+
+def decode_arrays(data: bytes) -> DecodedNetwork:
+    """
+    Decode a codec blob into raw numpy arrays without copying.
+
+    Args:
+        data: Encoded bytes (from encode_network)
+
+    Returns:
+        DecodedNetwork with zero-copy, read-only array views
+
+    Raises:
+        FileLoadError: If the blob is not a codec blob, has an unsupported
+                      version, or is truncated
+    """
+    if len(data) < _HEADER.size or not is_encoded(data):
+        raise FileLoadError("Data is not an encoded network blob")
+
+    (
+        _magic, version, dtype_code, flags, unit_code,
+        n_ports, name_len, n_points, z0_real, z0_imag,
+    ) = _HEADER.unpack_from(data, 0)
+
+    if version > FORMAT_VERSION:
+        raise FileLoadError(
+            f"Network blob format version {version} is newer than supported "
+            f"version {FORMAT_VERSION}. Please update the application."
+        )
+    if dtype_code not in _DTYPES or unit_code >= len(FREQUENCY_UNITS):
+        raise FileLoadError("Corrupted network blob header")
+
+    name_start = _HEADER.size
+    name = bytes(data[name_start:name_start + name_len]).decode("utf-8") or None
+    offset = name_start + name_len + _padding(name_start + name_len)
+
+    s_dtype = _DTYPES[dtype_code]
+    n_elements = n_points * n_ports * n_ports
+    expected = offset + 8 * n_points + s_dtype.itemsize * n_elements
+    if flags & _FLAG_PER_POINT_Z0:
+        expected += 16 * n_points * n_ports
+    if len(data) < expected:
+        raise FileLoadError(
+            f"Truncated network blob: expected {expected} bytes, got {len(data)}"
+        )
+
+    frequency_hz = np.frombuffer(data, dtype="<f8", count=n_points, offset=offset)
+    offset += 8 * n_points
+    s = np.frombuffer(data, dtype=s_dtype, count=n_elements, offset=offset)
+    s = s.reshape(n_points, n_ports, n_ports)
+    offset += s_dtype.itemsize * n_elements
+
+    if flags & _FLAG_PER_POINT_Z0:
+        z0 = np.frombuffer(data, dtype="<c16", count=n_points * n_ports, offset=offset)
+        z0 = z0.reshape(n_points, n_ports)
+    else:
+        # Broadcast view - no per-point allocation for the uniform case
+        z0 = np.broadcast_to(np.complex128(complex(z0_real, z0_imag)), (n_points, n_ports))
+
+    return DecodedNetwork(
+        frequency_hz=frequency_hz,
+        s=s,
+        z0=z0,
+        frequency_unit=FREQUENCY_UNITS[unit_code],
+        name=name,
+    )
+
+
+def read_header(data: bytes) -> TouchstoneHeader:
+    """
+    Read the header facts of a codec blob without decoding its arrays.
+
+    Only the fixed header and the first and last frequency are read, so
+    the cost does not depend on the blob size.
+
+    Args:
+        data: Encoded bytes (from encode_network)
+
+    Returns:
+        TouchstoneHeader of the stored network (data_format is None)
+
+    Raises:
+        FileLoadError: If the blob is not a codec blob, has an unsupported
+                      version, or is truncated
+    """
+    if len(data) < _HEADER.size or not is_encoded(data):
+        raise FileLoadError("Data is not an encoded network blob")
+
+    (
+        _magic, version, _dtype_code, _flags, unit_code,
+        n_ports, name_len, n_points, z0_real, _z0_imag,
+    ) = _HEADER.unpack_from(data, 0)
+
+    if version > FORMAT_VERSION:
+        raise FileLoadError(
+            f"Network blob format version {version} is newer than supported "
+            f"version {FORMAT_VERSION}. Please update the application."
+        )
+    if unit_code >= len(FREQUENCY_UNITS):
+        raise FileLoadError("Corrupted network blob header")
+
+    offset = _HEADER.size + name_len + _padding(_HEADER.size + name_len)
+    if n_points == 0 or len(data) < offset + 8 * n_points:
+        raise FileLoadError("Truncated network blob: frequency buffer is incomplete")
+
+    (freq_start,) = _FREQUENCY.unpack_from(data, offset)
+    (freq_stop,) = _FREQUENCY.unpack_from(data, offset + 8 * (n_points - 1))
+    return TouchstoneHeader(
+        n_ports=n_ports,
+        n_points=n_points,
+        freq_start_hz=freq_start,
+        freq_stop_hz=freq_stop,
+        frequency_unit=FREQUENCY_UNITS[unit_code],
+        z0=z0_real,
+    )
+
+
+def decode_network(data: bytes) -> Network:
+    """
+    Decode a codec blob into a scikit-rf Network object.
+
+    Args:
+        data: Encoded bytes (from encode_network)
+
+    The blob was encoded from a valid Network, so it is rebuilt without
+    the constructor's validation (see build_network, trusted=True).
+
+    Returns:
+        scikit-rf Network object (fully functional, ready for analysis)
+
+    Raises:
+        FileLoadError: If scikit-rf is missing or the blob cannot be decoded
+    """
+    return build_network(decode_arrays(data), trusted=True)
+
+
+def build_network(decoded: DecodedNetwork, trusted: bool = False) -> Network:
+    """
+    Build a scikit-rf Network from raw arrays.
+
+    Shared by decode_network and the native Touchstone parser.
+
+    Args:
+        decoded: Raw arrays (from decode_arrays or parse_touchstone)
+        trusted: The arrays come from a valid Network (a codec blob). The
+                 Network is then assembled like unpickling does - the
+                 attribute state of a constructed template with the arrays
+                 swapped in - skipping the constructor's shape fixing,
+                 monotonicity checks and copies (about 3x faster), unless
+                 the installed scikit-rf fails _fast_path_available.
+                 Parsed files keep the validating constructor.
+
+    Returns:
+        scikit-rf Network object (owns writable copies of the arrays)
+
+    Raises:
+        FileLoadError: If scikit-rf is missing or the Network cannot be built
+    """
+    if not SKRF_AVAILABLE:
+        raise FileLoadError(
+            "scikit-rf is not installed. Please install it with: pip install scikit-rf"
+        )
+
+    try:
+        if trusted and _fast_path_available():
+            return _assemble_network(decoded)
+        frequency = Frequency.from_f(decoded.frequency_hz, unit="hz")
+        frequency.unit = decoded.frequency_unit
+        return Network(
+            frequency=frequency,
+            s=decoded.s,
+            z0=decoded.z0,
+            name=decoded.name,
+        )
+    except Exception as e:
+        raise FileLoadError(f"Failed to build Network from blob: {e}") from e
+
+
+# Private attributes _assemble_network sets (scikit-rf 2.x layout)
+_NETWORK_ATTRIBUTES = ("_frequency", "_s", "_z0", "_port_modes", "name")
+_FREQUENCY_ATTRIBUTES = ("_f",)
+
+
+@lru_cache(maxsize=1)
+def _fast_path_available() -> bool:
+    """
+    Whether _assemble_network works with the installed scikit-rf.
+
+    The template must have every attribute _assemble_network sets, and a
+    reference network assembled from it must equal the one the public
+    constructor builds (frequencies, S-matrix, z0, port modes, unit, name).
+    Checked once per process.
+
+    Returns:
+        True if trusted arrays may skip the constructor
+    """
+    try:
+        network_state, frequency_state = _network_template()
+        if not (set(_NETWORK_ATTRIBUTES) <= network_state.keys()
+                and set(_FREQUENCY_ATTRIBUTES) <= frequency_state.keys()):
+            raise AttributeError("unexpected Network attribute layout")
+        reference = DecodedNetwork(
+            frequency_hz=np.array([1e9, 2e9, 3e9]),
+            s=np.arange(12, dtype=complex).reshape(3, 2, 2) * (0.01 + 0.02j),
+            z0=np.full((3, 2), 50.0, dtype=complex),
+            frequency_unit="GHz",
+            name="reference",
+        )
+        fast = _assemble_network(reference)
+        constructed = build_network(reference)
+        return bool(
+            fast == constructed
+            and np.array_equal(fast.f, constructed.f)
+            and np.array_equal(fast.z0, constructed.z0)
+            and np.array_equal(fast.port_modes, constructed.port_modes)
+            and fast.frequency.unit == constructed.frequency.unit
+            and fast.name == constructed.name
+            and fast.__dict__.keys() == constructed.__dict__.keys()
+        )
+    except Exception as e:
+        logging.getLogger(__name__).warning(
+            f"Decoding networks with the Network constructor: {e}"
+        )
+        return False
+
+
+@lru_cache(maxsize=1)
+def _network_template() -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Attribute state of a constructed 1-port Network and its Frequency.
+
+    Taken from the installed scikit-rf at runtime, so attributes added by
+    other versions get their constructor defaults.
+
+    Returns:
+        Tuple of (Network __dict__, Frequency __dict__)
+    """
+    template = Network(
+        frequency=Frequency.from_f(np.array([1.0]), unit="hz"),
+        s=np.zeros((1, 1, 1), dtype=complex),
+        z0=50.0,
+    )
+    return dict(template.__dict__), dict(template.frequency.__dict__)
+
+
+def _assemble_network(decoded: DecodedNetwork) -> Network:
+    """
+    Build a Network from trusted arrays without running its constructor.
+
+    Args:
+        decoded: Arrays of a valid network (from decode_arrays)
+
+    Returns:
+        scikit-rf Network equal to the constructed one
+    """
+    network_state, frequency_state = _network_template()
+    n_ports = decoded.s.shape[-1]
+
+    frequency = Frequency.__new__(Frequency)
+    frequency.__dict__.update(frequency_state)
+    frequency._f = np.array(decoded.frequency_hz, dtype=float)
+    frequency.unit = decoded.frequency_unit
+
+    network = Network.__new__(Network)
+    network.__setstate__({
+        # Fresh containers - the template's must not be shared
+        key: value.copy() if isinstance(value, (dict, list)) else value
+        for key, value in network_state.items()
+    })
+    network._frequency = frequency
+    network._s = np.array(decoded.s, dtype=complex)
+    network._z0 = np.array(decoded.z0, dtype=complex)
+    network._port_modes = np.array(["S"] * n_ports)
+    network.name = decoded.name
+    return network
+
+
+def _padding(length: int) -> int:
+    """
+    Number of zero bytes needed to pad length up to the buffer alignment.
+
+    Args:
+        length: Current byte length
+
+    Returns:
+        Padding size in bytes (0 to _ALIGNMENT - 1)
+    """
+    return (-length) % _ALIGNMENT
@@ -18,21 +18,136 @@ Key design:
 - Frequency ranges are specified in GHz (user-friendly)
 - Internal calculations use Hz (scikit-rf requirement)
 - Results returned in standard RF units (dB, dBc, VSWR ratio)
+- Batch calculations: networks sharing a frequency grid (production units
+  of a part number on the same VNA setup) are stacked into one
+  [N, f, n, n] array and reduced together
 """
 
 import re
-from typing import Optional, Tuple, List, Union
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple, List, Union
 import numpy as np
 
 # Try to import scikit-rf - handle gracefully if not installed
 try:
-    from skrf import Network
+    from skrf import Network, Frequency
+    from skrf.mathFunctions import complex_2_db
     SKRF_AVAILABLE = True
 except ImportError:
     SKRF_AVAILABLE = False
     Network = None
+    Frequency = None
+    complex_2_db = None
 
 from ..exceptions import FileLoadError
+from .band_plan import BandPlanCache, BandPlanStats
+
+
+# Version of the band metric calculations (calculate_band_metrics).
+# Stored MeasurementMetrics are tagged with it - bump when the math changes
+# so metrics stored by older code are recalculated instead of reused.
+CALCULATOR_VERSION = 3
+
+# Return loss is clipped to |S| >= 1e-10 (see calculate_return_loss)
+_RETURN_LOSS_FLOOR_DB = -200.0
+
+# Default guard bands of the margin engine (in the criterion's unit): margins
+# below these count as "close to the limit"
+DEFAULT_GAIN_GUARD_BAND_DB = 0.5
+DEFAULT_VSWR_GUARD_BAND = 0.1
+
+# Band plans shared by every calculator that is not given its own cache
+# (test types, plotting service, ...), so a grid/band is planned once
+_SHARED_BAND_PLANS = BandPlanCache()
+
+
+@dataclass
+class NetworkStack:
+    """
+    Networks with an identical frequency grid, stacked for batch calculations.
+    
+    Attributes:
+        frequency_hz: Shared frequency points in Hz, shape [f]
+        s: Stacked S-matrices, shape [N, f, n, n]
+        indices: Position of each stacked network in the list passed to
+                 SParameterCalculator.stack_networks (length N)
+    """
+    frequency_hz: np.ndarray
+    s: np.ndarray
+    indices: List[int]
+
+
+@dataclass
+class BandSamples:
+    """
+    Band-limited |S| in dB and VSWR - the input of every band reduction.
+    
+    Produced once per band (calculate_band_samples); band metrics and
+    margins are both reductions of the same samples.
+    
+    Attributes:
+        frequency_hz: Band frequencies in Hz, shape [f]
+        s_db: |S| in dB, shape [f, ..., n, n]
+        vswr: VSWR of the reflection coefficients, shape [f, ..., n]
+    """
+    frequency_hz: np.ndarray
+    s_db: np.ndarray
+    vswr: np.ndarray
+    
+    def row(self, index: int) -> "BandSamples":
+        """
+        Samples of one network of a stack (views, no copy).
+        
+        Args:
+            index: Row of the stack (see NetworkStack)
+            
+        Returns:
+            BandSamples with s_db [f, n, n] and vswr [f, n]
+        """
+        return BandSamples(self.frequency_hz, self.s_db[:, index], self.vswr[:, index])
+
+
+@dataclass(frozen=True)
+class MarginLimit:
+    """
+    Criterion limit for the margin engine (calculate_margins).
+    
+    Attributes:
+        quantity: "gain" (|S| in dB of every port pair) or "vswr" (every port)
+        lower: Lower limit (value >= lower passes), None if unbounded
+        upper: Upper limit (value <= upper passes), None if unbounded
+        guard_band: Margins below this count as within the guard band
+    """
+    quantity: str
+    lower: Optional[float] = None
+    upper: Optional[float] = None
+    guard_band: float = 0.0
+    
+    @property
+    def key(self) -> str:
+        """
+        Text key of the limit (stored margin reductions are keyed by it).
+        
+        Returns:
+            Quantity, bounds and guard band, e.g. "gain:27.5:31.3:0.5"
+        """
+        return f"{self.quantity}:{self.lower!r}:{self.upper!r}:{self.guard_band!r}"
+
+
+def _vswr(s: np.ndarray) -> np.ndarray:
+    """
+    VSWR of the reflection coefficients (diagonal of the port axes).
+    
+    Same formula as scikit-rf's s_vswr: (1 + |Γ|) / (1 - |Γ|).
+    
+    Args:
+        s: S-parameters, shape [..., n, n]
+        
+    Returns:
+        VSWR, shape [..., n]
+    """
+    gamma = np.abs(np.diagonal(s, axis1=-2, axis2=-1))
+    return (1 + gamma) / (1 - gamma)
 
 
 class SParameterCalculator:
@@ -50,13 +165,17 @@ class SParameterCalculator:
     wideband, or OOB ranges).
     """
     
-    def __init__(self):
+    def __init__(self, band_plans: Optional[BandPlanCache] = None):
         """
         Initialize the calculator.
         
         Verifies that scikit-rf is available. All calculation methods require
         scikit-rf to function.
         
+        Args:
+            band_plans: Cache of band index plans (default: one cache
+                       shared by all calculators of the process)
+        
         Raises:
             FileLoadError: If scikit-rf is not installed
         """
@@ -64,6 +183,16 @@ class SParameterCalculator:
             raise FileLoadError(
                 "scikit-rf is not installed. Please install it with: pip install scikit-rf"
             )
+        self.band_plans = band_plans if band_plans is not None else _SHARED_BAND_PLANS
+    
+    def band_plan_stats(self) -> BandPlanStats:
+        """
+        Get the hit/miss counters of the band plan cache.
+        
+        Returns:
+            BandPlanStats snapshot
+        """
+        return self.band_plans.stats()
     
     def filter_frequency_range(
         self,
@@ -92,39 +221,63 @@ class SParameterCalculator:
             Filtered Network object containing only frequencies in range
             (includes boundary points even if slightly outside range)
         """
-        # Convert GHz to Hz for scikit-rf (scikit-rf uses Hz internally)
-        freq_min_hz = freq_min * 1e9
-        freq_max_hz = freq_max * 1e9
-        
         # Get frequency array from network (in Hz)
         freq_hz = network.f
         
         if len(freq_hz) == 0:
             return network.copy()
         
-        # Ensure freq_min_hz <= freq_max_hz
-        if freq_min_hz > freq_max_hz:
-            freq_min_hz, freq_max_hz = freq_max_hz, freq_min_hz
+        # Slice the interior samples and interpolate only the two band edges.
+        # The S-matrix and the port impedances share the same band plan.
+        f_band, s_band = self.band_limit_arrays(freq_hz, network.s, freq_min, freq_max)
+        _, z0_band = self.band_limit_arrays(freq_hz, network.z0, freq_min, freq_max)
         
-        # Clamp desired boundaries to network domain (no extrapolation)
-        global_min = freq_hz.min()
-        global_max = freq_hz.max()
-        target_min = np.clip(freq_min_hz, global_min, global_max)
-        target_max = np.clip(freq_max_hz, global_min, global_max)
+        # Thin Network wrapper around the band-limited arrays so callers keep
+        # using the familiar .f / .s / .s_db / .s_vswr API
+        frequency = Frequency.from_f(f_band, unit="hz")
+        frequency.unit = network.frequency.unit
+        return Network(frequency=frequency, s=s_band, z0=z0_band, name=network.name)
+    
+    def band_limit_arrays(
+        self,
+        freq_hz: np.ndarray,
+        data: np.ndarray,
+        freq_min: float,
+        freq_max: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Band-limit raw frequency-domain arrays, including boundary points.
         
-        # Build target frequency list including boundaries
-        interior = freq_hz[(freq_hz >= target_min) & (freq_hz <= target_max)]
-        targets = np.concatenate([interior, [target_min, target_max]])
-        targets = np.unique(np.sort(targets))
+        Numpy kernel behind filter_frequency_range. The interior samples
+        are returned as a slice of the input and ONLY the two band-edge
+        samples are linearly interpolated, instead of re-interpolating every
+        S-parameter at every point the way Network.interpolate does.
+        Interpolation is on the complex values (real and imaginary parts),
+        matching scikit-rf's default 'cart' mode.
         
-        # Interpolate to requested frequencies (linear)
-        interpolated = network.interpolate(targets)
+        The slice indices and edge weights depend only on the grid and the
+        band; they come from the band plan cache (see band_plan), so
+        measurements sharing a grid are planned once per band.
         
-        # Final mask to ensure inclusive boundaries
-        mask = (interpolated.f >= target_min - 1e-9) & (interpolated.f <= target_max + 1e-9)
-        filtered = interpolated[mask]
+        Boundary behavior matches the original implementation:
+        - freq_min/freq_max are swapped if given in reverse order
+        - Boundaries are clamped to the measured sweep (no extrapolation)
+        - A boundary that falls exactly on a measured point is not duplicated
         
-        return filtered
+        Args:
+            freq_hz: Frequency array in Hz (ascending), shape [frequency_points]
+            data: Array with frequency as the first axis, e.g. S-matrix
+                  [frequency_points, n, n] or z0 [frequency_points, n]
+            freq_min: Minimum frequency in GHz
+            freq_max: Maximum frequency in GHz
+            
+        Returns:
+            Tuple of (band_frequencies_hz, band_data). Both are views of the
+            input when both boundaries fall exactly on measured points;
+            otherwise band_frequencies_hz is a shared read-only array.
+        """
+        plan = self.band_plans.get_plan(freq_hz, freq_min, freq_max)
+        return plan.band_frequencies(freq_hz), plan.apply(data)
     
     def calculate_gain(self, network: Network, s_param: str = "S21") -> np.ndarray:
         """
@@ -341,8 +494,439 @@ class SParameterCalculator:
         # Example: If requirement is >= 60 dBc and min_rejection = 65 dBc, it passes.
         # If min_rejection = 55 dBc, it fails (even if some points have 70 dBc rejection).
         min_rejection = float(np.min(rejections_dbce))
-        
+
         return min_rejection
+
+    def calculate_band_metrics(
+        self,
+        network: Network,
+        freq_min: float,
+        freq_max: float
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calculate gain and VSWR metrics for every port pair in a single pass.
+
+        This is the vectorized counterpart of calling calculate_gain_range,
+        calculate_flatness, calculate_lowest_in_band_gain and calculate_vswr
+        once per S-parameter. Those helpers each band-limit the network again,
+        so evaluating all n² S-parameters of a 10-port file costs hundreds of
+        interpolations. Here the network is band-limited once, |S| in dB is
+        computed once for the whole [frequency, output, input] cube, and all
+        reductions are numpy axis reductions over the frequency axis.
+
+        Results are numerically identical to the per-S-parameter helpers
+        (same filtering, same scikit-rf dB and VSWR conversions).
+
+        Args:
+            network: scikit-rf Network object (full frequency sweep)
+            freq_min: Minimum frequency in GHz (operational range start)
+            freq_max: Maximum frequency in GHz (operational range end)
+
+        Returns:
+            Dictionary of arrays indexed [output_port - 1, input_port - 1]:
+            - "gain_min": Minimum gain in dB, shape [n, n]
+            - "gain_max": Maximum gain in dB, shape [n, n]
+            - "flatness": gain_max - gain_min in dB, shape [n, n]
+            - "vswr_max": Maximum VSWR per port, shape [n]
+            - "gain_min_freq" / "gain_max_freq": Frequency in GHz where the
+              minimum / maximum gain occurs, shape [n, n]
+            - "vswr_max_freq": Frequency in GHz of the maximum VSWR, shape [n]
+            Empty dictionary if the band contains no frequency points.
+        """
+        # Band-limit ONCE for all port pairs (raw arrays, no Network wrapper)
+        f_band, s_band = self.band_limit_arrays(network.f, network.s, freq_min, freq_max)
+        if len(s_band) == 0:
+            return {}
+        
+        # |S| in dB for the whole cube - shape [frequency_points, n, n]
+        return self.reduce_band_samples(BandSamples(f_band, complex_2_db(s_band), _vswr(s_band)))
+    
+    def calculate_multi_band_metrics(
+        self,
+        network: Network,
+        bands: Sequence[Tuple[float, float]]
+    ) -> Dict[Tuple[float, float], Dict[str, np.ndarray]]:
+        """
+        Calculate band metrics for several bands in one pass over the sweep.
+        
+        |S| in dB and VSWR are computed ONCE for the whole sweep; every band
+        is then a slice of those arrays (from its cached band plan) plus the
+        dB/VSWR of at most two interpolated edge samples. Calling
+        calculate_band_metrics per band would instead band-limit the
+        complex S-matrix and convert it to dB again for every band - the
+        operational band, the wideband range and each OOB criterion band.
+        
+        Results equal calculate_band_metrics of each band exactly.
+        
+        Args:
+            network: scikit-rf Network object (full frequency sweep)
+            bands: (freq_min, freq_max) bands in GHz
+            
+        Returns:
+            Dictionary mapping band -> calculate_band_metrics result
+        """
+        return self._multi_band_metrics(network.f, network.s, bands)
+    
+    def calculate_band_samples(
+        self,
+        network: Network,
+        bands: Sequence[Tuple[float, float]]
+    ) -> Dict[Tuple[float, float], BandSamples]:
+        """
+        Band-limited dB and VSWR samples of several bands in one pass.
+        
+        The samples are what calculate_multi_band_metrics reduces; callers
+        that also need margins (calculate_margins) keep them, so metrics and
+        margins share one dB conversion and one band-limit per band.
+        
+        Args:
+            network: scikit-rf Network object (full frequency sweep)
+            bands: (freq_min, freq_max) bands in GHz
+            
+        Returns:
+            Dictionary mapping band -> BandSamples (s_db [f, n, n], vswr [f, n])
+        """
+        return self._band_samples(network.f, network.s, bands)
+    
+    @staticmethod
+    def calculate_margins(samples: BandSamples, limit: MarginLimit) -> Dict[str, np.ndarray]:
+        """
+        Signed margin to a limit at every frequency point, for every S-parameter.
+        
+        The margin is the distance to the nearest limit: value - lower and
+        upper - value (the smaller of the two for a range). Positive means
+        inside the limit, negative means a violation. All port pairs (gain)
+        or ports (VSWR) are evaluated at once with numpy axis operations
+        over the samples metrics are computed from - no extra decode or
+        interpolation.
+        
+        The minimum margin equals the margin of the band metric extremes
+        (e.g. min(gain_min - lower, upper - gain_max) for a gain range).
+        
+        Args:
+            samples: Band samples (calculate_band_samples), possibly of a stack
+            limit: Limit to measure the margin to
+            
+        Returns:
+            Dictionary of arrays ("..." = the port axes of the quantity:
+            [n, n] for gain, [n] for VSWR; with a leading N for a stack):
+            - "margin": Signed margin at every frequency, shape [f, ...]
+            - "margin_min": Worst-case (smallest) margin, shape [...]
+            - "margin_min_freq": Frequency in GHz of the worst case, shape [...]
+            - "guard_band_percent": Percentage of frequency points whose
+              margin is below limit.guard_band (including violations), shape [...]
+            Empty dictionary if the band contains no frequency points.
+            
+        Raises:
+            ValueError: If the quantity is unknown or the limit has no bound
+        """
+        if limit.quantity == "gain":
+            values = samples.s_db
+        elif limit.quantity == "vswr":
+            values = samples.vswr
+        else:
+            raise ValueError(f"Unknown margin quantity: {limit.quantity}")
+        if limit.lower is None and limit.upper is None:
+            raise ValueError("Margin limit needs a lower or an upper bound")
+        if len(samples.frequency_hz) == 0:
+            return {}
+        
+        # Distance to each bound; the nearer bound decides for a range
+        if limit.lower is not None:
+            margin = values - limit.lower
+            if limit.upper is not None:
+                margin = np.minimum(margin, limit.upper - values)
+        else:
+            margin = limit.upper - values
+        
+        margin_min_idx = np.argmin(margin, axis=0)
+        return {
+            "margin": margin,
+            "margin_min": np.take_along_axis(margin, margin_min_idx[np.newaxis], axis=0)[0],
+            "margin_min_freq": samples.frequency_hz[margin_min_idx] / 1e9,
+            "guard_band_percent": 100.0 * np.mean(margin < limit.guard_band, axis=0),
+        }
+    
+    def calculate_oob_rejections(
+        self,
+        network: Network,
+        oob_bands: Sequence[Tuple[float, float]],
+        operational_freq_min: float,
+        operational_freq_max: float
+    ) -> Dict[Tuple[float, float], Dict[str, np.ndarray]]:
+        """
+        Calculate worst-case OOB rejection of every port pair for many OOB bands.
+        
+        The lowest in-band gain is computed once per S-parameter (not once
+        per OOB band and S-parameter as with calculate_oob_rejection), and
+        all OOB bands are reduced in one pass (calculate_multi_band_metrics).
+        The worst case is at the OOB gain peak, so the rejection is the
+        lowest in-band gain minus the peak OOB gain.
+        
+        Args:
+            network: scikit-rf Network object (full frequency sweep)
+            oob_bands: (freq_min, freq_max) OOB bands in GHz
+            operational_freq_min: Minimum operational frequency in GHz
+            operational_freq_max: Maximum operational frequency in GHz
+            
+        Returns:
+            Dictionary mapping OOB band -> {
+                "rejection": Worst-case rejection in dBc, shape [n, n]
+                             (equals calculate_oob_rejection per S-parameter),
+                "rejection_freq": Frequency in GHz of the worst case, shape [n, n]
+            }
+            Empty dictionary if the network has no frequency points.
+        """
+        operational = (operational_freq_min, operational_freq_max)
+        metrics = self._multi_band_metrics(network.f, network.s, [operational, *oob_bands])
+        if not metrics[operational]:
+            return {}
+        return {
+            band: {
+                "rejection": self.calculate_oob_rejection_batch(metrics[operational], metrics[band]),
+                "rejection_freq": metrics[band]["gain_max_freq"],
+            }
+            for band in oob_bands
+        }
+    
+    def stack_networks(self, networks: Sequence[Network]) -> List[NetworkStack]:
+        """
+        Group networks by frequency grid and stack each group.
+        
+        Networks belong to the same group if they have the same port count
+        and exactly the same frequency points. Each group becomes one
+        NetworkStack, so a campaign measured on one VNA setup is a single
+        [N, f, n, n] array; measurements on other grids form further stacks.
+        
+        Args:
+            networks: scikit-rf Network objects
+            
+        Returns:
+            List of NetworkStack objects, in order of first appearance.
+            Together their indices cover every input network once.
+        """
+        groups: Dict[Tuple[int, bytes], List[int]] = {}
+        for index, network in enumerate(networks):
+            # The grid itself is the key - equal point counts are not enough
+            key = (network.nports, np.ascontiguousarray(network.f).tobytes())
+            groups.setdefault(key, []).append(index)
+        
+        return [
+            NetworkStack(
+                frequency_hz=networks[indices[0]].f,
+                s=np.stack([networks[i].s for i in indices]),
+                indices=indices
+            )
+            for indices in groups.values()
+        ]
+    
+    def calculate_band_metrics_batch(
+        self,
+        stack: NetworkStack,
+        freq_min: float,
+        freq_max: float
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calculate band metrics for every network of a stack at once.
+        
+        Batch counterpart of calculate_band_metrics: the shared grid is
+        band-limited once for the whole stack, |S| in dB is computed once
+        for the [f, N, n, n] cube and every reduction runs over the
+        frequency axis for all networks and port pairs together. Results
+        equal calculate_band_metrics of each network exactly.
+        
+        Args:
+            stack: Networks sharing a frequency grid (see stack_networks)
+            freq_min: Minimum frequency in GHz (band start)
+            freq_max: Maximum frequency in GHz (band end)
+            
+        Returns:
+            Dictionary with the keys of calculate_band_metrics, each array
+            with a leading axis of length N (e.g., "gain_min" [N, n, n],
+            "vswr_max" [N, n]). Empty dictionary if the band contains no
+            frequency points.
+        """
+        # Frequency first, so the interior of the band is a view of the stack
+        f_band, s_band = self.band_limit_arrays(
+            stack.frequency_hz, np.moveaxis(stack.s, 1, 0), freq_min, freq_max
+        )
+        if len(s_band) == 0:
+            return {}
+        
+        # |S| in dB for every network - shape [frequency_points, N, n, n]
+        return self.reduce_band_samples(BandSamples(f_band, complex_2_db(s_band), _vswr(s_band)))
+    
+    def calculate_multi_band_metrics_batch(
+        self,
+        stack: NetworkStack,
+        bands: Sequence[Tuple[float, float]]
+    ) -> Dict[Tuple[float, float], Dict[str, np.ndarray]]:
+        """
+        Calculate band metrics for several bands of a whole stack in one pass.
+        
+        Combines calculate_band_metrics_batch (all networks at once) with
+        calculate_multi_band_metrics (dB and VSWR computed once per sweep).
+        
+        Args:
+            stack: Networks sharing a frequency grid (see stack_networks)
+            bands: (freq_min, freq_max) bands in GHz
+            
+        Returns:
+            Dictionary mapping band -> calculate_band_metrics_batch result
+        """
+        return self._multi_band_metrics(stack.frequency_hz, np.moveaxis(stack.s, 1, 0), bands)
+    
+    def calculate_band_samples_batch(
+        self,
+        stack: NetworkStack,
+        bands: Sequence[Tuple[float, float]]
+    ) -> Dict[Tuple[float, float], BandSamples]:
+        """
+        Band samples of a whole stack (see calculate_band_samples).
+        
+        Args:
+            stack: Networks sharing a frequency grid (see stack_networks)
+            bands: (freq_min, freq_max) bands in GHz
+            
+        Returns:
+            Dictionary mapping band -> BandSamples (s_db [f, N, n, n],
+            vswr [f, N, n]; BandSamples.row gives one network)
+        """
+        return self._band_samples(stack.frequency_hz, np.moveaxis(stack.s, 1, 0), bands)
+    
+    def _multi_band_metrics(
+        self,
+        freq_hz: np.ndarray,
+        s: np.ndarray,
+        bands: Sequence[Tuple[float, float]]
+    ) -> Dict[Tuple[float, float], Dict[str, np.ndarray]]:
+        """
+        Band metrics of several bands from one dB/VSWR conversion of the sweep.
+        
+        Args:
+            freq_hz: Frequency array in Hz
+            s: S-parameters with frequency as the first axis, [f, ..., n, n]
+            bands: (freq_min, freq_max) bands in GHz
+            
+        Returns:
+            Dictionary mapping band -> metrics (see reduce_band_samples); empty
+            metrics for every band if the sweep has no points
+        """
+        return {
+            band: self.reduce_band_samples(samples)
+            for band, samples in self._band_samples(freq_hz, s, bands).items()
+        }
+    
+    def _band_samples(
+        self,
+        freq_hz: np.ndarray,
+        s: np.ndarray,
+        bands: Sequence[Tuple[float, float]]
+    ) -> Dict[Tuple[float, float], BandSamples]:
+        """
+        Band samples of several bands from one dB/VSWR conversion of the sweep.
+        
+        Args:
+            freq_hz: Frequency array in Hz
+            s: S-parameters with frequency as the first axis, [f, ..., n, n]
+            bands: (freq_min, freq_max) bands in GHz
+            
+        Returns:
+            Dictionary mapping band -> BandSamples (no frequency points if
+            the sweep has none)
+        """
+        s_db = complex_2_db(s)
+        vswr = _vswr(s)
+        
+        samples = {}
+        for band in bands:
+            plan = self.band_plans.get_plan(freq_hz, *band)
+            # Interior from the sweep-wide arrays, edges converted separately
+            samples[band] = BandSamples(
+                plan.band_frequencies(freq_hz),
+                plan.apply_derived(s_db, s, complex_2_db),
+                plan.apply_derived(vswr, s, _vswr)
+            )
+        return samples
+    
+    @staticmethod
+    def reduce_band_samples(samples: BandSamples) -> Dict[str, np.ndarray]:
+        """
+        Band metrics of samples from calculate_band_samples.
+        
+        Reduces over the frequency axis for all port pairs (and networks of
+        a stack) at once.
+        
+        The arg-reductions also give the frequency of each extreme.
+        
+        Args:
+            samples: Band samples, s_db [f, ..., n, n] and vswr [f, ..., n]
+            
+        Returns:
+            Metrics dictionary (see calculate_band_metrics), leading axes
+            as the inputs after the frequency axis; empty if the band
+            contains no frequency points
+        """
+        if len(samples.frequency_hz) == 0:
+            return {}
+        f_band_ghz = samples.frequency_hz / 1e9
+        s_db = samples.s_db
+        vswr = samples.vswr
+        gain_min_idx = np.argmin(s_db, axis=0)
+        gain_max_idx = np.argmax(s_db, axis=0)
+        gain_min = np.take_along_axis(s_db, gain_min_idx[np.newaxis], axis=0)[0]
+        gain_max = np.take_along_axis(s_db, gain_max_idx[np.newaxis], axis=0)[0]
+        vswr_max_idx = np.argmax(vswr, axis=0)
+        
+        return {
+            "gain_min": gain_min,
+            "gain_max": gain_max,
+            "flatness": gain_max - gain_min,
+            "vswr_max": np.take_along_axis(vswr, vswr_max_idx[np.newaxis], axis=0)[0],
+            "gain_min_freq": f_band_ghz[gain_min_idx],
+            "gain_max_freq": f_band_ghz[gain_max_idx],
+            "vswr_max_freq": f_band_ghz[vswr_max_idx],
+        }
+    
+    @staticmethod
+    def calculate_return_loss_batch(band_metrics: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Worst-case return loss per port from (batch) band metrics.
+        
+        Return loss is 20*log10(|Sii|), i.e. the diagonal of the gain
+        metrics; the worst (most negative) value is the diagonal of
+        gain_min. Equals calculate_return_loss with a frequency range.
+        
+        Args:
+            band_metrics: Result of calculate_band_metrics or
+                          calculate_band_metrics_batch (non-empty)
+            
+        Returns:
+            Return loss in dB, shape [..., n] (leading axes as the input)
+        """
+        diagonal = np.diagonal(band_metrics["gain_min"], axis1=-2, axis2=-1)
+        return np.clip(diagonal, _RETURN_LOSS_FLOOR_DB, 0.0)
+    
+    @staticmethod
+    def calculate_oob_rejection_batch(
+        in_band_metrics: Dict[str, np.ndarray],
+        oob_metrics: Dict[str, np.ndarray]
+    ) -> np.ndarray:
+        """
+        Worst-case OOB rejection for every port pair from (batch) band metrics.
+        
+        Rejection is the lowest in-band gain minus the OOB gain, so the
+        worst case is at the OOB gain peak. Equals calculate_oob_rejection
+        for each S-parameter.
+        
+        Args:
+            in_band_metrics: Band metrics over the operational band
+            oob_metrics: Band metrics over the OOB band (same networks)
+            
+        Returns:
+            Rejection in dBc, shape [..., n, n] (leading axes as the input)
+        """
+        return in_band_metrics["gain_min"] - oob_metrics["gain_max"]
     
     def calculate_vswr(
         self,
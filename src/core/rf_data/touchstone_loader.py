@@ -1,23 +1,30 @@
 """
-Touchstone file loader using scikit-rf.
+Touchstone file loader using a native parser and scikit-rf.
 
 This module provides functionality to load Touchstone files (S-parameter data)
 using the scikit-rf library. Touchstone files are standard RF measurement files
 with extensions like .s2p (2-port), .s4p (4-port), etc.
 
 Key features:
-- Loads Touchstone files (S2P to S10P supported)
+- Loads Touchstone files (S2P to S10P supported) with the native
+  vectorized parser (see touchstone_parser), falling back to scikit-rf for
+  files it does not support
+- Scans file headers (ports, points, frequency range) without loading
 - Parses filename metadata using FilenameParser
+- Hashes file contents for deduplicated storage
 - Serializes/deserializes Network objects for database storage
+  (compact versioned binary format, see network_codec)
+- Reads legacy pickled Network blobs for backward compatibility
 - Handles scikit-rf import errors gracefully
 
 The loader integrates with FilenameParser to extract metadata from filenames,
 enabling automatic identification of serial numbers, part numbers, paths, etc.
 """
 
+import hashlib
 import pickle
 from pathlib import Path
-from typing import Optional, Union
+from typing import Any, Optional, Union
 
 # Try to import scikit-rf - handle gracefully if not installed
 try:
@@ -30,6 +37,15 @@ except ImportError:
 
 from ..exceptions import FileLoadError
 from .filename_parser import FilenameParser
+from . import network_codec
+from .lazy_network import LazyNetwork
+from .touchstone_parser import parse_touchstone, parse_touchstone_mapped
+from .touchstone_scan import TouchstoneHeader, scan_touchstone
+
+
+# Files this large (bytes) are parsed from a memory map in chunks, keeping
+# the peak memory near the size of the parsed arrays
+MEMORY_MAP_THRESHOLD = 32 * 1024 * 1024
 
 
 class TouchstoneLoader:
@@ -39,8 +55,9 @@ class TouchstoneLoader:
     Provides functionality to:
     - Load Touchstone files (.s2p, .s4p, etc.) into scikit-rf Network objects
     - Parse filename metadata automatically
-    - Serialize Network objects for database storage (pickle)
-    - Deserialize stored Network objects back for analysis
+    - Serialize Network objects for database storage (binary array codec)
+    - Deserialize stored Network objects back for analysis (codec or
+      legacy pickle blobs)
     
     The loader validates file existence and format before attempting to load,
     providing clear error messages for common issues.
@@ -49,28 +66,56 @@ class TouchstoneLoader:
     or real/imaginary). scikit-rf handles the file format details.
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        storage_precision: str = "double",
+        native_parser: bool = True,
+        memory_map_threshold: Optional[int] = MEMORY_MAP_THRESHOLD
+    ):
         """
         Initialize the loader.
         
         Checks for scikit-rf availability and initializes the filename parser.
         
+        Args:
+            storage_precision: S-matrix precision used by serialize_network:
+                              "double" (complex128, lossless, default) or
+                              "single" (complex64, half the blob size)
+            native_parser: Parse files with the native vectorized parser
+                          (default). False always uses scikit-rf's reader.
+            memory_map_threshold: File size in bytes from which the native
+                                 parser reads through a memory map in
+                                 chunks (0 = always, None = never)
+        
         Raises:
-            FileLoadError: If scikit-rf is not installed
+            FileLoadError: If scikit-rf is not installed or the precision
+                          mode is unknown
         """
         if not SKRF_AVAILABLE:
             raise FileLoadError(
                 "scikit-rf is not installed. Please install it with: pip install scikit-rf"
             )
+        if storage_precision not in network_codec.PRECISIONS:
+            raise FileLoadError(
+                f"Unknown storage precision '{storage_precision}'. "
+                f"Expected one of: {', '.join(network_codec.PRECISIONS)}"
+            )
         # Initialize filename parser for metadata extraction
         self.parser = FilenameParser()
+        self.storage_precision = storage_precision
+        self.native_parser = native_parser
+        self.memory_map_threshold = memory_map_threshold
     
     def load_file(self, filepath: Union[str, Path]) -> Network:
         """
-        Load a Touchstone file using scikit-rf.
+        Load a Touchstone file into a scikit-rf Network.
         
-        Validates file existence and format, then uses scikit-rf to load
-        the S-parameter data into a Network object.
+        Validates file existence and format, then parses the file with the
+        native vectorized parser. Files it does not support (non-S
+        parameters, noise data, uncommon Touchstone 2.0 keywords) or cannot
+        parse are loaded by scikit-rf instead, which also reports errors in
+        malformed files. Files of memory_map_threshold bytes or more are
+        parsed from a memory map, chunk by chunk.
         
         Args:
             filepath: Path to the Touchstone file (.s2p, .s4p, etc.)
@@ -100,6 +145,17 @@ class TouchstoneLoader:
                 f"Expected extension like .s2p, .s4p, etc."
             )
         
+        if self.native_parser:
+            try:
+                if (self.memory_map_threshold is not None
+                        and filepath.stat().st_size >= self.memory_map_threshold):
+                    decoded = parse_touchstone_mapped(filepath)
+                else:
+                    decoded = parse_touchstone(filepath)
+                return network_codec.build_network(decoded)
+            except FileLoadError:
+                pass  # Unsupported or malformed - let scikit-rf handle it
+        
         try:
             # Use scikit-rf to load the Touchstone file
             # scikit-rf automatically handles format parsing (frequency, S-parameters, etc.)
@@ -109,6 +165,35 @@ class TouchstoneLoader:
             # Wrap any loading errors in FileLoadError for consistent error handling
             raise FileLoadError(f"Failed to load Touchstone file {filepath}: {e}") from e
     
+    def scan_file(self, filepath: Union[str, Path]) -> TouchstoneHeader:
+        """
+        Read the header facts of a Touchstone file without loading it.
+        
+        Returns the port count (from the extension), the option line
+        settings, the number of frequency points and the first/last
+        frequency. Only the frequency column is converted and no Network is
+        built, so this is much cheaper than load_file when the S-parameter
+        data itself is not needed (filters, port count validation).
+        
+        Args:
+            filepath: Path to the Touchstone file (.s2p, .s4p, etc.)
+            
+        Returns:
+            TouchstoneHeader with n_ports, n_points, freq_start_hz,
+            freq_stop_hz and the option line settings
+            
+        Raises:
+            FileLoadError: If file not found, wrong format, or its data is
+                          malformed or truncated
+        """
+        filepath = Path(filepath)
+        
+        # Validate file exists
+        if not filepath.exists():
+            raise FileLoadError(f"File not found: {filepath}")
+        
+        return scan_touchstone(filepath)
+    
     def load_with_metadata(self, filepath: Union[str, Path]) -> tuple:
         """
         Load a Touchstone file and parse its filename for metadata.
@@ -136,19 +221,38 @@ class TouchstoneLoader:
         
         return network, metadata
     
+    def hash_file(self, filepath: Union[str, Path]) -> str:
+        """
+        Compute the content hash of a file.
+        
+        Used to detect reloads of identical files: the hash identifies the
+        stored RF data, so an already-stored file does not need parsing.
+        Hashing is far cheaper than parsing the Touchstone text.
+        
+        Args:
+            filepath: Path to the file
+            
+        Returns:
+            SHA-256 hex digest of the file contents
+            
+        Raises:
+            FileLoadError: If the file cannot be read
+        """
+        try:
+            return hashlib.sha256(Path(filepath).read_bytes()).hexdigest()
+        except OSError as e:
+            raise FileLoadError(f"Failed to read file {filepath}: {e}") from e
+    
     def serialize_network(self, network: Network) -> bytes:
         """
         Serialize a Network object to bytes for database storage.
         
         Network objects are complex Python objects that cannot be directly
-        stored in SQLite. This method uses pickle to convert the Network
-        object to a byte string that can be stored as a BLOB.
-        
-        The serialized data contains all Network properties:
-        - Frequency array
-        - S-parameter matrices
-        - Port count
-        - Metadata (if any)
+        stored in SQLite. This method encodes the raw arrays with the
+        versioned binary codec (see network_codec) - a small header (port
+        count, point count, z0, dtype, frequency unit) followed by contiguous
+        frequency and complex S-matrix buffers. Unlike pickle, the stored
+        format does not depend on the scikit-rf class layout.
         
         Args:
             network: scikit-rf Network object to serialize
@@ -159,12 +263,7 @@ class TouchstoneLoader:
         Raises:
             FileLoadError: If serialization fails
         """
-        try:
-            # Use pickle to serialize Network object to bytes
-            # Pickle handles complex objects with nested arrays, etc.
-            return pickle.dumps(network)
-        except Exception as e:
-            raise FileLoadError(f"Failed to serialize Network object: {e}") from e
+        return network_codec.encode_network(network, precision=self.storage_precision)
     
     def deserialize_network(self, data: bytes) -> Network:
         """
@@ -173,6 +272,11 @@ class TouchstoneLoader:
         Reverse operation of serialize_network. Converts stored bytes back
         into a scikit-rf Network object for analysis and calculations.
         
+        Codec blobs are decoded with np.frombuffer. Blobs written before the
+        codec existed are pickled Network objects; they are still readable
+        so existing databases keep working until they are migrated (see
+        MeasurementRepository.migrate_legacy_blobs).
+        
         Args:
             data: Serialized bytes (from database BLOB or previous serialization)
             
@@ -182,9 +286,49 @@ class TouchstoneLoader:
         Raises:
             FileLoadError: If deserialization fails (corrupted data, format mismatch, etc.)
         """
+        if network_codec.is_encoded(data):
+            return network_codec.decode_network(data)
+        
         try:
-            # Use pickle to deserialize bytes back to Network object
-            # Restores all Network properties and data structures
+            # Legacy format: pickled Network object
             return pickle.loads(data)
         except Exception as e:
             raise FileLoadError(f"Failed to deserialize Network object: {e}") from e
+    
+    def resolve_network(self, data: Any) -> Network:
+        """
+        Return a scikit-rf Network for any form of measurement RF data.
+        
+        Measurement.touchstone_data can hold a Network (freshly loaded
+        file), bytes (encoded BLOB) or a LazyNetwork proxy (repository list
+        queries). This is the single place that turns all of them into a
+        real Network.
+        
+        Args:
+            data: Network object, encoded bytes, or LazyNetwork proxy
+            
+        Returns:
+            scikit-rf Network object
+            
+        Raises:
+            FileLoadError: If data is missing or cannot be decoded
+        """
+        if data is None:
+            raise FileLoadError("Measurement has no touchstone data")
+        if isinstance(data, LazyNetwork):
+            return data.load()
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            return self.deserialize_network(bytes(data))
+        return data
+    
+    def is_legacy_blob(self, data: bytes) -> bool:
+        """
+        Check whether a stored blob uses the legacy pickle format.
+        
+        Args:
+            data: Stored blob
+            
+        Returns:
+            True if the blob is not in the binary codec format
+        """
+        return not network_codec.is_encoded(data)
@@ -0,0 +1,495 @@
+"""
+Native vectorized Touchstone parser.
+
+scikit-rf parses Touchstone files line by line in Python and builds its
+Network through several conversion layers. This parser reads the whole
+numeric body in one pass into a flat float64 array, reshapes it to
+[points, 1 + 2*n*n] and converts the value pairs to the complex [f, n, n]
+S-matrix with vectorized numpy operations.
+
+Supported:
+- .s1p to .s<n>p files, Touchstone 1.x and 2.0 (full matrix)
+- MA, DB and RI formats, Hz/kHz/MHz/GHz/THz frequency units
+- Data points wrapped over several lines (files with more than 2 ports)
+- Comments anywhere ("!" to end of line)
+- Per-port reference impedances ([Reference] keyword)
+
+Everything else (Y/Z/H/G parameters, noise data, lower/upper matrix
+formats, other 2.0 keywords) raises FileLoadError, and TouchstoneLoader
+falls back to scikit-rf for the file.
+Malformed data raises FileLoadError too, so scikit-rf reports the error.
+
+Very large files (wideband sweeps of 10-port modules) are parsed with
+parse_touchstone_mapped instead: the file is memory-mapped and tokenized
+chunk by chunk straight into preallocated result arrays, so the peak
+memory stays near the size of the result instead of several copies of
+the file text.
+
+The result is a network_codec.DecodedNetwork, turned into a Network with
+network_codec.build_network (the same path stored blobs take).
+"""
+
+import mmap
+import re
+import warnings
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional, Tuple, Union
+
+import numpy as np
+
+from ..exceptions import FileLoadError
+from .network_codec import DecodedNetwork
+from .touchstone_scan import parse_option_line, port_count_from_extension
+
+
+# "!" comments, to the end of the line
+_COMMENT = re.compile(rb"![^\n]*")
+
+# Option lines ("# GHz S MA R 50")
+_OPTION_LINE = re.compile(rb"(?m)^[ \t]*#[^\n]*")
+
+# Touchstone 2.0 keyword lines ("[Number of Ports] 4")
+_KEYWORD_LINE = re.compile(rb"(?m)^[ \t]*\[([^\]\n]*)\]([^\n]*)")
+
+# Touchstone 2.0 keywords this parser understands
+_SUPPORTED_KEYWORDS = {
+    "version", "number of ports", "two-port data order",
+    "number of frequencies", "reference", "matrix format", "network data", "end",
+}
+
+# Bytes of text tokenized at a time by parse_touchstone_mapped
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Headroom on the point count estimated from the first chunk (line
+# lengths vary a little with the number of digits)
+_CAPACITY_HEADROOM = 1.02
+
+
+@dataclass(frozen=True)
+class _Layout:
+    """
+    Option line settings and location of the network data of a file.
+
+    Attributes:
+        n_ports: Port count
+        multiplier: Frequency unit -> Hz factor
+        unit: Display frequency unit
+        data_format: "MA", "DB" or "RI"
+        z0: Reference impedance (scalar or one value per port)
+        column_order_2port: 2-port data is S11 S21 S12 S22 (1.x default)
+        data_start: Offset of the network data
+        data_end: Offset after the network data
+    """
+    n_ports: int
+    multiplier: float
+    unit: str
+    data_format: str
+    z0: Any
+    column_order_2port: bool
+    data_start: int
+    data_end: int
+
+    @property
+    def values_per_point(self) -> int:
+        """Numbers per frequency point (frequency + n*n value pairs)."""
+        return 1 + 2 * self.n_ports * self.n_ports
+
+
+def parse_touchstone(filepath: Union[str, Path]) -> DecodedNetwork:
+    """
+    Parse a Touchstone file into raw arrays.
+
+    Args:
+        filepath: Path of the Touchstone file (.s1p, .s2p, ...)
+
+    Returns:
+        DecodedNetwork with frequency_hz [f], s [f, n, n], z0 [f, n],
+        the option line frequency unit and the file stem as name
+
+    Raises:
+        FileLoadError: If the file cannot be read, uses a feature this
+                      parser does not support, or is malformed
+    """
+    path = Path(filepath)
+    n_ports = port_count_from_extension(path)
+    try:
+        raw = path.read_bytes()
+    except OSError as e:
+        raise FileLoadError(f"Failed to read file {path}: {e}") from e
+    return parse_touchstone_bytes(raw, n_ports, name=path.stem)
+
+
+def parse_touchstone_bytes(raw: bytes, n_ports: int, name: str = None) -> DecodedNetwork:
+    """
+    Parse Touchstone file contents into raw arrays.
+
+    Args:
+        raw: File contents
+        n_ports: Port count (from the file extension)
+        name: Network name (typically the file stem)
+
+    Returns:
+        DecodedNetwork of the file contents
+
+    Raises:
+        FileLoadError: If the contents use an unsupported feature or are
+                      malformed
+    """
+    layout = _read_layout(raw, n_ports)
+    values = parse_values(_strip_non_numeric(raw[layout.data_start:layout.data_end]))
+
+    values_per_point = layout.values_per_point
+    if values.size == 0 or values.size % values_per_point:
+        raise FileLoadError(
+            f"Touchstone data has {values.size} values, not a multiple of "
+            f"{values_per_point} per point (noise data or truncated file)"
+        )
+    frequency_hz, s = _convert(values.reshape(-1, values_per_point), layout)
+    return _decoded(frequency_hz, s, layout, name)
+
+
+def parse_touchstone_mapped(
+    filepath: Union[str, Path],
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> DecodedNetwork:
+    """
+    Parse a Touchstone file through a memory map, chunk by chunk.
+
+    The file is never read into one bytes object. Each chunk of about
+    chunk_size bytes (cut after a line end) is tokenized by numpy, and
+    its complete frequency points are converted straight into the result
+    arrays; the values of a point cut by the chunk boundary are carried
+    over to the next chunk. The result arrays are allocated once, sized
+    from the bytes per point of the first chunk, and trimmed at the end.
+
+    Peak memory is the result arrays plus a few chunk-sized temporaries,
+    compared to the file text, the tokenized values and the complex
+    intermediates all at full size for parse_touchstone.
+
+    Args:
+        filepath: Path of the Touchstone file (.s1p, .s2p, ...)
+        chunk_size: Approximate bytes of text tokenized at a time
+
+    Returns:
+        DecodedNetwork equal to parse_touchstone's result
+
+    Raises:
+        FileLoadError: If the file cannot be read, uses a feature this
+                      parser does not support, or is malformed
+    """
+    path = Path(filepath)
+    n_ports = port_count_from_extension(path)
+    try:
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return _parse_mapped(mapped, n_ports, path.stem, chunk_size)
+    except (OSError, ValueError) as e:
+        # ValueError: an empty file cannot be mapped
+        raise FileLoadError(f"Failed to map file {path}: {e}") from e
+
+
+def parse_values(text: bytes) -> np.ndarray:
+    """
+    Tokenize whitespace-separated numbers into a float64 array.
+
+    numpy parses the text directly - no Python list of tokens is built.
+
+    Args:
+        text: Numeric text (no comments, option or keyword lines)
+
+    Returns:
+        Flat float64 array
+
+    Raises:
+        FileLoadError: If the text contains anything but numbers
+    """
+    if text.isspace():
+        # numpy returns [-1.0] for whitespace-only text (comment-only chunks)
+        return np.empty(0)
+    try:
+        with warnings.catch_warnings():
+            # numpy < 2.3 only warns (and returns a partial array) on bad data
+            warnings.simplefilter("error", DeprecationWarning)
+            return np.fromstring(text, dtype=np.float64, sep=" ")
+    except (ValueError, DeprecationWarning) as e:
+        raise FileLoadError(f"Malformed Touchstone data: {e}") from e
+
+
+def _parse_mapped(
+    mapped: mmap.mmap,
+    n_ports: int,
+    name: str,
+    chunk_size: int
+) -> DecodedNetwork:
+    """
+    Parse a memory-mapped file chunk by chunk (see parse_touchstone_mapped).
+
+    Args:
+        mapped: Read-only memory map of the file
+        n_ports: Port count (from the file extension)
+        name: Network name
+        chunk_size: Approximate bytes of text per chunk
+
+    Returns:
+        DecodedNetwork of the file contents
+
+    Raises:
+        FileLoadError: If the data is malformed or truncated
+    """
+    layout = _read_layout(mapped, n_ports)
+    values_per_point = layout.values_per_point
+    n = layout.n_ports
+    data_bytes = layout.data_end - layout.data_start
+
+    frequency_hz: Optional[np.ndarray] = None
+    s: Optional[np.ndarray] = None
+    n_points = 0
+    carry = np.empty(0)  # Values of a point cut by the chunk boundary
+
+    position = layout.data_start
+    while position < layout.data_end:
+        end = min(position + max(chunk_size, 1), layout.data_end)
+        if end < layout.data_end:
+            # Cut after a line end so no number or comment is split
+            newline = mapped.find(b"\n", end, layout.data_end)
+            end = layout.data_end if newline < 0 else newline + 1
+        # Slicing copies just this chunk out of the map (np.fromstring
+        # needs bytes, not a memoryview)
+        values = parse_values(_strip_non_numeric(mapped[position:end]))
+        if carry.size:
+            values = np.concatenate((carry, values))
+        complete = values.size - values.size % values_per_point
+        carry = values[complete:].copy()
+        position = end
+        if not complete:
+            continue
+
+        chunk_frequency, chunk_s = _convert(values[:complete].reshape(-1, values_per_point), layout)
+        count = chunk_frequency.size
+        if s is None:
+            # Size the result from the bytes per point seen so far
+            bytes_per_point = (end - layout.data_start) / count
+            capacity = int(data_bytes / bytes_per_point * _CAPACITY_HEADROOM) + 1
+            frequency_hz = np.empty(capacity)
+            s = np.empty((capacity, n, n), dtype=np.complex128)
+        elif n_points + count > s.shape[0]:
+            # Estimate was short - grow in place (realloc, no second array)
+            capacity = max(n_points + count, int(s.shape[0] * 1.25))
+            frequency_hz.resize(capacity, refcheck=False)
+            s.resize((capacity, n, n), refcheck=False)
+        frequency_hz[n_points:n_points + count] = chunk_frequency
+        s[n_points:n_points + count] = chunk_s
+        n_points += count
+
+    if s is None or carry.size:
+        raise FileLoadError(
+            f"Touchstone data is not a whole number of {values_per_point}-value "
+            f"points (noise data or truncated file)"
+        )
+    # Give back the unused capacity
+    frequency_hz.resize(n_points, refcheck=False)
+    s.resize((n_points, n, n), refcheck=False)
+    return _decoded(frequency_hz, s, layout, name)
+
+
+def _read_layout(buffer: Any, n_ports: int) -> _Layout:
+    """
+    Read the option line and locate the network data.
+
+    Works on bytes and memory maps alike; the data itself is not copied.
+
+    Args:
+        buffer: File contents (bytes or mmap)
+        n_ports: Port count from the file extension
+
+    Returns:
+        _Layout of the file
+
+    Raises:
+        FileLoadError: If the option line or a keyword is not supported
+    """
+    # The option line precedes the data (only [Version] and comments come
+    # before it), so only the text after it is processed further - the
+    # (usually long) comment header is never scanned again
+    option_match = _OPTION_LINE.search(buffer)
+    if option_match is not None:
+        option_line = option_match.group(0).decode("latin-1").split("!", 1)[0].strip()
+        data_start = option_match.end()
+    else:
+        option_line = "#"
+        data_start = 0
+    try:
+        multiplier, unit, parameter, data_format, z0 = parse_option_line(option_line)
+    except ValueError as e:
+        raise FileLoadError(f"Malformed Touchstone option line '{option_line}': {e}") from e
+    if parameter != "S":
+        raise FileLoadError(f"{parameter}-parameter files are not supported by the native parser")
+
+    # Touchstone 1.x 2-port data is S11 S21 S12 S22 (column order)
+    column_order_2port = True
+    data_end = len(buffer)
+    if buffer.find(b"[", data_start) >= 0:
+        n_ports, column_order_2port, reference, data_start, data_end = _network_data_section(
+            buffer, data_start, n_ports
+        )
+        if reference is not None:
+            z0 = reference
+
+    return _Layout(
+        n_ports=n_ports,
+        multiplier=multiplier,
+        unit=unit,
+        data_format=data_format,
+        z0=z0,
+        column_order_2port=column_order_2port,
+        data_start=data_start,
+        data_end=data_end,
+    )
+
+
+def _network_data_section(buffer: Any, start: int, n_ports: int) -> Tuple:
+    """
+    Interpret Touchstone 2.0 keywords and locate the network data.
+
+    Args:
+        buffer: File contents (bytes or mmap)
+        start: Offset after the option line
+        n_ports: Port count from the file extension
+
+    Returns:
+        Tuple of (port count, 2-port column order flag, per-port reference
+                  impedances or None, data start offset, data end offset)
+
+    Raises:
+        FileLoadError: If a keyword is not supported or has a malformed value
+    """
+    data_start, data_end = None, len(buffer)
+    column_order_2port = True
+    reference = None
+    found_keyword = False
+    for match in _KEYWORD_LINE.finditer(buffer, start):
+        found_keyword = True
+        keyword = match.group(1).decode("latin-1").strip().lower()
+        value = match.group(2).decode("latin-1").split("!", 1)[0].strip()
+        if keyword not in _SUPPORTED_KEYWORDS:
+            raise FileLoadError(f"Touchstone keyword [{keyword}] is not supported by the native parser")
+        if keyword == "number of ports":
+            try:
+                n_ports = int(value)
+            except ValueError as e:
+                raise FileLoadError(f"Malformed [Number of Ports] value '{value}': {e}") from e
+            if n_ports < 1:
+                raise FileLoadError(f"Invalid [Number of Ports] value '{value}'")
+        elif keyword == "reference":
+            try:
+                reference = np.array(value.split(), dtype=np.float64)
+            except ValueError as e:
+                raise FileLoadError(f"Malformed [Reference] values '{value}': {e}") from e
+        elif keyword == "two-port data order":
+            column_order_2port = value == "21_12"
+        elif keyword == "matrix format" and value.lower() != "full":
+            raise FileLoadError(f"Matrix format '{value}' is not supported by the native parser")
+        elif keyword == "network data":
+            data_start = match.end()
+        elif keyword == "end":
+            data_end = match.start()
+            break
+    if not found_keyword:
+        # Only a "[" inside a comment - a Touchstone 1.x file
+        return n_ports, column_order_2port, None, start, data_end
+    if data_start is None:
+        raise FileLoadError("Touchstone 2.0 file without [Network Data]")
+    if reference is not None and reference.size != n_ports:
+        # Values wrapped onto the following lines
+        raise FileLoadError("Multi-line [Reference] is not supported by the native parser")
+    return n_ports, column_order_2port, reference, data_start, data_end
+
+
+def _strip_non_numeric(text: bytes) -> bytes:
+    """
+    Remove comments and repeated option lines from network data text.
+
+    Args:
+        text: Network data (or a chunk of it, cut at a line end)
+
+    Returns:
+        Numeric text (the input itself if there is nothing to remove)
+    """
+    if b"!" in text:
+        text = _COMMENT.sub(b"", text)
+    if b"#" in text:
+        text = _OPTION_LINE.sub(b"", text)  # Repeated option lines are ignored
+    return text
+
+
+def _convert(table: np.ndarray, layout: _Layout) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert data rows to frequencies in Hz and the complex S-matrix.
+
+    Args:
+        table: Values, shape [points, 1 + 2*n*n]
+        layout: Layout of the file
+
+    Returns:
+        Tuple of (frequency_hz [points], s [points, n, n])
+    """
+    n = layout.n_ports
+    frequency_hz = table[:, 0] * layout.multiplier
+    s = _to_complex(table[:, 1::2], table[:, 2::2], layout.data_format).reshape(-1, n, n)
+    if n == 2 and layout.column_order_2port:
+        s = s.transpose(0, 2, 1)
+    return frequency_hz, s
+
+
+def _decoded(
+    frequency_hz: np.ndarray,
+    s: np.ndarray,
+    layout: _Layout,
+    name: Optional[str]
+) -> DecodedNetwork:
+    """
+    Check the frequencies and wrap the parsed arrays.
+
+    Args:
+        frequency_hz: Frequencies in Hz
+        s: Complex S-matrix [f, n, n]
+        layout: Layout of the file
+        name: Network name
+
+    Returns:
+        DecodedNetwork
+
+    Raises:
+        FileLoadError: If the frequencies are not increasing (noise data
+                      read as network data)
+    """
+    if frequency_hz.size > 1 and not np.all(frequency_hz[1:] > frequency_hz[:-1]):
+        raise FileLoadError("Touchstone frequencies are not increasing (noise data?)")
+    return DecodedNetwork(
+        frequency_hz=frequency_hz,
+        s=np.ascontiguousarray(s),
+        z0=np.broadcast_to(
+            np.asarray(layout.z0, dtype=np.complex128), (frequency_hz.size, layout.n_ports)
+        ),
+        frequency_unit=layout.unit,
+        name=name,
+    )
+
+
+def _to_complex(a: np.ndarray, b: np.ndarray, data_format: str) -> np.ndarray:
+    """
+    Convert Touchstone value pairs to complex numbers.
+
+    Args:
+        a: First value of each pair (magnitude, dB or real part)
+        b: Second value of each pair (angle in degrees or imaginary part)
+        data_format: "MA", "DB" or "RI"
+
+    Returns:
+        Complex array with the shape of a
+    """
+    if data_format == "RI":
+        return a + 1j * b
+    magnitude = 10.0 ** (a / 20.0) if data_format == "DB" else a
+    return magnitude * np.exp(1j * np.deg2rad(b))
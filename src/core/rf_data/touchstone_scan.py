@@ -0,0 +1,277 @@
+"""
+Header-only Touchstone scanning.
+
+Several places only need the facts about a Touchstone file - its port
+count, the number of frequency points and the first/last frequency - not
+the S-parameter data itself. Building a scikit-rf Network for that parses
+and converts every value in the file.
+
+scan_touchstone() reads the option line, takes the port count from the
+extension (.s2p, .s4p, ...) and walks the data lines only far enough to
+count frequency points (one point is 1 + 2*n*n numbers, spread over one or
+more lines) and keep the first and last frequency. No values other than
+frequencies are converted and no Network is built.
+
+The same facts can be read from a stored codec blob (network_codec.read_header)
+or a loaded Network (header_from_network), so measurements store them as
+columns regardless of where their RF data came from.
+
+Supported: Touchstone 1.x files and 2.0 files with a full matrix. 2-port
+noise parameter data (after the network data) is ignored.
+"""
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from ..exceptions import FileLoadError
+
+
+# Touchstone extension: .s<ports>p (case insensitive)
+_EXTENSION_PATTERN = re.compile(r"^\.s(\d+)p$", re.IGNORECASE)
+
+# Option line frequency units -> (Hz multiplier, display unit)
+_FREQUENCY_UNITS = {
+    "HZ": (1.0, "Hz"),
+    "KHZ": (1e3, "kHz"),
+    "MHZ": (1e6, "MHz"),
+    "GHZ": (1e9, "GHz"),
+    "THZ": (1e12, "THz"),
+}
+_PARAMETERS = {"S", "Y", "Z", "H", "G"}
+_DATA_FORMATS = {"MA", "DB", "RI"}
+
+# Numbers per line of 2-port noise parameter data (network data has 9)
+_NOISE_VALUES = 5
+
+
+@dataclass(frozen=True)
+class TouchstoneHeader:
+    """
+    Facts about a Touchstone file (or stored network) without its data.
+
+    Attributes:
+        n_ports: Number of ports
+        n_points: Number of frequency points
+        freq_start_hz: First frequency in Hz
+        freq_stop_hz: Last frequency in Hz
+        frequency_unit: Display unit of the frequencies (e.g., "GHz")
+        parameter: Network parameter type ("S", "Y", "Z", "H" or "G")
+        data_format: Value format ("MA", "DB", "RI"), None if not from a file
+        z0: Reference impedance in ohms
+    """
+    n_ports: int
+    n_points: int
+    freq_start_hz: float
+    freq_stop_hz: float
+    frequency_unit: str = "GHz"
+    parameter: str = "S"
+    data_format: Optional[str] = None
+    z0: float = 50.0
+
+    @property
+    def freq_start_ghz(self) -> float:
+        """First frequency in GHz (the unit used throughout the application)."""
+        return self.freq_start_hz / 1e9
+
+    @property
+    def freq_stop_ghz(self) -> float:
+        """Last frequency in GHz."""
+        return self.freq_stop_hz / 1e9
+
+
+def port_count_from_extension(filepath: Union[str, Path]) -> int:
+    """
+    Get the port count encoded in a Touchstone file extension.
+
+    Free (the file is not opened), so callers can reject files with the
+    wrong port count before reading them.
+
+    Args:
+        filepath: Path of a .s<n>p file
+
+    Returns:
+        Port count n
+
+    Raises:
+        FileLoadError: If the extension is not a Touchstone extension
+    """
+    match = _EXTENSION_PATTERN.match(Path(filepath).suffix)
+    if match is None or int(match.group(1)) < 1:
+        raise FileLoadError(
+            f"File does not appear to be a Touchstone file: {filepath}. "
+            f"Expected extension like .s2p, .s4p, etc."
+        )
+    return int(match.group(1))
+
+
+def check_port_count(filepath: Union[str, Path], required_ports: int) -> int:
+    """
+    Reject a Touchstone file with too few ports for a device.
+
+    Uses the extension only, so a wrong file is rejected before it is
+    hashed or parsed.
+
+    Args:
+        filepath: Path of a .s<n>p file
+        required_ports: Highest port number the device uses
+
+    Returns:
+        Port count of the file
+
+    Raises:
+        FileLoadError: If the file has fewer ports than required (or is
+                      not a Touchstone file)
+    """
+    n_ports = port_count_from_extension(filepath)
+    if n_ports < required_ports:
+        raise FileLoadError(
+            f"{Path(filepath).name} has {n_ports} ports, but the device "
+            f"uses port {required_ports}"
+        )
+    return n_ports
+
+
+def scan_touchstone(filepath: Union[str, Path]) -> TouchstoneHeader:
+    """
+    Read the header facts of a Touchstone file without parsing its data.
+
+    Args:
+        filepath: Path of the Touchstone file
+
+    Returns:
+        TouchstoneHeader of the file
+
+    Raises:
+        FileLoadError: If the file cannot be read, has an unsupported
+                      layout, or its data is malformed or truncated
+    """
+    path = Path(filepath)
+    n_ports = port_count_from_extension(path)
+    values_per_point = 1 + 2 * n_ports * n_ports
+
+    options = None
+    n_points = 0
+    remaining = 0  # Numbers still expected for the current point
+    first = last = None
+    try:
+        # latin-1 decodes any byte - instrument comments are not always UTF-8
+        with open(path, "r", encoding="latin-1") as f:
+            for raw_line in f:
+                line = raw_line.split("!", 1)[0].strip()
+                if not line:
+                    continue
+                if line[0] == "#":
+                    # Only the first option line counts (Touchstone spec)
+                    if options is None:
+                        options = parse_option_line(line)
+                    continue
+                if line[0] == "[":
+                    keyword, _, value = line[1:].partition("]")
+                    keyword = keyword.strip().lower()
+                    if keyword == "number of ports":
+                        n_ports = int(value)
+                        values_per_point = 1 + 2 * n_ports * n_ports
+                    elif keyword == "matrix format" and value.strip().lower() != "full":
+                        raise FileLoadError(
+                            f"Cannot scan {path}: matrix format '{value.strip()}' "
+                            f"is not supported"
+                        )
+                    elif keyword in ("noise data", "end"):
+                        break
+                    continue
+
+                tokens = line.split()
+                if remaining == 0:
+                    # First line of a new frequency point
+                    if n_ports == 2 and n_points and len(tokens) == _NOISE_VALUES:
+                        break  # Touchstone 1.x noise parameters follow
+                    last = float(tokens[0])
+                    if first is None:
+                        first = last
+                    n_points += 1
+                    remaining = values_per_point
+                remaining -= len(tokens)
+                if remaining < 0:
+                    raise FileLoadError(
+                        f"Malformed Touchstone data in {path} at frequency point "
+                        f"{n_points}: expected {values_per_point} values per point"
+                    )
+    except OSError as e:
+        raise FileLoadError(f"Failed to read file {path}: {e}") from e
+    except ValueError as e:
+        raise FileLoadError(f"Malformed Touchstone file {path}: {e}") from e
+
+    if n_points == 0:
+        raise FileLoadError(f"Touchstone file {path} contains no data")
+    if remaining:
+        raise FileLoadError(f"Truncated Touchstone file {path}: last point is incomplete")
+
+    multiplier, unit, parameter, data_format, z0 = options or parse_option_line("#")
+    return TouchstoneHeader(
+        n_ports=n_ports,
+        n_points=n_points,
+        freq_start_hz=first * multiplier,
+        freq_stop_hz=last * multiplier,
+        frequency_unit=unit,
+        parameter=parameter,
+        data_format=data_format,
+        z0=z0,
+    )
+
+
+def header_from_network(network: Any) -> TouchstoneHeader:
+    """
+    Get the header facts of a loaded scikit-rf Network.
+
+    Args:
+        network: scikit-rf Network object
+
+    Returns:
+        TouchstoneHeader (data_format is None - not known after loading)
+    """
+    frequency_hz = network.f
+    z0 = network.z0
+    return TouchstoneHeader(
+        n_ports=int(network.nports),
+        n_points=len(frequency_hz),
+        freq_start_hz=float(frequency_hz[0]),
+        freq_stop_hz=float(frequency_hz[-1]),
+        frequency_unit=network.frequency.unit,
+        z0=float(z0.flat[0].real) if z0.size else 50.0,
+    )
+
+
+def parse_option_line(line: str) -> tuple:
+    """
+    Parse a Touchstone option line ("# GHz S MA R 50").
+
+    Missing fields take the Touchstone defaults (GHz, S, MA, R 50).
+
+    Args:
+        line: Option line including the leading "#"
+
+    Returns:
+        Tuple of (Hz multiplier, display unit, parameter, data format, z0)
+
+    Raises:
+        ValueError: If the reference impedance is not a number
+    """
+    multiplier, unit = _FREQUENCY_UNITS["GHZ"]
+    parameter, data_format, z0 = "S", "MA", 50.0
+    tokens = line[1:].upper().split()
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token in _FREQUENCY_UNITS:
+            multiplier, unit = _FREQUENCY_UNITS[token]
+        elif token in _PARAMETERS:
+            parameter = token
+        elif token in _DATA_FORMATS:
+            data_format = token
+        elif token == "R" and i + 1 < len(tokens):
+            z0 = float(tokens[i + 1])
+            i += 1
+        i += 1
+    return multiplier, unit, parameter, data_format, z0
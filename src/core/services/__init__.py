@@ -14,16 +14,20 @@ Services provided:
 - DeviceService: Device and test criteria management
 - MeasurementService: File loading and measurement management
 - ComplianceService: Pass/fail evaluation and result storage
+- BulkIngestService: Parallel ingest of whole directory trees
 """
 
 from .device_service import DeviceService
 from .measurement_service import MeasurementService
 from .compliance_service import ComplianceService
 from .plotting_service import PlottingService
+from .bulk_ingest_service import BulkIngestService, IngestReport
 
 __all__ = [
     "DeviceService",
     "MeasurementService",
     "ComplianceService",
-    "PlottingService"
+    "PlottingService",
+    "BulkIngestService",
+    "IngestReport"
 ]
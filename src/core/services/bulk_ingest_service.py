@@ -0,0 +1,444 @@
+"""
+Bulk directory ingest service.
+
+Backfilling a measurement campaign means loading thousands of Touchstone
+files. MeasurementService.load_multiple_files handles one 2- or 4-file set
+at a time and parses sequentially, which leaves every core but one idle.
+
+BulkIngestService walks a directory tree and fans the CPU-bound work
+(filename parsing, Touchstone parsing, encoding to the storage codec) out to
+a process pool. Workers return ready-to-store codec bytes, so the parent
+process only groups files into PRI/RED (or HG/LG) sets and streams them to a
+single writer that inserts in batches (one transaction per batch).
+
+SQLite allows one writer at a time, so keeping all database writes in the
+parent process is both simpler and faster than letting workers write.
+
+Workers check each file's port count (from its extension) against the
+device first, then hash it. Files already stored (same content hash) are
+not parsed again; their measurements reference the stored data and only
+the file header is scanned for the port/frequency facts.
+
+Per-file errors (unparseable filenames, corrupt Touchstone files, duplicate
+files for the same set) are collected in the IngestReport instead of
+aborting the run.
+"""
+
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, Iterator, List, Optional, Tuple, Union
+
+from ..models.device import Device
+from ..models.measurement import Measurement
+from ..repositories.measurement_repository import MeasurementRepository
+from ..repositories.device_repository import DeviceRepository
+from ..rf_data.touchstone_loader import TouchstoneLoader
+from ..rf_data.touchstone_scan import TouchstoneHeader, check_port_count, header_from_network
+from ..exceptions import DeviceNotFoundError, MacallanRFError
+
+
+# Touchstone extensions: .s2p, .s4p, ... .s10p (case insensitive)
+TOUCHSTONE_SUFFIX_PATTERN = re.compile(r"^\.s\d+p$", re.IGNORECASE)
+
+# Multi-gain path suffix: PRI_HG, RED-LG, ... (FilenameParser only extracts
+# the PRI/RED part, the gain suffix is picked up here)
+GAIN_PATH_PATTERN = re.compile(r"(?i)[_.-](PRI|RED)[_-](HG|LG)(?:[_.-]|$)")
+
+# Temperature delimited by separators (e.g., "_PRI_HOT.s4p"). FilenameParser
+# uses word boundaries, which never match next to "_", and the interactive
+# loader relies on the user-selected temperature instead. Bulk ingest has no
+# user selection, so files without a temperature token are treated as AMB.
+TEMPERATURE_PATTERN = re.compile(r"(?i)[_.-](AMB|HOT|COLD)(?:[_.-]|$)")
+
+# Path types that make up a complete set for each device mode
+STANDARD_PATHS = frozenset({"PRI", "RED"})
+MULTI_GAIN_PATHS = frozenset({"PRI_HG", "PRI_LG", "RED_HG", "RED_LG"})
+
+# Set key: (serial_number, temperature, run_number)
+SetKey = Tuple[str, str, str]
+
+
+@dataclass
+class IngestError:
+    """
+    A file that could not be ingested.
+
+    Attributes:
+        file_path: Path of the offending file
+        message: Human-readable reason
+    """
+    file_path: str
+    message: str
+
+
+@dataclass
+class IngestReport:
+    """
+    Summary of a bulk ingest run.
+
+    Attributes:
+        files_found: Touchstone files discovered under the root directory
+        measurements_saved: Measurements inserted into the database
+        complete_sets: Number of sets with every expected path type
+        incomplete_sets: Sets missing path types, mapped to the missing paths
+                         (their files are still saved)
+        errors: Files that could not be ingested
+        warnings: Non-fatal issues (e.g., part number mismatch)
+        elapsed_s: Wall-clock duration of the run in seconds
+    """
+    files_found: int = 0
+    measurements_saved: int = 0
+    complete_sets: int = 0
+    incomplete_sets: Dict[SetKey, List[str]] = field(default_factory=dict)
+    errors: List[IngestError] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    elapsed_s: float = 0.0
+
+    @property
+    def failed(self) -> int:
+        """Number of files that could not be ingested."""
+        return len(self.errors)
+
+
+@dataclass
+class _ParsedFile:
+    """
+    Result of parsing one file in a worker process.
+
+    Must stay picklable - it is sent back from the worker processes.
+    On success metadata, content_hash and header are set; blob is None when
+    the content hash is already stored (file not parsed, header scanned).
+    On failure only error is set.
+    """
+    file_path: str
+    metadata: Optional[dict] = None
+    content_hash: Optional[str] = None
+    blob: Optional[bytes] = None
+    header: Optional[TouchstoneHeader] = None
+    error: Optional[str] = None
+
+
+# Per-process state, created once by _init_worker (also called directly when
+# parsing in-process) instead of once per file
+_worker_loader: Optional[TouchstoneLoader] = None
+_worker_known_hashes: FrozenSet[str] = frozenset()
+_worker_required_ports = 0
+
+
+def _init_worker(
+    storage_precision: str,
+    known_hashes: FrozenSet[str] = frozenset(),
+    required_ports: int = 0
+) -> None:
+    """
+    Process pool initializer: create the worker's TouchstoneLoader.
+
+    Args:
+        storage_precision: Codec precision passed to TouchstoneLoader
+        known_hashes: Content hashes already stored in the database
+        required_ports: Highest port number the device uses (files with
+                        fewer ports are rejected)
+    """
+    global _worker_loader, _worker_known_hashes, _worker_required_ports
+    _worker_loader = TouchstoneLoader(storage_precision=storage_precision)
+    _worker_known_hashes = known_hashes
+    _worker_required_ports = required_ports
+
+
+def _parse_file(file_path: str) -> _ParsedFile:
+    """
+    Parse one Touchstone file into metadata and codec bytes.
+
+    Runs in a worker process. Errors are returned rather than raised so one
+    bad file never aborts the pool. Files with too few ports are rejected
+    before they are read. Files whose content hash is already stored only
+    get their filename parsed and their header scanned.
+
+    Args:
+        file_path: Path of the Touchstone file
+
+    Returns:
+        _ParsedFile with metadata and encoded network, or an error message
+    """
+    try:
+        check_port_count(file_path, _worker_required_ports)
+        content_hash = _worker_loader.hash_file(file_path)
+        if content_hash in _worker_known_hashes:
+            network = None
+            header = _worker_loader.scan_file(file_path)
+            metadata = _worker_loader.parser.parse(file_path)
+        else:
+            network, metadata = _worker_loader.load_with_metadata(file_path)
+            header = header_from_network(network)
+        filename = Path(file_path).name
+        temperature_match = TEMPERATURE_PATTERN.search(filename)
+        if temperature_match:
+            metadata["temperature"] = temperature_match.group(1).upper()
+        # Refine PRI/RED to PRI_HG etc. for multi-gain files
+        gain_match = GAIN_PATH_PATTERN.search(filename)
+        if gain_match:
+            metadata["path_type"] = (
+                f"{gain_match.group(1)}_{gain_match.group(2)}".upper()
+            )
+        return _ParsedFile(
+            file_path=file_path,
+            metadata=metadata,
+            content_hash=content_hash,
+            blob=_worker_loader.serialize_network(network) if network is not None else None,
+            header=header,
+        )
+    except MacallanRFError as e:
+        return _ParsedFile(file_path=file_path, error=str(e))
+    except Exception as e:
+        # Unexpected parser failure - still report per file
+        return _ParsedFile(file_path=file_path, error=f"Unexpected error: {e}")
+
+
+class BulkIngestService:
+    """
+    Service for ingesting whole directory trees of Touchstone files.
+
+    Parsing runs in a ProcessPoolExecutor (scales with core count); the
+    calling process groups results into sets and writes them in batches.
+
+    Typical usage:
+        service = BulkIngestService(measurement_repo, device_repo)
+        report = service.ingest_directory(Path("campaign/"), device, "SIT")
+    """
+
+    def __init__(
+        self,
+        measurement_repository: MeasurementRepository,
+        device_repository: DeviceRepository,
+        max_workers: Optional[int] = None,
+        batch_size: int = 200,
+        storage_precision: str = "double"
+    ):
+        """
+        Initialize bulk ingest service.
+
+        Args:
+            measurement_repository: Repository for measurement writes
+            device_repository: Repository for device lookups
+            max_workers: Worker processes (default: os.cpu_count()).
+                         1 parses in-process without a pool.
+            batch_size: Measurements per insert transaction
+            storage_precision: Codec precision for stored networks
+                               ("double" or "single")
+        """
+        self.measurement_repo = measurement_repository
+        self.device_repo = device_repository
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.batch_size = max(1, batch_size)
+        self.storage_precision = storage_precision
+
+    def find_touchstone_files(self, root: Union[str, Path]) -> List[Path]:
+        """
+        Recursively find Touchstone files under a directory.
+
+        Args:
+            root: Directory to search
+
+        Returns:
+            Sorted list of Touchstone file paths
+        """
+        return sorted(
+            path for path in Path(root).rglob("*")
+            if path.is_file() and TOUCHSTONE_SUFFIX_PATTERN.match(path.suffix)
+        )
+
+    def ingest_directory(
+        self,
+        root: Union[str, Path],
+        device: Device,
+        test_stage: str,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> IngestReport:
+        """
+        Ingest every Touchstone file under a directory tree.
+
+        Files are grouped into sets by (serial number, temperature, run).
+        A set is written as soon as it is complete; sets still incomplete at
+        the end are written too and listed in the report.
+
+        Args:
+            root: Directory to ingest
+            device: Device the measurements belong to
+            test_stage: Test stage (user-selected, not from filename)
+            progress_callback: Optional callable(files_done, files_total)
+
+        Returns:
+            IngestReport summarizing the run
+
+        Raises:
+            DeviceNotFoundError: If the device doesn't exist in database
+            DatabaseError: If a batch insert fails (earlier batches stay saved)
+        """
+        if self.device_repo.get_by_id(device.id) is None:
+            raise DeviceNotFoundError(f"Device with id {device.id} not found")
+
+        start = time.perf_counter()
+        files = self.find_touchstone_files(root)
+        report = IngestReport(files_found=len(files))
+        expected_paths = MULTI_GAIN_PATHS if device.multi_gain_mode else STANDARD_PATHS
+
+        # Sets still waiting for files: key -> {path_type: Measurement}
+        pending: Dict[SetKey, Dict[str, Measurement]] = {}
+        batch: List[Measurement] = []
+
+        required_ports = max(device.get_all_ports(), default=0)
+        for done, parsed in enumerate(self._parse_all(files, required_ports), start=1):
+            if parsed.error is not None:
+                report.errors.append(IngestError(parsed.file_path, parsed.error))
+            else:
+                measurement = self._to_measurement(parsed, device, test_stage, report)
+                key = self._set_key(measurement)
+                members = pending.setdefault(key, {})
+
+                if measurement.path_type in members:
+                    report.errors.append(IngestError(
+                        parsed.file_path,
+                        f"Duplicate {measurement.path_type} file for set {key} "
+                        f"(already have {members[measurement.path_type].file_path})"
+                    ))
+                elif measurement.path_type not in expected_paths:
+                    report.errors.append(IngestError(
+                        parsed.file_path,
+                        f"Path type {measurement.path_type} does not match device mode "
+                        f"(expected one of {', '.join(sorted(expected_paths))})"
+                    ))
+                else:
+                    members[measurement.path_type] = measurement
+                    # Complete set - hand it to the writer
+                    if set(members) == expected_paths:
+                        batch.extend(pending.pop(key).values())
+                        report.complete_sets += 1
+
+                if len(batch) >= self.batch_size:
+                    report.measurements_saved += len(self.measurement_repo.create_many(batch))
+                    batch = []
+
+            if progress_callback:
+                progress_callback(done, len(files))
+
+        # Flush incomplete sets (saved, but reported)
+        for key, members in pending.items():
+            if not members:
+                continue
+            report.incomplete_sets[key] = sorted(expected_paths - set(members))
+            batch.extend(members.values())
+        if batch:
+            report.measurements_saved += len(self.measurement_repo.create_many(batch))
+
+        report.elapsed_s = time.perf_counter() - start
+        return report
+
+    def _parse_all(self, files: List[Path], required_ports: int = 0) -> Iterator[_ParsedFile]:
+        """
+        Parse files, in a process pool when more than one worker is configured.
+
+        Results are yielded in file order as they become available, so the
+        writer can start inserting before parsing finishes.
+
+        Args:
+            files: Touchstone files to parse
+            required_ports: Highest port number the device uses
+
+        Yields:
+            _ParsedFile per input file
+        """
+        paths = [str(path) for path in files]
+        known_hashes = frozenset(self.measurement_repo.get_content_hashes())
+        if self.max_workers == 1 or len(paths) <= 1:
+            _init_worker(self.storage_precision, known_hashes, required_ports)
+            yield from map(_parse_file, paths)
+            return
+
+        # "spawn" is safe when called from a GUI thread (forking a
+        # multi-threaded Qt process is not) and behaves the same on all OSes
+        context = multiprocessing.get_context("spawn")
+        workers = min(self.max_workers, len(paths))
+        # A few chunks per worker amortizes IPC overhead while still
+        # balancing load across uneven file sizes
+        chunksize = max(1, len(paths) // (workers * 4))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.storage_precision, known_hashes, required_ports),
+        ) as executor:
+            yield from executor.map(_parse_file, paths, chunksize=chunksize)
+
+    def _to_measurement(
+        self,
+        parsed: _ParsedFile,
+        device: Device,
+        test_stage: str,
+        report: IngestReport
+    ) -> Measurement:
+        """
+        Build a Measurement (with pre-encoded RF data) from a parsed file.
+
+        Args:
+            parsed: Successful worker result
+            device: Target device
+            test_stage: Test stage (user-selected)
+            report: Report to append part number warnings to
+
+        Returns:
+            Measurement ready for create_many (touchstone_data is codec
+            bytes, or a lazy proxy of the stored data for known files)
+        """
+        metadata = parsed.metadata
+        part_number = metadata.get("part_number")
+        if part_number and part_number != device.part_number:
+            report.warnings.append(
+                f"{metadata['filename']}: part number in filename ({part_number}) "
+                f"does not match device part number ({device.part_number})"
+            )
+        if parsed.blob is not None:
+            touchstone_data = parsed.blob  # Already encoded - stored as-is
+        else:
+            touchstone_data = self.measurement_repo.get_lazy_network_by_content_hash(
+                parsed.content_hash
+            )
+        header = parsed.header
+        return Measurement(
+            device_id=device.id,
+            serial_number=metadata["serial_number"],
+            test_type=metadata.get("test_type", "S-Parameters"),
+            test_stage=test_stage,
+            temperature=metadata["temperature"],
+            path_type=metadata["path_type"],
+            file_path=metadata["file_path"],
+            measurement_date=metadata["date"],
+            touchstone_data=touchstone_data,
+            metadata=metadata,
+            content_hash=parsed.content_hash,
+            n_ports=header.n_ports if header else None,
+            n_points=header.n_points if header else None,
+            freq_start=header.freq_start_ghz if header else None,
+            freq_stop=header.freq_stop_ghz if header else None
+        )
+
+    @staticmethod
+    def _set_key(measurement: Measurement) -> SetKey:
+        """
+        Grouping key for a measurement's file set.
+
+        Args:
+            measurement: Measurement built from a parsed file
+
+        Returns:
+            (serial_number, temperature, run_number) - run is "" if absent
+        """
+        return (
+            measurement.serial_number,
+            measurement.temperature,
+            measurement.metadata.get("run_number") or "",
+        )
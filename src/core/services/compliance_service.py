@@ -9,24 +9,29 @@ evaluation using test types from the TestTypeRegistry. It handles:
 - Retrieving compliance results for display
 - Marking results as stale when criteria change
 - Aggregating pass/fail status across all results
+- Storing band metrics so re-evaluation after criteria changes compares
+  stored numbers instead of re-processing RF data
 
 The service can evaluate automatically when measurements are loaded, or
 manually when requested. It evaluates all measurements at once (all
 temperatures, all paths) for comprehensive compliance checking.
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
 
 from ..models.measurement import Measurement
+from ..models.measurement_metrics import MeasurementMetrics
 from ..models.device import Device
 from ..models.test_criteria import TestCriteria
-from ..models.test_result import TestResult
+from ..models.test_result import TestResult, ResultSummary
 from ..repositories.measurement_repository import MeasurementRepository
+from ..repositories.measurement_metrics_repository import MeasurementMetricsRepository
 from ..repositories.test_criteria_repository import TestCriteriaRepository
 from ..repositories.device_repository import DeviceRepository
 from ..repositories.test_result_repository import TestResultRepository
 from ..test_types.registry import TestTypeRegistry
+from ..test_types.base import AbstractTestType
 from ..exceptions import DeviceNotFoundError, DatabaseError
 
 
@@ -55,7 +60,8 @@ class ComplianceService:
         device_repository: DeviceRepository,
         result_repository: TestResultRepository,
         test_type_registry: Optional[TestTypeRegistry] = None,
-        auto_evaluate_on_load: bool = True
+        auto_evaluate_on_load: bool = True,
+        metrics_repository: Optional[MeasurementMetricsRepository] = None
     ):
         """
         Initialize compliance service with dependencies.
@@ -67,6 +73,9 @@ class ComplianceService:
             result_repository: Repository for result storage
             test_type_registry: Optional - creates default if not provided
             auto_evaluate_on_load: If True, automatically evaluate when measurements loaded
+            metrics_repository: Optional - stores band metrics for test types
+                               that support them. Without it, every
+                               evaluation processes the RF data.
         """
         self.measurement_repo = measurement_repository
         self.criteria_repo = criteria_repository  # Make accessible for GUI
@@ -74,6 +83,7 @@ class ComplianceService:
         self.result_repo = result_repository
         self.registry = test_type_registry or TestTypeRegistry()
         self.auto_evaluate_on_load = auto_evaluate_on_load
+        self.metrics_repo = metrics_repository
     
     def evaluate_compliance(
         self,
@@ -87,7 +97,9 @@ class ComplianceService:
         This method:
         1. Gets criteria for device/test_type/test_stage
         2. Gets appropriate test type from registry
-        3. Calls test_type.evaluate_compliance()
+        3. Evaluates from stored band metrics if the test type supports them
+           (computing and storing any missing bands), otherwise calls
+           test_type.evaluate_compliance()
         4. Returns list of TestResult objects
         
         Note: Results are NOT saved automatically - caller must call save_test_results().
@@ -125,16 +137,7 @@ class ComplianceService:
             # No test type registered - return empty results
             return []
         
-        # Evaluate compliance using test type
-        results = test_type.evaluate_compliance(
-            measurement=measurement,
-            device=device,
-            test_criteria=criteria,
-            operational_freq_min=device.operational_freq_min,
-            operational_freq_max=device.operational_freq_max
-        )
-        
-        return results
+        return self._evaluate(measurement, device, criteria, test_type)
     
     def evaluate_all_measurements(
         self,
@@ -173,21 +176,159 @@ class ComplianceService:
         all_measurements = self.measurement_repo.get_by_device(device_id)
         measurements = [m for m in all_measurements if m.test_type == test_type]
         
-        # Evaluate each measurement against the specified test_stage criteria
-        all_results = {}
-        for measurement in measurements:
-            results = self.evaluate_compliance(measurement, device, test_stage)
-            all_results[measurement.id] = results
+        # Criteria and test type are shared by every measurement - look up once
+        criteria = self.criteria_repo.get_by_device_and_test(device_id, test_type, test_stage)
+        test_type_impl = self.registry.get(test_type)
+        if not criteria or test_type_impl is None:
+            return {measurement.id: [] for measurement in measurements}
+        
+        bands = test_type_impl.get_metric_bands(
+            criteria, device.operational_freq_min, device.operational_freq_max
+        )
+        if not bands or self.metrics_repo is None:
+            # Test type processes each measurement's RF data
+            return {
+                measurement.id: test_type_impl.evaluate_compliance(
+                    measurement=measurement,
+                    device=device,
+                    test_criteria=criteria,
+                    operational_freq_min=device.operational_freq_min,
+                    operational_freq_max=device.operational_freq_max
+                )
+                for measurement in measurements
+            }
+        
+        # Stored metrics for the whole campaign in one query
+        stored_metrics = self.metrics_repo.get_for_measurements(
+            [m.id for m in measurements], test_type_impl.metrics_version
+        )
         
-        return all_results
+        # Metrics missing from storage are computed for the whole campaign
+        # at once (stacked arrays), then every measurement is a comparison
+        band_metrics = self._complete_band_metrics(
+            measurements, bands, criteria, test_type_impl, stored_metrics
+        )
+        return {
+            measurement.id: test_type_impl.evaluate_band_metrics(
+                measurement, device, criteria, band_metrics[measurement.id],
+                device.operational_freq_min, device.operational_freq_max
+            )
+            for measurement in measurements
+        }
+    
+    def _evaluate(
+        self,
+        measurement: Measurement,
+        device: Device,
+        criteria: List[TestCriteria],
+        test_type: AbstractTestType
+    ) -> List[TestResult]:
+        """
+        Evaluate one measurement, from stored band metrics when possible.
+        
+        Band metrics missing from storage (new measurement, new OOB range,
+        new calculator version) are computed from the RF data once and
+        stored; afterwards criteria changes never touch the RF data.
+        
+        Args:
+            measurement: Measurement to evaluate
+            device: Device configuration
+            criteria: Criteria for the measurement's test type and stage
+            test_type: Test type implementation
+            
+        Returns:
+            List of TestResult objects
+        """
+        bands = test_type.get_metric_bands(
+            criteria, device.operational_freq_min, device.operational_freq_max
+        )
+        if not bands or self.metrics_repo is None:
+            # Evaluate compliance using test type (processes RF data)
+            return test_type.evaluate_compliance(
+                measurement=measurement,
+                device=device,
+                test_criteria=criteria,
+                operational_freq_min=device.operational_freq_min,
+                operational_freq_max=device.operational_freq_max
+            )
+        
+        stored_metrics = {
+            measurement.id: self.metrics_repo.get_for_measurement(
+                measurement.id, test_type.metrics_version
+            )
+        }
+        band_metrics = self._complete_band_metrics(
+            [measurement], bands, criteria, test_type, stored_metrics
+        )
+        return test_type.evaluate_band_metrics(
+            measurement, device, criteria, band_metrics[measurement.id],
+            device.operational_freq_min, device.operational_freq_max
+        )
+    
+    def _complete_band_metrics(
+        self,
+        measurements: List[Measurement],
+        bands: List[Tuple[float, float]],
+        criteria: List[TestCriteria],
+        test_type: AbstractTestType,
+        stored_metrics: Dict[UUID, Dict[Tuple[float, float], MeasurementMetrics]]
+    ) -> Dict[UUID, Dict[Tuple[float, float], MeasurementMetrics]]:
+        """
+        Add the band metrics missing from storage, computed in batches.
+        
+        Measurements missing the same bands (usually the whole campaign)
+        are computed together with compute_band_metrics_batch, and all
+        computed metrics are stored in one transaction.
+        
+        Args:
+            measurements: Measurements being evaluated
+            bands: Bands evaluation needs (get_metric_bands)
+            criteria: Criteria being evaluated (passed to the computation)
+            test_type: Test type implementation
+            stored_metrics: Stored metrics by measurement_id (may be partial)
+            
+        Returns:
+            Dictionary mapping measurement_id -> (band -> MeasurementMetrics)
+            with every band present
+        """
+        band_metrics = {
+            measurement.id: dict(stored_metrics.get(measurement.id, {}))
+            for measurement in measurements
+        }
+        
+        # Group by the set of missing bands - one batch per group
+        missing_groups: Dict[Tuple[Tuple[float, float], ...], List[Measurement]] = {}
+        for measurement in measurements:
+            missing = tuple(band for band in bands if band not in band_metrics[measurement.id])
+            if missing:
+                missing_groups.setdefault(missing, []).append(measurement)
+        
+        computed = []
+        for missing, group in missing_groups.items():
+            for measurement_id, metrics in test_type.compute_band_metrics_batch(
+                group, list(missing), criteria
+            ).items():
+                band_metrics[measurement_id].update(metrics)
+                computed.extend(metrics.values())
+        
+        if computed:
+            try:
+                self.metrics_repo.save_many(computed)
+            except DatabaseError:
+                # Metrics are a cache - e.g., the measurement is not saved
+                # yet (foreign key). Evaluation still uses computed values.
+                pass
+        return band_metrics
     
     def save_test_results(self, results: List[TestResult]) -> List[TestResult]:
         """
         Save test results to the database.
         
-        Stores all results from compliance evaluation. Each result is saved
-        individually. If results already exist for a measurement/criterion,
-        they are overwritten (new results replace old ones).
+        Stores all results from compliance evaluation in a single
+        transaction (one executemany, one commit). If results already exist
+        for a measurement/criterion/S-parameter, they are updated in place
+        (only if the value or verdict changed), so saving the same
+        evaluation twice is harmless.
         
         Args:
             results: List of TestResult objects to save
@@ -198,10 +339,8 @@ class ComplianceService:
         Raises:
             DatabaseError: If save operation fails
         """
-        saved = []
-        for result in results:
-            saved.append(self.result_repo.create(result))
-        return saved
+        self.result_repo.upsert_by_key(results)
+        return results
     
     def save_all_results(
         self,
@@ -211,7 +350,8 @@ class ComplianceService:
         Save all results from batch evaluation.
         
         Convenience method for saving results from evaluate_all_measurements().
-        Saves all results for all measurements.
+        Saves all results for all measurements in a single transaction,
+        updating existing results by key (see save_test_results).
         
         Args:
             results_by_measurement: Dictionary from evaluate_all_measurements()
@@ -219,10 +359,52 @@ class ComplianceService:
         Returns:
             Dictionary of saved results (same structure as input)
         """
-        saved = {}
-        for measurement_id, results in results_by_measurement.items():
-            saved[measurement_id] = self.save_test_results(results)
-        return saved
+        # One batched write for the whole campaign instead of one per measurement
+        all_results = [
+            result
+            for results in results_by_measurement.values()
+            for result in results
+        ]
+        self.result_repo.upsert_by_key(all_results)
+        return {
+            measurement_id: list(results)
+            for measurement_id, results in results_by_measurement.items()
+        }
+    
+    def replace_stage_results(
+        self,
+        results_by_measurement: Dict[UUID, List[TestResult]],
+        test_stage: str
+    ) -> Dict[UUID, List[TestResult]]:
+        """
+        Save a stage re-evaluation and drop results it no longer produces.
+        
+        Like save_all_results, existing results are updated in place by key.
+        In the same transaction, results of these measurements for the
+        stage's criteria that the evaluation did not produce (e.g., after a
+        port configuration change) are deleted, so the stored results match
+        the evaluation exactly.
+        
+        Args:
+            results_by_measurement: Evaluation results of every re-evaluated
+                                    measurement (empty lists included)
+            test_stage: Test stage the results were evaluated for
+            
+        Returns:
+            Dictionary of saved results (same structure as input)
+        """
+        all_results = [
+            result
+            for results in results_by_measurement.values()
+            for result in results
+        ]
+        self.result_repo.replace_stage_results(
+            list(results_by_measurement), test_stage, all_results
+        )
+        return {
+            measurement_id: list(results)
+            for measurement_id, results in results_by_measurement.items()
+        }
     
     def get_compliance_results(
         self,
@@ -245,31 +427,47 @@ class ComplianceService:
             List of TestResult objects for this measurement (excluding stale results)
             Empty list if no results found
         """
-        # Get all results for measurement
-        all_results = self.result_repo.get_by_measurement_id(measurement_id)
-        
-        # Filter out stale results - they need to be recalculated
-        fresh_results = [r for r in all_results if not r.is_stale]
-        
-        # Filter by test_stage if provided
-        # Results are linked to criteria via test_criteria_id, and criteria have test_stage
-        # So we need to check each result's criteria to filter by test_stage
-        if test_stage:
-            filtered_results = []
-            for result in fresh_results:
-                # Get the criterion for this result
-                criterion = self.criteria_repo.get_by_id(result.test_criteria_id)
-                if criterion and criterion.test_stage == test_stage:
-                    filtered_results.append(result)
-            return filtered_results
-        
-        return fresh_results
+        # One joined query - the stage filter is applied on the criterion
+        # columns in SQL instead of looking each result's criterion up
+        return [
+            result
+            for result, _ in self.result_repo.get_with_criteria([measurement_id], test_stage)
+        ]
+    
+    def get_compliance_results_with_criteria(
+        self,
+        measurement_ids: List[UUID],
+        test_stage: Optional[str] = None
+    ) -> Dict[UUID, List[Tuple[TestResult, TestCriteria]]]:
+        """
+        Retrieve compliance results with their criteria for many measurements.
+        
+        Used by the compliance table, which needs the requirement name,
+        limits and unit of every result. Everything is fetched in a single
+        query regardless of the number of measurements and results.
+        
+        Excludes stale results - they should be recalculated before being used.
+        
+        Args:
+            measurement_ids: UUIDs of the measurements
+            test_stage: Optional test stage filter (if None, gets all results)
+            
+        Returns:
+            Dictionary mapping measurement_id -> list of (TestResult, TestCriteria)
+            Measurements without results map to an empty list
+        """
+        by_measurement: Dict[UUID, List[Tuple[TestResult, TestCriteria]]] = {
+            measurement_id: [] for measurement_id in measurement_ids
+        }
+        for result, criterion in self.result_repo.get_with_criteria(measurement_ids, test_stage):
+            by_measurement[result.measurement_id].append((result, criterion))
+        return by_measurement
     
     def delete_results_for_measurement_and_stage(
         self,
         measurement_id: UUID,
         test_stage: str
-    ) -> None:
+    ) -> int:
         """
         Delete all results for a measurement/test_stage combination.
         
@@ -280,14 +478,31 @@ class ComplianceService:
         Args:
             measurement_id: Measurement whose results should be cleared
             test_stage: Test stage whose results should be removed
+            
+        Returns:
+            Number of results deleted
         """
-        results_to_delete = self.get_compliance_results(
-            measurement_id,
-            test_stage=test_stage
-        )
+        return self.delete_results_for_measurements_and_stage([measurement_id], test_stage)
+    
+    def delete_results_for_measurements_and_stage(
+        self,
+        measurement_ids: List[UUID],
+        test_stage: str
+    ) -> int:
+        """
+        Delete all results of many measurements for a test stage.
         
-        for result in results_to_delete:
-            self.result_repo.delete(result.id)
+        Clears a whole session with a single DELETE statement (stale and
+        current results of the stage's criteria).
+        
+        Args:
+            measurement_ids: Measurements whose results should be cleared
+            test_stage: Test stage whose results should be removed
+            
+        Returns:
+            Number of results deleted
+        """
+        return self.result_repo.delete_by_measurements_and_stage(measurement_ids, test_stage)
     
     def get_overall_pass_status(self, measurement_id: UUID) -> bool:
         """
@@ -303,13 +518,7 @@ class ComplianceService:
             True if all results pass, False if any result fails
             Returns True if no results found (nothing to fail)
         """
-        results = self.result_repo.get_by_measurement_id(measurement_id)
-        
-        if not results:
-            return True  # No results = nothing to fail
-        
-        # All results must pass for overall pass
-        return all(result.passed for result in results)
+        return self.get_overall_pass_status_for_all_measurements([measurement_id])[measurement_id]
     
     def get_overall_pass_status_for_all_measurements(
         self,
@@ -319,19 +528,50 @@ class ComplianceService:
         Get overall pass/fail status for multiple measurements.
         
         Convenience method for checking pass status across all measurements
-        for a device/test_stage combination.
+        for a device/test_stage combination. Uses one aggregate query (counts
+        per measurement) - no results are loaded.
         
         Args:
             measurement_ids: List of measurement UUIDs
             
         Returns:
             Dictionary mapping measurement_id -> pass_status (bool)
+            Measurements without results pass (nothing to fail)
         """
-        statuses = {}
-        for measurement_id in measurement_ids:
-            statuses[measurement_id] = self.get_overall_pass_status(measurement_id)
+        statuses = {measurement_id: True for measurement_id in measurement_ids}
+        for summary in self.result_repo.get_summaries(measurement_ids=measurement_ids):
+            statuses[summary.measurement_id] = summary.all_passed
         return statuses
     
+    def get_result_summaries(
+        self,
+        measurement_ids: Optional[List[UUID]] = None,
+        device_id: Optional[UUID] = None,
+        test_stage: Optional[str] = None,
+        group_by: str = "measurement"
+    ) -> List[ResultSummary]:
+        """
+        Get pass/fail/stale counts for status displays and reports.
+        
+        One aggregate query for any number of measurements, or for every
+        measurement of a device.
+        
+        Args:
+            measurement_ids: UUIDs of the measurements to summarize
+            device_id: Summarize every measurement of this device instead
+            test_stage: Optional test stage filter
+            group_by: "measurement", "stage" or "criterion"
+            
+        Returns:
+            List of ResultSummary objects (groups without results are absent)
+        """
+        return self.result_repo.get_summaries(
+            measurement_ids=measurement_ids,
+            device_id=device_id,
+            test_stage=test_stage,
+            group_by=group_by
+        )
+    
     def mark_results_stale_for_criteria(self, criteria_id: UUID) -> int:
         """
         Mark all test results for a criterion as stale.
@@ -360,15 +600,17 @@ class ComplianceService:
         Returns:
             Number of results deleted
         """
-        # Get all results for measurement
-        results = self.result_repo.get_by_measurement_id(measurement_id)
-        
-        # Delete stale ones
-        count = 0
-        for result in results:
-            if result.is_stale:
-                self.result_repo.delete(result.id)
-                count += 1
+        return self.delete_stale_results_for_measurements([measurement_id])
+    
+    def delete_stale_results_for_measurements(self, measurement_ids: List[UUID]) -> int:
+        """
+        Delete stale results of many measurements with a single statement.
         
-        return count
+        Args:
+            measurement_ids: UUIDs of the measurements
+            
+        Returns:
+            Number of results deleted
+        """
+        return self.result_repo.delete_stale(measurement_ids)
 
@@ -177,8 +177,8 @@ class DeviceService:
         # Get count of measurements if repository available
         measurement_count = 0
         if self.measurement_repo:
-            measurements = self.measurement_repo.get_by_device(device_id)
-            measurement_count = len(measurements)
+            # COUNT(*) query - never loads measurement BLOBs
+            measurement_count = self.measurement_repo.count_by_device(device_id)
         
         return {
             "device": device,
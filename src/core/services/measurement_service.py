@@ -23,11 +23,12 @@ from uuid import UUID
 from pathlib import Path
 
 from ..models.device import Device
-from ..models.measurement import Measurement
+from ..models.measurement import Measurement, MeasurementHeader
 from ..repositories.measurement_repository import MeasurementRepository
 from ..repositories.device_repository import DeviceRepository
 from ..rf_data.touchstone_loader import TouchstoneLoader
 from ..rf_data.filename_parser import FilenameParser
+from ..rf_data.touchstone_scan import check_port_count
 from ..exceptions import FileLoadError, ValidationError, DeviceNotFoundError
 
 
@@ -80,10 +81,13 @@ class MeasurementService:
         Load a single Touchstone file and create Measurement object.
         
         This method:
-        1. Loads the Touchstone file using scikit-rf
-        2. Parses filename metadata
-        3. Validates part number matches device (warns if mismatch)
-        4. Creates Measurement object with all metadata
+        1. Checks the file's port count (from its extension) covers the
+           device's ports, then hashes the file contents
+        2. Loads the Touchstone file using scikit-rf - or, if an identical
+           file was stored before, reuses its stored data without parsing
+        3. Parses filename metadata
+        4. Validates part number matches device (warns if mismatch)
+        5. Creates Measurement object with all metadata
         
         Note: Measurement is NOT saved to database - caller must call save_measurement().
         This allows caller to validate multiple files before saving.
@@ -100,7 +104,8 @@ class MeasurementService:
                             None if everything matches
             
         Raises:
-            FileLoadError: If file cannot be loaded or parsed
+            FileLoadError: If file cannot be loaded or parsed, or has fewer
+                          ports than the device uses
             DeviceNotFoundError: If device doesn't exist in database
         """
         # Verify device exists
@@ -108,8 +113,19 @@ class MeasurementService:
         if existing_device is None:
             raise DeviceNotFoundError(f"Device with id {device.id} not found")
         
-        # Load Touchstone file and parse metadata
-        network, metadata = self.loader.load_with_metadata(filepath)
+        # Wrong port count? Reject before reading the file at all
+        check_port_count(filepath, max(existing_device.get_all_ports(), default=0))
+        
+        # Identical file already stored? Reuse its encoded data (decoded
+        # lazily on first use) and only parse the filename
+        content_hash = self.loader.hash_file(filepath)
+        stored_data = self.measurement_repo.get_blob_by_content_hash(content_hash)
+        if stored_data is not None:
+            touchstone_data = stored_data
+            metadata = self.parser.parse(filepath)
+        else:
+            # Load Touchstone file and parse metadata
+            touchstone_data, metadata = self.loader.load_with_metadata(filepath)
         
         # Validate part number match (warn but don't block)
         warning_message = None
@@ -131,8 +147,9 @@ class MeasurementService:
             path_type=metadata["path_type"],
             file_path=metadata["file_path"],
             measurement_date=metadata["date"],
-            touchstone_data=network,  # Network object (will be serialized on save)
-            metadata=metadata  # Store all parsed metadata
+            touchstone_data=touchstone_data,  # Network object or stored bytes
+            metadata=metadata,  # Store all parsed metadata
+            content_hash=content_hash
         )
         
         return measurement, warning_message
@@ -265,7 +282,8 @@ class MeasurementService:
         Save multiple measurements to the database.
         
         Convenience method for saving a batch of measurements (e.g., from
-        load_multiple_files). Each measurement is saved individually.
+        load_multiple_files). All measurements are written in a single
+        transaction - either all are saved or none are.
         
         Args:
             measurements: List of Measurement objects to save
@@ -276,10 +294,7 @@ class MeasurementService:
         Raises:
             DatabaseError: If any save operation fails
         """
-        saved = []
-        for measurement in measurements:
-            saved.append(self.save_measurement(measurement))
-        return saved
+        return self.measurement_repo.create_many(measurements)
     
     def get_measurements_for_device(
         self,
@@ -306,6 +321,45 @@ class MeasurementService:
             device_id, test_type, test_stage
         )
     
+    def get_measurement_headers_for_device(
+        self,
+        device_id: UUID,
+        test_type: str,
+        test_stage: str
+    ) -> List[MeasurementHeader]:
+        """
+        Get header-only measurement records for a device/test type/test stage.
+        
+        Same rows as get_measurements_for_device, without RF data. Used by
+        file listing widgets that only show file names and metadata.
+        
+        Args:
+            device_id: UUID of the device
+            test_type: Test type name (e.g., "S-Parameters")
+            test_stage: Test stage name (e.g., "SIT", "Board-Bring-Up")
+            
+        Returns:
+            List of MeasurementHeader objects, ordered by temperature, path_type
+        """
+        return self.measurement_repo.get_headers_by_device_and_test_stage(
+            device_id, test_type, test_stage
+        )
+    
+    def migrate_legacy_storage(self, batch_size: int = 25) -> int:
+        """
+        Convert legacy pickled measurement BLOBs to the binary codec.
+        
+        Intended to run in a background thread at startup. Legacy rows stay
+        readable until converted, so this is purely an optimization.
+        
+        Args:
+            batch_size: Number of rows converted per transaction
+            
+        Returns:
+            Number of measurements migrated
+        """
+        return self.measurement_repo.migrate_legacy_blobs(batch_size=batch_size)
+    
     def validate_part_number_match(
         self,
         filename_part_number: str,
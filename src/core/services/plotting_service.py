@@ -24,6 +24,7 @@ from ..models.measurement import Measurement
 from ..models.test_criteria import TestCriteria
 from ..rf_data.s_parameter_calculator import SParameterCalculator
 from ..rf_data.touchstone_loader import TouchstoneLoader
+from ..rf_data.analysis_context import AnalysisContextPool, shared_analysis_pool
 
 
 logger = logging.getLogger(__name__)
@@ -74,10 +75,19 @@ class PlottingService:
     The GUI should only call methods and update displays based on results.
     """
     
-    def __init__(self):
-        """Initialize plotting service."""
+    def __init__(self, analysis_pool: Optional[AnalysisContextPool] = None):
+        """
+        Initialize plotting service.
+        
+        Args:
+            analysis_pool: Pool of decoded measurements; defaults to the
+                           process-wide pool shared with compliance
+                           evaluation, so a refresh decodes and band-limits
+                           each measurement once
+        """
         self.calculator = SParameterCalculator()
         self.loader = TouchstoneLoader()
+        self.analysis_pool = analysis_pool if analysis_pool is not None else shared_analysis_pool()
     
     def prepare_plot_data(
         self,
@@ -166,16 +176,13 @@ class PlottingService:
             try:
                 logger.debug(f"Processing measurement: {measurement.path_type}, {measurement.temperature}")
                 
-                # Deserialize Network if needed
-                if isinstance(measurement.touchstone_data, Network):
-                    network = measurement.touchstone_data
-                else:
-                    network = self.loader.deserialize_network(measurement.touchstone_data)
+                # Pooled context: the network (bytes or lazy proxy) is
+                # decoded and band-limited once, shared with compliance
+                context = self.analysis_pool.get(measurement)
+                network = context.network
                 
                 # Filter to frequency range
-                filtered_network = self.calculator.filter_frequency_range(
-                    network, freq_min, freq_max
-                )
+                filtered_network = context.band_network(freq_min, freq_max)
                 
                 # Get appropriate S-parameters
                 if is_vswr_plot or is_return_loss_plot:
@@ -21,11 +21,12 @@ by the application.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from uuid import UUID
 
 from ..models.device import Device
 from ..models.measurement import Measurement
+from ..models.measurement_metrics import MeasurementMetrics
 from ..models.test_criteria import TestCriteria
 from ..models.test_result import TestResult
 
@@ -52,8 +53,18 @@ class AbstractTestType(ABC):
     
     The device parameter is needed for configuration (e.g., port assignments
     for S-parameters) that affects which measurements are evaluated.
+    
+    Stored metrics (optional): test types whose metrics reduce to per-band
+    values can override get_metric_bands, compute_band_metrics and
+    evaluate_band_metrics (and optionally compute_band_metrics_batch).
+    ComplianceService then stores the band metrics and re-evaluates
+    criteria changes without touching the RF data.
     """
     
+    # Version of the stored band metrics this test type produces (see
+    # MeasurementMetrics). Only meaningful if get_metric_bands is overridden.
+    metrics_version: int = 0
+    
     @property
     @abstractmethod
     def name(self) -> str:
@@ -193,3 +204,101 @@ class AbstractTestType(ABC):
             each criterion applies to (e.g., which S-parameters).
         """
         return []
+    
+    def get_metric_bands(
+        self,
+        test_criteria: List[TestCriteria],
+        operational_freq_min: float,
+        operational_freq_max: float
+    ) -> List[Tuple[float, float]]:
+        """
+        Get the frequency bands whose metrics evaluation needs.
+        
+        Optional method for test types that support stored metrics. The
+        default (empty list) means evaluation always uses evaluate_compliance.
+        
+        Args:
+            test_criteria: Criteria that will be evaluated
+            operational_freq_min: Minimum operational frequency in GHz
+            operational_freq_max: Maximum operational frequency in GHz
+            
+        Returns:
+            List of (freq_min, freq_max) bands in GHz
+        """
+        return []
+    
+    def compute_band_metrics(
+        self,
+        measurement: Measurement,
+        bands: List[Tuple[float, float]],
+        test_criteria: Optional[List[TestCriteria]] = None
+    ) -> Dict[Tuple[float, float], MeasurementMetrics]:
+        """
+        Compute band metrics from the measurement's RF data.
+        
+        Only called for test types that override get_metric_bands.
+        
+        Args:
+            measurement: Measurement with touchstone_data
+            bands: Bands to compute, as returned by get_metric_bands
+            test_criteria: Criteria being evaluated, for test types that
+                           store per-criterion values with the metrics
+            
+        Returns:
+            Dictionary mapping band -> MeasurementMetrics
+        """
+        raise NotImplementedError(f"{self.name} does not support stored metrics")
+    
+    def compute_band_metrics_batch(
+        self,
+        measurements: List[Measurement],
+        bands: List[Tuple[float, float]],
+        test_criteria: Optional[List[TestCriteria]] = None
+    ) -> Dict[UUID, Dict[Tuple[float, float], MeasurementMetrics]]:
+        """
+        Compute band metrics for many measurements.
+        
+        Only called for test types that override get_metric_bands. The
+        default computes each measurement separately; test types that can
+        vectorize across measurements override it.
+        
+        Args:
+            measurements: Measurements with touchstone_data
+            bands: Bands to compute, as returned by get_metric_bands
+            test_criteria: Criteria being evaluated (see compute_band_metrics)
+            
+        Returns:
+            Dictionary mapping measurement_id -> (band -> MeasurementMetrics)
+        """
+        return {
+            measurement.id: self.compute_band_metrics(measurement, bands, test_criteria)
+            for measurement in measurements
+        }
+    
+    def evaluate_band_metrics(
+        self,
+        measurement: Measurement,
+        device: Device,
+        test_criteria: List[TestCriteria],
+        band_metrics: Dict[Tuple[float, float], MeasurementMetrics],
+        operational_freq_min: float,
+        operational_freq_max: float
+    ) -> List[TestResult]:
+        """
+        Evaluate compliance from band metrics (no RF data access).
+        
+        Must give the same results as evaluate_compliance. Only called for
+        test types that override get_metric_bands.
+        
+        Args:
+            measurement: The measurement being evaluated (RF data not used)
+            device: Device configuration
+            test_criteria: List of test criteria to evaluate against
+            band_metrics: Metrics for every band from get_metric_bands
+            operational_freq_min: Minimum operational frequency in GHz
+            operational_freq_max: Maximum operational frequency in GHz
+            
+        Returns:
+            List of TestResult objects
+        """
+        raise NotImplementedError(f"{self.name} does not support stored metrics")
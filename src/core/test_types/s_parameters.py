@@ -14,22 +14,38 @@ Key design features:
 - Port-based S-parameter identification (from device configuration)
 - Per-S-parameter results (each result tagged with s_parameter field)
 - Frequency range filtering (operational vs OOB ranges)
+- Stored band metrics: every criterion reduces to per-band gain min/max and
+  VSWR (MeasurementMetrics), so criteria changes re-evaluate from stored
+  metrics without the RF data
+- Limit margins: gain range and VSWR results carry the worst-case signed
+  margin to the limit and the share of the band within the guard band
+  (SParameterCalculator.calculate_margins). The reductions of each limit
+  are stored with the operational band metrics; a limit changed since
+  then gets its margin from the band extremes and no guard band share
 
 The implementation uses SParameterCalculator for RF calculations and
 TouchstoneLoader for data handling.
 """
 
-from typing import List, Dict, Any, Optional, Union
-from uuid import uuid4
+from typing import List, Dict, Any, Optional, Tuple
+from uuid import UUID, uuid4
 
 from ..models.device import Device
 from ..models.measurement import Measurement
+from ..models.measurement_metrics import MeasurementMetrics
 from ..models.test_criteria import TestCriteria
 from ..models.test_result import TestResult
 from ..rf_data.touchstone_loader import TouchstoneLoader
-from ..rf_data.s_parameter_calculator import SParameterCalculator
+from ..rf_data.s_parameter_calculator import (
+    SParameterCalculator, CALCULATOR_VERSION, BandSamples, MarginLimit,
+    DEFAULT_GAIN_GUARD_BAND_DB, DEFAULT_VSWR_GUARD_BAND
+)
+from ..rf_data.analysis_context import AnalysisContextPool, shared_analysis_pool
 from .base import AbstractTestType
 
+# Frequency band key (freq_min, freq_max) in GHz
+Band = Tuple[float, float]
+
 
 class SParametersTestType(AbstractTestType):
     """
@@ -50,15 +66,25 @@ class SParametersTestType(AbstractTestType):
     apply to multiple S-parameters automatically (e.g., S21, S31, S41).
     """
     
-    def __init__(self):
+    # Stored band metrics are produced by SParameterCalculator
+    metrics_version = CALCULATOR_VERSION
+    
+    def __init__(self, analysis_pool: Optional[AnalysisContextPool] = None):
         """
         Initialize S-Parameters test type.
         
         Creates instances of TouchstoneLoader and SParameterCalculator
         for RF data processing and calculations.
+        
+        Args:
+            analysis_pool: Pool of decoded measurements; defaults to the
+                           process-wide pool shared with plotting, so a
+                           measurement evaluated and then plotted is
+                           decoded once
         """
         self.loader = TouchstoneLoader()
         self.calculator = SParameterCalculator()
+        self.analysis_pool = analysis_pool if analysis_pool is not None else shared_analysis_pool()
     
     @property
     def name(self) -> str:
@@ -120,16 +146,214 @@ class SParametersTestType(AbstractTestType):
         if measurement.touchstone_data is None:
             raise ValueError("Measurement has no touchstone data")
         
-        # Get network object (may need to deserialize from bytes)
-        # Touchstone data can be stored as bytes (pickled) in database
-        # or as Network object in memory
-        if isinstance(measurement.touchstone_data, bytes):
-            network = self.loader.deserialize_network(measurement.touchstone_data)
-        else:
-            network = measurement.touchstone_data
+        band = (operational_freq_min, operational_freq_max)
+        return self._metrics_from_band(
+            self.compute_band_metrics(measurement, [band])[band]
+        )
+    
+    def get_metric_bands(
+        self,
+        test_criteria: List[TestCriteria],
+        operational_freq_min: float,
+        operational_freq_max: float
+    ) -> List[Band]:
+        """
+        Get the frequency bands whose metrics evaluation needs.
+        
+        The operational band (gain range, flatness, VSWR, in-band reference
+        for OOB) plus one band per distinct OOB criterion range.
+        
+        Args:
+            test_criteria: Criteria that will be evaluated
+            operational_freq_min: Minimum operational frequency in GHz
+            operational_freq_max: Maximum operational frequency in GHz
+            
+        Returns:
+            List of unique (freq_min, freq_max) bands, operational band first
+        """
+        bands = [(operational_freq_min, operational_freq_max)]
+        for criterion in test_criteria:
+            if self._criterion_kind(criterion) == "oob":
+                bands.append((criterion.frequency_min, criterion.frequency_max))
+        return list(dict.fromkeys(bands))  # Unique, order preserved
+    
+    def compute_band_metrics(
+        self,
+        measurement: Measurement,
+        bands: List[Band],
+        test_criteria: Optional[List[TestCriteria]] = None
+    ) -> Dict[Band, MeasurementMetrics]:
+        """
+        Compute band metrics from the measurement's RF data.
+        
+        The network is resolved once and |S| in dB is computed once for the
+        whole sweep; each band (operational, wideband, every OOB criterion)
+        is then a slice of it reduced over all port pairs
+        (SParameterCalculator.calculate_multi_band_metrics). The decoded
+        network and the metric arrays are kept in the measurement's
+        analysis context, shared with plotting.
+        
+        The margin reductions of the criteria's gain range and VSWR limits
+        are computed from the same band samples and stored with the
+        operational band (see _margin_reductions).
+        
+        Args:
+            measurement: Measurement containing touchstone_data
+            bands: (freq_min, freq_max) bands in GHz
+            test_criteria: Criteria being evaluated (margin limits), None
+                           for metrics only
+            
+        Returns:
+            Dictionary mapping band -> MeasurementMetrics (empty metrics if
+            the band has no frequency points)
+            
+        Raises:
+            ValueError: If measurement has no touchstone_data
+        """
+        # Validate measurement has data
+        if measurement.touchstone_data is None:
+            raise ValueError("Measurement has no touchstone data")
+        
+        # Pooled context - touchstone data (encoded bytes, lazy proxy or
+        # Network object) is decoded at most once per measurement
+        context = self.analysis_pool.get(measurement)
+        
+        # One pass for all missing bands: dB cube once, each band a slice of
+        # it reduced over every port pair with numpy axis reductions
+        arrays_by_band = context.band_metrics(bands)
+        n_ports = context.network.nports
+        limits = self._margin_limits(test_criteria)
+        margin_bands = self._margin_bands(bands, test_criteria)
+        samples_by_band = context.band_samples(margin_bands) if limits else {}
+        return {
+            band: self._band_metrics_model(
+                measurement.id, band, n_ports, arrays,
+                self._margin_reductions(samples_by_band.get(band), limits)
+            )
+            for band, arrays in arrays_by_band.items()
+        }
+    
+    def compute_band_metrics_batch(
+        self,
+        measurements: List[Measurement],
+        bands: List[Band],
+        test_criteria: Optional[List[TestCriteria]] = None
+    ) -> Dict[UUID, Dict[Band, MeasurementMetrics]]:
+        """
+        Compute band metrics for many measurements with stacked arrays.
+        
+        Measurements sharing a frequency grid are stacked into one
+        [N, f, n, n] array (SParameterCalculator.stack_networks) and all
+        bands are reduced from one dB conversion of the whole stack
+        (calculate_band_samples_batch). Measurements on other grids form
+        their own stacks. Results equal compute_band_metrics of each
+        measurement.
+        
+        Args:
+            measurements: Measurements containing touchstone_data
+            bands: (freq_min, freq_max) bands in GHz
+            test_criteria: Criteria being evaluated (margin limits), None
+                           for metrics only
+            
+        Returns:
+            Dictionary mapping measurement_id -> (band -> MeasurementMetrics)
+            
+        Raises:
+            ValueError: If a measurement has no touchstone_data
+        """
+        for measurement in measurements:
+            if measurement.touchstone_data is None:
+                raise ValueError("Measurement has no touchstone data")
+        
+        contexts = [self.analysis_pool.get(m) for m in measurements]
+        networks = [context.network for context in contexts]
+        metrics_by_measurement: Dict[UUID, Dict[Band, MeasurementMetrics]] = {
+            measurement.id: {} for measurement in measurements
+        }
+        limits = self._margin_limits(test_criteria)
+        margin_bands = set(self._margin_bands(bands, test_criteria)) if limits else set()
+        for stack in self.calculator.stack_networks(networks):
+            n_ports = stack.s.shape[-1]
+            samples_by_band = self.calculator.calculate_band_samples_batch(stack, bands)
+            for band, samples in samples_by_band.items():
+                arrays = self.calculator.reduce_band_samples(samples)
+                # Margins of the whole stack at once, split per row below
+                stack_margins = self._margin_reductions(
+                    samples if band in margin_bands else None, limits
+                )
+                for row, index in enumerate(stack.indices):
+                    measurement_id = measurements[index].id
+                    row_arrays = {key: values[row] for key, values in arrays.items()}
+                    # Keep arrays and samples for later lookups
+                    contexts[index].store_band_metrics(band, row_arrays, samples.row(row))
+                    row_margins = {
+                        key: {name: values[row] for name, values in reductions.items()}
+                        for key, reductions in stack_margins.items()
+                    }
+                    metrics_by_measurement[measurement_id][band] = self._band_metrics_model(
+                        measurement_id, band, n_ports, row_arrays, row_margins
+                    )
+        return metrics_by_measurement
+    
+    @staticmethod
+    def _band_metrics_model(
+        measurement_id: UUID,
+        band: Band,
+        n_ports: int,
+        arrays: Dict[str, Any],
+        margins: Dict[str, Dict[str, Any]]
+    ) -> MeasurementMetrics:
+        """
+        Wrap calculate_band_metrics arrays of one measurement in a model.
+        
+        Args:
+            measurement_id: Measurement the metrics belong to
+            band: (freq_min, freq_max) in GHz
+            n_ports: Port count of the network
+            arrays: Metric arrays of the measurement (empty if the band has
+                    no frequency points)
+            margins: Margin reduction arrays by limit key (see
+                     _margin_reductions), empty if none were computed
+            
+        Returns:
+            MeasurementMetrics (empty metrics for an empty band)
+        """
+        return MeasurementMetrics(
+            measurement_id=measurement_id,
+            freq_min=band[0],
+            freq_max=band[1],
+            calculator_version=CALCULATOR_VERSION,
+            n_ports=n_ports,
+            # No frequency points in the band - empty metrics
+            gain_min=arrays["gain_min"].tolist() if arrays else [],
+            gain_max=arrays["gain_max"].tolist() if arrays else [],
+            vswr_max=arrays["vswr_max"].tolist() if arrays else [],
+            gain_min_freq=arrays["gain_min_freq"].tolist() if arrays else [],
+            gain_max_freq=arrays["gain_max_freq"].tolist() if arrays else [],
+            vswr_max_freq=arrays["vswr_max_freq"].tolist() if arrays else [],
+            margins={
+                key: {name: values.tolist() for name, values in reductions.items()}
+                for key, reductions in margins.items()
+            }
+        )
+    
+    def _metrics_from_band(self, band: MeasurementMetrics) -> Dict[str, Any]:
+        """
+        Build the named metrics dictionary from operational band metrics.
         
+        Args:
+            band: Metrics over the operational band
+            
+        Returns:
+            Metrics dictionary (see calculate_metrics); empty if the band
+            has no frequency points
+        """
         metrics = {}
-        n_ports = network.nports
+        if band.is_empty:
+            # No frequency points in the band - nothing to report
+            return metrics
+        
+        n_ports = band.n_ports
         
         # Calculate metrics for ALL possible S-parameters (we'll filter usage based on port config during evaluation)
         # This ensures we have all data available when determining which S-parameters to evaluate
@@ -137,49 +361,46 @@ class SParametersTestType(AbstractTestType):
         for out_port in range(1, n_ports + 1):
             for in_port in range(1, n_ports + 1):
                 s_param = f"S{out_port}{in_port}"
+                gain_min = band.gain_min[out_port - 1][in_port - 1]
+                gain_max = band.gain_max[out_port - 1][in_port - 1]
                 
-                try:
-                    # Gain range (transmission parameters)
-                    # Calculated for all S-parameters, but only used for input→output combinations
-                    min_gain, max_gain = self.calculator.calculate_gain_range(
-                        network, operational_freq_min, operational_freq_max, s_param
-                    )
-                    metrics[f"{s_param} Gain Range"] = {
-                        "min": min_gain,
-                        "max": max_gain
-                    }
-                    
-                    # Flatness: Variation in gain across operational range
-                    flatness = self.calculator.calculate_flatness(
-                        network, operational_freq_min, operational_freq_max, s_param
-                    )
-                    metrics[f"{s_param} Flatness"] = flatness
-                    
-                    # Lowest in-band gain (needed for OOB calculations)
-                    # Used as reference point for OOB rejection calculations
-                    lowest_gain = self.calculator.calculate_lowest_in_band_gain(
-                        network, operational_freq_min, operational_freq_max, s_param
-                    )
-                    metrics[f"{s_param} Lowest In-Band Gain"] = lowest_gain
-                except (ValueError, IndexError):
-                    # Skip if S-parameter calculation fails (invalid port combination, etc.)
-                    pass
+                # Gain range (transmission parameters)
+                # Calculated for all S-parameters, but only used for input→output combinations
+                metrics[f"{s_param} Gain Range"] = {
+                    "min": gain_min,
+                    "max": gain_max
+                }
+                
+                # Flatness: Variation in gain across operational range
+                metrics[f"{s_param} Flatness"] = gain_max - gain_min
+                
+                # Lowest in-band gain (needed for OOB calculations)
+                # Used as reference point for OOB rejection calculations
+                metrics[f"{s_param} Lowest In-Band Gain"] = gain_min
         
         # VSWR for all ports (reflection coefficients: S11, S22, S33, etc.)
         # VSWR measures port matching quality - calculated for each port independently
         for port in range(1, n_ports + 1):
-            try:
-                vswr = self.calculator.calculate_vswr(
-                    network, port=port, freq_min=operational_freq_min, freq_max=operational_freq_max
-                )
-                s_param = f"S{port}{port}"  # Reflection coefficient (same port in/out)
-                metrics[f"{s_param} VSWR"] = vswr
-            except (ValueError, IndexError):
-                # Skip if VSWR calculation fails
-                pass
+            s_param = f"S{port}{port}"  # Reflection coefficient (same port in/out)
+            metrics[f"{s_param} VSWR"] = band.vswr_max[port - 1]
         
         return metrics
     
+    @staticmethod
+    def _band_value(matrix: List[List[float]], out_port: int, in_port: int) -> Optional[float]:
+        """
+        Look up an S-parameter entry of a band metric matrix.
+        
+        Args:
+            matrix: Metric matrix indexed [out_port - 1][in_port - 1] (may be empty)
+            out_port: Output port number (1-based)
+            in_port: Input port number (1-based)
+            
+        Returns:
+            The entry, or None if the matrix is empty
+        """
+        return matrix[out_port - 1][in_port - 1] if matrix else None
+    
     def evaluate_compliance(
         self,
         measurement: Measurement,
@@ -192,10 +413,9 @@ class SParametersTestType(AbstractTestType):
         Evaluate compliance of measurement against S-parameter criteria.
         
         This is the main compliance evaluation method. It:
-        1. Calculates all metrics for the measurement
-        2. Gets port configuration from device (determines which S-parameters to evaluate)
-        3. Evaluates each criterion against applicable S-parameters
-        4. Generates TestResult objects with s_parameter tags
+        1. Calculates band metrics (operational band and each OOB band)
+        2. Evaluates them with evaluate_band_metrics - the same path used
+           for stored metrics, so both always give identical results
         
         Generic criteria (e.g., "Gain Range") are automatically applied to
         all relevant S-parameters based on port configuration. Each application
@@ -224,44 +444,91 @@ class SParametersTestType(AbstractTestType):
             - VSWR Max for S33
             - VSWR Max for S44
         """
-        results = []
+        bands = self.get_metric_bands(test_criteria, operational_freq_min, operational_freq_max)
+        band_metrics = self.compute_band_metrics(measurement, bands, test_criteria)
+        return self.evaluate_band_metrics(
+            measurement, device, test_criteria, band_metrics,
+            operational_freq_min, operational_freq_max
+        )
+    
+    def evaluate_band_metrics(
+        self,
+        measurement: Measurement,
+        device: Device,
+        test_criteria: List[TestCriteria],
+        band_metrics: Dict[Band, MeasurementMetrics],
+        operational_freq_min: float,
+        operational_freq_max: float
+    ) -> List[TestResult]:
+        """
+        Evaluate compliance from band metrics (no RF data access).
         
-        # Step 1: Calculate all metrics first (one-time calculation for all criteria)
-        metrics = self.calculate_metrics(measurement, operational_freq_min, operational_freq_max)
+        Pure comparison of metrics against criteria limits - used directly
+        with stored metrics when only criteria changed.
         
-        # Step 2: Get network object for OOB calculations (needed if OOB criteria present)
-        if isinstance(measurement.touchstone_data, bytes):
-            network = self.loader.deserialize_network(measurement.touchstone_data)
-        else:
-            network = measurement.touchstone_data
+        Args:
+            measurement: The measurement being evaluated (RF data not used)
+            device: Device configuration (port configuration)
+            test_criteria: List of test criteria to evaluate against
+            band_metrics: Metrics for every band from get_metric_bands
+            operational_freq_min: Minimum operational frequency in GHz
+            operational_freq_max: Maximum operational frequency in GHz
+            
+        Returns:
+            List of TestResult objects (one per S-parameter per criterion)
+        """
+        results = []
+        
+        # Step 1: Named metrics over the operational band
+        operational = band_metrics[(operational_freq_min, operational_freq_max)]
+        metrics = self._metrics_from_band(operational)
         
-        n_ports = network.nports
+        n_ports = operational.n_ports
         
-        # Step 3: Get port configuration from device
+        # Step 2: Get port configuration from device
         # This determines which S-parameters represent gain (input→output) vs VSWR (reflection)
         gain_s_params = device.get_gain_s_parameters(n_ports)
         vswr_s_params = device.get_vswr_s_parameters(n_ports)
         
-        # Step 4: Evaluate each criterion against applicable S-parameters
+        # Step 3: Evaluate each criterion against applicable S-parameters
         for criterion in test_criteria:
             criterion_results = self._evaluate_criterion_for_all_s_params(
-                criterion, metrics, network, measurement, device,
-                operational_freq_min, operational_freq_max,
+                criterion, metrics, operational, band_metrics, measurement,
                 gain_s_params, vswr_s_params
             )
             results.extend(criterion_results)
         
         return results
     
+    def _criterion_kind(self, criterion: TestCriteria) -> Optional[str]:
+        """
+        Classify a criterion by its requirement name and frequency range.
+        
+        Args:
+            criterion: TestCriteria to classify
+            
+        Returns:
+            "gain_range", "flatness", "vswr", "oob", or None if unrecognized
+        """
+        req_name = criterion.requirement_name.lower()  # Case-insensitive matching
+        if "gain" in req_name and "range" in req_name:
+            return "gain_range"
+        if "flatness" in req_name:
+            return "flatness"
+        if "vswr" in req_name:
+            return "vswr"
+        # OOB criteria must have both frequency_min and frequency_max defined
+        if criterion.frequency_min is not None and criterion.frequency_max is not None:
+            return "oob"
+        return None
+    
     def _evaluate_criterion_for_all_s_params(
         self,
         criterion: TestCriteria,
         metrics: Dict[str, Any],
-        network: Any,
+        operational: MeasurementMetrics,
+        band_metrics: Dict[Band, MeasurementMetrics],
         measurement: Measurement,
-        device: Device,
-        operational_freq_min: float,
-        operational_freq_max: float,
         gain_s_params: List[str],
         vswr_s_params: List[str]
     ) -> List[TestResult]:
@@ -280,12 +547,11 @@ class SParametersTestType(AbstractTestType):
         
         Args:
             criterion: TestCriteria to evaluate
-            metrics: Pre-calculated metrics dictionary
-            network: scikit-rf Network object (for OOB calculations)
+            metrics: Pre-calculated metrics dictionary (operational band)
+            operational: Operational band metrics (frequencies of the extremes,
+                         margin reductions)
+            band_metrics: Band metrics (OOB bands for OOB criteria)
             measurement: Measurement being evaluated
-            device: Device configuration
-            operational_freq_min: Minimum operational frequency in GHz
-            operational_freq_max: Maximum operational frequency in GHz
             gain_s_params: List of gain S-parameters (from port config, e.g., ["S31", "S41"])
             vswr_s_params: List of VSWR S-parameters (from port config, e.g., ["S11", "S22", "S33", "S44"])
             
@@ -294,22 +560,25 @@ class SParametersTestType(AbstractTestType):
             Empty list if criterion doesn't match any recognized type
         """
         results = []
-        req_name = criterion.requirement_name.lower()  # Case-insensitive matching
+        kind = self._criterion_kind(criterion)
+        
+        # Stored margin reductions of the criterion's limit (gain range and VSWR)
+        margins = self._criterion_margins(criterion, operational)
         
         # Determine which type of criterion this is and evaluate accordingly
         # Gain Range: evaluate for all input→output S-parameters
         # Example: "Gain Range" applies to S31, S32, S41, S42 (from port config)
-        if "gain" in req_name and "range" in req_name:
+        if kind == "gain_range":
             for s_param in gain_s_params:
                 result = self._evaluate_gain_range_criterion(
-                    criterion, metrics, s_param, measurement
+                    criterion, metrics, operational, s_param, measurement, margins
                 )
                 if result:
                     results.append(result)
         
         # Flatness: evaluate for all input→output S-parameters
         # Measures gain variation across frequency range
-        elif "flatness" in req_name:
+        elif kind == "flatness":
             for s_param in gain_s_params:
                 result = self._evaluate_flatness_criterion(
                     criterion, metrics, s_param, measurement
@@ -319,33 +588,188 @@ class SParametersTestType(AbstractTestType):
         
         # VSWR: evaluate for all ports (reflection coefficients)
         # Each port gets its own VSWR measurement (S11, S22, S33, etc.)
-        elif "vswr" in req_name:
+        elif kind == "vswr":
             for s_param in vswr_s_params:
                 result = self._evaluate_vswr_criterion(
-                    criterion, metrics, s_param, measurement
+                    criterion, metrics, operational, s_param, measurement, margins
                 )
                 if result:
                     results.append(result)
         
         # OOB rejection: evaluate for all input→output S-parameters
         # OOB criteria must have both frequency_min and frequency_max defined
-        elif criterion.frequency_min is not None and criterion.frequency_max is not None:
+        elif kind == "oob":
+            oob_metrics = band_metrics[(criterion.frequency_min, criterion.frequency_max)]
             for s_param in gain_s_params:
                 result = self._evaluate_oob_criterion(
-                    criterion, network, s_param, measurement,
-                    operational_freq_min, operational_freq_max
+                    criterion, metrics, oob_metrics, s_param, measurement
                 )
                 if result:
                     results.append(result)
         
         return results
     
+    def margin_limit(self, criterion: TestCriteria) -> Optional[MarginLimit]:
+        """
+        Limit of a criterion for the margin engine.
+        
+        Only criteria on a per-frequency quantity have one: gain range
+        (|S| in dB of the gain S-parameters) and VSWR. The bounds follow the
+        criteria_type (see TestCriteria.evaluate).
+        
+        Args:
+            criterion: TestCriteria to convert
+            
+        Returns:
+            MarginLimit, or None for flatness, OOB and unrecognized criteria
+        """
+        kind = self._criterion_kind(criterion)
+        if kind == "gain_range":
+            quantity, guard_band = "gain", DEFAULT_GAIN_GUARD_BAND_DB
+        elif kind == "vswr":
+            quantity, guard_band = "vswr", DEFAULT_VSWR_GUARD_BAND
+        else:
+            return None
+        
+        has_lower = criterion.criteria_type in ("range", "min", "greater_than_equal")
+        has_upper = criterion.criteria_type in ("range", "max", "less_than_equal")
+        lower = criterion.min_value if has_lower else None
+        upper = criterion.max_value if has_upper else None
+        if lower is None and upper is None:
+            return None
+        return MarginLimit(quantity=quantity, lower=lower, upper=upper, guard_band=guard_band)
+    
+    def _margin_limits(self, test_criteria: Optional[List[TestCriteria]]) -> List[MarginLimit]:
+        """
+        Distinct margin limits of the criteria (see margin_limit).
+        
+        Args:
+            test_criteria: Criteria being evaluated (None for none)
+            
+        Returns:
+            List of MarginLimit, one per distinct limit key
+        """
+        limits = (self.margin_limit(criterion) for criterion in test_criteria or [])
+        return list({limit.key: limit for limit in limits if limit is not None}.values())
+    
+    def _margin_bands(
+        self,
+        bands: List[Band],
+        test_criteria: Optional[List[TestCriteria]]
+    ) -> List[Band]:
+        """
+        Bands whose metrics carry margin reductions.
+        
+        Margins are taken over the operational band - every band of
+        get_metric_bands that is not an OOB criterion range.
+        
+        Args:
+            bands: Bands being computed
+            test_criteria: Criteria being evaluated (None for none)
+            
+        Returns:
+            The bands to reduce margins for
+        """
+        oob_bands = {
+            (criterion.frequency_min, criterion.frequency_max)
+            for criterion in test_criteria or []
+            if self._criterion_kind(criterion) == "oob"
+        }
+        return [band for band in bands if band not in oob_bands]
+    
+    def _margin_reductions(
+        self,
+        samples: Optional[BandSamples],
+        limits: List[MarginLimit]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Margin reductions of band samples for several limits.
+        
+        Only the reductions are kept (minimum margin, its frequency and
+        the guard band share) - the per-frequency margins are dropped, so
+        the stored metrics stay a few numbers per port.
+        
+        Args:
+            samples: Band samples (possibly of a stack), None for no margins
+            limits: Limits to reduce the margins for
+            
+        Returns:
+            Dictionary mapping MarginLimit.key -> reduction arrays; empty
+            if there are no samples or the band has no frequency points
+        """
+        if samples is None or len(samples.frequency_hz) == 0:
+            return {}
+        reductions = {}
+        for limit in limits:
+            margins = self.calculator.calculate_margins(samples, limit)
+            reductions[limit.key] = {
+                name: margins[name]
+                for name in ("margin_min", "margin_min_freq", "guard_band_percent")
+            }
+        return reductions
+    
+    def _criterion_margins(
+        self,
+        criterion: TestCriteria,
+        operational: MeasurementMetrics
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Stored margin reductions of a criterion's limit.
+        
+        Computed and stored metrics carry the same reductions, so every
+        evaluation path gives the same margins.
+        
+        Args:
+            criterion: Criterion being evaluated
+            operational: Operational band metrics
+            
+        Returns:
+            Reduction lists ("margin_min", "margin_min_freq",
+            "guard_band_percent"), or None for criteria without a margin
+            limit or a limit the metrics were not computed for
+        """
+        limit = self.margin_limit(criterion)
+        if limit is None:
+            return None
+        return operational.margins.get(limit.key)
+    
+    @staticmethod
+    def _extreme_margin(
+        limit: Optional[MarginLimit],
+        value_min: Optional[float],
+        value_max: Optional[float]
+    ) -> Optional[float]:
+        """
+        Worst-case margin from the band extremes (limits without reductions).
+        
+        Equals the margin engine's minimum margin: the margin to the lower
+        bound is smallest at the minimum, to the upper bound at the maximum.
+        
+        Args:
+            limit: Criterion limit (None if the criterion has none)
+            value_min: Minimum of the quantity over the band (None if unknown)
+            value_max: Maximum of the quantity over the band
+            
+        Returns:
+            Signed margin, or None if no bound can be evaluated
+        """
+        if limit is None:
+            return None
+        margins = []
+        if limit.lower is not None and value_min is not None:
+            margins.append(value_min - limit.lower)
+        if limit.upper is not None and value_max is not None:
+            margins.append(limit.upper - value_max)
+        return min(margins) if margins else None
+    
     def _evaluate_gain_range_criterion(
         self,
         criterion: TestCriteria,
         metrics: Dict[str, Any],
+        operational: MeasurementMetrics,
         s_param: str,
-        measurement: Measurement
+        measurement: Measurement,
+        margins: Optional[Dict[str, Any]] = None
     ) -> Optional[TestResult]:
         """
         Evaluate gain range criterion for a specific S-parameter.
@@ -356,8 +780,11 @@ class SParametersTestType(AbstractTestType):
         Args:
             criterion: TestCriteria with criteria_type="range"
             metrics: Pre-calculated metrics dictionary
+            operational: Operational band metrics (frequencies of the extremes)
             s_param: S-parameter being evaluated (e.g., "S21", "S31")
             measurement: Measurement being evaluated
+            margins: Stored margin reductions of the criterion's limit
+                     (_criterion_margins), None if unavailable
             
         Returns:
             TestResult if metric exists and evaluation succeeds, None otherwise
@@ -378,17 +805,40 @@ class SParametersTestType(AbstractTestType):
         passed = min_pass and max_pass
         
         # Store max_gain as measured_value for database compatibility
-        # The GUI will recalculate min/max from measurement data for display
-        # This allows showing "min to max" format in the compliance table
+        # min/max are stored as secondary values so the compliance table can
+        # show the "min to max" format without recalculating from RF data
         measured_value = max_gain
         
+        # Worst case is the extreme with the smaller margin to its limit
+        # (negative margin = outside the limit)
+        min_margin = min_gain - criterion.min_value if criterion.min_value is not None else float("inf")
+        max_margin = criterion.max_value - max_gain if criterion.max_value is not None else float("inf")
+        out_port, in_port = int(s_param[1]), int(s_param[2])
+        worst_frequency = self._band_value(
+            operational.gain_min_freq if min_margin <= max_margin else operational.gain_max_freq,
+            out_port, in_port
+        )
+        margin = self._extreme_margin(self.margin_limit(criterion), min_gain, max_gain)
+        guard_band_percent = None
+        if margins:
+            # Same worst case from the per-frequency margins, plus the
+            # share of the band close to the limit
+            margin = self._band_value(margins["margin_min"], out_port, in_port)
+            worst_frequency = self._band_value(margins["margin_min_freq"], out_port, in_port)
+            guard_band_percent = self._band_value(margins["guard_band_percent"], out_port, in_port)
+        
         return TestResult(
             id=uuid4(),
             measurement_id=measurement.id,
             test_criteria_id=criterion.id,
             measured_value=measured_value,
             passed=passed,
-            s_parameter=s_param
+            s_parameter=s_param,
+            measured_min=min_gain,
+            measured_max=max_gain,
+            worst_frequency=worst_frequency,
+            margin=margin,
+            guard_band_percent=guard_band_percent
         )
     
     def _evaluate_flatness_criterion(
@@ -420,21 +870,29 @@ class SParametersTestType(AbstractTestType):
         flatness = metrics[metric_key]
         passed = criterion.evaluate(flatness)
         
+        # Flatness spans the gain range - store its extremes. A span has no
+        # single worst-case frequency.
+        gain_range = metrics.get(f"{s_param} Gain Range", {})
+        
         return TestResult(
             id=uuid4(),
             measurement_id=measurement.id,
             test_criteria_id=criterion.id,
             measured_value=flatness,
             passed=passed,
-            s_parameter=s_param
+            s_parameter=s_param,
+            measured_min=gain_range.get("min"),
+            measured_max=gain_range.get("max")
         )
     
     def _evaluate_vswr_criterion(
         self,
         criterion: TestCriteria,
         metrics: Dict[str, Any],
+        operational: MeasurementMetrics,
         s_param: str,
-        measurement: Measurement
+        measurement: Measurement,
+        margins: Optional[Dict[str, Any]] = None
     ) -> Optional[TestResult]:
         """
         Evaluate VSWR criterion for a specific S-parameter (reflection coefficient).
@@ -445,8 +903,11 @@ class SParametersTestType(AbstractTestType):
         Args:
             criterion: TestCriteria (typically criteria_type="max")
             metrics: Pre-calculated metrics dictionary
+            operational: Operational band metrics (frequency of the maximum)
             s_param: S-parameter being evaluated (reflection: S11, S22, S33, etc.)
             measurement: Measurement being evaluated
+            margins: Stored margin reductions of the criterion's limit
+                     (_criterion_margins), None if unavailable
             
         Returns:
             TestResult if metric exists, None otherwise
@@ -458,34 +919,51 @@ class SParametersTestType(AbstractTestType):
         vswr = metrics[metric_key]
         passed = criterion.evaluate(vswr)
         
+        port = int(s_param[1])
+        worst_frequency = operational.vswr_max_freq[port - 1] if operational.vswr_max_freq else None
+        # Only the maximum is stored - enough for the usual "VSWR <= max"
+        margin = self._extreme_margin(self.margin_limit(criterion), None, vswr)
+        guard_band_percent = None
+        if margins:
+            margin = margins["margin_min"][port - 1]
+            worst_frequency = margins["margin_min_freq"][port - 1]
+            guard_band_percent = margins["guard_band_percent"][port - 1]
+        
         return TestResult(
             id=uuid4(),
             measurement_id=measurement.id,
             test_criteria_id=criterion.id,
             measured_value=vswr,
             passed=passed,
-            s_parameter=s_param
+            s_parameter=s_param,
+            measured_max=vswr,
+            worst_frequency=worst_frequency,
+            margin=margin,
+            guard_band_percent=guard_band_percent
         )
     
     def _evaluate_oob_criterion(
         self,
         criterion: TestCriteria,
-        network: Any,
+        metrics: Dict[str, Any],
+        oob_metrics: MeasurementMetrics,
         s_param: str,
-        measurement: Measurement,
-        operational_freq_min: float,
-        operational_freq_max: float
+        measurement: Measurement
     ) -> Optional[TestResult]:
         """
         Evaluate OOB rejection criterion for a specific S-parameter.
         
         OOB rejection is evaluated across a frequency range (frequency_min to frequency_max).
-        The calculator returns the worst-case (minimum) rejection across this range,
-        which is then compared against the criterion requirement.
+        The worst-case (minimum) rejection across this range is compared
+        against the criterion requirement.
         
         IMPORTANT: This evaluates REJECTION (in dBc) >= requirement, NOT gain.
         Rejection = min_in_band_gain - worst_case_oob_gain.
         
+        The worst case is at the OOB gain peak, so the minimum rejection is
+        lowest in-band gain - peak OOB gain (both stored band metrics). This
+        equals SParameterCalculator.calculate_oob_rejection.
+        
         Example:
         - Requirement: >= 60 dBc
         - Calculated rejection: 65 dBc (worst-case across OOB range)
@@ -493,50 +971,46 @@ class SParametersTestType(AbstractTestType):
         
         Args:
             criterion: TestCriteria with frequency_min and frequency_max set
-            network: scikit-rf Network object (needed for OOB calculation)
+            metrics: Pre-calculated metrics dictionary (operational band)
+            oob_metrics: Band metrics over the criterion's OOB range
             s_param: S-parameter to evaluate (e.g., "S21")
             measurement: Measurement being evaluated
-            operational_freq_min: Minimum operational frequency in GHz
-            operational_freq_max: Maximum operational frequency in GHz
             
         Returns:
-            TestResult if evaluation succeeds, None if calculation fails
+            TestResult if evaluation succeeds, None if either band has no
+            frequency points
         """
-        # Validate that frequency range is provided
-        if criterion.frequency_min is None or criterion.frequency_max is None:
+        metric_key = f"{s_param} Lowest In-Band Gain"
+        if metric_key not in metrics or oob_metrics.is_empty:
             return None
         
-        try:
-            # Calculate worst-case (minimum) rejection across OOB frequency range
-            # Rejection is calculated as: min_in_band_gain - worst_case_oob_gain (in dBc)
-            rejection = self.calculator.calculate_oob_rejection(
-                network,
-                criterion.frequency_min,  # OOB range minimum
-                criterion.frequency_max,  # OOB range maximum
-                operational_freq_min,
-                operational_freq_max,
-                s_param
-            )
-            
-            # IMPORTANT: Compare REJECTION (dBc) >= requirement, NOT gain
-            # Example: If requirement is >= 60 dBc:
-            #   - rejection = 65 dBc → passes (65 >= 60)
-            #   - rejection = 55 dBc → fails (55 < 60)
-            # The rejection value is the minimum (worst-case) across the OOB range
-            # Higher rejection is better (means OOB gain is much lower than in-band)
-            passed = rejection >= criterion.min_value if criterion.min_value else False
-            
-            return TestResult(
-                id=uuid4(),
-                measurement_id=measurement.id,
-                test_criteria_id=criterion.id,
-                measured_value=rejection,
-                passed=passed,
-                s_parameter=s_param
-            )
-        except (ValueError, IndexError):
-            # Return None if calculation fails (invalid frequency range, missing data, etc.)
-            return None
+        out_port, in_port = int(s_param[1]), int(s_param[2])
+        peak_oob_gain = self._band_value(oob_metrics.gain_max, out_port, in_port)
+        
+        # Rejection is calculated as: min_in_band_gain - worst_case_oob_gain (in dBc)
+        rejection = metrics[metric_key] - peak_oob_gain
+        # Best case is at the OOB gain minimum
+        best_rejection = metrics[metric_key] - self._band_value(oob_metrics.gain_min, out_port, in_port)
+        
+        # IMPORTANT: Compare REJECTION (dBc) >= requirement, NOT gain
+        # Example: If requirement is >= 60 dBc:
+        #   - rejection = 65 dBc → passes (65 >= 60)
+        #   - rejection = 55 dBc → fails (55 < 60)
+        # Higher rejection is better (means OOB gain is much lower than in-band)
+        passed = rejection >= criterion.min_value if criterion.min_value else False
+        
+        return TestResult(
+            id=uuid4(),
+            measurement_id=measurement.id,
+            test_criteria_id=criterion.id,
+            measured_value=rejection,
+            passed=passed,
+            s_parameter=s_param,
+            measured_min=rejection,
+            measured_max=best_rejection,
+            # Worst-case rejection is at the OOB gain peak
+            worst_frequency=self._band_value(oob_metrics.gain_max_freq, out_port, in_port)
+        )
     
     def get_required_criteria_names(self) -> List[str]:
         """
@@ -0,0 +1,354 @@
+"""
+Database connection management.
+
+This module provides the ConnectionManager, which opens tuned SQLite
+connections and keeps a bounded pool of them for background worker threads.
+
+Connection settings:
+- WAL journal mode: readers never block the writer and the writer never
+  blocks readers, so a background evaluation saving results does not freeze
+  GUI queries (only writer vs writer is serialized)
+- synchronous=NORMAL: in WAL mode this is still safe against corruption;
+  only the last transactions can be lost on power failure
+- cache_size / mmap_size: larger page cache and memory-mapped reads for
+  measurement BLOBs
+- busy_timeout: a connection waits for a competing writer instead of failing
+  immediately with "database is locked"
+- foreign_keys=ON: cascading deletes (results, metrics) work on every connection
+
+SQLite connections must not be used by two threads at the same time. Pooled
+connections are opened with check_same_thread=False, and the pool hands each
+connection to one borrower at a time: a worker borrows a connection, uses it
+on its own thread and returns it when done. The pool records which thread
+holds each connection; connection_released() lets deferred loaders (lazy
+RF data) refuse to touch a connection their thread no longer holds.
+
+Typical usage:
+    manager = get_connection_manager(database_path)
+    with manager.connection() as conn:
+        ...  # Use conn on this thread only
+    close_all_connection_managers()  # At application shutdown
+"""
+
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+from ..core.exceptions import DatabaseError
+
+
+# Default pragma values (see module docstring)
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+DEFAULT_CACHE_SIZE_KIB = 16 * 1024  # 16 MiB page cache per connection
+DEFAULT_MMAP_SIZE = 256 * 1024 * 1024  # 256 MiB memory-mapped I/O
+
+# Default number of pooled connections (concurrent worker threads)
+DEFAULT_MAX_CONNECTIONS = 4
+
+
+class ConnectionManager:
+    """
+    Opens tuned SQLite connections and pools them for worker threads.
+
+    The pool is bounded: at most max_connections connections exist at once.
+    Returned connections are kept open (idle) for the next borrower, so
+    workers no longer pay for a new connection (and schema page reads) per
+    run. acquire() blocks while all connections are borrowed.
+
+    Connections opened with open_connection() are not pooled (e.g. the GUI
+    thread's own connection) but use the same settings.
+    """
+
+    def __init__(
+        self,
+        database_path: Union[str, Path],
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS,
+        cache_size_kib: int = DEFAULT_CACHE_SIZE_KIB,
+        mmap_size: int = DEFAULT_MMAP_SIZE
+    ):
+        """
+        Initialize connection manager (no connection is opened yet).
+
+        Args:
+            database_path: Path to the database file
+            max_connections: Maximum number of pooled connections
+            busy_timeout_ms: How long a connection waits for a lock (ms)
+            cache_size_kib: Page cache size per connection (KiB)
+            mmap_size: Memory-mapped I/O size per connection (bytes)
+
+        Raises:
+            ValueError: If max_connections is less than 1
+        """
+        if max_connections < 1:
+            raise ValueError("max_connections must be at least 1")
+
+        self.database_path = Path(database_path)
+        self.max_connections = max_connections
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cache_size_kib = cache_size_kib
+        self.mmap_size = mmap_size
+
+        # Pool state - guarded by the condition's lock
+        self._condition = threading.Condition()
+        self._idle: List[sqlite3.Connection] = []
+        self._borrowed: List[sqlite3.Connection] = []
+        # id(connection) -> thread ident of its borrower
+        self._borrowers: Dict[int, int] = {}
+        self._closed = False
+
+        _pools.add(self)
+
+    def open_connection(self, check_same_thread: bool = True) -> sqlite3.Connection:
+        """
+        Open a new tuned connection (not pooled).
+
+        Args:
+            check_same_thread: Passed to sqlite3.connect. Pooled connections
+                              use False because they move between threads
+                              (one borrower at a time).
+
+        Returns:
+            SQLite connection with row_factory=sqlite3.Row and pragmas applied
+
+        Raises:
+            DatabaseError: If the database cannot be opened
+        """
+        try:
+            conn = sqlite3.connect(
+                str(self.database_path),
+                timeout=self.busy_timeout_ms / 1000,
+                check_same_thread=check_same_thread
+            )
+            conn.row_factory = sqlite3.Row
+            self._configure(conn)
+            return conn
+        except sqlite3.Error as e:
+            raise DatabaseError(f"Failed to open database {self.database_path}: {e}") from e
+
+    def acquire(self, timeout: Optional[float] = None) -> sqlite3.Connection:
+        """
+        Borrow a pooled connection.
+
+        Reuses an idle connection if there is one, opens a new one if the
+        pool is below max_connections, and otherwise waits for a return.
+
+        Args:
+            timeout: Maximum seconds to wait for a connection (None = forever)
+
+        Returns:
+            SQLite connection (must be given back with release())
+
+        Raises:
+            DatabaseError: If the manager is closed, no connection became
+                          available within timeout, or opening failed
+        """
+        with self._condition:
+            available = self._condition.wait_for(
+                lambda: self._closed or self._idle or self._pool_size() < self.max_connections,
+                timeout=timeout
+            )
+            if self._closed:
+                raise DatabaseError("Connection manager is closed")
+            if not available:
+                raise DatabaseError(
+                    f"No database connection available within {timeout} s "
+                    f"({self.max_connections} in use)"
+                )
+            if self._idle:
+                conn = self._idle.pop()
+            else:
+                # Open while holding the lock so the pool never exceeds its bound
+                conn = self.open_connection(check_same_thread=False)
+            self._borrowed.append(conn)
+            self._borrowers[id(conn)] = threading.get_ident()
+            return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        """
+        Return a borrowed connection to the pool.
+
+        Any uncommitted transaction is rolled back first, so the next
+        borrower starts clean (and no write lock is held while idle).
+
+        Args:
+            conn: Connection obtained from acquire()
+
+        Raises:
+            ValueError: If the connection was not borrowed from this pool
+        """
+        with self._condition:
+            if not any(conn is borrowed for borrowed in self._borrowed):
+                raise ValueError("Connection was not borrowed from this pool")
+            self._borrowed = [c for c in self._borrowed if c is not conn]
+            del self._borrowers[id(conn)]
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                # Broken connection - drop it instead of pooling it
+                conn.close()
+            else:
+                if self._closed:
+                    conn.close()
+                else:
+                    self._idle.append(conn)
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a pooled connection for the duration of a with-block.
+
+        Args:
+            timeout: Maximum seconds to wait for a connection (None = forever)
+
+        Yields:
+            SQLite connection, returned to the pool when the block exits
+        """
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close_all(self) -> None:
+        """
+        Close the pool.
+
+        Idle connections are closed immediately; borrowed connections are
+        closed when they are released. Blocked acquire() calls fail with
+        DatabaseError.
+        """
+        with self._condition:
+            self._closed = True
+            for conn in self._idle:
+                conn.close()
+            self._idle.clear()
+            self._condition.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        """Whether close_all() has been called."""
+        with self._condition:
+            return self._closed
+
+    @property
+    def idle_count(self) -> int:
+        """Number of open connections waiting in the pool."""
+        with self._condition:
+            return len(self._idle)
+
+    @property
+    def borrowed_count(self) -> int:
+        """Number of connections currently borrowed."""
+        with self._condition:
+            return len(self._borrowed)
+
+    def is_released(self, conn: sqlite3.Connection, thread_id: int) -> Optional[bool]:
+        """
+        Whether a connection of this pool is no longer held by a thread.
+
+        Args:
+            conn: SQLite connection
+            thread_id: Thread ident (threading.get_ident()) of the expected borrower
+
+        Returns:
+            False if thread_id currently borrows conn, True if conn is idle or
+            borrowed by another thread, None if conn is not in this pool
+        """
+        with self._condition:
+            if any(conn is borrowed for borrowed in self._borrowed):
+                return self._borrowers[id(conn)] != thread_id
+            if any(conn is idle for idle in self._idle):
+                return True
+            return None
+
+    def _pool_size(self) -> int:
+        """Number of open pooled connections (caller holds the lock)."""
+        return len(self._idle) + len(self._borrowed)
+
+    def _configure(self, conn: sqlite3.Connection) -> None:
+        """
+        Apply connection pragmas.
+
+        journal_mode=WAL is persistent (stored in the database file); the
+        other pragmas apply per connection. In-memory databases ignore WAL.
+
+        Args:
+            conn: Newly opened connection
+        """
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        # Negative cache_size is in KiB rather than pages
+        conn.execute(f"PRAGMA cache_size = {-int(self.cache_size_kib)}")
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        conn.execute("PRAGMA foreign_keys = ON")
+
+
+# Every pool (shared or not), for connection_released()
+_pools: "weakref.WeakSet[ConnectionManager]" = weakref.WeakSet()
+
+# One manager (pool) per database file, shared by all worker threads
+_managers: Dict[Path, ConnectionManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_connection_manager(database_path: Union[str, Path]) -> ConnectionManager:
+    """
+    Get the shared connection manager for a database file.
+
+    Creates the manager on first use. Workers call this with their database
+    path instead of opening connections themselves.
+
+    Args:
+        database_path: Path to the database file
+
+    Returns:
+        ConnectionManager for that file (same object for every caller)
+    """
+    key = Path(database_path).resolve()
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None or manager.closed:
+            manager = ConnectionManager(key)
+            _managers[key] = manager
+        return manager
+
+
+def close_all_connection_managers() -> None:
+    """
+    Close every shared connection manager.
+
+    Called at application shutdown, after worker threads have finished.
+    """
+    with _managers_lock:
+        managers = list(_managers.values())
+        _managers.clear()
+    for manager in managers:
+        manager.close_all()
+
+
+def connection_released(conn: sqlite3.Connection, thread_id: int) -> bool:
+    """
+    Whether a pooled connection has left the thread that borrowed it.
+
+    True once the connection was returned to its pool (or handed to another
+    thread). Connections that were never pooled (e.g. the GUI thread's own
+    connection) are never released.
+
+    Args:
+        conn: SQLite connection
+        thread_id: Thread ident (threading.get_ident()) of the borrower
+
+    Returns:
+        True if thread_id no longer holds the pooled connection
+    """
+    for pool in list(_pools):
+        released = pool.is_released(conn, thread_id)
+        if released is not None:
+            return released
+    return False
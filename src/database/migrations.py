@@ -0,0 +1,408 @@
+"""
+Versioned schema migrations.
+
+create_schema() builds the version 1 schema (tables and their original
+indexes) with CREATE ... IF NOT EXISTS. Every later schema change - new
+tables, columns, indexes and triggers - is a Migration: a numbered step
+that is applied once, in order, inside its own transaction, and recorded
+in the schema_migrations table. Steps check for what they add, so a
+database that already has it is left unchanged.
+
+Adding a migration:
+- Append a Migration with the next version number to MIGRATIONS
+- Never edit or reorder a released migration (databases in the field have
+  already recorded it as applied)
+- SCHEMA_VERSION (schema.py) follows the last migration automatically
+
+Migration history:
+- schema_migrations: version, description, applied_at, one row per step
+- schema_version: single row holding the highest applied version (kept for
+  the version check in initialize_database)
+"""
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Callable, List, Sequence
+
+from ..core.exceptions import DatabaseError, FileLoadError
+from ..core.rf_data import network_codec
+
+
+# Version of the schema created by create_schema() before any migration
+BASE_SCHEMA_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    One schema change.
+
+    Attributes:
+        version: Schema version after this step (consecutive, starting at 2)
+        description: Human-readable summary (stored in schema_migrations)
+        apply: Function executing the step's SQL on the connection. It must
+               not commit - the runner commits or rolls back the whole step.
+    """
+    version: int
+    description: str
+    apply: Callable[[sqlite3.Connection], None]
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    """
+    Get the column names of a table.
+
+    Args:
+        conn: SQLite connection
+        table: Table name
+
+    Returns:
+        Column names in table order
+    """
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def _touchstone_content_hash(conn: sqlite3.Connection) -> None:
+    """
+    Deduplicate RF data by source file content hash.
+
+    Adds measurements.content_hash (SHA-256 of the Touchstone file) and the
+    touchstone_blobs table holding one encoded network per hash. Rows with
+    a content_hash keep their RF data there (touchstone_data is then an
+    empty BLOB); existing rows keep their inline data and a NULL hash. A
+    trigger releases a blob when its last measurement is deleted (also for
+    rows removed by ON DELETE CASCADE from devices), and the index on
+    content_hash serves reload detection and that trigger.
+    """
+    if "content_hash" not in _columns(conn, "measurements"):
+        conn.execute("ALTER TABLE measurements ADD COLUMN content_hash TEXT")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS touchstone_blobs (
+            content_hash TEXT PRIMARY KEY,
+            data BLOB NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_measurements_content_hash
+        ON measurements(content_hash)
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_measurements_release_blob
+        AFTER DELETE ON measurements
+        WHEN OLD.content_hash IS NOT NULL
+        BEGIN
+            DELETE FROM touchstone_blobs
+            WHERE content_hash = OLD.content_hash
+              AND NOT EXISTS (
+                  SELECT 1 FROM measurements WHERE content_hash = OLD.content_hash
+              );
+        END
+    """)
+
+
+def _measurement_metrics(conn: sqlite3.Connection) -> None:
+    """
+    Create the measurement_metrics table.
+
+    Band reductions computed from RF data (gain min/max per S-parameter,
+    VSWR per port) so that criteria changes re-evaluate by comparing
+    stored numbers. One row per measurement, frequency band (operational
+    or OOB) and calculator version. metrics is JSON text: {"gain_min":
+    [[...]], "gain_max": [[...]], "vswr_max": [...], plus the frequency of
+    each extreme: "gain_min_freq", "gain_max_freq", "vswr_max_freq", and
+    the margin reductions per criterion limit: "margins"}.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS measurement_metrics (
+            measurement_id TEXT NOT NULL,
+            freq_min REAL NOT NULL,
+            freq_max REAL NOT NULL,
+            calculator_version INTEGER NOT NULL,
+            n_ports INTEGER NOT NULL,
+            metrics TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (measurement_id, freq_min, freq_max, calculator_version),
+            FOREIGN KEY (measurement_id) REFERENCES measurements(id) ON DELETE CASCADE
+        )
+    """)
+
+
+def _test_result_extremes(conn: sqlite3.Connection) -> None:
+    """
+    Add measured_min, measured_max and worst_frequency to test_results.
+
+    Secondary values from evaluation (e.g. gain range extremes and where
+    the worst case occurs), so display needs no RF math. Existing results
+    keep NULL until they are re-evaluated.
+    """
+    columns = _columns(conn, "test_results")
+    for column in ("measured_min", "measured_max", "worst_frequency"):
+        if column not in columns:
+            conn.execute(f"ALTER TABLE test_results ADD COLUMN {column} REAL")
+
+
+def _index_test_results_by_criteria(conn: sqlite3.Connection) -> None:
+    """
+    Index test_results(test_criteria_id).
+
+    Used by mark_as_stale_by_criteria, get_by_criteria_id and the
+    ON DELETE CASCADE from test_criteria (which otherwise scans every result
+    for each deleted criterion).
+    """
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_test_results_criteria
+        ON test_results(test_criteria_id)
+    """)
+
+
+def _index_measurements_by_serial_number(conn: sqlite3.Connection) -> None:
+    """
+    Index measurements(serial_number, measurement_date).
+
+    Used by get_by_serial_number; the date column also provides its
+    ORDER BY without a sort.
+    """
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_measurements_serial
+        ON measurements(serial_number, measurement_date)
+    """)
+
+
+def _index_test_results_by_measurement_and_stale(conn: sqlite3.Connection) -> None:
+    """
+    Replace idx_test_results_measurement with (measurement_id, is_stale).
+
+    Result lookups filter by measurement and (unless stale results are
+    requested) by is_stale = 0. The composite index serves both, and also
+    every measurement_id-only lookup, so the old single-column index is
+    dropped instead of being maintained on every insert.
+    """
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_test_results_measurement_stale
+        ON test_results(measurement_id, is_stale)
+    """)
+    conn.execute("DROP INDEX IF EXISTS idx_test_results_measurement")
+
+
+def _unique_test_result_key(conn: sqlite3.Connection) -> None:
+    """
+    Make (measurement_id, test_criteria_id, s_parameter) unique in test_results.
+
+    Existing duplicates (left by re-evaluations whose delete step was
+    missed) are removed first, keeping one row per key: current results
+    before stale ones, then the newest. s_parameter is NULL for results
+    that do not apply to an S-parameter; IFNULL makes those unique too
+    (NULLs never conflict in a plain unique index).
+    """
+    conn.execute("""
+        DELETE FROM test_results WHERE rowid IN (
+            SELECT rowid FROM (
+                SELECT rowid, ROW_NUMBER() OVER (
+                    PARTITION BY measurement_id, test_criteria_id, IFNULL(s_parameter, '')
+                    ORDER BY is_stale, created_at DESC, rowid DESC
+                ) AS key_rank
+                FROM test_results
+            )
+            WHERE key_rank > 1
+        )
+    """)
+    conn.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_test_results_key
+        ON test_results(measurement_id, test_criteria_id, IFNULL(s_parameter, ''))
+    """)
+
+
+def _measurement_header_facts(conn: sqlite3.Connection) -> None:
+    """
+    Add RF data header facts to measurements and index them.
+
+    n_ports, n_points, freq_start and freq_stop (GHz) let port queries and
+    filters run without decoding networks. Existing rows are backfilled
+    from their codec blob headers, read once per stored blob; rows holding
+    legacy pickle blobs keep NULL facts until migrate_legacy_blobs converts
+    them. The index on (device_id, test_type, n_ports) serves
+    MeasurementRepository.get_port_counts.
+    """
+    columns = _columns(conn, "measurements")
+    for column, column_type in (
+        ("n_ports", "INTEGER"),
+        ("n_points", "INTEGER"),
+        ("freq_start", "REAL"),
+        ("freq_stop", "REAL"),
+    ):
+        if column not in columns:
+            conn.execute(f"ALTER TABLE measurements ADD COLUMN {column} {column_type}")
+
+    # Collect first, update after - the SELECT cursor stays untouched
+    facts_by_source = {}
+    updates = []
+    rows = conn.execute("""
+        SELECT id, content_hash,
+               COALESCE((SELECT data FROM touchstone_blobs
+                         WHERE content_hash = measurements.content_hash),
+                        touchstone_data)
+        FROM measurements
+        WHERE n_ports IS NULL
+    """)
+    for measurement_id, content_hash, data in rows:
+        source = content_hash or measurement_id
+        if source not in facts_by_source:
+            facts_by_source[source] = None
+            if data is not None and network_codec.is_encoded(data):
+                try:
+                    header = network_codec.read_header(data)
+                    facts_by_source[source] = (
+                        header.n_ports, header.n_points,
+                        header.freq_start_ghz, header.freq_stop_ghz,
+                    )
+                except FileLoadError:
+                    pass  # Unreadable blob - leave the facts NULL
+        if facts_by_source[source] is not None:
+            updates.append(facts_by_source[source] + (measurement_id,))
+    conn.executemany(
+        """
+        UPDATE measurements SET n_ports = ?, n_points = ?, freq_start = ?, freq_stop = ?
+        WHERE id = ?
+        """,
+        updates
+    )
+
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_measurements_device_ports
+        ON measurements(device_id, test_type, n_ports)
+    """)
+
+
+def _test_result_margins(conn: sqlite3.Connection) -> None:
+    """
+    Add margin and guard_band_percent to test_results.
+
+    margin is the signed distance of the worst sample to the limit and
+    guard_band_percent the share of the band within the guard band of it.
+    Existing results keep NULL until they are re-evaluated.
+    """
+    columns = _columns(conn, "test_results")
+    for column in ("margin", "guard_band_percent"):
+        if column not in columns:
+            conn.execute(f"ALTER TABLE test_results ADD COLUMN {column} REAL")
+
+
+# All migrations in version order
+MIGRATIONS: Sequence[Migration] = (
+    Migration(2, "Touchstone content hash", _touchstone_content_hash),
+    Migration(3, "Measurement metrics", _measurement_metrics),
+    Migration(4, "Test result extremes", _test_result_extremes),
+    Migration(5, "Index test_results by criteria", _index_test_results_by_criteria),
+    Migration(6, "Index measurements by serial number", _index_measurements_by_serial_number),
+    Migration(
+        7,
+        "Index test_results by measurement and staleness",
+        _index_test_results_by_measurement_and_stale
+    ),
+    Migration(8, "Unique test result key", _unique_test_result_key),
+    Migration(9, "Measurement header facts", _measurement_header_facts),
+    Migration(10, "Test result margins", _test_result_margins),
+)
+
+# Schema version after all migrations
+LATEST_VERSION = MIGRATIONS[-1].version if MIGRATIONS else BASE_SCHEMA_VERSION
+
+
+def get_applied_versions(conn: sqlite3.Connection) -> List[int]:
+    """
+    Get the versions recorded in schema_migrations.
+
+    Args:
+        conn: SQLite connection
+
+    Returns:
+        Applied migration versions in ascending order (empty if the history
+        table does not exist yet)
+    """
+    cursor = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'schema_migrations'"
+    )
+    if cursor.fetchone() is None:
+        return []
+    return [row[0] for row in conn.execute("SELECT version FROM schema_migrations ORDER BY version")]
+
+
+def run_migrations(
+    conn: sqlite3.Connection,
+    migrations: Sequence[Migration] = MIGRATIONS
+) -> List[int]:
+    """
+    Apply all pending migrations in version order.
+
+    Each migration runs in its own transaction together with its history
+    row and the schema_version update, so an interrupted upgrade leaves the
+    database at the last completed version and resumes from there.
+
+    Args:
+        conn: SQLite connection with the base schema (no open transaction
+              is expected; pending changes are committed first)
+        migrations: Migrations to consider (default: MIGRATIONS)
+
+    Returns:
+        Versions applied by this call (empty if already up to date)
+
+    Raises:
+        DatabaseError: If a migration fails (it is rolled back), or if the
+                      database has migrations newer than this application
+    """
+    _ensure_history_table(conn)
+    applied = set(get_applied_versions(conn))
+
+    latest = max((m.version for m in migrations), default=BASE_SCHEMA_VERSION)
+    if applied and max(applied) > latest:
+        # A newer application has upgraded this database - prevent corruption
+        raise DatabaseError(
+            f"Database schema version ({max(applied)}) is newer than "
+            f"application version ({latest}). Please update the application."
+        )
+
+    newly_applied = []
+    for migration in sorted(migrations, key=lambda m: m.version):
+        if migration.version in applied:
+            continue
+        try:
+            conn.execute("BEGIN")
+            migration.apply(conn)
+            conn.execute(
+                "INSERT INTO schema_migrations (version, description) VALUES (?, ?)",
+                (migration.version, migration.description)
+            )
+            conn.execute("DELETE FROM schema_version")
+            conn.execute(
+                "INSERT INTO schema_version (version) VALUES (?)",
+                (migration.version,)
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            raise DatabaseError(
+                f"Failed to apply migration {migration.version} "
+                f"({migration.description}): {e}"
+            ) from e
+        newly_applied.append(migration.version)
+
+    return newly_applied
+
+
+def _ensure_history_table(conn: sqlite3.Connection) -> None:
+    """
+    Create the schema_migrations table if needed.
+
+    Args:
+        conn: SQLite connection (any pending transaction is committed)
+    """
+    conn.commit()
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.commit()
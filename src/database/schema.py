@@ -13,11 +13,14 @@ Key tables:
 - devices: Device configurations (part numbers, frequency ranges, port configs)
 - test_criteria: Test requirements organized by device/test_type/test_stage
 - measurements: Loaded Touchstone files with RF data
+- touchstone_blobs: Encoded RF data shared by measurements (content-addressed)
+- measurement_metrics: Stored band metrics (re-evaluation without RF data)
 - test_results: Pass/fail evaluation results
 
 Schema versioning:
-- Current version: 1
-- Future versions will support migrations
+- create_schema() builds the version 1 schema, then applies the numbered
+  migrations in migrations.py (every later table, column and index)
+- Applied migrations are recorded in schema_migrations
 - Version mismatch detection prevents data corruption
 
 Database location:
@@ -31,9 +34,11 @@ from pathlib import Path
 from typing import Optional
 from uuid import UUID
 
-# Current schema version - increment when schema changes
+from .migrations import BASE_SCHEMA_VERSION, LATEST_VERSION, run_migrations
+
+# Current schema version - the version of the last migration
 # Used for migration detection and validation
-SCHEMA_VERSION = 1
+SCHEMA_VERSION = LATEST_VERSION
 
 
 def get_database_path() -> Path:
@@ -57,23 +62,31 @@ def create_schema(conn: sqlite3.Connection) -> None:
     """
     Create the database schema.
     
-    Creates all tables, indexes, and schema version tracking. This function
-    is called when initializing a new database or when schema version changes.
+    Creates all tables, indexes, and schema version tracking, then applies
+    pending migrations. Safe to call on every startup: existing tables are
+    left untouched and applied migrations are skipped.
     
     Table structure:
     - schema_version: Tracks current schema version
     - devices: Device configurations
     - test_criteria: Test requirements (with frequency ranges for OOB)
-    - measurements: RF measurement data (with pickled Network objects)
+    - measurements: RF measurement data (with encoded Network arrays)
     - test_results: Compliance evaluation results (with s_parameter tags)
     
+    Later tables (touchstone_blobs, measurement_metrics), columns and
+    indexes are added by migrations (see migrations.py).
+    
     Foreign keys use CASCADE deletion:
     - Deleting a device deletes all its criteria and measurements
     - Deleting a measurement deletes all its test results
     - Deleting criteria deletes all associated test results
     
     Args:
-        conn: SQLite connection (will be committed by caller)
+        conn: SQLite connection (committed by this function)
+        
+    Raises:
+        DatabaseError: If a migration fails or the database is newer than
+                      this application
     """
     cursor = conn.cursor()
     
@@ -85,11 +98,11 @@ def create_schema(conn: sqlite3.Connection) -> None:
         )
     """)
     
-    # Insert current schema version
-    # INSERT OR REPLACE ensures version is always current
+    # New databases start at the base version; migrations advance it
     cursor.execute("""
-        INSERT OR REPLACE INTO schema_version (version) VALUES (?)
-    """, (SCHEMA_VERSION,))
+        INSERT INTO schema_version (version)
+        SELECT ? WHERE NOT EXISTS (SELECT 1 FROM schema_version)
+    """, (BASE_SCHEMA_VERSION,))
     
     # Devices table: Stores device configurations
     # Devices define the physical characteristics and test requirements
@@ -138,7 +151,7 @@ def create_schema(conn: sqlite3.Connection) -> None:
     """)
     
     # Measurements table: Stores loaded RF measurement files
-    # touchstone_data is stored as BLOB (pickled Network objects)
+    # touchstone_data is stored as BLOB (binary network codec; legacy rows are pickled Network objects)
     # metadata is stored as JSON text (flexible additional information)
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS measurements (
@@ -194,13 +207,13 @@ def create_schema(conn: sqlite3.Connection) -> None:
         CREATE INDEX IF NOT EXISTS idx_measurements_device ON measurements(device_id, test_type, test_stage)
     """)
     
-    # Index on test_results for filtering by measurement
-    # Used when retrieving all results for a measurement
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_test_results_measurement ON test_results(measurement_id)
-    """)
-    
+    # Everything added after version 1 (content hashing, stored metrics,
+    # result values, indexes) is created by migrations. Version 1's
+    # idx_test_results_measurement is replaced by a migration and is no
+    # longer created here.
     conn.commit()
+    
+    run_migrations(conn)
 
 
 def initialize_database(db_path: Optional[Path] = None) -> sqlite3.Connection:
@@ -209,7 +222,7 @@ def initialize_database(db_path: Optional[Path] = None) -> sqlite3.Connection:
     
     Handles database initialization, schema creation, and version checking.
     For new databases, creates full schema. For existing databases, checks
-    version and handles migrations (currently just version updates).
+    version and applies pending migrations.
     
     Database location:
     - If db_path provided: Use that path
@@ -255,11 +268,9 @@ def initialize_database(db_path: Optional[Path] = None) -> sqlite3.Connection:
         current_version = row[0] if row else 0
         
         if current_version < SCHEMA_VERSION:
-            # Database is older than application - migration needed
-            # TODO: Run migrations here when we have version changes
-            # For now, just update version number
-            cursor.execute("UPDATE schema_version SET version = ?", (SCHEMA_VERSION,))
-            conn.commit()
+            # Database is older than application - add new tables/columns
+            # and apply pending migrations
+            create_schema(conn)
         elif current_version > SCHEMA_VERSION:
             # Database is newer than application - prevent data corruption
             from ..core.exceptions import DatabaseError
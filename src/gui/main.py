@@ -14,7 +14,9 @@ from PyQt6.QtCore import Qt
 
 from .main_window import MainWindow
 from .utils.service_factory import create_services
+from .utils.blob_migration_worker import BlobMigrationWorker
 from .utils.error_handler import handle_exception
+from ..database.connection_manager import close_all_connection_managers
 
 # Enable logging for debugging
 logging.basicConfig(
@@ -87,11 +89,20 @@ def main():
         )
         window.show()
         
+        # Convert legacy pickled measurement data in the background
+        migration_worker = BlobMigrationWorker(database_path)
+        migration_worker.error_occurred.connect(lambda msg: logging.warning(msg))
+        migration_worker.start()
+        
         # Run event loop
         exit_code = app.exec()
         
-        # Close database connection
+        # Let an in-flight migration batch finish before closing the database
+        migration_worker.wait()
+        
+        # Close database connections (GUI connection and worker pool)
         db_conn.close()
+        close_all_connection_managers()
         
         return exit_code
         
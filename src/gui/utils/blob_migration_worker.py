@@ -0,0 +1,50 @@
+"""
+Background worker for migrating legacy measurement storage.
+
+Databases created before the binary network codec store pickled Network
+objects in measurements.touchstone_data. They remain readable, but are
+larger and slower to load. This worker converts them to the codec format
+in small batches after startup, without blocking the UI.
+"""
+
+import logging
+from pathlib import Path
+from PyQt6.QtCore import QThread, pyqtSignal as Signal
+
+from .service_factory import thread_services
+
+logger = logging.getLogger(__name__)
+
+
+class BlobMigrationWorker(QThread):
+    """
+    Background worker that re-encodes legacy pickled measurement BLOBs.
+    
+    Borrows a pooled database connection and creates its own services for
+    thread safety.
+    Each batch is committed separately so the UI thread never waits long
+    for the database write lock.
+    """
+    migration_complete = Signal(int)  # Number of measurements migrated
+    error_occurred = Signal(str)
+    
+    def __init__(self, database_path: Path, batch_size: int = 25):
+        super().__init__()
+        self.database_path = database_path
+        self.batch_size = batch_size
+    
+    def run(self):
+        """Execute the storage migration in background thread."""
+        try:
+            # Borrow a pooled connection for thread-local services
+            # SQLite connections cannot be shared across threads
+            with thread_services(self.database_path) as (_, measurement_service, _):
+                migrated = measurement_service.migrate_legacy_storage(batch_size=self.batch_size)
+            if migrated:
+                logger.info("Migrated %d measurements to binary storage", migrated)
+            self.migration_complete.emit(migrated)
+            
+        except Exception as e:
+            import traceback
+            error_msg = f"Error migrating measurement storage: {e}\n{traceback.format_exc()}"
+            self.error_occurred.emit(error_msg)
@@ -8,21 +8,59 @@ setup and makes it easy to swap implementations (e.g., for testing).
 The factory creates a database connection, initializes repositories, and
 wires them together with services. This is the single point of configuration
 for the application's service layer.
+
+Connections come from the shared ConnectionManager of the database file
+(WAL mode, tuned pragmas). Worker threads borrow pooled connections through
+thread_services() and return them when done.
+
+Devices and criteria are cached in one EntityCache per database file,
+shared by the repositories of the GUI thread and of every worker, so a
+criteria edit in device maintenance invalidates what the workers see.
 """
 
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Dict, Iterator, Tuple
 
 from ...database.schema import create_schema, get_database_path
+from ...database.connection_manager import get_connection_manager
+from ...core.repositories.entity_cache import EntityCache
 from ...core.repositories.device_repository import DeviceRepository
 from ...core.repositories.test_criteria_repository import TestCriteriaRepository
 from ...core.repositories.measurement_repository import MeasurementRepository
 from ...core.repositories.test_result_repository import TestResultRepository
+from ...core.repositories.measurement_metrics_repository import MeasurementMetricsRepository
 from ...core.services.device_service import DeviceService
 from ...core.services.measurement_service import MeasurementService
 from ...core.services.compliance_service import ComplianceService
 
 
+# One device/criteria cache per database file, shared by all threads
+_entity_caches: Dict[Path, EntityCache] = {}
+_entity_caches_lock = threading.Lock()
+
+
+def get_entity_cache(database_path: Path) -> EntityCache:
+    """
+    Get the shared device/criteria cache of a database file.
+    
+    Args:
+        database_path: Path to the database file
+    
+    Returns:
+        EntityCache for that file (same object for every caller)
+    """
+    key = Path(database_path).resolve()
+    with _entity_caches_lock:
+        cache = _entity_caches.get(key)
+        if cache is None:
+            cache = EntityCache()
+            _entity_caches[key] = cache
+        return cache
+
+
 def create_services(database_path: Path = None) -> tuple:
     """
     Create all service instances with dependencies injected.
@@ -72,82 +110,72 @@ def create_services(database_path: Path = None) -> tuple:
     # Create database directory if needed
     database_path.parent.mkdir(parents=True, exist_ok=True)
     
-    # Open database connection
-    conn = sqlite3.connect(str(database_path))
-    conn.row_factory = sqlite3.Row
-    
-    # Enable foreign keys
-    conn.execute("PRAGMA foreign_keys = ON")
+    # Open the GUI thread's database connection (WAL mode, tuned pragmas,
+    # foreign keys enabled). Not pooled - it lives as long as the application.
+    conn = get_connection_manager(database_path).open_connection()
     
     # Create schema if needed
     create_schema(conn)
     
-    # Create repositories
-    device_repo = DeviceRepository(conn)
-    criteria_repo = TestCriteriaRepository(conn)
-    measurement_repo = MeasurementRepository(conn)
-    result_repo = TestResultRepository(conn)
-    
-    # Create services with dependency injection
-    # Ensure all repositories are properly initialized
-    if criteria_repo is None:
-        raise ValueError("TestCriteriaRepository must be initialized before creating DeviceService")
-    
-    device_service = DeviceService(
-        device_repository=device_repo,
-        criteria_repository=criteria_repo,
-        measurement_repository=measurement_repo,
-        result_repository=result_repo
+    device_service, measurement_service, compliance_service = _create_services_for_connection(
+        conn, get_entity_cache(database_path)
     )
     
     # Verify service was created correctly
     if device_service.criteria_repo is None:
         raise ValueError("DeviceService.criteria_repo is None after initialization")
     
-    measurement_service = MeasurementService(
-        measurement_repository=measurement_repo,
-        device_repository=device_repo
-    )
-    
-    compliance_service = ComplianceService(
-        measurement_repository=measurement_repo,
-        criteria_repository=criteria_repo,
-        device_repository=device_repo,
-        result_repository=result_repo
-    )
-    
     return device_service, measurement_service, compliance_service, conn, database_path
 
 
-def create_services_for_thread(database_path: Path) -> tuple:
+@contextmanager
+def thread_services(
+    database_path: Path
+) -> Iterator[Tuple[DeviceService, MeasurementService, ComplianceService]]:
     """
-    Create service instances with a NEW database connection for use in a worker thread.
+    Provide service instances on a pooled connection for a worker thread.
+    
+    SQLite connections cannot be used by two threads at once. This borrows a
+    connection from the database's shared pool for the duration of the
+    with-block and returns it afterwards, so workers reuse connections
+    instead of opening (and leaking) a new one per run.
     
-    SQLite connections cannot be shared across threads. This function creates
-    a new connection and new service instances that can be safely used in
-    background worker threads.
+    The services must only be used inside the with-block, on the thread
+    that entered it.
     
     Args:
         database_path: Path to the database file
     
-    Returns:
+    Yields:
         Tuple of (DeviceService, MeasurementService, ComplianceService)
-        Note: Connection is NOT returned - it's managed by repositories
-    """
-    import sqlite3
     
-    # Create new connection for this thread
-    conn = sqlite3.connect(str(database_path))
-    conn.row_factory = sqlite3.Row
+    Raises:
+        DatabaseError: If no connection can be opened
+    """
+    with get_connection_manager(database_path).connection() as conn:
+        yield _create_services_for_connection(conn, get_entity_cache(database_path))
+
+
+def _create_services_for_connection(
+    conn: sqlite3.Connection,
+    cache: EntityCache
+) -> Tuple[DeviceService, MeasurementService, ComplianceService]:
+    """
+    Create repositories and services on an open connection.
     
-    # Enable foreign keys
-    conn.execute("PRAGMA foreign_keys = ON")
+    Args:
+        conn: SQLite connection (row_factory=sqlite3.Row)
+        cache: Device/criteria cache of the database
     
-    # Create repositories with new connection
-    device_repo = DeviceRepository(conn)
-    criteria_repo = TestCriteriaRepository(conn)
+    Returns:
+        Tuple of (DeviceService, MeasurementService, ComplianceService)
+    """
+    # Create repositories
+    device_repo = DeviceRepository(conn, cache)
+    criteria_repo = TestCriteriaRepository(conn, cache)
     measurement_repo = MeasurementRepository(conn)
     result_repo = TestResultRepository(conn)
+    metrics_repo = MeasurementMetricsRepository(conn)
     
     # Create services with dependency injection
     device_service = DeviceService(
@@ -166,7 +194,8 @@ def create_services_for_thread(database_path: Path) -> tuple:
         measurement_repository=measurement_repo,
         criteria_repository=criteria_repo,
         device_repository=device_repo,
-        result_repository=result_repo
+        result_repository=result_repo,
+        metrics_repository=metrics_repo
     )
     
     return device_service, measurement_service, compliance_service
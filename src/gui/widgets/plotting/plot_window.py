@@ -36,7 +36,7 @@ from ....core.models.device import Device
 from ....core.models.measurement import Measurement
 from ....core.models.test_criteria import TestCriteria
 from ...utils.error_handler import StatusBarMessage
-from ...utils.service_factory import create_services_for_thread
+from ...utils.service_factory import thread_services
 
 
 class PlottingWorker(QThread):
@@ -44,7 +44,8 @@ class PlottingWorker(QThread):
     Background worker thread for plot data processing.
     
     All heavy processing (filtering, deserialization, calculations) happens here.
-    Creates its own database connection and services for thread safety.
+    Borrows a pooled database connection and creates its own services for
+    thread safety.
     """
     data_ready = Signal(object)  # PlotData
     error_occurred = Signal(str)
@@ -75,20 +76,19 @@ class PlottingWorker(QThread):
     def run(self):
         """Execute plot data processing in background thread."""
         try:
-            # Create thread-local compliance service with new database connection
+            # Borrow a pooled connection for a thread-local compliance service
             # SQLite connections cannot be shared across threads
-            _, _, compliance_service = create_services_for_thread(self.database_path)
-            
-            plot_data = self.plotting_service.prepare_plot_data(
-                device=self.device,
-                measurements=self.measurements,
-                plot_type=self.plot_type,
-                selected_temperatures=self.selected_temperatures,
-                selected_paths=self.selected_paths,
-                selected_s_params=self.selected_s_params,
-                test_stage=self.test_stage,
-                compliance_service=compliance_service
-            )
+            with thread_services(self.database_path) as (_, _, compliance_service):
+                plot_data = self.plotting_service.prepare_plot_data(
+                    device=self.device,
+                    measurements=self.measurements,
+                    plot_type=self.plot_type,
+                    selected_temperatures=self.selected_temperatures,
+                    selected_paths=self.selected_paths,
+                    selected_s_params=self.selected_s_params,
+                    test_stage=self.test_stage,
+                    compliance_service=compliance_service
+                )
             self.data_ready.emit(plot_data)
         except Exception as e:
             import traceback
@@ -486,48 +486,39 @@ class PlotWindow(QMainWindow):
             logger.warning("No session measurements available for populating S-parameter filters")
             return
         
-        # Find first measurement with valid network data
-        measurement = None
+        # Find first measurement with a known port count. Stored header
+        # facts (n_ports) make this free; only measurements without them
+        # (legacy rows) need their network decoded - through the shared
+        # analysis pool, so plotting reuses the decode.
+        n_ports = None
         for m in self.test_setup_tab.session_measurements:
             if m.device_id == device.id and m.test_type == "S-Parameters":
-                if isinstance(m.touchstone_data, Network):
-                    measurement = m
+                if m.n_ports is not None:
+                    n_ports = m.n_ports
                     break
-                elif isinstance(m.touchstone_data, bytes):
-                    # Try to deserialize
-                    try:
-                        from ....core.rf_data.touchstone_loader import TouchstoneLoader
-                        loader = TouchstoneLoader()
-                        network = loader.deserialize_network(m.touchstone_data)
-                        measurement = m
-                        break
-                    except Exception as e:
-                        logger.debug(f"Failed to deserialize measurement {m.id}: {e}")
-                        continue
-        
-        if measurement is None:
+                # Network, encoded bytes or lazy proxy - resolve to a Network
+                try:
+                    n_ports = self.plotting_service.analysis_pool.get(m).network.nports
+                    break
+                except Exception as e:
+                    logger.debug(f"Failed to deserialize measurement {m.id}: {e}")
+                    continue
+        
+        if n_ports is None:
             logger.warning(f"No valid measurement found for device {device.id} to determine port count")
             return
         
-        # Get network to determine ports
-        if isinstance(measurement.touchstone_data, Network):
-            network = measurement.touchstone_data
-        else:
-            from ....core.rf_data.touchstone_loader import TouchstoneLoader
-            loader = TouchstoneLoader()
-            network = loader.deserialize_network(measurement.touchstone_data)
-        
-        logger.debug(f"Using network with {network.nports} ports to determine S-parameters")
+        logger.debug(f"Using {n_ports} ports to determine S-parameters")
         
         # Get appropriate S-parameters based on plot type
         if self.is_vswr_plot or self.is_return_loss_plot:
             # For VSWR and Return Loss, use ALL ports in the network (1 to nports)
             # VSWR and Return Loss are measured at every port regardless of device config
-            s_params = [f"S{p}{p}" for p in range(1, network.nports + 1)]
-            logger.info(f"{'VSWR' if self.is_vswr_plot else 'Return Loss'} S-parameters for checkbox population: {s_params} (network has {network.nports} ports)")
+            s_params = [f"S{p}{p}" for p in range(1, n_ports + 1)]
+            logger.info(f"{'VSWR' if self.is_vswr_plot else 'Return Loss'} S-parameters for checkbox population: {s_params} (network has {n_ports} ports)")
             logger.info(f"Device config: input_ports={device.input_ports}, output_ports={device.output_ports}")
         else:
-            s_params = device.get_gain_s_parameters(network.nports)
+            s_params = device.get_gain_s_parameters(n_ports)
             logger.debug(f"Device gain S-parameters: {s_params}")
         
         # Create checkboxes for each S-parameter
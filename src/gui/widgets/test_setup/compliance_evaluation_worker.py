@@ -11,7 +11,7 @@ from PyQt6.QtCore import QThread, pyqtSignal as Signal
 
 from ....core.models.device import Device
 from ....core.models.measurement import Measurement
-from ...utils.service_factory import create_services_for_thread
+from ...utils.service_factory import thread_services
 
 
 class ComplianceEvaluationWorker(QThread):
@@ -21,7 +21,8 @@ class ComplianceEvaluationWorker(QThread):
     Used when test stage changes - re-evaluates all session measurements
     with new criteria in the background.
     
-    Creates its own database connection and services for thread safety.
+    Borrows a pooled database connection and creates its own services for
+    thread safety.
     """
     evaluation_complete = Signal(object)  # Dict[UUID, List[TestResult]]
     error_occurred = Signal(str)
@@ -42,31 +43,30 @@ class ComplianceEvaluationWorker(QThread):
     def run(self):
         """Execute compliance re-evaluation in background thread."""
         try:
-            # Create thread-local services with new database connection
-            # SQLite connections cannot be shared across threads
-            _, _, compliance_service = create_services_for_thread(self.database_path)
-            
             results_by_measurement: Dict = {}
             print(f"[ComplianceEvaluationWorker] Starting stage {self.test_stage} for {len(self.measurements)} measurements")
             
-            # Re-evaluate all measurements with new test stage criteria
-            for measurement in self.measurements:
-                print(f"[ComplianceEvaluationWorker] Evaluating measurement {measurement.id} ({measurement.temperature} {measurement.path_type})")
-                # Remove existing results for this measurement/stage before recalculating
-                compliance_service.delete_results_for_measurement_and_stage(
-                    measurement.id,
-                    self.test_stage
-                )
+            # Borrow a pooled connection for thread-local services (returned
+            # to the pool when the block exits)
+            # SQLite connections cannot be shared across threads
+            with thread_services(self.database_path) as (_, _, compliance_service):
+                # Re-evaluate all measurements with new test stage criteria
+                for measurement in self.measurements:
+                    print(f"[ComplianceEvaluationWorker] Evaluating measurement {measurement.id} ({measurement.temperature} {measurement.path_type})")
+                    results = compliance_service.evaluate_compliance(
+                        measurement,
+                        self.device,
+                        self.test_stage
+                    )
+                    results_by_measurement[measurement.id] = results
+                    print(f"[ComplianceEvaluationWorker] Measurement {measurement.id} -> {len(results) if results else 0} results")
                 
-                results = compliance_service.evaluate_compliance(
-                    measurement,
-                    self.device,
-                    self.test_stage
+                # Save all results with one batched upsert; the stage's results
+                # the re-evaluation no longer produced (e.g., after a port
+                # change) are deleted in the same transaction
+                compliance_service.replace_stage_results(
+                    results_by_measurement, self.test_stage
                 )
-                if results:
-                    compliance_service.save_test_results(results)
-                results_by_measurement[measurement.id] = results
-                print(f"[ComplianceEvaluationWorker] Measurement {measurement.id} -> {len(results) if results else 0} results saved")
             
             # Signal completion
             print(f"[ComplianceEvaluationWorker] Completed stage {self.test_stage}")
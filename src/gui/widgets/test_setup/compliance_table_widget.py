@@ -7,7 +7,7 @@ Each row shows the 6 columns: Requirement, Limit, PRI (value), PRI Status,
 RED (value), RED Status.
 """
 
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 from uuid import UUID
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QTreeWidget, QTreeWidgetItem, QHeaderView,
@@ -117,12 +117,21 @@ class ComplianceTableWidget(QWidget):
             device: Current device
             measurements: List of measurements to display
             test_stage: Current test stage
+            precomputed_results: Optional results already evaluated, by
+                                 measurement ID (skips the database query
+                                 for those measurements)
         """
         self.tree.clear()
         
         if not measurements:
             return
         
+        # Results and their criteria for all measurements, fetched up front
+        # (no criterion lookups per result row)
+        results_by_measurement, criteria_by_id = self._collect_results(
+            measurements, test_stage, precomputed_results
+        )
+        
         # Group measurements by temperature
         by_temperature: Dict[str, List[Measurement]] = {}
         for measurement in measurements:
@@ -138,10 +147,7 @@ class ComplianceTableWidget(QWidget):
         for temp, temp_measurements in by_temperature.items():
             logger.debug(f"  - {temp}: {len(temp_measurements)} measurements")
             for m in temp_measurements:
-                if precomputed_results and m.id in precomputed_results:
-                    stage_results = precomputed_results[m.id]
-                else:
-                    stage_results = self.compliance_service.get_compliance_results(m.id, test_stage)
+                stage_results = results_by_measurement.get(m.id, [])
                 logger.debug(
                     "    measurement %s (%s %s) -> %s results for stage %s",
                     m.id,
@@ -169,24 +175,8 @@ class ComplianceTableWidget(QWidget):
                 continue
             
             # Get results for PRI and RED
-            pri_results = {}
-            red_results = {}
-            
-            if pri_measurements:
-                for m in pri_measurements:
-                    if precomputed_results and m.id in precomputed_results:
-                        results = precomputed_results[m.id]
-                    else:
-                        results = self.compliance_service.get_compliance_results(m.id, test_stage)
-                    pri_results[m.id] = results
-            
-            if red_measurements:
-                for m in red_measurements:
-                    if precomputed_results and m.id in precomputed_results:
-                        results = precomputed_results[m.id]
-                    else:
-                        results = self.compliance_service.get_compliance_results(m.id, test_stage)
-                    red_results[m.id] = results
+            pri_results = {m.id: results_by_measurement.get(m.id, []) for m in pri_measurements}
+            red_results = {m.id: results_by_measurement.get(m.id, []) for m in red_measurements}
             
             # Group results by criterion type
             criterion_groups: Dict[str, Dict[str, List[TestResult]]] = {}
@@ -195,7 +185,9 @@ class ComplianceTableWidget(QWidget):
             for measurement_id, results in pri_results.items():
                 for result in results:
                     # Get criterion name (without S-parameter suffix)
-                    criterion_name = self._get_criterion_base_name(result)
+                    criterion_name = self._get_criterion_base_name(
+                        criteria_by_id.get(result.test_criteria_id)
+                    )
                     if criterion_name not in criterion_groups:
                         criterion_groups[criterion_name] = {}
                     if result.s_parameter not in criterion_groups[criterion_name]:
@@ -205,7 +197,9 @@ class ComplianceTableWidget(QWidget):
             # Process RED results (merge)
             for measurement_id, results in red_results.items():
                 for result in results:
-                    criterion_name = self._get_criterion_base_name(result)
+                    criterion_name = self._get_criterion_base_name(
+                        criteria_by_id.get(result.test_criteria_id)
+                    )
                     if criterion_name not in criterion_groups:
                         criterion_groups[criterion_name] = {}
                     if result.s_parameter not in criterion_groups[criterion_name]:
@@ -262,42 +256,34 @@ class ComplianceTableWidget(QWidget):
                     s_item.setText(0, f"{s_param} {criterion_name}")
                     
                     # Limit (from criterion - need to get from service)
-                    limit_text = self._get_limit_text(result)
+                    limit_text = self._get_limit_text(criteria_by_id.get(result.test_criteria_id))
                     s_item.setText(1, limit_text)
                     
                     # PRI
                     if pri_result:
-                        # Find the corresponding measurement for PRI
-                        pri_measurement = None
-                        for m in pri_measurements:
-                            if m.id == pri_result.measurement_id:
-                                pri_measurement = m
-                                break
                         pri_value_text = self._format_value(
                             pri_result.measured_value,
                             pri_result,
-                            pri_measurement,
-                            device
+                            criteria_by_id.get(pri_result.test_criteria_id)
                         )
                         s_item.setText(2, pri_value_text)
+                        s_item.setToolTip(2, self._margin_tooltip(
+                            pri_result, criteria_by_id.get(pri_result.test_criteria_id)
+                        ))
                         s_item.setText(3, "PASS" if pri_result.passed else "FAIL")
                         self._set_status_color(s_item, 3, pri_result.passed)
                     
                     # RED
                     if red_result:
-                        # Find the corresponding measurement for RED
-                        red_measurement = None
-                        for m in red_measurements:
-                            if m.id == red_result.measurement_id:
-                                red_measurement = m
-                                break
                         red_value_text = self._format_value(
                             red_result.measured_value,
                             red_result,
-                            red_measurement,
-                            device
+                            criteria_by_id.get(red_result.test_criteria_id)
                         )
                         s_item.setText(4, red_value_text)
+                        s_item.setToolTip(4, self._margin_tooltip(
+                            red_result, criteria_by_id.get(red_result.test_criteria_id)
+                        ))
                         s_item.setText(5, "PASS" if red_result.passed else "FAIL")
                         self._set_status_color(s_item, 5, red_result.passed)
         
@@ -307,148 +293,145 @@ class ComplianceTableWidget(QWidget):
         # Set proportional column widths after populating
         self._set_proportional_column_widths()
     
-    def _get_criterion_base_name(self, result: TestResult) -> str:
+    def _collect_results(
+        self,
+        measurements: List[Measurement],
+        test_stage: str,
+        precomputed_results: Optional[Dict[UUID, List[TestResult]]]
+    ) -> Tuple[Dict[UUID, List[TestResult]], Dict[UUID, TestCriteria]]:
+        """
+        Get the results of all measurements together with their criteria.
+        
+        Measurements without precomputed results are fetched with a single
+        joined result + criterion query. Criteria of precomputed results are
+        fetched with a single query by ID.
+        
+        Args:
+            measurements: Measurements to display
+            test_stage: Current test stage
+            precomputed_results: Optional results already evaluated, by measurement ID
+            
+        Returns:
+            Tuple of (results by measurement ID, criteria by criteria ID)
+        """
+        precomputed_results = precomputed_results or {}
+        results_by_measurement: Dict[UUID, List[TestResult]] = {}
+        criteria_by_id: Dict[UUID, TestCriteria] = {}
+        
+        to_fetch = [m.id for m in measurements if m.id not in precomputed_results]
+        if to_fetch:
+            joined = self.compliance_service.get_compliance_results_with_criteria(to_fetch, test_stage)
+            for measurement_id, pairs in joined.items():
+                results_by_measurement[measurement_id] = [result for result, _ in pairs]
+                criteria_by_id.update((criterion.id, criterion) for _, criterion in pairs)
+        
+        missing_criteria = set()
+        for m in measurements:
+            if m.id in precomputed_results:
+                results_by_measurement[m.id] = precomputed_results[m.id]
+                missing_criteria.update(r.test_criteria_id for r in precomputed_results[m.id])
+        missing_criteria -= criteria_by_id.keys()
+        if missing_criteria:
+            try:
+                criteria_by_id.update(
+                    self.compliance_service.criteria_repo.get_by_ids(missing_criteria)
+                )
+            except Exception as e:
+                # Rows fall back to "Unknown" / "N/A" - same as a missing criterion
+                import logging
+                logging.getLogger(__name__).debug(f"Could not look up criteria: {e}")
+        
+        return results_by_measurement, criteria_by_id
+    
+    def _get_criterion_base_name(self, criteria: Optional[TestCriteria]) -> str:
         """Get base criterion name (without S-parameter)."""
-        # Get criterion from service to get requirement_name
-        criteria = None
-        try:
-            criteria_repo = self.compliance_service.criteria_repo
-            criteria = criteria_repo.get_by_id(result.test_criteria_id)
-            if criteria:
-                return criteria.requirement_name
-        except Exception:
-            pass
+        if criteria:
+            return criteria.requirement_name
         return "Unknown"  # Fallback
     
-    def _get_limit_text(self, result: TestResult) -> str:
+    def _get_limit_text(self, criteria: Optional[TestCriteria]) -> str:
         """Get limit text from criterion."""
-        try:
-            criteria_repo = self.compliance_service.criteria_repo
-            criteria = criteria_repo.get_by_id(result.test_criteria_id)
-            if criteria:
-                if criteria.criteria_type == "range":
-                    return f"{criteria.min_value} to {criteria.max_value} {criteria.unit}"
-                elif criteria.criteria_type == "max":
-                    return f"<= {criteria.max_value} {criteria.unit}"
-                elif criteria.criteria_type == "min":
-                    return f">= {criteria.min_value} {criteria.unit}"
-                elif criteria.criteria_type == "greater_than_equal":
-                    return f">= {criteria.min_value} {criteria.unit}"
-                elif criteria.criteria_type == "less_than_equal":
-                    return f"<= {criteria.max_value} {criteria.unit}"
-        except Exception:
-            pass
+        if criteria:
+            if criteria.criteria_type == "range":
+                return f"{criteria.min_value} to {criteria.max_value} {criteria.unit}"
+            elif criteria.criteria_type == "max":
+                return f"<= {criteria.max_value} {criteria.unit}"
+            elif criteria.criteria_type == "min":
+                return f">= {criteria.min_value} {criteria.unit}"
+            elif criteria.criteria_type == "greater_than_equal":
+                return f">= {criteria.min_value} {criteria.unit}"
+            elif criteria.criteria_type == "less_than_equal":
+                return f"<= {criteria.max_value} {criteria.unit}"
         return "N/A"  # Fallback
     
     def _format_value(
         self,
         value: Optional[float],
         result: TestResult,
-        measurement: Optional[Measurement] = None,
-        device: Optional[Device] = None
+        criteria: Optional[TestCriteria] = None
     ) -> str:
         """
         Format measured value for display.
         
-        For Gain Range criteria, displays min-max range format.
+        For Gain Range criteria, displays min-max range format using the
+        min/max stored with the result by evaluation (no RF calculations).
         For other criteria, displays single value.
         
         Args:
             value: Measured value (typically max for gain range)
-            result: TestResult object (contains criterion info)
-            measurement: Optional measurement object (needed for recalculating gain range)
-            device: Optional device object (needed for frequency ranges)
+            result: TestResult object
+            criteria: Criterion of the result (None if it no longer exists)
         """
         if value is None:
             return "N/A"
         
-        # Check if this is a Gain Range criterion
-        try:
-            criteria_repo = self.compliance_service.criteria_repo
-            criteria = criteria_repo.get_by_id(result.test_criteria_id)
-            
-            # Check for Gain Range criterion - use exact match for reliability
-            is_gain_range = (criteria and 
-                           criteria.requirement_name == "Gain Range" and
-                           criteria.criteria_type == "range")
-            
-            if is_gain_range:
-                # This is a Gain Range criterion - need to show min-max range
-                # Recalculate from measurement if available
-                if measurement and device and result.s_parameter:
-                    # Check if measurement has touchstone_data
-                    if not hasattr(measurement, 'touchstone_data') or measurement.touchstone_data is None:
-                        import logging
-                        logger = logging.getLogger(__name__)
-                        logger.warning(f"Measurement {measurement.id} has no touchstone_data")
-                        unit = criteria.unit if criteria.unit else "dB"
-                        return f"{value:.2f} {unit}"
-                    
-                    try:
-                        from ....core.rf_data.s_parameter_calculator import SParameterCalculator
-                        from skrf import Network
-                        
-                        calculator = SParameterCalculator()
-                        
-                        # Get network from measurement - it's already deserialized from database
-                        # touchstone_data is a Network object, not bytes
-                        if isinstance(measurement.touchstone_data, Network):
-                            network = measurement.touchstone_data
-                        else:
-                            # If it's bytes (shouldn't happen, but handle gracefully)
-                            from ....core.rf_data.touchstone_loader import TouchstoneLoader
-                            loader = TouchstoneLoader()
-                            network = loader.deserialize_network(measurement.touchstone_data)
-                        
-                        # Calculate gain range for this S-parameter
-                        min_gain, max_gain = calculator.calculate_gain_range(
-                            network,
-                            device.operational_freq_min,
-                            device.operational_freq_max,
-                            result.s_parameter
-                        )
-                        
-                        # Format as range: "min to max dB"
-                        unit = criteria.unit if criteria.unit else "dB"
-                        return f"{min_gain:.2f} to {max_gain:.2f} {unit}"
-                    except Exception as e:
-                        # Log error for debugging but fall back gracefully
-                        import logging
-                        import traceback
-                        logger = logging.getLogger(__name__)
-                        logger.warning(f"Failed to recalculate gain range for display: {e}")
-                        logger.warning(f"Measurement ID: {measurement.id if measurement else 'None'}, Device: {device.id if device else 'None'}, S-param: {result.s_parameter}")
-                        logger.debug(f"Traceback: {traceback.format_exc()}")
-                        # If recalculation fails, fall back to single value
-                        unit = criteria.unit if criteria.unit else "dB"
-                        return f"{value:.2f} {unit}"
-                else:
-                    # Don't have measurement data - format as single value with unit
-                    import logging
-                    logger = logging.getLogger(__name__)
-                    missing = []
-                    if not measurement:
-                        missing.append("measurement")
-                    if not device:
-                        missing.append("device")
-                    if not result.s_parameter:
-                        missing.append("s_parameter")
-                    logger.debug(f"Cannot format gain range: missing {', '.join(missing)}")
-                    unit = criteria.unit if criteria.unit else "dB"
-                    return f"{value:.2f} {unit}"
-        except Exception as e:
-            # If criterion lookup fails, format as single value
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.debug(f"Could not lookup criterion for gain range formatting: {e}")
-            pass
-        
-        # Default: format as single value
         unit_suffix = ""
         if criteria and criteria.unit:
             unit_suffix = f" {criteria.unit}"
+        
+        # Check for Gain Range criterion - use exact match for reliability
+        is_gain_range = (criteria and
+                         criteria.requirement_name == "Gain Range" and
+                         criteria.criteria_type == "range")
+        
+        # Results stored before min/max were recorded only have the single
+        # value - shown as such until the next evaluation
+        if is_gain_range and result.measured_min is not None and result.measured_max is not None:
+            unit = criteria.unit if criteria.unit else "dB"
+            return f"{result.measured_min:.2f} to {result.measured_max:.2f} {unit}"
+        
+        # Default: format as single value
         return f"{value:.2f}{unit_suffix}"
     
+    def _margin_tooltip(
+        self,
+        result: TestResult,
+        criteria: Optional[TestCriteria] = None
+    ) -> str:
+        """
+        Tooltip with the margin to the limit and where the worst case is.
+        
+        Uses the margin stored with the result by evaluation (no RF
+        calculations).
+        
+        Args:
+            result: TestResult object
+            criteria: Criterion of the result (None if it no longer exists)
+            
+        Returns:
+            Tooltip text, empty for results without a margin (flatness,
+            OOB, results stored before margins were recorded)
+        """
+        if result.margin is None:
+            return ""
+        unit_suffix = f" {criteria.unit}" if criteria and criteria.unit else ""
+        text = f"Margin to limit: {result.margin:+.2f}{unit_suffix}"
+        if result.worst_frequency is not None:
+            text += f" at {result.worst_frequency:.3f} GHz"
+        if result.guard_band_percent is not None:
+            text += f"\n{result.guard_band_percent:.1f}% of band within the guard band"
+        return text
+    
     def _set_status_color(self, item: QTreeWidgetItem, column: int, passed: bool) -> None:
         """Set background and foreground colors for pass/fail status."""
         if passed:
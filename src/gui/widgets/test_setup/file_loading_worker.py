@@ -11,7 +11,7 @@ from PyQt6.QtCore import QThread, pyqtSignal as Signal
 
 from ....core.models.device import Device
 from ....core.models.measurement import Measurement
-from ...utils.service_factory import create_services_for_thread
+from ...utils.service_factory import thread_services
 
 
 class FileLoadingWorker(QThread):
@@ -25,7 +25,8 @@ class FileLoadingWorker(QThread):
     - Compliance evaluation
     - Database saving
     
-    Creates its own database connection and services for thread safety.
+    Borrows a pooled database connection and creates its own services for
+    thread safety.
     """
     files_loaded = Signal(object, object)  # (measurements: List[Measurement], warnings: List[str])
     error_occurred = Signal(str)
@@ -48,30 +49,32 @@ class FileLoadingWorker(QThread):
     def run(self):
         """Execute file loading and compliance evaluation in background thread."""
         try:
-            # Create thread-local services with new database connection
+            # Borrow a pooled connection for thread-local services (returned
+            # to the pool when the block exits)
             # SQLite connections cannot be shared across threads
-            _, measurement_service, compliance_service = create_services_for_thread(self.database_path)
-            
-            # Load files (includes parsing, metadata extraction, validation)
-            measurements, warnings = measurement_service.load_multiple_files(
-                self.file_paths,
-                self.device,
-                self.test_stage,
-                self.temperature
-            )
-            
-            # Save measurements to database
-            measurement_service.save_multiple_measurements(measurements)
-            
-            # Evaluate compliance for all measurements (heavy processing)
-            for measurement in measurements:
-                results = compliance_service.evaluate_compliance(
-                    measurement,
+            with thread_services(self.database_path) as (_, measurement_service, compliance_service):
+                # Load files (includes parsing, metadata extraction, validation)
+                measurements, warnings = measurement_service.load_multiple_files(
+                    self.file_paths,
                     self.device,
-                    self.test_stage
+                    self.test_stage,
+                    self.temperature
                 )
-                if results:
-                    compliance_service.save_test_results(results)
+                
+                # Save measurements to database (single transaction)
+                measurement_service.save_multiple_measurements(measurements)
+                
+                # Evaluate compliance for all measurements (heavy processing)
+                results_by_measurement = {}
+                for measurement in measurements:
+                    results_by_measurement[measurement.id] = compliance_service.evaluate_compliance(
+                        measurement,
+                        self.device,
+                        self.test_stage
+                    )
+                
+                # Save all results with one batched write
+                compliance_service.save_all_results(results_by_measurement)
             
             # Emit success signal with measurements and warnings
             self.files_loaded.emit(measurements, warnings)
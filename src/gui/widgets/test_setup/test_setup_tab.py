@@ -622,13 +622,19 @@ class TestSetupTab(QWidget):
                 print(f"[Compliance Complete] Measurement {meas_id} -> {len(results) if results is not None else None} results")
             
             # Determine if any measurement ended up without results for this stage
+            # (stored results are counted with one aggregate query, not loaded)
+            unreported = [m.id for m in measurements if m.id not in results_by_measurement]
+            stored_counts = {
+                summary.measurement_id: summary.current
+                for summary in self.compliance_service.get_result_summaries(
+                    measurement_ids=unreported,
+                    test_stage=self.current_test_stage
+                )
+            } if unreported else {}
             for measurement in measurements:
                 stage_results = results_by_measurement.get(measurement.id)
                 if stage_results is None:
-                    stage_results = self.compliance_service.get_compliance_results(
-                        measurement.id,
-                        self.current_test_stage
-                    )
+                    stage_results = stored_counts.get(measurement.id, 0)
                 if not stage_results:
                     missing_results = True
                     break
@@ -638,26 +644,28 @@ class TestSetupTab(QWidget):
                     "[Compliance Complete] Missing results for stage %s, re-evaluating inline",
                     self.current_test_stage
                 )
-                for measurement in measurements:
-                    # Remove any stale results for this stage before recalculating
-                    self.compliance_service.delete_results_for_measurement_and_stage(
-                        measurement.id,
-                        self.current_test_stage
-                    )
-                    refreshed_results = self.compliance_service.evaluate_compliance(
+                refreshed_results = {
+                    measurement.id: self.compliance_service.evaluate_compliance(
                         measurement,
                         self.current_device,
                         self.current_test_stage
                     )
-                    if refreshed_results:
-                        self.compliance_service.save_test_results(refreshed_results)
+                    for measurement in measurements
+                }
+                # One transaction: upsert, then drop results no longer produced
+                self.compliance_service.replace_stage_results(
+                    refreshed_results, self.current_test_stage
+                )
             
             sample_measurement = measurements[0] if measurements else None
             if sample_measurement:
-                results_count = len(self.compliance_service.get_compliance_results(
-                    sample_measurement.id,
-                    self.current_test_stage
-                ))
+                results_count = sum(
+                    summary.current
+                    for summary in self.compliance_service.get_result_summaries(
+                        measurement_ids=[sample_measurement.id],
+                        test_stage=self.current_test_stage
+                    )
+                )
                 logger.debug(
                     "[Compliance Complete] Sample measurement %s results for stage %s: %s",
                     sample_measurement.id,
@@ -784,8 +792,9 @@ class TestSetupTab(QWidget):
             return
         
         # Get measurements for current device/test_stage
+        # Header-only query: file displays never need the RF data
         try:
-            measurements = self.measurement_service.get_measurements_for_device(
+            measurements = self.measurement_service.get_measurement_headers_for_device(
                 self.current_device.id,
                 current_test_type,
                 self.current_test_stage
@@ -804,7 +813,7 @@ class TestSetupTab(QWidget):
         if not isinstance(measurements, list):
             import logging
             logger = logging.getLogger(__name__)
-            logger.warning(f"get_measurements_for_device returned non-list: {type(measurements)}")
+            logger.warning(f"get_measurement_headers_for_device returned non-list: {type(measurements)}")
             measurements = []
         
         import logging
@@ -0,0 +1,110 @@
+"""Unit tests for ConnectionManager."""
+
+import threading
+import pytest
+
+from src.database.connection_manager import (
+    ConnectionManager, get_connection_manager, close_all_connection_managers
+)
+from src.database.schema import create_schema
+from src.core.exceptions import DatabaseError
+
+
+class TestConnectionManager:
+    """Test connection settings, pooling and shutdown."""
+    
+    @pytest.fixture
+    def manager(self, tmp_path):
+        """Provide a ConnectionManager on a file database with schema."""
+        manager = ConnectionManager(tmp_path / "test.db", max_connections=2)
+        conn = manager.open_connection()
+        create_schema(conn)
+        conn.close()
+        yield manager
+        manager.close_all()
+    
+    def test_connection_pragmas(self, manager):
+        """Test connections use WAL mode and the tuned pragmas."""
+        with manager.connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+            assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == manager.busy_timeout_ms
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] == -manager.cache_size_kib
+            assert conn.execute("SELECT COUNT(*) FROM devices").fetchone()["COUNT(*)"] == 0
+    
+    def test_returned_connections_are_reused(self, manager):
+        """Test a released connection is handed to the next borrower."""
+        with manager.connection() as first:
+            pass
+        with manager.connection() as second:
+            assert second is first
+        assert manager.idle_count == 1
+        assert manager.borrowed_count == 0
+    
+    def test_pool_is_bounded(self, manager):
+        """Test acquire waits (and times out) when all connections are borrowed."""
+        a = manager.acquire()
+        b = manager.acquire()
+        
+        with pytest.raises(DatabaseError):
+            manager.acquire(timeout=0.05)
+        
+        # A release from another thread wakes a waiting borrower
+        threading.Timer(0.05, manager.release, args=(a,)).start()
+        assert manager.acquire(timeout=5) is a
+        manager.release(a)
+        manager.release(b)
+    
+    def test_release_rolls_back_uncommitted_work(self, manager):
+        """Test an uncommitted transaction is not left holding the write lock."""
+        with manager.connection() as conn:
+            conn.execute(
+                "INSERT INTO schema_version (version) VALUES (99)"
+            )
+        with manager.connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM schema_version WHERE version = 99").fetchone()[0] == 0
+    
+    def test_connections_usable_from_worker_threads(self, manager):
+        """Test pooled connections move between threads (one borrower at a time)."""
+        errors = []
+        
+        def worker():
+            try:
+                with manager.connection() as conn:
+                    conn.execute("SELECT COUNT(*) FROM devices").fetchone()
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+        
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert errors == []
+        assert manager.idle_count <= manager.max_connections
+    
+    def test_close_all(self, manager):
+        """Test shutdown closes idle and later-released connections."""
+        borrowed = manager.acquire()
+        with manager.connection():
+            pass
+        
+        manager.close_all()
+        manager.release(borrowed)
+        
+        assert manager.idle_count == 0
+        with pytest.raises(DatabaseError):
+            manager.acquire()
+    
+    def test_shared_manager_per_database(self, tmp_path):
+        """Test the shared manager is reused per file until shut down."""
+        manager = get_connection_manager(tmp_path / "shared.db")
+        assert get_connection_manager(tmp_path / "shared.db") is manager
+        
+        close_all_connection_managers()
+        
+        assert manager.closed
+        assert get_connection_manager(tmp_path / "shared.db") is not manager
+        close_all_connection_managers()
@@ -0,0 +1,237 @@
+"""Unit tests for schema migrations."""
+
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from src.database.migrations import (
+    Migration, MIGRATIONS, LATEST_VERSION, get_applied_versions, run_migrations
+)
+from src.database.schema import SCHEMA_VERSION, create_schema, initialize_database
+from src.core.exceptions import DatabaseError
+
+
+def _indexes(conn):
+    """Get the names of all indexes in the database."""
+    return {
+        row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    }
+
+
+def _columns(conn, table):
+    """Get the column names of a table."""
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def _database_at_version(path, version):
+    """Create a database file with the version 1 schema migrated up to version."""
+    conn = sqlite3.connect(str(path))
+    with patch("src.database.schema.run_migrations"):
+        create_schema(conn)
+    # Version 1 indexed results by measurement alone (replaced by a migration)
+    conn.execute("CREATE INDEX idx_test_results_measurement ON test_results(measurement_id)")
+    conn.commit()
+    if version > 1:
+        run_migrations(conn, [m for m in MIGRATIONS if m.version <= version])
+    conn.close()
+    return path
+
+
+def _schema_version(conn):
+    """Get the single version stored in schema_version."""
+    return [row[0] for row in conn.execute("SELECT version FROM schema_version")]
+
+
+class TestMigrations:
+    """Test migration ordering, history and failure handling."""
+
+    @pytest.fixture
+    def db_connection(self):
+        """Provide in-memory database connection with the current schema."""
+        from src.database.schema import get_in_memory_connection
+        conn = get_in_memory_connection()
+        yield conn
+        conn.close()
+
+    @pytest.fixture
+    def legacy_db_path(self, tmp_path):
+        """Provide a version 1 database file (before the migration framework)."""
+        return _database_at_version(tmp_path / "legacy.db", 1)
+
+    def test_new_database_is_fully_migrated(self, db_connection):
+        """Test a new database records every migration and the latest version."""
+        assert get_applied_versions(db_connection) == [m.version for m in MIGRATIONS]
+        assert _schema_version(db_connection) == [SCHEMA_VERSION]
+        assert SCHEMA_VERSION == LATEST_VERSION
+        assert {
+            "idx_test_results_criteria",
+            "idx_measurements_serial",
+            "idx_test_results_measurement_stale"
+        } <= _indexes(db_connection)
+        assert "idx_test_results_measurement" not in _indexes(db_connection)
+
+    def test_migrations_are_consecutive(self):
+        """Test migration versions start after the base schema without gaps."""
+        assert [m.version for m in MIGRATIONS] == list(range(2, 2 + len(MIGRATIONS)))
+
+    def test_run_is_idempotent(self, db_connection):
+        """Test already applied migrations are skipped."""
+        assert run_migrations(db_connection) == []
+        create_schema(db_connection)
+        assert get_applied_versions(db_connection) == [m.version for m in MIGRATIONS]
+
+    def test_legacy_database_is_upgraded(self, legacy_db_path):
+        """Test initialize_database applies pending migrations to a version 1 file."""
+        conn = initialize_database(legacy_db_path)
+        try:
+            assert get_applied_versions(conn) == [m.version for m in MIGRATIONS]
+            assert _schema_version(conn) == [SCHEMA_VERSION]
+            assert "idx_test_results_measurement" not in _indexes(conn)
+            assert "idx_test_results_measurement_stale" in _indexes(conn)
+            assert {"content_hash", "n_ports"} <= _columns(conn, "measurements")
+            assert {"measured_min", "worst_frequency", "margin"} <= _columns(conn, "test_results")
+            assert _columns(conn, "touchstone_blobs") and _columns(conn, "measurement_metrics")
+        finally:
+            conn.close()
+
+    def test_duplicate_results_are_removed(self, legacy_db_path):
+        """Test the unique-key migration keeps one result per key (current, newest)."""
+        conn = sqlite3.connect(str(legacy_db_path))
+        rows = [
+            # id, measurement, criterion, s_parameter, is_stale, created_at
+            ("old", "m1", "c1", "S31", 0, "2025-01-01 00:00:00"),
+            ("new", "m1", "c1", "S31", 0, "2025-01-02 00:00:00"),
+            ("newer-stale", "m1", "c1", "S31", 1, "2025-01-03 00:00:00"),
+            ("none-a", "m1", "c1", None, 0, "2025-01-01 00:00:00"),
+            ("none-b", "m1", "c1", None, 0, "2025-01-02 00:00:00"),
+            ("other", "m1", "c1", "S41", 0, "2025-01-01 00:00:00"),
+        ]
+        conn.executemany(
+            """
+            INSERT INTO test_results (
+                id, measurement_id, test_criteria_id, passed, s_parameter, is_stale, created_at
+            ) VALUES (?, ?, ?, 1, ?, ?, ?)
+            """,
+            [(r[0], r[1], r[2], r[3], r[4], r[5]) for r in rows]
+        )
+        conn.commit()
+        conn.close()
+
+        conn = initialize_database(legacy_db_path)
+        try:
+            kept = {row[0] for row in conn.execute("SELECT id FROM test_results")}
+            assert kept == {"new", "none-b", "other"}
+            assert "idx_test_results_key" in _indexes(conn)
+        finally:
+            conn.close()
+
+    def test_measurement_header_facts_are_backfilled(self, tmp_path):
+        """Test codec rows get header facts from their blob, pickle rows stay NULL."""
+        from pathlib import Path
+        from src.core.rf_data.touchstone_loader import TouchstoneLoader
+
+        try:
+            loader = TouchstoneLoader()
+        except Exception:
+            pytest.skip("scikit-rf not installed")
+        network = loader.load_file(
+            Path("tests/data/20250930_S-Par-SIT_Run1_L109908_SN0001_PRI.s4p")
+        )
+        blob = loader.serialize_network(network)
+
+        # Content-hashed rows exist before the header facts migration (9)
+        legacy_db_path = _database_at_version(tmp_path / "v8.db", 8)
+        conn = sqlite3.connect(str(legacy_db_path))
+        conn.execute("INSERT INTO touchstone_blobs (content_hash, data) VALUES ('h', ?)", (blob,))
+        conn.executemany(
+            """
+            INSERT INTO measurements (
+                id, device_id, serial_number, test_type, test_stage, temperature,
+                path_type, file_path, measurement_date, touchstone_data, content_hash
+            ) VALUES (?, 'd', 'SN0001', 'S-Parameters', 'SIT', 'AMB', 'PRI', 'f.s4p',
+                      '2025-09-30', ?, ?)
+            """,
+            [("shared", b"", "h"), ("inline", blob, None), ("pickled", b"\x80legacy", None)]
+        )
+        conn.commit()
+        conn.close()
+
+        conn = initialize_database(legacy_db_path)
+        try:
+            facts = {
+                row[0]: row[1:] for row in conn.execute(
+                    "SELECT id, n_ports, n_points, freq_start, freq_stop FROM measurements"
+                )
+            }
+            expected = (4, len(network.f), network.f[0] / 1e9, network.f[-1] / 1e9)
+            assert facts["shared"] == pytest.approx(expected)
+            assert facts["inline"] == pytest.approx(expected)
+            assert facts["pickled"] == (None, None, None, None)
+            assert "idx_measurements_device_ports" in _indexes(conn)
+        finally:
+            conn.close()
+
+    def test_version_9_database_gets_result_margins(self, tmp_path):
+        """Test a version 9 file gains the margin columns and stores results with margins."""
+        from uuid import uuid4
+        from src.core.models.test_result import TestResult
+        from src.core.repositories import TestResultRepository
+
+        path = _database_at_version(tmp_path / "v9.db", 9)
+
+        conn = initialize_database(path)
+        try:
+            assert get_applied_versions(conn)[-1] == 10
+            assert _schema_version(conn) == [SCHEMA_VERSION]
+
+            results = TestResultRepository(conn)
+            saved = results.create(TestResult(
+                measurement_id=uuid4(), test_criteria_id=uuid4(),
+                measured_value=29.5, passed=True, s_parameter="S31",
+                margin=1.5, guard_band_percent=12.5
+            ))
+            stored = results.get_by_id(saved.id)
+            assert (stored.margin, stored.guard_band_percent) == (1.5, 12.5)
+        finally:
+            conn.close()
+
+    def test_failed_migration_is_rolled_back(self, db_connection):
+        """Test a failing step leaves no partial changes and is not recorded."""
+        def broken(conn):
+            conn.execute("CREATE INDEX idx_partial ON devices(name)")
+            conn.execute("CREATE INDEX idx_broken ON no_such_table(x)")
+
+        migrations = list(MIGRATIONS) + [Migration(LATEST_VERSION + 1, "Broken", broken)]
+
+        with pytest.raises(DatabaseError):
+            run_migrations(db_connection, migrations)
+
+        assert "idx_partial" not in _indexes(db_connection)
+        assert get_applied_versions(db_connection)[-1] == LATEST_VERSION
+        assert _schema_version(db_connection) == [LATEST_VERSION]
+
+    def test_pending_migrations_apply_in_order(self, db_connection):
+        """Test new migrations run in version order and update the version."""
+        order = []
+        migrations = list(MIGRATIONS) + [
+            Migration(LATEST_VERSION + 2, "Second", lambda conn: order.append(2)),
+            Migration(LATEST_VERSION + 1, "First", lambda conn: order.append(1)),
+        ]
+
+        applied = run_migrations(db_connection, migrations)
+
+        assert applied == [LATEST_VERSION + 1, LATEST_VERSION + 2]
+        assert order == [1, 2]
+        assert _schema_version(db_connection) == [LATEST_VERSION + 2]
+
+    def test_newer_database_is_rejected(self, db_connection):
+        """Test a database migrated by a newer application is not touched."""
+        db_connection.execute(
+            "INSERT INTO schema_migrations (version, description) VALUES (?, 'Future')",
+            (LATEST_VERSION + 1,)
+        )
+        db_connection.commit()
+
+        with pytest.raises(DatabaseError, match="newer"):
+            run_migrations(db_connection)
@@ -0,0 +1,299 @@
+"""
+Query plan checks for every repository query.
+
+Each public repository method is called on a populated database while the
+executed SQL is traced. Every traced statement is run through
+EXPLAIN QUERY PLAN and must not scan a table, except for the queries listed
+in SCAN_ALLOWED (which read a whole table by design).
+"""
+
+import inspect
+import pytest
+from datetime import date
+from pathlib import Path
+from uuid import uuid4
+
+from src.core.models.device import Device
+from src.core.models.measurement import Measurement
+from src.core.models.measurement_metrics import MeasurementMetrics
+from src.core.models.test_criteria import TestCriteria
+from src.core.models.test_result import TestResult
+from src.core.repositories import (
+    DeviceRepository, TestCriteriaRepository, MeasurementRepository,
+    TestResultRepository, MeasurementMetricsRepository
+)
+from src.core.rf_data.touchstone_loader import TouchstoneLoader
+from src.core.exceptions import FileLoadError
+
+
+REPOSITORIES = (
+    DeviceRepository, TestCriteriaRepository, MeasurementRepository,
+    TestResultRepository, MeasurementMetricsRepository
+)
+
+# Methods that read or maintain a whole table on purpose
+SCAN_ALLOWED = {
+    ("DeviceRepository", "get_all"): "lists every device",
+    ("TestCriteriaRepository", "get_all"): "lists every criterion",
+    ("MeasurementRepository", "get_all"): "lists every measurement",
+    ("MeasurementRepository", "get_content_hashes"): "returns every stored hash",
+    ("TestResultRepository", "get_all"): "lists every result",
+    ("MeasurementMetricsRepository", "delete_outdated"): "maintenance sweep over all versions",
+}
+
+
+def _calls(data):
+    """
+    Build one call per public repository method.
+
+    Args:
+        data: Dictionary of repositories and stored entities (see fixture)
+
+    Returns:
+        List of (repository class name, method name, zero-argument callable)
+    """
+    devices = data["devices"]
+    criteria_repo = data["criteria_repo"]
+    measurements = data["measurements"]
+    results = data["results"]
+    metrics_repo = data["metrics_repo"]
+    device, criteria = data["device"], data["criteria"]
+    measurement, result, metrics = data["measurement"], data["result"], data["metrics"]
+
+    return [
+        ("DeviceRepository", "get_by_id", lambda: devices.get_by_id(device.id)),
+        ("DeviceRepository", "get_all", lambda: devices.get_all()),
+        ("DeviceRepository", "create", lambda: devices.create(
+            device.model_copy(update={"id": uuid4()}))),
+        ("DeviceRepository", "update", lambda: devices.update(device)),
+        ("DeviceRepository", "delete", lambda: devices.delete(devices.create(
+            device.model_copy(update={"id": uuid4()})).id)),
+
+        ("TestCriteriaRepository", "get_by_id", lambda: criteria_repo.get_by_id(criteria.id)),
+        ("TestCriteriaRepository", "get_all", lambda: criteria_repo.get_all()),
+        ("TestCriteriaRepository", "get_by_ids", lambda: criteria_repo.get_by_ids([criteria.id])),
+        ("TestCriteriaRepository", "get_by_device_and_test", lambda: criteria_repo.get_by_device_and_test(
+            device.id, "S-Parameters", "SIT")),
+        ("TestCriteriaRepository", "create", lambda: criteria_repo.create(
+            criteria.model_copy(update={"id": uuid4()}))),
+        ("TestCriteriaRepository", "update", lambda: criteria_repo.update(criteria)),
+        ("TestCriteriaRepository", "delete", lambda: criteria_repo.delete(criteria_repo.create(
+            criteria.model_copy(update={"id": uuid4()})).id)),
+        ("TestCriteriaRepository", "delete_by_device", lambda: criteria_repo.delete_by_device(
+            uuid4())),
+
+        ("MeasurementRepository", "get_by_id", lambda: measurements.get_by_id(measurement.id)),
+        ("MeasurementRepository", "get_all", lambda: measurements.get_all()),
+        ("MeasurementRepository", "get_by_device_and_test_stage",
+         lambda: measurements.get_by_device_and_test_stage(device.id, "S-Parameters", "SIT")),
+        ("MeasurementRepository", "get_by_device", lambda: measurements.get_by_device(device.id)),
+        ("MeasurementRepository", "get_by_serial_number",
+         lambda: measurements.get_by_serial_number("SN0001")),
+        ("MeasurementRepository", "get_headers_by_device",
+         lambda: measurements.get_headers_by_device(device.id)),
+        ("MeasurementRepository", "get_headers_by_device_and_test_stage",
+         lambda: measurements.get_headers_by_device_and_test_stage(device.id, "S-Parameters", "SIT")),
+        ("MeasurementRepository", "count_by_device", lambda: measurements.count_by_device(device.id)),
+        ("MeasurementRepository", "get_port_counts",
+         lambda: measurements.get_port_counts(device.id, "S-Parameters")),
+        ("MeasurementRepository", "create", lambda: measurements.create(
+            measurement.model_copy(update={"id": uuid4()}))),
+        ("MeasurementRepository", "create_many", lambda: measurements.create_many([
+            measurement.model_copy(update={"id": uuid4()})])),
+        ("MeasurementRepository", "upsert_many", lambda: measurements.upsert_many([measurement])),
+        ("MeasurementRepository", "get_blob_by_content_hash",
+         lambda: measurements.get_blob_by_content_hash("0" * 64)),
+        ("MeasurementRepository", "get_content_hashes", lambda: measurements.get_content_hashes()),
+        ("MeasurementRepository", "get_lazy_network_by_content_hash",
+         lambda: measurements.get_lazy_network_by_content_hash("0" * 64)),
+        ("MeasurementRepository", "update", lambda: measurements.update(measurement)),
+        ("MeasurementRepository", "delete", lambda: measurements.delete(measurements.create(
+            measurement.model_copy(update={"id": uuid4()})).id)),
+        ("MeasurementRepository", "migrate_legacy_blobs", lambda: measurements.migrate_legacy_blobs()),
+
+        ("TestResultRepository", "get_by_id", lambda: results.get_by_id(result.id)),
+        ("TestResultRepository", "get_all", lambda: results.get_all()),
+        ("TestResultRepository", "get_by_measurement_id",
+         lambda: results.get_by_measurement_id(measurement.id)),
+        ("TestResultRepository", "get_by_criteria_id", lambda: results.get_by_criteria_id(criteria.id)),
+        ("TestResultRepository", "get_by_measurement_and_criteria",
+         lambda: results.get_by_measurement_and_criteria(measurement.id, criteria.id)),
+        ("TestResultRepository", "get_with_criteria",
+         lambda: results.get_with_criteria([measurement.id], "SIT")),
+        ("TestResultRepository", "get_summaries", lambda: (
+            results.get_summaries([measurement.id], group_by="criterion"),
+            results.get_summaries(device_id=device.id, test_stage="SIT", group_by="stage"))),
+        ("TestResultRepository", "create", lambda: results.create(
+            result.model_copy(update={"id": uuid4(), "s_parameter": "S41"}))),
+        ("TestResultRepository", "create_many", lambda: results.create_many([
+            result.model_copy(update={"id": uuid4(), "s_parameter": "S42"})])),
+        ("TestResultRepository", "upsert_many", lambda: results.upsert_many([result])),
+        ("TestResultRepository", "upsert_by_key", lambda: results.upsert_by_key([
+            result.model_copy(update={"id": uuid4(), "measured_value": 30.0})])),
+        ("TestResultRepository", "replace_stage_results", lambda: results.replace_stage_results(
+            [measurement.id], "SIT", [result.model_copy(update={"id": uuid4()})])),
+        ("TestResultRepository", "update", lambda: results.update(result)),
+        ("TestResultRepository", "delete", lambda: results.delete(results.create(
+            result.model_copy(update={"id": uuid4(), "s_parameter": "S43"})).id)),
+        ("TestResultRepository", "mark_as_stale_by_criteria",
+         lambda: results.mark_as_stale_by_criteria(criteria.id)),
+        ("TestResultRepository", "mark_as_stale_by_measurement",
+         lambda: results.mark_as_stale_by_measurement(measurement.id)),
+        ("TestResultRepository", "delete_by_measurement",
+         lambda: results.delete_by_measurement(uuid4())),
+        ("TestResultRepository", "delete_by_measurements_and_stage",
+         lambda: results.delete_by_measurements_and_stage([uuid4()], "SIT")),
+        ("TestResultRepository", "delete_stale", lambda: results.delete_stale([measurement.id])),
+
+        ("MeasurementMetricsRepository", "get_for_measurement",
+         lambda: metrics_repo.get_for_measurement(measurement.id, 1)),
+        ("MeasurementMetricsRepository", "get_for_measurements",
+         lambda: metrics_repo.get_for_measurements([measurement.id], 1)),
+        ("MeasurementMetricsRepository", "save_many", lambda: metrics_repo.save_many([metrics])),
+        ("MeasurementMetricsRepository", "delete_for_measurement",
+         lambda: metrics_repo.delete_for_measurement(uuid4())),
+        ("MeasurementMetricsRepository", "delete_outdated", lambda: metrics_repo.delete_outdated(1)),
+    ]
+
+
+def _scans(conn, sql):
+    """
+    Get the table scans in a statement's query plan.
+
+    Args:
+        conn: SQLite connection
+        sql: Expanded SQL statement (parameters inlined)
+
+    Returns:
+        Plan details of full scans (json_each table-valued functions and
+        constant rows are not tables and are ignored)
+    """
+    plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    return [
+        row["detail"] for row in plan
+        if row["detail"].startswith("SCAN ")
+        and "VIRTUAL TABLE" not in row["detail"]
+        and row["detail"] != "SCAN CONSTANT ROW"
+    ]
+
+
+class TestQueryPlans:
+    """Test repository queries use indexes."""
+
+    @pytest.fixture
+    def db_connection(self):
+        """Provide in-memory database connection with foreign keys enforced."""
+        from src.database.schema import get_in_memory_connection
+        conn = get_in_memory_connection()
+        conn.execute("PRAGMA foreign_keys = ON")
+        yield conn
+        conn.close()
+
+    @pytest.fixture
+    def data(self, db_connection):
+        """Provide repositories and one stored entity of each kind."""
+        try:
+            network = TouchstoneLoader().load_file(
+                Path("tests/data/20250930_S-Par-SIT_Run1_L109908_SN0001_PRI.s4p")
+            )
+        except FileLoadError:
+            pytest.skip("scikit-rf not available or test file not found")
+
+        devices = DeviceRepository(db_connection)
+        criteria_repo = TestCriteriaRepository(db_connection)
+        measurements = MeasurementRepository(db_connection)
+        results = TestResultRepository(db_connection)
+        metrics_repo = MeasurementMetricsRepository(db_connection)
+
+        device = devices.create(Device(
+            name="Test Device",
+            part_number="L109908",
+            operational_freq_min=0.5,
+            operational_freq_max=2.0,
+            wideband_freq_min=0.1,
+            wideband_freq_max=5.0,
+            input_ports=[1, 2],
+            output_ports=[3, 4],
+        ))
+        criteria = criteria_repo.create(TestCriteria(
+            device_id=device.id, test_type="S-Parameters", test_stage="SIT",
+            requirement_name="Gain Range", criteria_type="range",
+            min_value=27.5, max_value=31.3, unit="dB"
+        ))
+        measurement = measurements.create(Measurement(
+            device_id=device.id, serial_number="SN0001",
+            test_type="S-Parameters", test_stage="SIT",
+            temperature="AMB", path_type="PRI",
+            file_path="/path/to/file.s4p",
+            measurement_date=date(2025, 9, 30), touchstone_data=network
+        ))
+        result = results.create(TestResult(
+            measurement_id=measurement.id, test_criteria_id=criteria.id,
+            measured_value=29.5, passed=True, s_parameter="S31"
+        ))
+        metrics = MeasurementMetrics(
+            measurement_id=measurement.id, freq_min=0.5, freq_max=2.0,
+            calculator_version=1, n_ports=2,
+            gain_min=[[0.0, 0.0], [0.0, 0.0]], gain_max=[[0.0, 0.0], [0.0, 0.0]],
+            vswr_max=[1.0, 1.0]
+        )
+        metrics_repo.save_many([metrics])
+
+        return {
+            "devices": devices, "criteria_repo": criteria_repo,
+            "measurements": measurements, "results": results,
+            "metrics_repo": metrics_repo, "device": device, "criteria": criteria,
+            "measurement": measurement, "result": result, "metrics": metrics,
+        }
+
+    def test_every_repository_method_is_checked(self, data):
+        """Test the call list covers every public repository method."""
+        checked = {(repo, method) for repo, method, _ in _calls(data)}
+
+        for repository in REPOSITORIES:
+            public = {
+                name for name, _ in inspect.getmembers(repository, inspect.isfunction)
+                if not name.startswith("_")
+            }
+            missing = {name for name in public if (repository.__name__, name) not in checked}
+            assert not missing, f"{repository.__name__} methods without a plan check: {missing}"
+
+    def test_repository_queries_do_not_scan_tables(self, db_connection, data):
+        """Test no repository query plan contains a full table scan."""
+        violations = []
+        for repo, method, call in _calls(data):
+            statements = []
+            db_connection.set_trace_callback(statements.append)
+            try:
+                call()
+            finally:
+                db_connection.set_trace_callback(None)
+
+            if (repo, method) in SCAN_ALLOWED:
+                continue
+            for sql in statements:
+                if sql.lstrip().split(" ", 1)[0].upper() not in ("SELECT", "UPDATE", "DELETE", "INSERT", "WITH"):
+                    continue  # BEGIN/COMMIT, trigger bodies ("-- TRIGGER ...")
+                for scan in _scans(db_connection, sql):
+                    violations.append(f"{repo}.{method}: {scan}")
+
+        assert not violations, "Full table scans:\n" + "\n".join(violations)
+
+    def test_foreign_keys_are_indexed(self, db_connection):
+        """Test every foreign key column leads an index (cascades and joins)."""
+        tables = [
+            row[0] for row in db_connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'"
+            )
+        ]
+        unindexed = []
+        for table in tables:
+            leading = set()
+            for index in db_connection.execute(f"PRAGMA index_list({table})").fetchall():
+                columns = db_connection.execute(f"PRAGMA index_info({index['name']})").fetchall()
+                leading.add(columns[0]["name"])
+            for fk in db_connection.execute(f"PRAGMA foreign_key_list({table})").fetchall():
+                if fk["from"] not in leading:
+                    unindexed.append(f"{table}.{fk['from']}")
+
+        assert not unindexed, f"Foreign key columns without an index: {unindexed}"
@@ -124,3 +124,12 @@ class TestDeviceRepository:
         retrieved = device_repository.get_by_id(device.id)
         
         assert retrieved.tests_performed == ["S-Parameters", "Power/Linearity"]
+    
+    def test_loaded_device_equals_validated_device(self, device_repository, sample_device_multi_gain):
+        """Test trusted hydration (no re-validation) round-trips every field."""
+        device_repository.create(sample_device_multi_gain)
+        
+        retrieved = device_repository.get_by_id(sample_device_multi_gain.id)
+        
+        assert retrieved == sample_device_multi_gain
+        assert retrieved.model_dump() == sample_device_multi_gain.model_dump()
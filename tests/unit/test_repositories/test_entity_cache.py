@@ -0,0 +1,196 @@
+"""Unit tests for the device/criteria identity-map cache."""
+
+import threading
+from uuid import uuid4
+
+import pytest
+
+from src.core.models.test_criteria import TestCriteria
+from src.core.repositories.device_repository import DeviceRepository
+from src.core.repositories.entity_cache import (
+    CRITERIA, CRITERIA_BY_TEST, DEVICES, EntityCache
+)
+from src.core.repositories.test_criteria_repository import TestCriteriaRepository
+
+
+class TestEntityCache:
+    """Test EntityCache bookkeeping."""
+
+    def test_hit_and_miss_counters(self):
+        """Test lookups are counted per region."""
+        cache = EntityCache()
+        key = uuid4()
+
+        assert cache.get(DEVICES, key) is None
+        cache.put(DEVICES, key, "device", cache.generation)
+        assert cache.get(DEVICES, key) == "device"
+        assert cache.get(DEVICES, key) == "device"
+
+        stats = cache.stats()
+        assert (stats[DEVICES].hits, stats[DEVICES].misses) == (2, 1)
+        assert stats[DEVICES].hit_rate == pytest.approx(2 / 3)
+        assert stats[CRITERIA].hit_rate == 0.0
+
+        cache.reset_stats()
+        assert cache.stats()[DEVICES].lookups == 0
+
+    def test_put_after_invalidation_is_ignored(self):
+        """Test a value loaded before a concurrent write is not cached."""
+        cache = EntityCache()
+        key = uuid4()
+        generation = cache.generation
+
+        # Another thread writes (and invalidates) while this one queries
+        cache.invalidate(DEVICES, key)
+        cache.put(DEVICES, key, "stale", generation)
+
+        assert cache.get(DEVICES, key) is None
+
+    def test_thread_safety(self):
+        """Test concurrent lookups and invalidations keep counters exact."""
+        cache = EntityCache()
+        key = uuid4()
+        cache.put(DEVICES, key, "device", cache.generation)
+
+        def work():
+            for _ in range(1000):
+                cache.get(DEVICES, key)
+                cache.invalidate(CRITERIA, uuid4())
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert cache.stats()[DEVICES].lookups == 4000
+
+
+class TestCachedRepositories:
+    """Test DeviceRepository and TestCriteriaRepository with a shared cache."""
+
+    @pytest.fixture
+    def cache(self):
+        """Provide an empty cache."""
+        return EntityCache()
+
+    @pytest.fixture
+    def device_repo(self, db_connection, cache):
+        """Provide a cached device repository."""
+        return DeviceRepository(db_connection, cache)
+
+    @pytest.fixture
+    def criteria_repo(self, db_connection, cache):
+        """Provide a cached criteria repository."""
+        return TestCriteriaRepository(db_connection, cache)
+
+    @pytest.fixture
+    def device(self, device_repo, sample_device):
+        """Provide a stored device."""
+        return device_repo.create(sample_device)
+
+    def _criteria(self, device, name="Gain Range", max_value=31.3):
+        """Build a SIT criterion for the device."""
+        return TestCriteria(
+            device_id=device.id, test_type="S-Parameters", test_stage="SIT",
+            requirement_name=name, criteria_type="range",
+            min_value=27.5, max_value=max_value, unit="dB"
+        )
+
+    def _count_queries(self, db_connection, func):
+        """Run func and return (result, number of SQL statements executed)."""
+        statements = []
+        db_connection.set_trace_callback(statements.append)
+        try:
+            return func(), len(statements)
+        finally:
+            db_connection.set_trace_callback(None)
+
+    def test_repeated_lookups_do_not_query(self, db_connection, device_repo, criteria_repo, device, cache):
+        """Test the device and its criteria are loaded once."""
+        criteria = criteria_repo.create(self._criteria(device))
+        device_repo.get_by_id(device.id)
+        criteria_repo.get_by_device_and_test(device.id, "S-Parameters", "SIT")
+
+        def lookups():
+            return (
+                device_repo.get_by_id(device.id),
+                criteria_repo.get_by_device_and_test(device.id, "S-Parameters", "SIT"),
+                criteria_repo.get_by_id(criteria.id),
+                criteria_repo.get_by_ids([criteria.id]),
+            )
+
+        (loaded_device, listed, by_id, by_ids), queries = self._count_queries(db_connection, lookups)
+
+        assert queries == 0
+        assert loaded_device == device
+        assert listed == [criteria]
+        assert by_id is listed[0]
+        assert by_ids == {criteria.id: criteria}
+        stats = cache.stats()
+        assert stats[CRITERIA_BY_TEST].hit_rate == 0.5
+        assert stats[CRITERIA].hits == 2
+
+    def test_cached_list_is_a_copy(self, criteria_repo, device):
+        """Test modifying a returned list does not change the cached one."""
+        criteria_repo.create(self._criteria(device))
+        criteria_repo.get_by_device_and_test(device.id, "S-Parameters", "SIT").clear()
+
+        assert len(criteria_repo.get_by_device_and_test(device.id, "S-Parameters", "SIT")) == 1
+
+    def test_writes_invalidate(self, criteria_repo, device):
+        """Test create, update and delete are visible to the next lookup."""
+        def sit_criteria():
+            return criteria_repo.get_by_device_and_test(device.id, "S-Parameters", "SIT")
+
+        assert sit_criteria() == []
+        gain = criteria_repo.create(self._criteria(device))
+        assert sit_criteria() == [gain]
+
+        criteria_repo.update(self._criteria(device, max_value=32.0).model_copy(update={"id": gain.id}))
+        assert criteria_repo.get_by_id(gain.id).max_value == 32.0
+        assert sit_criteria()[0].max_value == 32.0
+
+        criteria_repo.delete(gain.id)
+        assert criteria_repo.get_by_id(gain.id) is None
+        assert sit_criteria() == []
+
+    def test_writes_through_other_repository_invalidate(self, db_connection, cache, criteria_repo, device):
+        """Test repositories sharing a cache see each other's writes."""
+        gain = criteria_repo.create(self._criteria(device))
+        criteria_repo.get_by_id(gain.id)
+
+        TestCriteriaRepository(db_connection, cache).update(
+            self._criteria(device, max_value=33.0).model_copy(update={"id": gain.id})
+        )
+
+        assert criteria_repo.get_by_id(gain.id).max_value == 33.0
+
+    def test_device_delete_drops_its_criteria(self, db_connection, device_repo, criteria_repo, device):
+        """Test deleting a device invalidates criteria removed by CASCADE."""
+        db_connection.execute("PRAGMA foreign_keys = ON")
+        gain = criteria_repo.create(self._criteria(device))
+        criteria_repo.get_by_device_and_test(device.id, "S-Parameters", "SIT")
+
+        device_repo.delete(device.id)
+
+        assert device_repo.get_by_id(device.id) is None
+        assert criteria_repo.get_by_id(gain.id) is None
+        assert criteria_repo.get_by_device_and_test(device.id, "S-Parameters", "SIT") == []
+
+    def test_device_update_invalidates(self, device_repo, device):
+        """Test an updated device is reloaded."""
+        device_repo.get_by_id(device.id)
+
+        device_repo.update(device.model_copy(update={"name": "Renamed"}))
+
+        assert device_repo.get_by_id(device.id).name == "Renamed"
+
+    def test_delete_by_device_invalidates(self, criteria_repo, device):
+        """Test deleting all criteria of a device clears its cached lists."""
+        criteria_repo.create(self._criteria(device))
+        criteria_repo.get_by_device_and_test(device.id, "S-Parameters", "SIT")
+
+        criteria_repo.delete_by_device(device.id)
+
+        assert criteria_repo.get_by_device_and_test(device.id, "S-Parameters", "SIT") == []
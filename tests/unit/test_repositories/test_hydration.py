@@ -0,0 +1,55 @@
+"""Unit tests for trusted model hydration."""
+
+from uuid import uuid4
+
+from src.core.models.test_result import TestResult
+from src.core.repositories.hydration import construct_trusted, uuid_from_db
+
+
+class TestHydration:
+    """Test construct_trusted and uuid_from_db."""
+    
+    def _fields(self):
+        """Every TestResult field, already in its model type."""
+        return dict(
+            id=uuid4(), measurement_id=uuid4(), test_criteria_id=uuid4(),
+            measured_value=29.5, passed=True, s_parameter="S31",
+            measured_min=28.0, measured_max=29.5, worst_frequency=1.25,
+            margin=1.5, guard_band_percent=12.5, is_stale=False
+        )
+    
+    def test_equals_validated_model(self):
+        """Test the trusted model is indistinguishable from a validated one."""
+        fields = self._fields()
+        trusted = construct_trusted(TestResult, **fields)
+        validated = TestResult(**fields)
+        
+        assert trusted == validated
+        assert trusted.model_dump() == validated.model_dump()
+        assert trusted.model_fields_set == set(fields)
+        assert trusted.model_copy(update={"passed": False}).passed is False
+    
+    def test_does_not_validate(self):
+        """Test no validation runs (the caller vouches for the values)."""
+        fields = self._fields()
+        fields["passed"] = "not a bool"
+        
+        assert construct_trusted(TestResult, **fields).passed == "not a bool"
+    
+    def test_instances_do_not_share_state(self):
+        """Test assignment on one instance does not leak into another."""
+        fields = self._fields()
+        first = construct_trusted(TestResult, **fields)
+        second = construct_trusted(TestResult, **fields)
+        
+        first.is_stale = True
+        
+        assert second.is_stale is False
+        assert "is_stale" in second.model_fields_set
+    
+    def test_uuid_from_db_is_cached(self):
+        """Test repeated foreign keys share one parsed UUID."""
+        text = str(uuid4())
+        
+        assert uuid_from_db(text) is uuid_from_db(text)
+        assert str(uuid_from_db(text)) == text
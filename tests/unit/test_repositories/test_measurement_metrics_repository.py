@@ -0,0 +1,147 @@
+"""Unit tests for MeasurementMetricsRepository."""
+
+import pytest
+from uuid import uuid4
+from datetime import date
+from pathlib import Path
+
+from src.core.repositories.measurement_metrics_repository import MeasurementMetricsRepository
+from src.core.repositories.measurement_repository import MeasurementRepository
+from src.core.models.measurement import Measurement
+from src.core.models.measurement_metrics import MeasurementMetrics
+from src.core.rf_data.touchstone_loader import TouchstoneLoader
+from src.core.exceptions import FileLoadError
+
+
+class TestMeasurementMetricsRepository:
+    """Test MeasurementMetricsRepository storage and invalidation."""
+
+    @pytest.fixture
+    def db_connection(self):
+        """Provide in-memory database connection with foreign keys enforced."""
+        from src.database.schema import get_in_memory_connection
+        conn = get_in_memory_connection()
+        conn.execute("PRAGMA foreign_keys = ON")
+        yield conn
+        conn.close()
+
+    @pytest.fixture
+    def repository(self, db_connection):
+        """Provide MeasurementMetricsRepository instance."""
+        return MeasurementMetricsRepository(db_connection)
+
+    @pytest.fixture
+    def measurement_repository(self, db_connection):
+        """Provide MeasurementRepository instance."""
+        return MeasurementRepository(db_connection)
+
+    @pytest.fixture
+    def measurement(self, db_connection, measurement_repository):
+        """Provide a stored Measurement (with its device row for the FK)."""
+        try:
+            network = TouchstoneLoader().load_file(
+                Path("tests/data/20250930_S-Par-SIT_Run1_L109908_SN0001_PRI.s4p")
+            )
+        except FileLoadError:
+            pytest.skip("scikit-rf not available or test file not found")
+
+        device_id = uuid4()
+        db_connection.execute(
+            """
+            INSERT INTO devices (
+                id, name, part_number, operational_freq_min, operational_freq_max,
+                wideband_freq_min, wideband_freq_max, input_ports, output_ports
+            ) VALUES (?, 'Test', 'L109908', 0.5, 2.0, 0.1, 5.0, '[1, 2]', '[3, 4]')
+            """,
+            (str(device_id),)
+        )
+        return measurement_repository.create(Measurement(
+            device_id=device_id,
+            serial_number="SN0001",
+            test_type="S-Parameters",
+            test_stage="SIT",
+            temperature="AMB",
+            path_type="PRI",
+            file_path="/path/to/file.s4p",
+            measurement_date=date(2025, 9, 30),
+            touchstone_data=network
+        ))
+
+    def _metrics(self, measurement_id, band=(0.5, 2.0), version=1):
+        """Build 2-port band metrics with exactly representable values."""
+        return MeasurementMetrics(
+            measurement_id=measurement_id,
+            freq_min=band[0],
+            freq_max=band[1],
+            calculator_version=version,
+            n_ports=2,
+            gain_min=[[-20.125, -40.0], [27.5, -18.25]],
+            gain_max=[[-15.0, -35.5], [29.75, -14.0]],
+            vswr_max=[1.4, 1.6],
+            margins={"vswr:None:2.0:0.1": {
+                "margin_min": [0.6, 0.4],
+                "margin_min_freq": [1.25, 0.5],
+                "guard_band_percent": [0.0, 12.5]
+            }}
+        )
+
+    def test_save_and_get_round_trip(self, repository, measurement):
+        """Test stored metrics are returned unchanged, keyed by band."""
+        operational = self._metrics(measurement.id)
+        oob = self._metrics(measurement.id, band=(3.0, 5.0))
+        repository.save_many([operational, oob])
+
+        stored = repository.get_for_measurement(measurement.id, 1)
+
+        assert set(stored) == {(0.5, 2.0), (3.0, 5.0)}
+        assert stored[(0.5, 2.0)] == operational
+        assert stored[(3.0, 5.0)] == oob
+
+    def test_save_replaces_existing_band(self, repository, measurement):
+        """Test saving the same band/version again replaces the row."""
+        repository.save_many([self._metrics(measurement.id)])
+        updated = self._metrics(measurement.id).model_copy(update={"vswr_max": [2.0, 2.5]})
+        repository.save_many([updated])
+
+        stored = repository.get_for_measurement(measurement.id, 1)
+
+        assert len(stored) == 1
+        assert stored[(0.5, 2.0)].vswr_max == [2.0, 2.5]
+
+    def test_get_for_measurements(self, repository, measurement):
+        """Test bulk lookup groups by measurement and omits unknown IDs."""
+        other_id = uuid4()
+        repository.save_many([self._metrics(measurement.id)])
+
+        stored = repository.get_for_measurements([measurement.id, other_id], 1)
+
+        assert list(stored) == [measurement.id]
+        assert repository.get_for_measurements([], 1) == {}
+
+    def test_version_filter_and_delete_outdated(self, repository, measurement):
+        """Test lookups ignore other calculator versions."""
+        repository.save_many([
+            self._metrics(measurement.id, version=1),
+            self._metrics(measurement.id, version=2)
+        ])
+
+        assert len(repository.get_for_measurement(measurement.id, 2)) == 1
+        assert repository.delete_outdated(2) == 1
+        assert repository.get_for_measurement(measurement.id, 1) == {}
+        assert len(repository.get_for_measurement(measurement.id, 2)) == 1
+
+    def test_metrics_removed_with_measurement(self, repository, measurement_repository, measurement):
+        """Test metrics are deleted when their measurement is deleted."""
+        repository.save_many([self._metrics(measurement.id)])
+
+        measurement_repository.delete(measurement.id)
+
+        assert repository.get_for_measurement(measurement.id, 1) == {}
+
+    def test_metrics_invalidated_on_update(self, repository, measurement_repository, measurement):
+        """Test replacing a measurement's RF data drops its stored metrics."""
+        repository.save_many([self._metrics(measurement.id)])
+
+        measurement_repository.update(measurement)
+
+        assert repository.get_for_measurement(measurement.id, 1) == {}
@@ -169,3 +169,241 @@ class TestMeasurementRepository:
 
 
 
+    
+    def test_migrate_legacy_blobs(self, repository, db_connection, sample_measurement, sample_network):
+        """Test legacy pickled BLOBs are re-encoded with the binary codec."""
+        import pickle
+        from src.core.rf_data import network_codec
+        
+        repository.create(sample_measurement)
+        # Simulate a row written by an older version (pickled Network)
+        db_connection.execute(
+            "UPDATE measurements SET touchstone_data = ? WHERE id = ?",
+            (pickle.dumps(sample_network), str(sample_measurement.id))
+        )
+        db_connection.commit()
+        
+        migrated = repository.migrate_legacy_blobs(batch_size=1)
+        
+        assert migrated == 1
+        blob = db_connection.execute(
+            "SELECT touchstone_data FROM measurements WHERE id = ?",
+            (str(sample_measurement.id),)
+        ).fetchone()[0]
+        assert network_codec.is_encoded(blob)
+        assert repository.get_by_id(sample_measurement.id).touchstone_data.nports == 4
+        # Already migrated - nothing left to do
+        assert repository.migrate_legacy_blobs() == 0
+    
+    def test_list_queries_load_touchstone_data_lazily(self, repository, db_connection, sample_measurement):
+        """Test list queries defer BLOB fetch/decode until first access."""
+        from src.core.rf_data.lazy_network import LazyNetwork
+        
+        repository.create(sample_measurement)
+        
+        statements = []
+        db_connection.set_trace_callback(statements.append)
+        results = repository.get_by_device(sample_measurement.device_id)
+        
+        assert len(results) == 1
+        lazy = results[0].touchstone_data
+        assert isinstance(lazy, LazyNetwork)
+        assert not lazy.is_loaded
+        assert not any("touchstone_data" in sql for sql in statements)
+        
+        # First attribute access fetches and decodes the BLOB
+        assert lazy.nports == 4
+        assert lazy.is_loaded
+        assert any("touchstone_data" in sql for sql in statements)
+        db_connection.set_trace_callback(None)
+
+    def test_lazy_network_rejects_foreign_thread(self, repository, sample_measurement):
+        """Test a proxy is not loaded through its connection from another thread."""
+        import threading
+        from src.core.exceptions import DatabaseError
+
+        repository.create(sample_measurement)
+        lazy = repository.get_by_device(sample_measurement.device_id)[0].touchstone_data
+
+        errors = []
+
+        def worker():
+            try:
+                lazy.load()
+            except DatabaseError as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+        assert len(errors) == 1 and "thread" in str(errors[0])
+        assert not lazy.is_loaded
+        # The owning thread can still load it
+        assert lazy.nports == 4
+
+    def test_lazy_network_rejects_returned_connection(self, tmp_path, sample_measurement):
+        """Test a proxy from a pooled connection fails once the connection is returned."""
+        from src.core.exceptions import DatabaseError
+        from src.database.connection_manager import ConnectionManager
+        from src.database.schema import create_schema
+
+        manager = ConnectionManager(tmp_path / "pool.db", max_connections=1)
+        try:
+            with manager.connection() as conn:
+                create_schema(conn)
+                # The sample measurement has no device row
+                conn.execute("PRAGMA foreign_keys = OFF")
+                repository = MeasurementRepository(conn)
+                repository.create(sample_measurement)
+                measurements = repository.get_by_device(sample_measurement.device_id)
+                loaded = measurements[0].touchstone_data
+                assert loaded.nports == 4
+                measurements = repository.get_by_device(sample_measurement.device_id)
+
+            lazy = measurements[0].touchstone_data
+            with pytest.raises(DatabaseError, match="returned"):
+                lazy.load()
+            # Already loaded proxies no longer need the connection
+            assert loaded.nports == 4
+        finally:
+            manager.close_all()
+
+    def test_header_only_queries(self, repository, sample_measurement):
+        """Test header projections and counts never include RF data."""
+        from src.core.models.measurement import MeasurementHeader
+        
+        repository.create(sample_measurement)
+        
+        headers = repository.get_headers_by_device_and_test_stage(
+            sample_measurement.device_id, "S-Parameters", "SIT"
+        )
+        assert len(headers) == 1
+        assert type(headers[0]) is MeasurementHeader
+        assert headers[0].file_path == sample_measurement.file_path
+        assert headers[0].metadata == sample_measurement.metadata
+        assert not hasattr(headers[0], "touchstone_data")
+        
+        assert len(repository.get_headers_by_device(sample_measurement.device_id)) == 1
+        assert repository.count_by_device(sample_measurement.device_id) == 1
+        assert repository.count_by_device(uuid4()) == 0
+    
+    def test_create_many(self, repository, device_id, sample_network):
+        """Test batched measurement creation."""
+        measurements = [
+            Measurement(
+                device_id=device_id,
+                serial_number=f"SN000{i}",
+                test_type="S-Parameters",
+                test_stage="SIT",
+                temperature="AMB",
+                path_type="PRI",
+                file_path=f"/path/to/file{i}.s4p",
+                measurement_date=date(2025, 9, 30),
+                touchstone_data=sample_network,
+                metadata={}
+            )
+            for i in range(1, 4)
+        ]
+        
+        repository.create_many(measurements)
+        
+        assert repository.count_by_device(device_id) == 3
+        
+        # Upsert: change one, re-save all
+        measurements[0].file_path = "/renamed.s4p"
+        repository.upsert_many(measurements)
+        assert repository.count_by_device(device_id) == 3
+        assert repository.get_by_id(measurements[0].id).file_path == "/renamed.s4p"
+    
+    def test_shared_blob_stored_once(self, repository, db_connection, device_id, sample_network):
+        """Test hashed measurements share one blob, released with the last row."""
+        measurements = [
+            Measurement(
+                device_id=device_id,
+                serial_number="SN0001",
+                test_type="S-Parameters",
+                test_stage=stage,
+                temperature="AMB",
+                path_type="PRI",
+                file_path="/path/to/file.s4p",
+                measurement_date=date(2025, 9, 30),
+                touchstone_data=sample_network,
+                content_hash="ab" * 32
+            )
+            for stage in ("SIT", "Board-Bring-Up")
+        ]
+        repository.create_many(measurements)
+        
+        blob_count = db_connection.execute("SELECT COUNT(*) FROM touchstone_blobs").fetchone()[0]
+        inline_bytes = db_connection.execute(
+            "SELECT SUM(length(touchstone_data)) FROM measurements"
+        ).fetchone()[0]
+        assert blob_count == 1
+        assert inline_bytes == 0
+        assert repository.get_content_hashes() == {"ab" * 32}
+        assert repository.get_blob_by_content_hash("ab" * 32) is not None
+        
+        # Both eager and lazy reads resolve the shared blob
+        assert repository.get_by_id(measurements[0].id).touchstone_data.nports == 4
+        lazy = repository.get_by_device(device_id)[0]
+        assert lazy.content_hash == "ab" * 32
+        assert lazy.touchstone_data.nports == 4
+        
+        # Saving a measurement backed by the stored blob does not re-encode it
+        proxy = repository.get_lazy_network_by_content_hash("ab" * 32)
+        copy = measurements[0].model_copy(update={"id": uuid4(), "touchstone_data": proxy})
+        repository.create(copy)
+        assert not proxy.is_loaded
+        
+        # Blob is kept while any measurement references it
+        repository.delete(measurements[0].id)
+        repository.delete(measurements[1].id)
+        assert repository.get_blob_by_content_hash("ab" * 32) is not None
+        repository.delete(copy.id)
+        assert repository.get_blob_by_content_hash("ab" * 32) is None
+    
+    def test_header_facts_stored_as_columns(self, repository, sample_measurement, sample_network):
+        """Test port/point/frequency facts are filled in on save and read back."""
+        repository.create(sample_measurement)
+        
+        assert sample_measurement.n_ports == 4
+        assert sample_measurement.n_points == len(sample_network.f)
+        assert sample_measurement.freq_start == pytest.approx(sample_network.f[0] / 1e9)
+        assert sample_measurement.freq_stop == pytest.approx(sample_network.f[-1] / 1e9)
+        header = repository.get_headers_by_device(sample_measurement.device_id)[0]
+        assert (header.n_ports, header.n_points, header.freq_start, header.freq_stop) == (
+            sample_measurement.n_ports, sample_measurement.n_points,
+            sample_measurement.freq_start, sample_measurement.freq_stop
+        )
+        assert repository.get_port_counts(sample_measurement.device_id, "S-Parameters") == [4]
+        assert repository.get_port_counts(sample_measurement.device_id, "Power/Linearity") == []
+    
+    def test_header_facts_of_stored_shared_blob(self, repository, sample_measurement):
+        """Test a measurement saved with an unloaded proxy gets the stored blob's facts."""
+        sample_measurement.content_hash = "cd" * 32
+        repository.create(sample_measurement)
+        
+        proxy = repository.get_lazy_network_by_content_hash("cd" * 32)
+        copy = sample_measurement.model_copy(update={
+            "id": uuid4(), "touchstone_data": proxy,
+            "n_ports": None, "n_points": None, "freq_start": None, "freq_stop": None
+        })
+        repository.create(copy)
+        
+        assert not proxy.is_loaded
+        assert repository.get_by_id(copy.id).n_points == sample_measurement.n_points
+    
+    def test_legacy_blobs_have_no_header_facts_until_migrated(
+        self, repository, db_connection, sample_measurement, sample_network
+    ):
+        """Test pickled rows keep NULL facts and get them from migrate_legacy_blobs."""
+        import pickle
+        
+        sample_measurement.touchstone_data = pickle.dumps(sample_network)
+        repository.create(sample_measurement)
+        assert repository.get_port_counts(sample_measurement.device_id, "S-Parameters") == []
+        
+        repository.migrate_legacy_blobs()
+        
+        assert repository.get_port_counts(sample_measurement.device_id, "S-Parameters") == [4]
@@ -155,3 +155,363 @@ class TestTestResultRepository:
 
 
 
+    
+    def test_create_many_single_transaction(self, repository, db_connection, measurement_id, criteria_id):
+        """Test create_many stores all results with a single commit."""
+        results = [
+            TestResult(
+                measurement_id=measurement_id,
+                test_criteria_id=criteria_id,
+                measured_value=float(i),
+                passed=True,
+                s_parameter=f"S{i}1"
+            )
+            for i in range(2, 6)
+        ]
+        
+        statements = []
+        db_connection.set_trace_callback(statements.append)
+        created = repository.create_many(results)
+        db_connection.set_trace_callback(None)
+        
+        assert len(created) == 4
+        assert len(repository.get_by_measurement_id(measurement_id)) == 4
+        assert sum(1 for sql in statements if sql.strip().upper() == "COMMIT") == 1
+    
+    def test_create_many_is_atomic(self, repository, sample_result, measurement_id, criteria_id):
+        """Test a failing row rolls back the whole batch."""
+        from src.core.exceptions import DatabaseError
+        
+        repository.create(sample_result)
+        new_result = TestResult(
+            measurement_id=measurement_id,
+            test_criteria_id=criteria_id,
+            measured_value=1.0,
+            passed=True,
+            s_parameter="S31"
+        )
+        
+        # Duplicate primary key in the batch -> nothing from the batch is stored
+        with pytest.raises(DatabaseError):
+            repository.create_many([new_result, sample_result])
+        
+        assert len(repository.get_by_measurement_id(measurement_id)) == 1
+    
+    def test_upsert_many(self, repository, sample_result, measurement_id, criteria_id):
+        """Test upsert_many updates existing IDs and inserts new ones."""
+        repository.create(sample_result)
+        sample_result.measured_value = 33.0
+        sample_result.passed = False
+        new_result = TestResult(
+            measurement_id=measurement_id,
+            test_criteria_id=criteria_id,
+            measured_value=1.0,
+            passed=True,
+            s_parameter="S31"
+        )
+        
+        repository.upsert_many([sample_result, new_result])
+        
+        updated = repository.get_by_id(sample_result.id)
+        assert updated.measured_value == 33.0
+        assert updated.passed is False
+        assert repository.get_by_id(new_result.id) is not None
+    
+    def test_secondary_values_persistence(self, repository, measurement_id, criteria_id):
+        """Test min/max and worst-case frequency round-trip through create and update."""
+        result = TestResult(
+            measurement_id=measurement_id,
+            test_criteria_id=criteria_id,
+            measured_value=31.0,
+            passed=True,
+            s_parameter="S31",
+            measured_min=28.25,
+            measured_max=31.0,
+            worst_frequency=1.75
+        )
+        repository.create(result)
+        
+        retrieved = repository.get_by_id(result.id)
+        assert (retrieved.measured_min, retrieved.measured_max, retrieved.worst_frequency) == (28.25, 31.0, 1.75)
+        
+        result.measured_min = None
+        repository.update(result)
+        assert repository.get_by_id(result.id).measured_min is None
+    
+    def test_margin_persistence(self, repository, measurement_id, criteria_id):
+        """Test margin and guard-band share round-trip through create, update and upsert."""
+        result = TestResult(
+            measurement_id=measurement_id,
+            test_criteria_id=criteria_id,
+            measured_value=1.8,
+            passed=True,
+            s_parameter="S11",
+            measured_max=1.8,
+            worst_frequency=1.5,
+            margin=0.2,
+            guard_band_percent=12.5
+        )
+        repository.create(result)
+        
+        retrieved = repository.get_by_id(result.id)
+        assert (retrieved.margin, retrieved.guard_band_percent) == (0.2, 12.5)
+        
+        result.guard_band_percent = None
+        repository.update(result)
+        assert repository.get_by_id(result.id).guard_band_percent is None
+        
+        repository.upsert_many([result.model_copy(update={"margin": -0.1})])
+        assert repository.get_by_id(result.id).margin == -0.1
+    
+    def _create_criteria(self, db_connection, test_stage, name="Gain Range"):
+        """Store a criterion and return it."""
+        from src.core.repositories.test_criteria_repository import TestCriteriaRepository
+        from src.core.models.test_criteria import TestCriteria
+        return TestCriteriaRepository(db_connection).create(TestCriteria(
+            device_id=uuid4(),
+            test_type="S-Parameters",
+            test_stage=test_stage,
+            requirement_name=name,
+            criteria_type="range",
+            min_value=27.5,
+            max_value=31.3,
+            unit="dB"
+        ))
+    
+    def test_get_with_criteria(self, repository, db_connection, measurement_id):
+        """Test results come joined with their criteria, filtered by stage and staleness."""
+        sit = self._create_criteria(db_connection, "SIT")
+        bringup = self._create_criteria(db_connection, "Board-Bring-Up")
+        repository.create_many([
+            TestResult(measurement_id=measurement_id, test_criteria_id=sit.id,
+                       measured_value=29.5, passed=True, s_parameter="S31"),
+            TestResult(measurement_id=measurement_id, test_criteria_id=sit.id,
+                       measured_value=26.0, passed=False, s_parameter="S41", is_stale=True),
+            TestResult(measurement_id=measurement_id, test_criteria_id=bringup.id,
+                       measured_value=28.0, passed=True, s_parameter="S31"),
+        ])
+        
+        pairs = repository.get_with_criteria([measurement_id], test_stage="SIT")
+        
+        assert len(pairs) == 1
+        result, criterion = pairs[0]
+        assert result.s_parameter == "S31"
+        assert criterion == sit
+        assert len(repository.get_with_criteria([measurement_id])) == 2
+        assert len(repository.get_with_criteria([measurement_id], include_stale=True)) == 3
+        assert repository.get_with_criteria([]) == []
+    
+    def test_get_with_criteria_single_query(self, repository, db_connection):
+        """Test results of many measurements and criteria are read with one SELECT."""
+        criteria = [self._create_criteria(db_connection, "SIT", f"Req {i}") for i in range(10)]
+        measurement_ids = [uuid4() for _ in range(4)]
+        repository.create_many([
+            TestResult(measurement_id=m_id, test_criteria_id=c.id, measured_value=1.0, passed=True)
+            for m_id in measurement_ids
+            for c in criteria
+        ])
+        
+        statements = []
+        db_connection.set_trace_callback(statements.append)
+        pairs = repository.get_with_criteria(measurement_ids, test_stage="SIT")
+        db_connection.set_trace_callback(None)
+        
+        assert len(pairs) == 40
+        assert {c.requirement_name for _, c in pairs} == {f"Req {i}" for i in range(10)}
+        assert sum(1 for sql in statements if sql.lstrip().upper().startswith("SELECT")) == 1
+    
+    def test_delete_by_measurements_and_stage(self, repository, db_connection):
+        """Test one DELETE removes a stage's results (stale too) for many measurements."""
+        sit = self._create_criteria(db_connection, "SIT")
+        bringup = self._create_criteria(db_connection, "Board-Bring-Up")
+        session_ids = [uuid4() for _ in range(3)]
+        other_id = uuid4()
+        repository.create_many([
+            TestResult(measurement_id=m_id, test_criteria_id=c.id, measured_value=1.0,
+                       passed=True, s_parameter=s_param, is_stale=stale)
+            for m_id in session_ids + [other_id]
+            for c in (sit, bringup)
+            for s_param, stale in (("S31", False), ("S41", True))
+        ])
+        
+        statements = []
+        db_connection.set_trace_callback(statements.append)
+        deleted = repository.delete_by_measurements_and_stage(session_ids, "SIT")
+        db_connection.set_trace_callback(None)
+        
+        assert deleted == 6
+        assert sum(1 for sql in statements if sql.lstrip().upper().startswith("DELETE")) == 1
+        remaining = repository.get_with_criteria(session_ids + [other_id], include_stale=True)
+        assert len(remaining) == 10
+        assert all(
+            c.test_stage == "Board-Bring-Up" or r.measurement_id == other_id
+            for r, c in remaining
+        )
+        assert repository.delete_by_measurements_and_stage([], "SIT") == 0
+    
+    def test_delete_stale(self, repository, measurement_id, criteria_id):
+        """Test only stale results of the given measurements are deleted."""
+        other_id = uuid4()
+        repository.create_many([
+            TestResult(measurement_id=m_id, test_criteria_id=criteria_id, measured_value=1.0,
+                       passed=True, s_parameter=s_param, is_stale=stale)
+            for m_id in (measurement_id, other_id)
+            for s_param, stale in (("S31", False), ("S41", True), ("S42", True))
+        ])
+        
+        assert repository.delete_stale([measurement_id]) == 2
+        
+        assert [r.is_stale for r in repository.get_by_measurement_id(measurement_id)] == [False]
+        assert len(repository.get_by_measurement_id(other_id)) == 3
+        assert repository.delete_stale([]) == 0
+    
+    def test_upsert_by_key(self, repository, db_connection, measurement_id, criteria_id):
+        """Test re-saving an evaluation updates by key and only rewrites changed rows."""
+        def evaluate(gain):
+            return [
+                TestResult(measurement_id=measurement_id, test_criteria_id=criteria_id,
+                           measured_value=gain, passed=True, s_parameter="S31"),
+                TestResult(measurement_id=measurement_id, test_criteria_id=criteria_id,
+                           measured_value=1.5, passed=True, s_parameter=None),
+            ]
+        
+        first = evaluate(29.5)
+        assert repository.upsert_by_key(first) == 2
+        
+        again = evaluate(29.5)
+        assert repository.upsert_by_key(again) == 0  # Identical - nothing rewritten
+        assert [r.id for r in again] == [r.id for r in first]  # Stored IDs adopted
+        
+        changed = evaluate(32.0)
+        changed[0].passed = False
+        assert repository.upsert_by_key(changed) == 1
+        
+        stored = repository.get_by_measurement_id(measurement_id)
+        assert len(stored) == 2
+        by_param = {r.s_parameter: r for r in stored}
+        assert by_param["S31"].id == first[0].id
+        assert by_param["S31"].measured_value == 32.0
+        assert by_param["S31"].passed is False
+        assert repository.upsert_by_key([]) == 0
+    
+    def test_upsert_by_key_clears_stale_flag(self, repository, measurement_id, criteria_id):
+        """Test a re-evaluated stale result becomes current again."""
+        result = TestResult(measurement_id=measurement_id, test_criteria_id=criteria_id,
+                            measured_value=29.5, passed=True, s_parameter="S31")
+        repository.upsert_by_key([result])
+        repository.mark_as_stale_by_criteria(criteria_id)
+        
+        assert repository.upsert_by_key([result.model_copy()]) == 1
+        
+        assert repository.get_by_id(result.id).is_stale is False
+    
+    def test_replace_stage_results(self, repository, db_connection):
+        """Test a stage re-evaluation keeps produced keys and drops the rest of the stage."""
+        sit = self._create_criteria(db_connection, "SIT")
+        bringup = self._create_criteria(db_connection, "Board-Bring-Up")
+        evaluated_id, empty_id, other_id = uuid4(), uuid4(), uuid4()
+        repository.create_many([
+            TestResult(measurement_id=m_id, test_criteria_id=c.id, measured_value=1.0,
+                       passed=True, s_parameter=s_param)
+            for m_id in (evaluated_id, empty_id, other_id)
+            for c in (sit, bringup)
+            for s_param in ("S31", "S41", None)
+        ])
+        kept = repository.get_by_measurement_and_criteria(evaluated_id, sit.id)
+        
+        # Port change - S41 is no longer produced, S32 is new
+        evaluation = [
+            TestResult(measurement_id=evaluated_id, test_criteria_id=sit.id,
+                       measured_value=1.0, passed=True, s_parameter=s_param)
+            for s_param in ("S31", "S32", None)
+        ]
+        written = repository.replace_stage_results([evaluated_id, empty_id], "SIT", evaluation)
+        
+        assert written == 1 + 1 + 3  # S32 inserted, S41 and every empty_id SIT result deleted
+        stored = {r.s_parameter: r.id for r in repository.get_by_measurement_and_criteria(evaluated_id, sit.id)}
+        assert set(stored) == {"S31", "S32", None}
+        assert {stored["S31"], stored[None]} <= {r.id for r in kept}
+        assert repository.get_by_measurement_and_criteria(empty_id, sit.id) == []
+        # Other stages and other measurements are untouched
+        assert len(repository.get_by_measurement_and_criteria(evaluated_id, bringup.id)) == 3
+        assert len(repository.get_by_measurement_id(other_id)) == 6
+        assert repository.replace_stage_results([], "SIT", []) == 0
+    
+    def test_result_key_is_unique(self, repository, sample_result):
+        """Test a second row with the same measurement/criterion/S-parameter is rejected."""
+        from src.core.exceptions import DatabaseError
+        repository.create(sample_result)
+        
+        with pytest.raises(DatabaseError):
+            repository.create(sample_result.model_copy(update={"id": uuid4()}))
+    
+    def test_get_summaries(self, repository, db_connection):
+        """Test pass/fail/stale counts per measurement, stage and criterion."""
+        sit = self._create_criteria(db_connection, "SIT")
+        sit_vswr = self._create_criteria(db_connection, "SIT", "VSWR")
+        bringup = self._create_criteria(db_connection, "Board-Bring-Up")
+        m1, m2 = uuid4(), uuid4()
+        repository.create_many([
+            TestResult(measurement_id=m1, test_criteria_id=sit.id, passed=True, s_parameter="S31"),
+            TestResult(measurement_id=m1, test_criteria_id=sit.id, passed=False, s_parameter="S41"),
+            TestResult(measurement_id=m1, test_criteria_id=sit_vswr.id, passed=True,
+                       s_parameter="S11", is_stale=True),
+            TestResult(measurement_id=m1, test_criteria_id=bringup.id, passed=True, s_parameter="S31"),
+            TestResult(measurement_id=m2, test_criteria_id=sit.id, passed=True, s_parameter="S31"),
+        ])
+        
+        per_measurement = {s.measurement_id: s for s in repository.get_summaries([m1, m2])}
+        assert (per_measurement[m1].total, per_measurement[m1].passed, per_measurement[m1].stale) == (4, 3, 1)
+        assert per_measurement[m1].failed == 1
+        assert per_measurement[m1].all_passed is False
+        assert per_measurement[m2].all_passed is True
+        
+        per_stage = {
+            (s.measurement_id, s.test_stage): s.total
+            for s in repository.get_summaries([m1, m2], group_by="stage")
+        }
+        assert per_stage == {(m1, "SIT"): 3, (m1, "Board-Bring-Up"): 1, (m2, "SIT"): 1}
+        
+        per_criterion = {
+            (s.measurement_id, s.test_criteria_id): (s.passed, s.current)
+            for s in repository.get_summaries([m1], test_stage="SIT", group_by="criterion")
+        }
+        assert per_criterion == {(m1, sit.id): (1, 2), (m1, sit_vswr.id): (1, 0)}
+        
+        assert repository.get_summaries([]) == []
+    
+    def test_get_summaries_for_device(self, repository, db_connection):
+        """Test a whole device is summarized through its criteria."""
+        sit = self._create_criteria(db_connection, "SIT")
+        other_device = self._create_criteria(db_connection, "SIT")
+        measurement_ids = [uuid4() for _ in range(3)]
+        repository.create_many([
+            TestResult(measurement_id=m_id, test_criteria_id=c.id, passed=True, s_parameter="S31")
+            for m_id in measurement_ids
+            for c in (sit, other_device)
+        ])
+        
+        summaries = repository.get_summaries(device_id=sit.device_id, test_stage="SIT")
+        
+        assert {s.measurement_id for s in summaries} == set(measurement_ids)
+        assert all(s.total == 1 for s in summaries)
+        with pytest.raises(ValueError):
+            repository.get_summaries()
+        with pytest.raises(ValueError):
+            repository.get_summaries(measurement_ids, group_by="serial")
+    
+    def test_loaded_models_equal_validated_models(self, repository, db_connection, measurement_id):
+        """Test trusted hydration (no re-validation) round-trips results and criteria."""
+        criteria = self._create_criteria(db_connection, "SIT")
+        result = TestResult(
+            measurement_id=measurement_id, test_criteria_id=criteria.id,
+            measured_value=29.5, passed=True, s_parameter="S31",
+            measured_min=28.0, measured_max=29.5, worst_frequency=1.25
+        )
+        repository.create(result)
+        
+        assert repository.get_by_id(result.id) == result
+        [(loaded_result, loaded_criteria)] = repository.get_with_criteria([measurement_id], "SIT")
+        assert loaded_result == result
+        assert loaded_criteria == criteria
+        assert loaded_criteria.model_dump() == criteria.model_dump()
@@ -0,0 +1,182 @@
+"""Unit tests for per-measurement analysis contexts and their pool."""
+
+from pathlib import Path
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from src.core.models.device import Device
+from src.core.models.measurement import Measurement
+from src.core.models.test_criteria import TestCriteria
+from src.core.rf_data.analysis_context import AnalysisContextPool
+from src.core.rf_data.lazy_network import LazyNetwork
+from src.core.rf_data.touchstone_loader import TouchstoneLoader
+from src.core.services.plotting_service import PlottingService
+from src.core.test_types.s_parameters import SParametersTestType
+
+pytest.importorskip("skrf")
+
+
+DATA_DIR = Path("tests/data")
+
+
+@pytest.fixture
+def device():
+    """Provide a 2-in/2-out device."""
+    return Device(
+        name="Test Device",
+        part_number="L109908",
+        operational_freq_min=1.0,
+        operational_freq_max=2.0,
+        wideband_freq_min=0.1,
+        wideband_freq_max=5.0,
+        input_ports=[1, 2],
+        output_ports=[3, 4]
+    )
+
+
+@pytest.fixture
+def measurements(device):
+    """Provide the ambient PRI and RED SIT measurements as encoded BLOBs."""
+    loader = TouchstoneLoader()
+    result = []
+    for path_type in ("PRI", "RED"):
+        path = DATA_DIR / f"20250930_S-Par-SIT_Run1_L109908_SN0001_{path_type}.s4p"
+        result.append(Measurement(
+            device_id=device.id,
+            serial_number="SN0001",
+            test_type="S-Parameters",
+            test_stage="SIT",
+            temperature="AMB",
+            path_type=path_type,
+            file_path=str(path),
+            measurement_date="2025-09-30",
+            touchstone_data=loader.serialize_network(loader.load_file(path)),
+            content_hash=path_type
+        ))
+    return result
+
+
+class TestAnalysisContext:
+    """Test what a context computes and caches."""
+
+    def test_network_is_decoded_once(self, measurements):
+        """Test every consumer of a context shares one decode."""
+        pool = AnalysisContextPool()
+        context = pool.get(measurements[0])
+
+        assert not context.is_decoded
+        assert pool.get(measurements[0]).network is context.network
+        assert pool.stats().decodes == 1
+        assert (pool.stats().hits, pool.stats().misses) == (1, 1)
+
+    def test_band_network_and_metrics_match_calculator(self, measurements):
+        """Test cached band views and metrics equal direct calculation."""
+        pool = AnalysisContextPool()
+        context = pool.get(measurements[0])
+        network = context.network
+
+        filtered = context.band_network(1.0, 2.0)
+        np.testing.assert_array_equal(
+            filtered.s, pool.calculator.filter_frequency_range(network, 1.0, 2.0).s
+        )
+        assert context.band_network(1.0, 2.0) is filtered
+
+        metrics = context.band_metrics([(1.0, 2.0), (3.0, 5.0)])
+        for band, arrays in metrics.items():
+            expected = pool.calculator.calculate_band_metrics(network, *band)
+            for key in expected:
+                np.testing.assert_array_equal(arrays[key], expected[key])
+        # Known bands are returned as stored, not recomputed
+        assert context.band_metrics([(3.0, 5.0)])[(3.0, 5.0)] is metrics[(3.0, 5.0)]
+
+    def test_undecoded_context_uses_latest_source(self, measurements):
+        """Test a context decodes the RF data of the caller that first needs it."""
+        pool = AnalysisContextPool()
+        calls = []
+        first = measurements[0].model_copy(update={
+            "touchstone_data": LazyNetwork(lambda: calls.append("first"))
+        })
+        blob = measurements[0].touchstone_data
+        second = measurements[0].model_copy(update={
+            "touchstone_data": LazyNetwork(lambda: calls.append("second") or pool.loader.resolve_network(blob))
+        })
+
+        pool.get(first)
+        assert pool.get(second).network.nports == 4
+        assert calls == ["second"]
+
+
+class TestAnalysisContextPool:
+    """Test pool keys, eviction and the shared refresh cycle."""
+
+    def test_lru_eviction_and_content_hash(self, measurements):
+        """Test the least recently used context is evicted and new content gets a new context."""
+        pool = AnalysisContextPool(max_contexts=2)
+        pri, red = measurements
+        pri_context = pool.get(pri)
+        pool.get(red)
+        pool.get(pri)
+        pool.get(pri.model_copy(update={"content_hash": "replaced"}))  # Evicts RED
+
+        assert pool.get(pri) is pri_context
+        assert pool.stats().evictions == 1
+        assert len(pool) == 2
+        with pytest.raises(ValueError):
+            AnalysisContextPool(max_contexts=0)
+
+    def test_pool_is_bounded_by_bytes(self, measurements):
+        """Test the pool evicts by the bytes its contexts hold, not only by count."""
+        pri, red = measurements
+        probe = AnalysisContextPool()
+        context = probe.get(pri)
+        context.band_metrics([(1.0, 2.0)])
+        context.band_network(1.0, 2.0)
+        one_context = context.nbytes
+        network = context.network
+        assert one_context > network.s.nbytes + network.f.nbytes
+        assert probe.nbytes == one_context == probe.stats().nbytes
+
+        # Room for one decoded measurement with its band data, not two
+        pool = AnalysisContextPool(max_bytes=int(one_context * 1.5))
+        for measurement in (pri, red, pri.model_copy(update={"content_hash": "replaced"})):
+            context = pool.get(measurement)
+            context.band_metrics([(1.0, 2.0)])
+            context.band_network(1.0, 2.0)
+            assert pool.nbytes <= pool.max_bytes
+
+        assert len(pool) == 1
+        assert pool.stats().evictions == 2
+        # An evicted context stays usable for callers still holding it
+        assert context.network.nports == 4
+        pool.clear()
+        assert pool.nbytes == 0
+        with pytest.raises(ValueError):
+            AnalysisContextPool(max_bytes=-1)
+
+    def test_refresh_cycle_decodes_each_measurement_once(self, device, measurements):
+        """Test compliance evaluation and every plot share one decode per measurement."""
+        pool = AnalysisContextPool()
+        test_type = SParametersTestType(analysis_pool=pool)
+        plotting = PlottingService(analysis_pool=pool)
+        criteria = [TestCriteria(
+            device_id=device.id,
+            test_type="S-Parameters",
+            test_stage="SIT",
+            requirement_name="Gain Range",
+            criteria_type="range",
+            min_value=20.0,
+            max_value=40.0,
+            unit="dB"
+        )]
+
+        for measurement in measurements:
+            test_type.evaluate_compliance(measurement, device, criteria, 1.0, 2.0)
+        for plot_type in ("Operational Gain", "Operational VSWR", "Wideband Gain"):
+            plot = plotting.prepare_plot_data(
+                device, measurements, plot_type, {"AMB"}, {"PRI", "RED"}, set(), "SIT"
+            )
+            assert plot.traces
+
+        assert pool.stats().decodes == len(measurements)
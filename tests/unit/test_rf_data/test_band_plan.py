@@ -0,0 +1,121 @@
+"""Unit tests for band index plans and the band plan cache."""
+
+import threading
+
+import numpy as np
+import pytest
+
+from src.core.rf_data.band_plan import BandPlanCache, grid_fingerprint, make_band_plan
+
+
+GRID = np.arange(10, 61) * 1e8  # 1 to 6 GHz in 0.1 GHz steps
+
+
+class TestBandPlan:
+    """Test make_band_plan and BandPlan.apply."""
+
+    def test_edges_between_samples(self):
+        """Test interior slice and interpolated edges."""
+        plan = make_band_plan(GRID, 1.05, 1.95)
+        data = np.arange(len(GRID), dtype=float) * (1 + 1j)
+
+        assert (plan.lo, plan.hi) == (1, 10)
+        assert plan.left.weight == pytest.approx(0.5)
+        np.testing.assert_allclose(plan.frequency_hz[[0, -1]], [1.05e9, 1.95e9])
+        np.testing.assert_allclose(plan.apply(data)[[0, -1]], [0.5 * (1 + 1j), 9.5 * (1 + 1j)])
+
+    def test_edges_on_grid_are_views(self):
+        """Test a band on measured points is a plain slice."""
+        plan = make_band_plan(GRID, 2.0, 1.0)  # Reversed range
+        data = np.arange(len(GRID), dtype=float)
+
+        assert plan.is_slice
+        assert np.shares_memory(plan.apply(data), data)
+        np.testing.assert_array_equal(plan.apply(data), data[0:11])
+
+    def test_apply_derived_converts_edges(self):
+        """Test derived quantities slice the interior and derive the interpolated edges."""
+        data = (np.arange(len(GRID)) + 1.0) * (1 + 1j)
+        derived = np.abs(data)
+
+        for band in [(1.05, 1.95), (1.0, 2.0)]:
+            plan = make_band_plan(GRID, *band)
+            np.testing.assert_array_equal(plan.apply_derived(derived, data, np.abs), np.abs(plan.apply(data)))
+            assert len(plan.band_frequencies(GRID)) == len(plan.apply(data))
+
+    def test_clamped_and_empty(self):
+        """Test bands outside the sweep are clamped and empty grids give empty plans."""
+        assert make_band_plan(GRID, 0.0, 100.0).is_slice
+        assert len(make_band_plan(GRID[:0], 1.0, 2.0).frequency_hz) == 0
+
+    def test_frequencies_are_read_only(self):
+        """Test shared plan frequencies cannot be modified."""
+        plan = make_band_plan(GRID, 1.05, 1.95)
+
+        with pytest.raises(ValueError):
+            plan.frequency_hz[0] = 0.0
+
+
+class TestBandPlanCache:
+    """Test BandPlanCache lookups, eviction and statistics."""
+
+    def test_hits_for_equal_grids(self):
+        """Test an equal grid (different array) reuses the plan."""
+        cache = BandPlanCache()
+
+        first = cache.get_plan(GRID, 1.05, 1.95)
+        second = cache.get_plan(GRID.copy(), 1.05, 1.95)
+
+        assert second is first
+        stats = cache.stats()
+        assert (stats.hits, stats.misses) == (1, 1)
+        assert stats.hit_rate == 0.5
+
+    def test_different_grids_and_bands_miss(self):
+        """Test the key includes the grid contents and the band."""
+        cache = BandPlanCache()
+        shifted = GRID.copy()
+        shifted[5] += 1.0
+
+        cache.get_plan(GRID, 1.0, 2.0)
+        cache.get_plan(shifted, 1.0, 2.0)
+        cache.get_plan(GRID, 1.0, 2.5)
+
+        assert grid_fingerprint(GRID) != grid_fingerprint(shifted)
+        assert cache.stats().misses == 3
+        assert len(cache) == 3
+
+    def test_lru_eviction(self):
+        """Test the least recently used plan is evicted first."""
+        cache = BandPlanCache(max_plans=2)
+        cache.get_plan(GRID, 1.0, 2.0)
+        cache.get_plan(GRID, 3.0, 4.0)
+        cache.get_plan(GRID, 1.0, 2.0)  # Now most recently used
+        cache.get_plan(GRID, 5.0, 6.0)  # Evicts (3.0, 4.0)
+
+        cache.reset_stats()
+        cache.get_plan(GRID, 1.0, 2.0)
+        cache.get_plan(GRID, 3.0, 4.0)
+
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.evictions) == (1, 1, 1)
+        assert len(cache) == 2
+        with pytest.raises(ValueError):
+            BandPlanCache(max_plans=0)
+
+    def test_thread_safety(self):
+        """Test concurrent lookups keep the counters exact."""
+        cache = BandPlanCache(max_plans=4)
+
+        def work():
+            for i in range(500):
+                cache.get_plan(GRID, 1.0 + (i % 6) * 0.1, 5.0)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert cache.stats().lookups == 2000
+        assert len(cache) <= 4
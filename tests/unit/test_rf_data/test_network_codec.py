@@ -0,0 +1,141 @@
+"""Unit tests for the binary network codec."""
+
+import pickle
+import pytest
+import numpy as np
+from pathlib import Path
+
+from src.core.rf_data.touchstone_loader import TouchstoneLoader
+from src.core.rf_data import network_codec
+from src.core.exceptions import FileLoadError
+
+
+class TestNetworkCodec:
+    """Test encoding/decoding Network objects with the binary codec."""
+    
+    @pytest.fixture
+    def sample_network(self):
+        """Load a sample S4P network for testing."""
+        try:
+            loader = TouchstoneLoader()
+        except FileLoadError:
+            pytest.skip("scikit-rf not installed")
+        return loader.load_file(Path("tests/data/20250930_S-Par-SIT_Run1_L109908_SN0001_PRI.s4p"))
+    
+    def test_round_trip_double_is_lossless(self, sample_network):
+        """Test double precision round trip reproduces the network exactly."""
+        blob = network_codec.encode_network(sample_network)
+        decoded = network_codec.decode_network(blob)
+        
+        assert network_codec.is_encoded(blob)
+        assert decoded.nports == sample_network.nports
+        assert decoded.name == sample_network.name
+        assert decoded.frequency.unit == sample_network.frequency.unit
+        np.testing.assert_array_equal(decoded.f, sample_network.f)
+        np.testing.assert_array_equal(decoded.s, sample_network.s)
+        np.testing.assert_array_equal(decoded.z0, sample_network.z0)
+    
+    def test_trusted_build_equals_constructor(self, sample_network):
+        """Test decode_network (no constructor) gives the constructed Network."""
+        network = sample_network.copy()
+        network.frequency.unit = "GHz"
+        decoded = network_codec.decode_arrays(network_codec.encode_network(network))
+        
+        fast = network_codec.build_network(decoded, trusted=True)
+        constructed = network_codec.build_network(decoded)
+        
+        assert fast == constructed
+        assert fast.__dict__.keys() == constructed.__dict__.keys()
+        assert fast.frequency.unit == "GHz" and fast.name == constructed.name
+        np.testing.assert_array_equal(fast.port_modes, constructed.port_modes)
+        np.testing.assert_array_equal(fast.s_db, constructed.s_db)
+        np.testing.assert_array_equal(fast["1-2ghz"].s, constructed["1-2ghz"].s)
+        # The Network owns writable arrays, not views of the blob
+        assert fast.s.flags.writeable and fast.s.base is None
+        pickle.loads(pickle.dumps(fast))
+    
+    def test_fast_path_matches_installed_skrf(self):
+        """Test the Network attributes the fast path sets exist in the installed scikit-rf."""
+        network_state, frequency_state = network_codec._network_template()
+        
+        # Fails on a scikit-rf upgrade that renames them - decoding then
+        # silently falls back to the (slower) constructor
+        assert set(network_codec._NETWORK_ATTRIBUTES) <= network_state.keys()
+        assert set(network_codec._FREQUENCY_ATTRIBUTES) <= frequency_state.keys()
+        assert network_codec._fast_path_available()
+    
+    def test_layout_mismatch_uses_constructor(self, sample_network, monkeypatch):
+        """Test an unexpected attribute layout disables the fast path and decoding still works."""
+        monkeypatch.setattr(network_codec, "_NETWORK_ATTRIBUTES", ("_renamed_s",))
+        network_codec._fast_path_available.cache_clear()
+        try:
+            assert not network_codec._fast_path_available()
+            decoded = network_codec.decode_network(network_codec.encode_network(sample_network))
+        finally:
+            network_codec._fast_path_available.cache_clear()
+        
+        assert decoded == sample_network
+        np.testing.assert_array_equal(decoded.f, sample_network.f)
+    
+    def test_decode_arrays_is_zero_copy(self, sample_network):
+        """Test decoded arrays are views of the blob, not copies."""
+        blob = network_codec.encode_network(sample_network)
+        decoded = network_codec.decode_arrays(blob)
+        
+        assert decoded.s.shape == sample_network.s.shape
+        assert decoded.s.base is not None
+        assert not decoded.s.flags.writeable  # Read-only view of the bytes
+        assert not decoded.frequency_hz.flags.owndata
+    
+    def test_single_precision_is_smaller(self, sample_network):
+        """Test complex64 mode halves the S-matrix and stays close."""
+        double_blob = network_codec.encode_network(sample_network, precision="double")
+        single_blob = network_codec.encode_network(sample_network, precision="single")
+        
+        s_bytes = sample_network.s.size * 16
+        assert len(double_blob) - len(single_blob) == s_bytes // 2
+        
+        decoded = network_codec.decode_network(single_blob)
+        np.testing.assert_allclose(decoded.s, sample_network.s, rtol=1e-6, atol=1e-9)
+    
+    def test_smaller_than_pickle(self, sample_network):
+        """Test codec blobs are smaller than pickled Network objects."""
+        blob = network_codec.encode_network(sample_network)
+        assert len(blob) < len(pickle.dumps(sample_network))
+    
+    def test_per_point_z0_preserved(self, sample_network):
+        """Test non-uniform reference impedance survives a round trip."""
+        network = sample_network.copy()
+        z0 = np.full(network.z0.shape, 50.0, dtype=complex)
+        z0[:, 1] = 75.0
+        network.z0 = z0
+        
+        decoded = network_codec.decode_network(network_codec.encode_network(network))
+        np.testing.assert_array_equal(decoded.z0, z0)
+    
+    def test_unknown_precision(self, sample_network):
+        """Test unknown precision mode raises error."""
+        with pytest.raises(FileLoadError, match="Unknown storage precision"):
+            network_codec.encode_network(sample_network, precision="half")
+    
+    def test_truncated_blob(self, sample_network):
+        """Test truncated blob raises error instead of returning garbage."""
+        blob = network_codec.encode_network(sample_network)
+        with pytest.raises(FileLoadError, match="Truncated"):
+            network_codec.decode_arrays(blob[:-10])
+    
+    def test_newer_version_rejected(self, sample_network):
+        """Test blobs from a newer format version are rejected."""
+        blob = bytearray(network_codec.encode_network(sample_network))
+        blob[4] = network_codec.FORMAT_VERSION + 1
+        with pytest.raises(FileLoadError, match="newer than supported"):
+            network_codec.decode_arrays(bytes(blob))
+    
+    def test_loader_reads_legacy_pickle(self, sample_network):
+        """Test the loader still reads pickled blobs from older databases."""
+        loader = TouchstoneLoader()
+        legacy = pickle.dumps(sample_network)
+        
+        assert loader.is_legacy_blob(legacy)
+        restored = loader.deserialize_network(legacy)
+        np.testing.assert_array_equal(restored.s, sample_network.s)
@@ -130,3 +130,237 @@ class TestSParameterCalculator:
         assert "S21" in s_params
         assert "S31" in s_params
         assert "S41" in s_params  # 4-port file should have S41
+    
+    def test_calculate_band_metrics_matches_per_parameter(self, calculator, sample_network):
+        """Test vectorized band metrics match the per-S-parameter helpers."""
+        band = calculator.calculate_band_metrics(sample_network, 1.0, 2.0)
+        
+        n_ports = sample_network.nports
+        assert band["gain_min"].shape == (n_ports, n_ports)
+        assert band["vswr_max"].shape == (n_ports,)
+        
+        for out_port in range(1, n_ports + 1):
+            for in_port in range(1, n_ports + 1):
+                s_param = f"S{out_port}{in_port}"
+                min_gain, max_gain = calculator.calculate_gain_range(
+                    sample_network, 1.0, 2.0, s_param
+                )
+                assert band["gain_min"][out_port - 1, in_port - 1] == pytest.approx(min_gain)
+                assert band["gain_max"][out_port - 1, in_port - 1] == pytest.approx(max_gain)
+                assert band["flatness"][out_port - 1, in_port - 1] == pytest.approx(max_gain - min_gain)
+        
+        for port in range(1, n_ports + 1):
+            vswr = calculator.calculate_vswr(sample_network, port=port, freq_min=1.0, freq_max=2.0)
+            assert band["vswr_max"][port - 1] == pytest.approx(vswr)
+    
+    def test_calculate_band_metrics_extreme_frequencies(self, calculator, sample_network):
+        """Test the frequency of each extreme is where the extreme occurs."""
+        import numpy as np
+        from skrf.mathFunctions import complex_2_db
+        band = calculator.calculate_band_metrics(sample_network, 1.0, 2.0)
+        f_band, s_band = calculator.band_limit_arrays(sample_network.f, sample_network.s, 1.0, 2.0)
+        s_db = complex_2_db(s_band)
+        f_ghz = f_band / 1e9
+        
+        assert band["gain_min_freq"].shape == (sample_network.nports, sample_network.nports)
+        assert band["vswr_max_freq"].shape == (sample_network.nports,)
+        # S31: the dB value at the reported frequency is the extreme
+        idx_min = int(np.flatnonzero(f_ghz == band["gain_min_freq"][2, 0])[0])
+        idx_max = int(np.flatnonzero(f_ghz == band["gain_max_freq"][2, 0])[0])
+        assert s_db[idx_min, 2, 0] == band["gain_min"][2, 0]
+        assert s_db[idx_max, 2, 0] == band["gain_max"][2, 0]
+        assert all(1.0 <= f <= 2.0 for f in band["vswr_max_freq"])
+    
+    def test_band_plans_are_reused(self, loader, sample_network):
+        """Test repeated band-limiting of one grid is planned once per band."""
+        from src.core.rf_data.band_plan import BandPlanCache
+        calculator = SParameterCalculator(band_plans=BandPlanCache())
+        
+        for _ in range(3):
+            calculator.calculate_band_metrics(sample_network, 1.0, 2.0)
+            calculator.filter_frequency_range(sample_network, 1.0, 2.0)
+        
+        stats = calculator.band_plan_stats()
+        assert (stats.misses, stats.hits) == (1, 8)
+    
+    @pytest.fixture
+    def campaign(self, loader):
+        """Load every SIT file plus one network on a coarser grid."""
+        networks = [loader.load_file(path) for path in sorted(Path("tests/data").glob("*.s4p"))]
+        return networks + [networks[0][::2]]
+    
+    def test_stack_networks_groups_by_grid(self, calculator, campaign):
+        """Test networks are stacked per frequency grid, in input order."""
+        stacks = calculator.stack_networks(campaign)
+        
+        assert [stack.indices for stack in stacks] == [list(range(len(campaign) - 1)), [len(campaign) - 1]]
+        assert stacks[0].s.shape == (len(campaign) - 1, 600, 4, 4)
+        np.testing.assert_array_equal(stacks[1].frequency_hz, campaign[-1].f)
+        np.testing.assert_array_equal(stacks[0].s[2], campaign[2].s)
+    
+    @pytest.mark.parametrize("freq_min,freq_max", [(1.0, 2.0), (3.0, 5.0), (0.0, 100.0)])
+    def test_band_metrics_batch_matches_single(self, calculator, campaign, freq_min, freq_max):
+        """Test batch metrics equal calculate_band_metrics of every network exactly."""
+        for stack in calculator.stack_networks(campaign):
+            batch = calculator.calculate_band_metrics_batch(stack, freq_min, freq_max)
+            for row, index in enumerate(stack.indices):
+                single = calculator.calculate_band_metrics(campaign[index], freq_min, freq_max)
+                assert batch.keys() == single.keys()
+                for key in single:
+                    np.testing.assert_array_equal(batch[key][row], single[key])
+    
+    def test_return_loss_and_oob_rejection_batch(self, calculator, campaign):
+        """Test the derived batch metrics equal the per-S-parameter helpers."""
+        stack = calculator.stack_networks(campaign)[0]
+        in_band = calculator.calculate_band_metrics_batch(stack, 1.0, 2.0)
+        oob = calculator.calculate_band_metrics_batch(stack, 3.0, 5.0)
+        return_loss = calculator.calculate_return_loss_batch(in_band)
+        rejection = calculator.calculate_oob_rejection_batch(in_band, oob)
+        
+        assert return_loss.shape == (len(stack.indices), 4)
+        for row, index in enumerate(stack.indices):
+            network = campaign[index]
+            for port in (1, 4):
+                assert return_loss[row, port - 1] == pytest.approx(
+                    calculator.calculate_return_loss(network, port=port, freq_min=1.0, freq_max=2.0)
+                )
+            assert rejection[row, 2, 0] == pytest.approx(
+                calculator.calculate_oob_rejection(network, 3.0, 5.0, 1.0, 2.0, "S31")
+            )
+    
+    def test_band_metrics_batch_empty_band(self, calculator, campaign):
+        """Test a stack whose band has no points gives empty metrics."""
+        stack = calculator.stack_networks(campaign[:1])[0]
+        stack.frequency_hz = stack.frequency_hz[:0]
+        stack.s = stack.s[:, :0]
+        
+        assert calculator.calculate_band_metrics_batch(stack, 1.0, 2.0) == {}
+    
+    OOB_BANDS = [(0.5, 0.9), (2.2, 2.55), (3.0, 5.0), (5.5, 6.0), (1.5, 1.5), (0.0, 100.0)]
+    
+    def test_multi_band_metrics_match_single(self, calculator, campaign):
+        """Test the one-pass metrics equal calculate_band_metrics of every band exactly."""
+        bands = [(1.0, 2.0), *self.OOB_BANDS]
+        multi = calculator.calculate_multi_band_metrics(campaign[0], bands)
+        stack = calculator.stack_networks(campaign)[0]
+        multi_batch = calculator.calculate_multi_band_metrics_batch(stack, bands)
+        
+        assert list(multi) == bands
+        for band in bands:
+            single = calculator.calculate_band_metrics(campaign[0], *band)
+            batch = calculator.calculate_band_metrics_batch(stack, *band)
+            assert multi[band].keys() == single.keys() == multi_batch[band].keys()
+            for key in single:
+                np.testing.assert_array_equal(multi[band][key], single[key])
+                np.testing.assert_array_equal(multi_batch[band][key], batch[key])
+    
+    def test_oob_rejections_match_per_parameter(self, calculator, sample_network):
+        """Test every OOB band's worst case equals calculate_oob_rejection and its frequency."""
+        rejections = calculator.calculate_oob_rejections(sample_network, self.OOB_BANDS, 1.0, 2.0)
+        
+        assert list(rejections) == self.OOB_BANDS
+        for band in self.OOB_BANDS:
+            rejection = rejections[band]["rejection"][2, 0]
+            assert rejection == pytest.approx(
+                calculator.calculate_oob_rejection(sample_network, *band, 1.0, 2.0, "S31")
+            )
+            # The worst case is at the OOB gain peak
+            freq = rejections[band]["rejection_freq"][2, 0]
+            oob_gain = calculator.calculate_band_metrics(sample_network, freq, freq)["gain_max"][2, 0]
+            in_band_min = calculator.calculate_lowest_in_band_gain(sample_network, 1.0, 2.0, "S31")
+            assert in_band_min - oob_gain == pytest.approx(rejection)
+            assert band[0] <= freq <= band[1] or band == (0.0, 100.0)
+    
+    def test_margins_match_band_extremes(self, calculator, sample_network):
+        """Test the worst-case margin equals the band metric extremes, for every port pair."""
+        from src.core.rf_data.s_parameter_calculator import MarginLimit
+        samples = calculator.calculate_band_samples(sample_network, [(1.05, 1.95)])[(1.05, 1.95)]
+        metrics = calculator.calculate_band_metrics(sample_network, 1.05, 1.95)
+        
+        gain = calculator.calculate_margins(samples, MarginLimit("gain", lower=-20.0, upper=10.0))
+        assert gain["margin"].shape == samples.s_db.shape
+        np.testing.assert_array_equal(
+            gain["margin_min"],
+            np.minimum(metrics["gain_min"] - (-20.0), 10.0 - metrics["gain_max"])
+        )
+        assert np.all((gain["margin_min_freq"] >= 1.05) & (gain["margin_min_freq"] <= 1.95))
+        
+        vswr = calculator.calculate_margins(samples, MarginLimit("vswr", upper=2.0))
+        np.testing.assert_array_equal(vswr["margin_min"], 2.0 - metrics["vswr_max"])
+        np.testing.assert_array_equal(vswr["margin_min_freq"], metrics["vswr_max_freq"])
+        
+        # Metrics reduced from the same samples are the band metrics
+        reduced = calculator.reduce_band_samples(samples)
+        for key in metrics:
+            np.testing.assert_array_equal(reduced[key], metrics[key])
+    
+    def test_margin_guard_band_percent(self, calculator, sample_network):
+        """Test the guard-band share counts points closer to the limit than the guard band."""
+        from src.core.rf_data.s_parameter_calculator import MarginLimit
+        samples = calculator.calculate_band_samples(sample_network, [(1.0, 2.0)])[(1.0, 2.0)]
+        gain_s31 = calculator.calculate_gain(calculator.filter_frequency_range(sample_network, 1.0, 2.0), "S31")
+        upper = float(np.median(gain_s31))
+        
+        margins = calculator.calculate_margins(samples, MarginLimit("gain", upper=upper, guard_band=0.5))
+        expected = 100.0 * np.mean(upper - gain_s31 < 0.5)
+        assert margins["guard_band_percent"][2, 0] == pytest.approx(expected)
+        assert margins["margin_min"][2, 0] < 0  # Half the band is above the median
+    
+    def test_margins_invalid_and_empty(self, calculator, sample_network):
+        """Test limits without a bound or quantity are rejected and empty bands give nothing."""
+        from src.core.rf_data.s_parameter_calculator import MarginLimit
+        samples = calculator.calculate_band_samples(sample_network, [(1.0, 2.0)])[(1.0, 2.0)]
+        with pytest.raises(ValueError):
+            calculator.calculate_margins(samples, MarginLimit("gain"))
+        with pytest.raises(ValueError):
+            calculator.calculate_margins(samples, MarginLimit("phase", upper=1.0))
+        
+        empty = calculator.calculate_band_samples(sample_network[:0], [(1.0, 2.0)])[(1.0, 2.0)]
+        assert calculator.calculate_margins(empty, MarginLimit("vswr", upper=2.0)) == {}
+    
+    def test_band_samples_batch_rows(self, calculator, campaign):
+        """Test stacked samples give each network's own samples."""
+        stack = calculator.stack_networks(campaign)[0]
+        batch = calculator.calculate_band_samples_batch(stack, [(1.0, 2.0)])[(1.0, 2.0)]
+        single = calculator.calculate_band_samples(campaign[3], [(1.0, 2.0)])[(1.0, 2.0)]
+        
+        row = batch.row(stack.indices.index(3))
+        np.testing.assert_array_equal(row.s_db, single.s_db)
+        np.testing.assert_array_equal(row.vswr, single.vswr)
+    
+    def test_oob_rejections_empty_network(self, calculator, sample_network):
+        """Test a network without frequency points gives no rejections."""
+        assert calculator.calculate_oob_rejections(sample_network[:0], self.OOB_BANDS, 1.0, 2.0) == {}
+    
+    @pytest.mark.parametrize("freq_min,freq_max", [
+        (1.0, 2.0),      # Both edges between samples (typical)
+        (2.0, 1.0),      # Reversed range
+        (0.0, 100.0),    # Wider than the sweep (clamped)
+        (1.5, 1.5),      # Collapsed band
+    ])
+    def test_filter_frequency_range_matches_skrf_interpolate(
+        self, calculator, sample_network, freq_min, freq_max
+    ):
+        """Test the band-edge kernel matches full skrf interpolation."""
+        # Reference: original implementation built on Network.interpolate
+        freq_hz = sample_network.f
+        lo, hi = sorted((freq_min * 1e9, freq_max * 1e9))
+        target_min = np.clip(lo, freq_hz.min(), freq_hz.max())
+        target_max = np.clip(hi, freq_hz.min(), freq_hz.max())
+        interior = freq_hz[(freq_hz >= target_min) & (freq_hz <= target_max)]
+        targets = np.unique(np.sort(np.concatenate([interior, [target_min, target_max]])))
+        expected = sample_network.interpolate(targets)
+        
+        filtered = calculator.filter_frequency_range(sample_network, freq_min, freq_max)
+        
+        np.testing.assert_allclose(filtered.f, expected.f)
+        np.testing.assert_allclose(filtered.s, expected.s, rtol=1e-9, atol=1e-12)
+        np.testing.assert_allclose(filtered.z0, expected.z0)
+    
+    def test_filter_frequency_range_edges_on_grid(self, calculator, sample_network):
+        """Test boundaries that fall exactly on measured points are not duplicated."""
+        f_ghz = sample_network.f / 1e9
+        filtered = calculator.filter_frequency_range(sample_network, f_ghz[10], f_ghz[20])
+        
+        assert len(filtered.f) == 11
+        np.testing.assert_array_equal(filtered.s, sample_network.s[10:21])
@@ -0,0 +1,216 @@
+"""Unit tests for the native vectorized Touchstone parser."""
+
+import shutil
+import tracemalloc
+import pytest
+import numpy as np
+from pathlib import Path
+
+from src.core.rf_data import touchstone_loader
+from src.core.rf_data.touchstone_loader import TouchstoneLoader
+from src.core.rf_data.touchstone_parser import parse_touchstone, parse_touchstone_mapped
+from src.core.exceptions import FileLoadError
+
+skrf = pytest.importorskip("skrf")
+
+
+DATA_DIR = Path("tests/data")
+
+
+class TestTouchstoneParser:
+    """Cross-check parse_touchstone against scikit-rf's reader."""
+
+    def _assert_matches_skrf(self, path):
+        """Parse a file both ways and compare every array."""
+        parsed = parse_touchstone(path)
+        reference = skrf.Network(str(path))
+
+        np.testing.assert_array_equal(parsed.frequency_hz, reference.f)
+        np.testing.assert_allclose(parsed.s, reference.s, rtol=1e-12, atol=1e-15)
+        np.testing.assert_allclose(parsed.z0, reference.z0)
+        assert parsed.frequency_unit == reference.frequency.unit
+        assert parsed.name == reference.name
+
+    def _write(self, tmp_path, n_ports, form, version="1.0", unit="GHz", z0=50.0):
+        """Write a random network with scikit-rf and return the file path."""
+        rng = np.random.default_rng(n_ports)
+        shape = (7, n_ports, n_ports)
+        network = skrf.Network(
+            frequency=skrf.Frequency(1, 4, 7, unit=unit),
+            s=rng.random(shape) * np.exp(1j * rng.uniform(-3, 3, shape)),
+            z0=z0,
+            name="dut",
+        )
+        network.write_touchstone(str(tmp_path / "dut"), form=form, version=version)
+        path = tmp_path / f"dut.s{n_ports}p"
+        if version != "1.0":
+            # Version 2 files are written as .ts
+            shutil.move(tmp_path / "dut.ts", path)
+        return path
+
+    @pytest.mark.parametrize("path", sorted(DATA_DIR.glob("*.s4p")), ids=lambda p: p.name)
+    def test_matches_skrf_on_sit_files(self, path):
+        """Test the 4-port instrument files (dB, Hz, wrapped lines)."""
+        self._assert_matches_skrf(path)
+
+    @pytest.mark.parametrize("n_ports", [1, 2, 3, 4])
+    @pytest.mark.parametrize("form", ["db", "ma", "ri"])
+    def test_matches_skrf_on_all_formats(self, tmp_path, n_ports, form):
+        """Test every data format and port counts with and without wrapping."""
+        self._assert_matches_skrf(self._write(tmp_path, n_ports, form, unit="MHz"))
+
+    @pytest.mark.parametrize("n_ports", [1, 2, 4])
+    def test_matches_skrf_on_version_2(self, tmp_path, n_ports):
+        """Test Touchstone 2.0 keywords, 2-port data order and [Reference]."""
+        z0 = np.arange(1, n_ports + 1) * 25.0
+        self._assert_matches_skrf(self._write(tmp_path, n_ports, "ri", version="2.0", z0=z0))
+
+    def test_unsupported_files_fall_back_to_skrf(self, tmp_path):
+        """Test Z-parameter files are rejected natively but still load."""
+        path = tmp_path / "dut.s1p"
+        path.write_text("# GHz Z RI R 50\n1 50 0\n2 50 0\n")
+
+        with pytest.raises(FileLoadError, match="not supported"):
+            parse_touchstone(path)
+        assert TouchstoneLoader().load_file(path).nports == 1
+
+    def test_two_port_noise_data_falls_back(self, tmp_path):
+        """Test 2-port files with noise parameters are left to scikit-rf."""
+        path = tmp_path / "lna.s2p"
+        path.write_text(
+            "# GHz S MA R 50\n"
+            "1 0.1 0 0.9 0 0.9 0 0.1 0\n"
+            "2 0.1 0 0.9 0 0.9 0 0.1 0\n"
+            "1 1.2 0.5 30 0.3\n"
+        )
+
+        with pytest.raises(FileLoadError):
+            parse_touchstone(path)
+        assert len(TouchstoneLoader().load_file(path).f) == 2
+
+    def test_malformed_data_is_rejected(self, tmp_path):
+        """Test garbled and truncated data raise FileLoadError (natively and via the loader)."""
+        garbled = tmp_path / "a.s1p"
+        garbled.write_text("# GHz S MA R 50\n1 0.5 x\n")
+        truncated = tmp_path / "b.s2p"
+        truncated.write_text("# GHz S MA R 50\n1 0.1 0 0.9 0\n")
+
+        for path in (garbled, truncated):
+            with pytest.raises(FileLoadError):
+                parse_touchstone(path)
+            with pytest.raises(FileLoadError):
+                TouchstoneLoader().load_file(path)
+
+    @pytest.mark.parametrize("ports", ["two", "0"])
+    def test_malformed_keyword_is_rejected(self, tmp_path, ports):
+        """Test a malformed Touchstone 2.0 keyword raises FileLoadError, not ValueError."""
+        path = tmp_path / "dut.s1p"
+        path.write_text(
+            "[Version] 2.0\n# GHz S MA R 50\n"
+            f"[Number of Ports] {ports}\n[Network Data]\n1 0.5 0\n"
+        )
+
+        for parse in (parse_touchstone, parse_touchstone_mapped):
+            with pytest.raises(FileLoadError, match="Number of Ports"):
+                parse(path)
+        with pytest.raises(FileLoadError):
+            TouchstoneLoader().load_file(path)
+
+    def test_loader_uses_native_parser(self):
+        """Test load_file returns the same network with either parser."""
+        path = DATA_DIR / "20250930_S-Par-SIT_Run1_L109908_SN0001_PRI.s4p"
+        native = TouchstoneLoader().load_file(path)
+        reference = TouchstoneLoader(native_parser=False).load_file(path)
+
+        assert native.name == reference.name
+        assert native.frequency.unit == reference.frequency.unit
+        np.testing.assert_array_equal(native.f, reference.f)
+        np.testing.assert_allclose(native.s, reference.s, rtol=1e-12)
+
+
+class TestMappedParser:
+    """Test parse_touchstone_mapped (chunked parsing of large files)."""
+
+    @pytest.fixture
+    def sweep(self, tmp_path):
+        """Write a wide 10-port sweep in dB with wrapped lines and comments."""
+        n_ports, n_points = 10, 1500
+        rng = np.random.default_rng(10)
+        table = np.column_stack([
+            np.linspace(1e9, 40e9, n_points),
+            rng.uniform(-60, 0, (n_points, 2 * n_ports * n_ports)).round(4),
+        ])
+        path = tmp_path / "module.s10p"
+        with open(path, "w") as f:
+            f.write("! Wideband sweep\n# Hz S DB R 50\n")
+            for row in table:
+                f.write(f"{row[0]:.0f}")
+                for start in range(1, row.size, 8):
+                    f.write(" " + " ".join(f"{v:.4f}" for v in row[start:start + 8]) + "\n")
+                f.write("! point done\n")
+        return path
+
+    def _assert_equal(self, parsed, reference):
+        """Compare two DecodedNetworks."""
+        np.testing.assert_array_equal(parsed.frequency_hz, reference.frequency_hz)
+        np.testing.assert_array_equal(parsed.s, reference.s)
+        np.testing.assert_array_equal(parsed.z0, reference.z0)
+        assert (parsed.frequency_unit, parsed.name) == (reference.frequency_unit, reference.name)
+
+    @pytest.mark.parametrize("chunk_size", [1, 777, 1 << 20])
+    def test_matches_in_memory_parse(self, sweep, chunk_size):
+        """Test every chunk size gives the in-memory result (points cut at any line)."""
+        self._assert_equal(parse_touchstone_mapped(sweep, chunk_size), parse_touchstone(sweep))
+
+    @pytest.mark.parametrize("n_ports", [1, 2, 4])
+    def test_matches_on_version_2(self, tmp_path, n_ports):
+        """Test keyword files (2-port data order, [Reference], [End])."""
+        path = TestTouchstoneParser()._write(
+            tmp_path, n_ports, "ri", version="2.0", z0=np.arange(1, n_ports + 1) * 25.0
+        )
+        self._assert_equal(parse_touchstone_mapped(path, 64), parse_touchstone(path))
+
+    def _peak_memory(self, func):
+        """Run func and return (result, peak traced allocation in bytes)."""
+        tracemalloc.start()
+        try:
+            result = func()
+            return result, tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    def test_peak_memory_near_result_size(self, sweep):
+        """Test the peak allocation stays close to the size of the parsed arrays."""
+        parsed, peak = self._peak_memory(lambda: parse_touchstone_mapped(sweep, chunk_size=64 * 1024))
+        _, in_memory_peak = self._peak_memory(lambda: parse_touchstone(sweep))
+
+        result_bytes = parsed.frequency_hz.nbytes + parsed.s.nbytes
+        assert peak < 1.1 * result_bytes + 512 * 1024
+        assert peak < in_memory_peak / 2
+
+    def test_malformed_files_are_rejected(self, tmp_path):
+        """Test empty, truncated and garbled files raise FileLoadError."""
+        empty = tmp_path / "a.s1p"
+        empty.write_bytes(b"")
+        truncated = tmp_path / "b.s2p"
+        truncated.write_text("# GHz S MA R 50\n1 0.1 0 0.9 0 0.9 0 0.1 0\n2 0.1 0 0.9 0\n")
+        garbled = tmp_path / "c.s1p"
+        garbled.write_text("# GHz S MA R 50\n1 0.5 x\n")
+
+        for path in (empty, truncated, garbled):
+            with pytest.raises(FileLoadError):
+                parse_touchstone_mapped(path, 16)
+
+    def test_loader_maps_large_files(self, sweep, monkeypatch):
+        """Test load_file uses the mapped parser from the size threshold on."""
+        calls = []
+        monkeypatch.setattr(
+            touchstone_loader, "parse_touchstone_mapped",
+            lambda path: calls.append(path) or parse_touchstone_mapped(path)
+        )
+
+        TouchstoneLoader(memory_map_threshold=None).load_file(sweep)
+        assert calls == []
+        network = TouchstoneLoader(memory_map_threshold=sweep.stat().st_size).load_file(sweep)
+        assert calls == [sweep]
+        assert network.nports == 10
@@ -0,0 +1,126 @@
+"""Unit tests for header-only Touchstone scanning."""
+
+import pytest
+from dataclasses import replace
+from pathlib import Path
+
+from src.core.rf_data.touchstone_loader import TouchstoneLoader
+from src.core.rf_data.touchstone_scan import (
+    check_port_count, header_from_network, port_count_from_extension, scan_touchstone
+)
+from src.core.rf_data import network_codec
+from src.core.exceptions import FileLoadError
+
+
+SAMPLE_FILE = Path("tests/data/20250930_S-Par-SIT_Run1_L109908_SN0001_PRI.s4p")
+
+
+class TestTouchstoneScan:
+    """Test scan_touchstone against full scikit-rf loads."""
+
+    @pytest.fixture
+    def loader(self):
+        """Provide a loader (skips without scikit-rf)."""
+        try:
+            return TouchstoneLoader()
+        except FileLoadError:
+            pytest.skip("scikit-rf not installed")
+
+    def _write(self, tmp_path, name, text):
+        """Write a Touchstone file and return its path."""
+        path = tmp_path / name
+        path.write_text(text)
+        return path
+
+    def test_matches_full_load(self, loader):
+        """Test the scanned facts equal those of the loaded Network."""
+        network = loader.load_file(SAMPLE_FILE)
+        header = loader.scan_file(SAMPLE_FILE)
+
+        assert header.n_ports == network.nports
+        assert header.n_points == len(network.f)
+        assert header.freq_start_hz == network.f[0]
+        assert header.freq_stop_hz == network.f[-1]
+        assert (header.frequency_unit, header.parameter, header.data_format, header.z0) == (
+            "Hz", "S", "DB", 50.0
+        )
+        assert replace(header_from_network(network), data_format="DB") == header
+
+    def test_codec_header_matches_scan(self, loader):
+        """Test read_header of a stored blob gives the same facts."""
+        network = loader.load_file(SAMPLE_FILE)
+        scanned = loader.scan_file(SAMPLE_FILE)
+        stored = network_codec.read_header(loader.serialize_network(network))
+
+        assert (stored.n_ports, stored.n_points) == (scanned.n_ports, scanned.n_points)
+        assert (stored.freq_start_hz, stored.freq_stop_hz) == (
+            scanned.freq_start_hz, scanned.freq_stop_hz
+        )
+        assert stored.data_format is None
+
+    def test_option_defaults_and_units(self, tmp_path):
+        """Test a file without option line uses GHz and wrapped points count once."""
+        path = self._write(tmp_path, "dut.s2p", (
+            "! comment line\n"
+            "1.0 0.1 0 0.9 0 0.9 0\n"   # A 2-port point may wrap lines
+            "    0.1 0\n"
+            "2.5 0.1 0 0.9 0 0.9 0 0.1 0 ! trailing comment\n"
+        ))
+        header = scan_touchstone(path)
+
+        assert (header.n_ports, header.n_points) == (2, 2)
+        assert (header.freq_start_ghz, header.freq_stop_ghz) == (1.0, 2.5)
+        assert (header.parameter, header.data_format, header.z0) == ("S", "MA", 50.0)
+
+    def test_two_port_noise_data_is_ignored(self, tmp_path):
+        """Test Touchstone 1.x noise parameters after the network data."""
+        path = self._write(tmp_path, "lna.s2p", (
+            "# MHz S RI R 75\n"
+            "100 0.1 0 0.9 0 0.9 0 0.1 0\n"
+            "200 0.1 0 0.9 0 0.9 0 0.1 0\n"
+            "100 1.2 0.5 30 0.3\n"
+        ))
+        header = scan_touchstone(path)
+
+        assert header.n_points == 2
+        assert header.freq_stop_hz == 200e6
+        assert (header.data_format, header.z0) == ("RI", 75.0)
+
+    def test_touchstone_2_keywords(self, tmp_path):
+        """Test [Number of Ports] and [End] keywords of version 2 files."""
+        path = self._write(tmp_path, "dut.s1p", (
+            "[Version] 2.0\n"
+            "# GHz S MA R 50\n"
+            "[Number of Ports] 1\n"
+            "[Network Data]\n"
+            "1 0.5 10\n"
+            "2 0.5 20\n"
+            "[End]\n"
+        ))
+        assert scan_touchstone(path).n_points == 2
+
+    def test_malformed_files_are_rejected(self, tmp_path):
+        """Test truncated, empty and garbled data raise FileLoadError."""
+        truncated = self._write(tmp_path, "a.s2p", "# GHz S MA R 50\n1 0.1 0 0.9 0\n")
+        empty = self._write(tmp_path, "b.s2p", "# GHz S MA R 50\n! nothing\n")
+        garbled = self._write(tmp_path, "c.s1p", "# GHz S MA R 50\nfreq 1 2\n")
+        too_many = self._write(tmp_path, "d.s1p", "# GHz S MA R 50\n1 0.5 10 99\n")
+
+        for path in (truncated, empty, garbled, too_many):
+            with pytest.raises(FileLoadError):
+                scan_touchstone(path)
+        with pytest.raises(FileLoadError, match="not found"):
+            TouchstoneLoader().scan_file(tmp_path / "missing.s2p")
+
+    def test_port_count_from_extension(self):
+        """Test the port count is read from the extension."""
+        assert port_count_from_extension("a.s2p") == 2
+        assert port_count_from_extension(Path("dir/b.S10P")) == 10
+        with pytest.raises(FileLoadError):
+            port_count_from_extension("c.txt")
+
+    def test_check_port_count(self):
+        """Test files with fewer ports than the device uses are rejected."""
+        assert check_port_count("dut.s4p", 4) == 4
+        with pytest.raises(FileLoadError, match="has 2 ports"):
+            check_port_count("dut.s2p", 4)
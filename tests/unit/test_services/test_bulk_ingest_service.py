@@ -0,0 +1,167 @@
+"""Unit tests for BulkIngestService."""
+
+import shutil
+import pytest
+from pathlib import Path
+
+from src.core.services.bulk_ingest_service import BulkIngestService
+from src.core.repositories.measurement_repository import MeasurementRepository
+from src.core.exceptions import DeviceNotFoundError
+
+
+DATA_DIR = Path("tests/data")
+
+
+class TestBulkIngestService:
+    """Test directory ingest, set grouping and per-file error collection."""
+
+    @pytest.fixture
+    def measurement_repository(self, db_connection):
+        """Provide MeasurementRepository on the shared in-memory database."""
+        return MeasurementRepository(db_connection)
+
+    @pytest.fixture
+    def device(self, device_repository, sample_device):
+        """Provide a saved standard-mode device matching the test files."""
+        sample_device.part_number = "L109908"
+        return device_repository.create(sample_device)
+
+    @pytest.fixture
+    def campaign_dir(self, tmp_path):
+        """
+        Build a campaign tree: 3 temperatures x PRI/RED for SN0001 (nested
+        folders), an orphan PRI file for SN0002 and two bad files.
+        """
+        for source in sorted(DATA_DIR.glob("*.s4p")):
+            temperature = "AMB"
+            for temp in ("HOT", "COLD"):
+                if f"_{temp}" in source.name:
+                    temperature = temp
+            target = tmp_path / temperature / source.name
+            target.parent.mkdir(exist_ok=True)
+            shutil.copy(source, target)
+
+        orphan = tmp_path / "20250930_S-Par-SIT_Run1_L109908_SN0002_PRI.s4p"
+        shutil.copy(DATA_DIR / "20250930_S-Par-SIT_Run1_L109908_SN0001_PRI.s4p", orphan)
+        # Unparseable filename (no serial number) and corrupt Touchstone data
+        shutil.copy(orphan, tmp_path / "no_metadata_here.s4p")
+        (tmp_path / "20250930_S-Par-SIT_Run2_L109908_SN0003_RED.s4p").write_text("garbage")
+        # Non-Touchstone files are ignored
+        (tmp_path / "notes.txt").write_text("ignore me")
+        return tmp_path
+
+    def test_find_touchstone_files(self, measurement_repository, device_repository, campaign_dir):
+        """Test only Touchstone files are discovered, recursively."""
+        service = BulkIngestService(measurement_repository, device_repository)
+        files = service.find_touchstone_files(campaign_dir)
+
+        assert len(files) == 9
+        assert all(f.suffix == ".s4p" for f in files)
+
+    def test_ingest_directory_in_process(self, measurement_repository, device_repository, device, campaign_dir):
+        """Test ingest groups sets, saves measurements and collects errors."""
+        service = BulkIngestService(
+            measurement_repository, device_repository, max_workers=1, batch_size=2
+        )
+        progress = []
+        report = service.ingest_directory(
+            campaign_dir, device, "SIT",
+            progress_callback=lambda done, total: progress.append((done, total))
+        )
+
+        assert report.files_found == 9
+        assert report.complete_sets == 3
+        assert report.incomplete_sets == {("SN0002", "AMB", "Run1"): ["RED"]}
+        assert report.measurements_saved == 7
+        assert report.failed == 2
+        assert {Path(e.file_path).name for e in report.errors} == {
+            "no_metadata_here.s4p",
+            "20250930_S-Par-SIT_Run2_L109908_SN0003_RED.s4p",
+        }
+        assert progress[-1] == (9, 9)
+
+        # Temperatures come from the filename, RF data is stored and loadable
+        saved = measurement_repository.get_by_device(device.id)
+        assert len(saved) == 7
+        sn0001 = {(m.temperature, m.path_type) for m in saved if m.serial_number == "SN0001"}
+        assert sn0001 == {(t, p) for t in ("AMB", "HOT", "COLD") for p in ("PRI", "RED")}
+        assert saved[0].touchstone_data.nports == 4
+
+    def test_ingest_directory_process_pool(self, measurement_repository, device_repository, device, campaign_dir):
+        """Test the process pool produces the same result as in-process parsing."""
+        service = BulkIngestService(measurement_repository, device_repository, max_workers=2)
+        report = service.ingest_directory(campaign_dir, device, "SIT")
+
+        assert report.complete_sets == 3
+        assert report.measurements_saved == 7
+        assert report.failed == 2
+
+    def test_duplicate_and_wrong_mode_files_are_errors(
+        self, measurement_repository, device_repository, device, tmp_path
+    ):
+        """Test duplicates within a set and HG/LG files on a standard device are rejected."""
+        source = DATA_DIR / "20250930_S-Par-SIT_Run1_L109908_SN0001_PRI.s4p"
+        (tmp_path / "a").mkdir()
+        shutil.copy(source, tmp_path / source.name)
+        shutil.copy(source, tmp_path / "a" / source.name)
+        shutil.copy(source, tmp_path / "20250930_S-Par-SIT_Run1_L109908_SN0001_PRI_HG.s4p")
+
+        service = BulkIngestService(measurement_repository, device_repository, max_workers=1)
+        report = service.ingest_directory(tmp_path, device, "SIT")
+
+        assert report.measurements_saved == 1
+        messages = sorted(e.message for e in report.errors)
+        assert len(messages) == 2
+        assert messages[0].startswith("Duplicate PRI file")
+        assert messages[1].startswith("Path type PRI_HG does not match device mode")
+
+    def test_part_number_mismatch_warns(
+        self, measurement_repository, device_repository, sample_device, tmp_path
+    ):
+        """Test part number mismatch is a warning, not an error."""
+        device = device_repository.create(sample_device)  # Part number L123456
+        shutil.copy(DATA_DIR / "20250930_S-Par-SIT_Run1_L109908_SN0001_PRI.s4p", tmp_path)
+
+        service = BulkIngestService(measurement_repository, device_repository, max_workers=1)
+        report = service.ingest_directory(tmp_path, device, "SIT")
+
+        assert report.measurements_saved == 1
+        assert len(report.warnings) == 1
+        assert "L109908" in report.warnings[0]
+
+    def test_unknown_device_raises(self, measurement_repository, device_repository, sample_device, tmp_path):
+        """Test ingest requires the device to exist."""
+        service = BulkIngestService(measurement_repository, device_repository, max_workers=1)
+        with pytest.raises(DeviceNotFoundError):
+            service.ingest_directory(tmp_path, sample_device, "SIT")
+
+    def test_reingest_reuses_stored_data(
+        self, measurement_repository, device_repository, device, db_connection, campaign_dir
+    ):
+        """Test re-ingesting identical files stores no new RF data."""
+        service = BulkIngestService(measurement_repository, device_repository, max_workers=1)
+        service.ingest_directory(campaign_dir, device, "SIT")
+        blobs_before = db_connection.execute("SELECT COUNT(*) FROM touchstone_blobs").fetchone()[0]
+
+        report = service.ingest_directory(campaign_dir, device, "Test-Campaign")
+
+        assert report.measurements_saved == 7
+        assert db_connection.execute("SELECT COUNT(*) FROM touchstone_blobs").fetchone()[0] == blobs_before
+        stored = measurement_repository.get_by_device_and_test_stage(
+            device.id, "S-Parameters", "Test-Campaign"
+        )
+        assert stored[0].touchstone_data.nports == 4
+        # Header facts of known files come from a header scan
+        assert {m.n_points for m in stored} == {600}
+
+    def test_files_with_too_few_ports_are_errors(
+        self, measurement_repository, device_repository, device, tmp_path
+    ):
+        """Test files with fewer ports than the device uses are rejected unread."""
+        (tmp_path / "20250930_S-Par-SIT_Run1_L109908_SN0001_PRI.s2p").write_text("not parsed")
+
+        service = BulkIngestService(measurement_repository, device_repository, max_workers=1)
+        report = service.ingest_directory(tmp_path, device, "SIT")
+
+        assert report.measurements_saved == 0
+        assert "has 2 ports" in report.errors[0].message
@@ -9,7 +9,7 @@ from src.core.services.compliance_service import ComplianceService
 from src.core.models.device import Device
 from src.core.models.measurement import Measurement
 from src.core.models.test_criteria import TestCriteria
-from src.core.models.test_result import TestResult
+from src.core.models.test_result import TestResult, ResultSummary
 from src.core.test_types.registry import TestTypeRegistry
 from src.core.exceptions import DeviceNotFoundError
 
@@ -187,12 +187,35 @@ class TestComplianceService:
                 s_parameter="S21"
             )
         ]
-        result_repo.create.return_value = results[0]
+        result_repo.upsert_by_key.return_value = 1
         
         saved = service.save_test_results(results)
         
         assert len(saved) == 1
-        result_repo.create.assert_called_once()
+        # Batched: one repository call (one transaction) for all results,
+        # updating existing results by key instead of inserting duplicates
+        result_repo.upsert_by_key.assert_called_once_with(results)
+        result_repo.create.assert_not_called()
+        result_repo.create_many.assert_not_called()
+    
+    def test_replace_stage_results(self, service, result_repo):
+        """Test a stage re-evaluation is replaced with one repository call."""
+        evaluated_id, empty_id = uuid4(), uuid4()
+        result = TestResult(
+            measurement_id=evaluated_id,
+            test_criteria_id=uuid4(),
+            measured_value=29.5,
+            passed=True,
+            s_parameter="S31"
+        )
+        
+        saved = service.replace_stage_results({evaluated_id: [result], empty_id: []}, "SIT")
+        
+        assert saved == {evaluated_id: [result], empty_id: []}
+        # Measurements without results are included - their stage results are dropped
+        result_repo.replace_stage_results.assert_called_once_with(
+            [evaluated_id, empty_id], "SIT", [result]
+        )
     
     def test_get_overall_pass_status_all_pass(self, service, result_repo):
         """Test overall pass status when all results pass."""
@@ -213,7 +236,12 @@ class TestComplianceService:
                 s_parameter="S11"
             )
         ]
-        result_repo.get_by_measurement_id.return_value = results
+        # Aggregated in SQL - the repository returns counts, not results
+        result_repo.get_summaries.return_value = [ResultSummary(
+            measurement_id=measurement_id,
+            total=len(results),
+            passed=sum(r.passed for r in results)
+        )]
         
         status = service.get_overall_pass_status(measurement_id)
         
@@ -238,12 +266,35 @@ class TestComplianceService:
                 s_parameter="S11"
             )
         ]
-        result_repo.get_by_measurement_id.return_value = results
+        # Aggregated in SQL - the repository returns counts, not results
+        result_repo.get_summaries.return_value = [ResultSummary(
+            measurement_id=measurement_id,
+            total=len(results),
+            passed=sum(r.passed for r in results)
+        )]
         
         status = service.get_overall_pass_status(measurement_id)
         
         assert status is False
     
+    def test_pass_status_for_many_measurements(self, service, result_repo):
+        """Test statuses of many measurements come from one aggregate query."""
+        passing, failing, without_results = uuid4(), uuid4(), uuid4()
+        result_repo.get_summaries.return_value = [
+            ResultSummary(measurement_id=passing, total=8, passed=8),
+            ResultSummary(measurement_id=failing, total=8, passed=7),
+        ]
+        
+        statuses = service.get_overall_pass_status_for_all_measurements(
+            [passing, failing, without_results]
+        )
+        
+        assert statuses == {passing: True, failing: False, without_results: True}
+        result_repo.get_summaries.assert_called_once_with(
+            measurement_ids=[passing, failing, without_results]
+        )
+        result_repo.get_by_measurement_id.assert_not_called()
+    
     def test_mark_results_stale_for_criteria(self, service, result_repo):
         """Test marking results as stale."""
         criteria_id = uuid4()
@@ -254,3 +305,260 @@ class TestComplianceService:
         assert count == 5
         result_repo.mark_as_stale_by_criteria.assert_called_once_with(criteria_id)
 
+    
+    def test_get_compliance_results_uses_joined_query(self, service, result_repo, criteria_repo, sample_criteria):
+        """Test stage filtering happens in the joined query, not per result."""
+        result = TestResult(
+            measurement_id=uuid4(),
+            test_criteria_id=sample_criteria[0].id,
+            measured_value=29.5,
+            passed=True,
+            s_parameter="S31"
+        )
+        result_repo.get_with_criteria.return_value = [(result, sample_criteria[0])]
+        
+        results = service.get_compliance_results(result.measurement_id, "SIT")
+        
+        assert results == [result]
+        result_repo.get_with_criteria.assert_called_once_with([result.measurement_id], "SIT")
+        criteria_repo.get_by_id.assert_not_called()
+
+    def test_delete_results_for_stage_is_set_based(self, service, result_repo):
+        """Test per-stage deletes go to the repository as one set-based call."""
+        measurement_ids = [uuid4(), uuid4()]
+        result_repo.delete_by_measurements_and_stage.return_value = 12
+
+        assert service.delete_results_for_measurements_and_stage(measurement_ids, "SIT") == 12
+        service.delete_results_for_measurement_and_stage(measurement_ids[0], "SIT")
+
+        result_repo.delete_by_measurements_and_stage.assert_any_call(measurement_ids, "SIT")
+        result_repo.delete_by_measurements_and_stage.assert_called_with([measurement_ids[0]], "SIT")
+        result_repo.get_with_criteria.assert_not_called()
+        result_repo.delete.assert_not_called()
+
+    def test_delete_stale_results_is_set_based(self, service, result_repo):
+        """Test stale results are deleted without loading them."""
+        measurement_id = uuid4()
+        result_repo.delete_stale.return_value = 3
+
+        assert service.delete_stale_results(measurement_id) == 3
+
+        result_repo.delete_stale.assert_called_once_with([measurement_id])
+        result_repo.get_by_measurement_id.assert_not_called()
+        result_repo.delete.assert_not_called()
+
+
+class TestComplianceServiceStoredMetrics:
+    """Test re-evaluation from stored band metrics (real in-memory database)."""
+    
+    @pytest.fixture
+    def repositories(self, db_connection):
+        """Provide real repositories on the shared in-memory database."""
+        from src.core.repositories import (
+            MeasurementRepository, TestCriteriaRepository, TestResultRepository,
+            MeasurementMetricsRepository
+        )
+        return {
+            "measurement": MeasurementRepository(db_connection),
+            "criteria": TestCriteriaRepository(db_connection),
+            "result": TestResultRepository(db_connection),
+            "metrics": MeasurementMetricsRepository(db_connection),
+        }
+    
+    @pytest.fixture
+    def service(self, repositories, device_repository):
+        """Provide ComplianceService with a metrics repository."""
+        return ComplianceService(
+            measurement_repository=repositories["measurement"],
+            criteria_repository=repositories["criteria"],
+            device_repository=device_repository,
+            result_repository=repositories["result"],
+            metrics_repository=repositories["metrics"]
+        )
+    
+    @pytest.fixture
+    def device(self, device_repository, sample_device):
+        """Provide a saved 4-port device."""
+        return device_repository.create(sample_device)
+    
+    @pytest.fixture
+    def measurement(self, repositories, device):
+        """Provide a stored measurement loaded from the SIT test file."""
+        from pathlib import Path
+        from src.core.rf_data.touchstone_loader import TouchstoneLoader
+        network = TouchstoneLoader().load_file(
+            Path("tests/data/20250930_S-Par-SIT_Run1_L109908_SN0001_PRI.s4p")
+        )
+        return repositories["measurement"].create(Measurement(
+            device_id=device.id,
+            serial_number="SN0001",
+            test_type="S-Parameters",
+            test_stage="SIT",
+            temperature="AMB",
+            path_type="PRI",
+            file_path="/path/to/file.s4p",
+            measurement_date=date(2025, 9, 30),
+            touchstone_data=network
+        ))
+    
+    @pytest.fixture
+    def criteria(self, repositories, device):
+        """Provide stored gain range and OOB criteria."""
+        return [
+            repositories["criteria"].create(TestCriteria(
+                device_id=device.id,
+                test_type="S-Parameters",
+                test_stage="SIT",
+                requirement_name="Gain Range",
+                criteria_type="range",
+                min_value=27.5,
+                max_value=31.3,
+                unit="dB"
+            )),
+            repositories["criteria"].create(TestCriteria(
+                device_id=device.id,
+                test_type="S-Parameters",
+                test_stage="SIT",
+                requirement_name="OOB 1",
+                criteria_type="greater_than_equal",
+                min_value=25.0,
+                unit="dBc",
+                frequency_min=3.0,
+                frequency_max=5.0
+            )),
+        ]
+    
+    def test_reevaluation_uses_stored_metrics(self, service, repositories, device, measurement, criteria):
+        """Test a second evaluation reuses stored metrics without loading RF data."""
+        first = service.evaluate_all_measurements(device.id, "S-Parameters", "SIT")
+        from src.core.rf_data.s_parameter_calculator import CALCULATOR_VERSION
+        stored = repositories["metrics"].get_for_measurement(measurement.id, CALCULATOR_VERSION)
+        assert set(stored) == {(0.5, 2.0), (3.0, 5.0)}
+        
+        # Tighten a limit - the new evaluation must not touch the RF data
+        criteria[0].min_value = 29.0
+        repositories["criteria"].update(criteria[0])
+        headers = repositories["measurement"].get_by_device(device.id)
+        second = service.evaluate_all_measurements(device.id, "S-Parameters", "SIT")
+        
+        assert not any(m.touchstone_data.is_loaded for m in headers)
+        for before, after in zip(first[measurement.id], second[measurement.id]):
+            assert after.measured_value == pytest.approx(before.measured_value)
+            assert after.s_parameter == before.s_parameter
+    
+    def test_stored_metrics_match_direct_evaluation(self, service, device, measurement, criteria):
+        """Test results from stored metrics equal a full evaluation of the RF data."""
+        service.evaluate_compliance(measurement, device, "SIT")
+        from_stored = service.evaluate_compliance(measurement, device, "SIT")
+        
+        direct = service.registry.get("S-Parameters").evaluate_compliance(
+            measurement, device, criteria, device.operational_freq_min, device.operational_freq_max
+        )
+        
+        assert len(from_stored) == len(direct)
+        for stored_result, direct_result in zip(from_stored, direct):
+            assert stored_result.measured_value == direct_result.measured_value
+            assert stored_result.passed == direct_result.passed
+            assert stored_result.margin == direct_result.margin
+            assert stored_result.guard_band_percent == direct_result.guard_band_percent
+
+
+    def test_campaign_metrics_are_computed_in_one_batch(
+        self, service, repositories, device, measurement, criteria, monkeypatch
+    ):
+        """Test evaluating many measurements computes their metrics in one batch call."""
+        for temperature in ("HOT", "COLD"):
+            repositories["measurement"].create(measurement.model_copy(update={
+                "id": uuid4(), "temperature": temperature
+            }))
+        test_type = service.registry.get("S-Parameters")
+        batches = []
+        compute = test_type.compute_band_metrics_batch
+        monkeypatch.setattr(test_type, "compute_band_metrics_batch", lambda group, bands, criteria: (
+            batches.append(len(group)) or compute(group, bands, criteria)
+        ))
+        
+        results = service.evaluate_all_measurements(device.id, "S-Parameters", "SIT")
+        
+        assert batches == [3]
+        direct = test_type.evaluate_compliance(
+            measurement, device, criteria, device.operational_freq_min, device.operational_freq_max
+        )
+        assert len(results) == 3
+        for batch_results in results.values():
+            assert [r.measured_value for r in batch_results] == [r.measured_value for r in direct]
+            assert [r.passed for r in batch_results] == [r.passed for r in direct]
+            # Batch-computed samples give the margins of a direct evaluation
+            assert [r.margin for r in batch_results] == pytest.approx([r.margin for r in direct])
+            assert [r.guard_band_percent for r in batch_results] == [r.guard_band_percent for r in direct]
+
+
+class TestComplianceServiceResultQueries:
+    """Test compliance result display queries (real in-memory database)."""
+    
+    @pytest.fixture
+    def service(self, db_connection, device_repository):
+        """Provide ComplianceService on real repositories."""
+        from src.core.repositories import (
+            MeasurementRepository, TestCriteriaRepository, TestResultRepository
+        )
+        return ComplianceService(
+            measurement_repository=MeasurementRepository(db_connection),
+            criteria_repository=TestCriteriaRepository(db_connection),
+            device_repository=device_repository,
+            result_repository=TestResultRepository(db_connection)
+        )
+    
+    @pytest.fixture
+    def stored_results(self, service, device_repository, sample_device):
+        """Store 10 criteria and one result per criterion for 4 measurements."""
+        device = device_repository.create(sample_device)
+        criteria = [
+            service.criteria_repo.create(TestCriteria(
+                device_id=device.id,
+                test_type="S-Parameters",
+                test_stage="SIT",
+                requirement_name=f"Requirement {i}",
+                criteria_type="max",
+                max_value=float(i),
+                unit="dB"
+            ))
+            for i in range(10)
+        ]
+        measurement_ids = [uuid4() for _ in range(4)]
+        service.save_test_results([
+            TestResult(measurement_id=m_id, test_criteria_id=c.id, measured_value=1.0, passed=True)
+            for m_id in measurement_ids
+            for c in criteria
+        ])
+        return measurement_ids, criteria
+    
+    def test_results_with_criteria_single_query(self, service, db_connection, stored_results):
+        """Test a 4-measurement, 10-criterion table is fetched with one SELECT."""
+        measurement_ids, criteria = stored_results
+        
+        statements = []
+        db_connection.set_trace_callback(statements.append)
+        by_measurement = service.get_compliance_results_with_criteria(measurement_ids, "SIT")
+        db_connection.set_trace_callback(None)
+        
+        assert sum(1 for sql in statements if sql.lstrip().upper().startswith("SELECT")) == 1
+        assert set(by_measurement) == set(measurement_ids)
+        for pairs in by_measurement.values():
+            assert sorted(c.requirement_name for _, c in pairs) == sorted(c.requirement_name for c in criteria)
+            assert all(r.test_criteria_id == c.id for r, c in pairs)
+        assert service.get_compliance_results_with_criteria(measurement_ids, "Board-Bring-Up") == {
+            m_id: [] for m_id in measurement_ids
+        }
+    
+    def test_get_criteria_by_ids(self, service, db_connection, stored_results):
+        """Test criteria of in-memory results are fetched with one SELECT."""
+        _, criteria = stored_results
+        
+        statements = []
+        db_connection.set_trace_callback(statements.append)
+        by_id = service.criteria_repo.get_by_ids([c.id for c in criteria] + [uuid4()])
+        db_connection.set_trace_callback(None)
+        
+        assert sum(1 for sql in statements if sql.lstrip().upper().startswith("SELECT")) == 1
+        assert by_id == {c.id: c for c in criteria}
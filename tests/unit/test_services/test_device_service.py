@@ -108,7 +108,7 @@ class TestDeviceService:
                 unit="dB"
             )
         ]
-        measurement_repo.get_by_device.return_value = [Mock()]  # Mock measurement
+        measurement_repo.count_by_device.return_value = 1  # One stored measurement
         
         info = service.get_deletion_info(sample_device.id)
         
@@ -116,6 +116,8 @@ class TestDeviceService:
         assert info["criteria_count"] == 1
         assert info["measurement_count"] == 1
         assert info["has_related_data"] is True
+        # Header-only path: measurements (and their BLOBs) are never loaded
+        measurement_repo.get_by_device.assert_not_called()
     
     def test_get_deletion_info_no_device(self, service, device_repo):
         """Test getting deletion info when device doesn't exist."""
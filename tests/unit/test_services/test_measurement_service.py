@@ -17,8 +17,10 @@ class TestMeasurementService:
     
     @pytest.fixture
     def measurement_repo(self):
-        """Mock measurement repository."""
-        return Mock()
+        """Mock measurement repository (no previously stored files)."""
+        repo = Mock()
+        repo.get_blob_by_content_hash.return_value = None
+        return repo
     
     @pytest.fixture
     def device_repo(self):
@@ -28,7 +30,9 @@ class TestMeasurementService:
     @pytest.fixture
     def touchstone_loader(self):
         """Mock touchstone loader."""
-        return Mock()
+        loader = Mock()
+        loader.hash_file.return_value = "0" * 64
+        return loader
     
     @pytest.fixture
     def filename_parser(self):
@@ -94,6 +98,28 @@ class TestMeasurementService:
         assert measurement.test_stage == "SIT"
         assert warning is None  # Part number matches
     
+    def test_load_measurement_file_reuses_stored_data(self, service, device_repo, measurement_repo, touchstone_loader, filename_parser, sample_device):
+        """Test an already-stored file is not parsed again."""
+        filepath = Path("test_file.s4p")
+        device_repo.get_by_id.return_value = sample_device
+        measurement_repo.get_blob_by_content_hash.return_value = b"MRFN stored"
+        filename_parser.parse.return_value = {
+            "serial_number": "SN0001",
+            "part_number": "L123456",
+            "date": date(2025, 9, 30),
+            "temperature": "AMB",
+            "path_type": "PRI",
+            "file_path": str(filepath),
+        }
+        
+        measurement, warning = service.load_measurement_file(filepath, sample_device, "SIT")
+        
+        touchstone_loader.load_with_metadata.assert_not_called()
+        measurement_repo.get_blob_by_content_hash.assert_called_once_with("0" * 64)
+        assert measurement.touchstone_data == b"MRFN stored"
+        assert measurement.content_hash == "0" * 64
+        assert warning is None
+    
     def test_load_measurement_file_part_number_mismatch(self, service, device_repo, touchstone_loader, filename_parser, sample_device, mock_network):
         """Test loading file with part number mismatch."""
         filepath = Path("test_file.s4p")
@@ -126,6 +152,17 @@ class TestMeasurementService:
         with pytest.raises(DeviceNotFoundError):
             service.load_measurement_file(Path("test.s4p"), sample_device, "SIT")
     
+    def test_load_measurement_file_too_few_ports(self, service, device_repo, touchstone_loader, sample_device):
+        """Test a file with fewer ports than the device uses is rejected unread."""
+        sample_device.output_ports = [3]
+        device_repo.get_by_id.return_value = sample_device
+        
+        with pytest.raises(FileLoadError, match="has 2 ports"):
+            service.load_measurement_file(Path("test_file.s2p"), sample_device, "SIT")
+        
+        touchstone_loader.hash_file.assert_not_called()
+        touchstone_loader.load_with_metadata.assert_not_called()
+    
     def test_load_multiple_files_standard_mode(self, service, device_repo, touchstone_loader, sample_device, mock_network):
         """Test loading 2 files for standard mode."""
         filepaths = [Path("pri.s4p"), Path("red.s4p")]
@@ -246,3 +246,187 @@ class TestSParametersTestType:
             assert result.measured_value is not None
             assert isinstance(result.passed, bool)
             assert result.s_parameter is not None
+    
+    def test_calculate_metrics_matches_per_parameter_calculator(self, test_type, sample_measurement):
+        """Test vectorized metrics equal the per-S-parameter calculator results."""
+        metrics = test_type.calculate_metrics(
+            sample_measurement,
+            operational_freq_min=0.5,
+            operational_freq_max=2.0
+        )
+        network = test_type.loader.deserialize_network(sample_measurement.touchstone_data)
+        calculator = test_type.calculator
+        
+        # 4-port file: 16 gain ranges, 16 flatness, 16 lowest in-band, 4 VSWR
+        assert len(metrics) == 16 * 3 + 4
+        
+        for s_param in ["S21", "S31", "S42", "S11"]:
+            min_gain, max_gain = calculator.calculate_gain_range(network, 0.5, 2.0, s_param)
+            assert metrics[f"{s_param} Gain Range"]["min"] == pytest.approx(min_gain)
+            assert metrics[f"{s_param} Gain Range"]["max"] == pytest.approx(max_gain)
+            assert metrics[f"{s_param} Flatness"] == pytest.approx(
+                calculator.calculate_flatness(network, 0.5, 2.0, s_param)
+            )
+            assert metrics[f"{s_param} Lowest In-Band Gain"] == pytest.approx(min_gain)
+        
+        assert metrics["S33 VSWR"] == pytest.approx(
+            calculator.calculate_vswr(network, port=3, freq_min=0.5, freq_max=2.0)
+        )
+    
+    def test_oob_rejection_matches_calculator(self, test_type, sample_measurement, sample_device, sample_criteria):
+        """Test OOB rejection from band metrics equals the per-S-parameter calculator."""
+        criterion = sample_criteria[3]
+        results = test_type.evaluate_compliance(
+            sample_measurement, sample_device, [criterion],
+            operational_freq_min=0.5, operational_freq_max=2.0
+        )
+        network = test_type.loader.deserialize_network(sample_measurement.touchstone_data)
+        
+        for result in results:
+            expected = test_type.calculator.calculate_oob_rejection(
+                network, criterion.frequency_min, criterion.frequency_max, 0.5, 2.0, result.s_parameter
+            )
+            assert result.measured_value == pytest.approx(expected)
+    
+    def test_evaluate_band_metrics_matches_evaluate_compliance(self, test_type, sample_measurement, sample_device, sample_criteria):
+        """Test evaluation from (stored) band metrics gives the same results."""
+        bands = test_type.get_metric_bands(sample_criteria, 0.5, 2.0)
+        assert bands == [(0.5, 2.0), (3.0, 5.0)]
+        
+        band_metrics = test_type.compute_band_metrics(sample_measurement, bands)
+        assert band_metrics[(0.5, 2.0)].n_ports == 4
+        assert band_metrics[(0.5, 2.0)].calculator_version == test_type.metrics_version
+        
+        # RF data is not needed once band metrics exist
+        header_only = sample_measurement.model_copy(update={"touchstone_data": None})
+        from_metrics = test_type.evaluate_band_metrics(
+            header_only, sample_device, sample_criteria, band_metrics, 0.5, 2.0
+        )
+        direct = test_type.evaluate_compliance(
+            sample_measurement, sample_device, sample_criteria, 0.5, 2.0
+        )
+        
+        def key(result):
+            return (result.test_criteria_id, result.s_parameter)
+        assert [(key(r), r.measured_value, r.passed) for r in sorted(from_metrics, key=key)] == \
+            [(key(r), r.measured_value, r.passed) for r in sorted(direct, key=key)]
+    
+    def test_empty_band_produces_no_results(self, test_type, sample_measurement, sample_device, sample_criteria):
+        """Test bands without frequency points yield no results."""
+        from src.core.models.measurement_metrics import MeasurementMetrics
+        empty = MeasurementMetrics(
+            measurement_id=sample_measurement.id,
+            freq_min=0.5,
+            freq_max=2.0,
+            calculator_version=test_type.metrics_version,
+            n_ports=4
+        )
+        assert empty.is_empty
+        
+        results = test_type.evaluate_band_metrics(
+            sample_measurement, sample_device, sample_criteria,
+            {(0.5, 2.0): empty, (3.0, 5.0): empty}, 0.5, 2.0
+        )
+        assert results == []
+    
+    def test_results_carry_secondary_values(self, test_type, sample_measurement, sample_device, sample_criteria):
+        """Test results store min/max and worst-case frequency from evaluation."""
+        network = test_type.loader.deserialize_network(sample_measurement.touchstone_data)
+        results = test_type.evaluate_compliance(
+            sample_measurement, sample_device, sample_criteria, 0.5, 2.0
+        )
+        by_criterion = {}
+        for result in results:
+            by_criterion.setdefault(result.test_criteria_id, {})[result.s_parameter] = result
+        gain_range, flatness, vswr, oob = (by_criterion[c.id] for c in sample_criteria)
+        
+        min_gain, max_gain = test_type.calculator.calculate_gain_range(network, 0.5, 2.0, "S31")
+        assert gain_range["S31"].measured_min == pytest.approx(min_gain)
+        assert gain_range["S31"].measured_max == pytest.approx(max_gain)
+        assert 0.5 <= gain_range["S31"].worst_frequency <= 2.0
+        assert flatness["S31"].measured_max - flatness["S31"].measured_min == pytest.approx(
+            flatness["S31"].measured_value
+        )
+        assert flatness["S31"].worst_frequency is None
+        assert vswr["S11"].measured_max == vswr["S11"].measured_value
+        assert 0.5 <= vswr["S11"].worst_frequency <= 2.0
+        assert oob["S31"].measured_min == oob["S31"].measured_value
+        assert oob["S31"].measured_max >= oob["S31"].measured_min
+        assert 3.0 <= oob["S31"].worst_frequency <= 5.0
+    
+    def _by_criterion(self, results):
+        """Index results by criterion ID and S-parameter."""
+        by_criterion = {}
+        for result in results:
+            by_criterion.setdefault(result.test_criteria_id, {})[result.s_parameter] = result
+        return by_criterion
+    
+    def test_results_carry_margins(self, test_type, sample_measurement, sample_device, sample_criteria):
+        """Test gain range and VSWR results carry the worst-case margin and guard-band share."""
+        results = test_type.evaluate_compliance(
+            sample_measurement, sample_device, sample_criteria, 0.5, 2.0
+        )
+        gain_range, flatness, vswr, oob = (
+            self._by_criterion(results)[c.id] for c in sample_criteria
+        )
+        
+        s31 = gain_range["S31"]
+        assert s31.margin == pytest.approx(min(s31.measured_min - 27.5, 31.3 - s31.measured_max))
+        assert 0.0 <= s31.guard_band_percent <= 100.0
+        assert s31.passed == (s31.margin >= 0)
+        assert vswr["S11"].margin == pytest.approx(2.0 - vswr["S11"].measured_value)
+        assert vswr["S11"].guard_band_percent is not None
+        assert flatness["S31"].margin is None and oob["S31"].margin is None
+    
+    def test_margins_from_stored_metrics(self, test_type, sample_measurement, sample_device, sample_criteria):
+        """Test stored-metric evaluation gives the margins of a direct evaluation, pool or not."""
+        from src.core.models.measurement_metrics import MeasurementMetrics
+        from src.core.rf_data.analysis_context import AnalysisContextPool
+        bands = test_type.get_metric_bands(sample_criteria, 0.5, 2.0)
+        # Round trip through JSON like the metrics repository
+        stored_metrics = {
+            band: MeasurementMetrics.model_validate_json(metrics.model_dump_json())
+            for band, metrics in test_type.compute_band_metrics(
+                sample_measurement, bands, sample_criteria
+            ).items()
+        }
+        direct = self._by_criterion(test_type.evaluate_compliance(
+            sample_measurement, sample_device, sample_criteria, 0.5, 2.0
+        ))
+        
+        # Empty pool (e.g., a later session) - margins come from the stored reductions
+        stored_only = self._by_criterion(SParametersTestType(analysis_pool=AnalysisContextPool()).evaluate_band_metrics(
+            sample_measurement, sample_device, sample_criteria, stored_metrics, 0.5, 2.0
+        ))
+        
+        for criterion in sample_criteria[:1] + sample_criteria[2:3]:
+            for s_param, result in direct[criterion.id].items():
+                stored = stored_only[criterion.id][s_param]
+                assert stored.margin == result.margin
+                assert stored.worst_frequency == result.worst_frequency
+                assert stored.guard_band_percent == result.guard_band_percent
+                assert stored.guard_band_percent is not None
+    
+    def test_margin_reductions_are_stored_for_operational_band(
+        self, test_type, sample_measurement, sample_device, sample_criteria
+    ):
+        """Test only the operational band keeps margins, and a changed limit falls back to extremes."""
+        bands = test_type.get_metric_bands(sample_criteria, 0.5, 2.0)
+        band_metrics = test_type.compute_band_metrics(sample_measurement, bands, sample_criteria)
+        operational, oob = band_metrics[(0.5, 2.0)], band_metrics[(3.0, 5.0)]
+        
+        gain_limit = test_type.margin_limit(sample_criteria[0])
+        assert set(operational.margins) == {
+            gain_limit.key, test_type.margin_limit(sample_criteria[2]).key
+        }
+        assert len(operational.margins[gain_limit.key]["guard_band_percent"]) == 4
+        assert oob.margins == {}
+        
+        # Limit changed after the metrics were stored - no RF data, no samples
+        changed = sample_criteria[0].model_copy(update={"min_value": 28.0})
+        results = self._by_criterion(test_type.evaluate_band_metrics(
+            sample_measurement, sample_device, [changed], band_metrics, 0.5, 2.0
+        ))
+        s31 = results[changed.id]["S31"]
+        assert s31.margin == pytest.approx(min(s31.measured_min - 28.0, 31.3 - s31.measured_max))
+        assert s31.guard_band_percent is None